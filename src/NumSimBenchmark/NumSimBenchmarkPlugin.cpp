@@ -0,0 +1,62 @@
+#include <cmath>
+#include <vector>
+
+#include "NumSimSimulation.h"
+
+// set per copy by CMakeLists.txt, so every copy of the plugin exports its own class
+#ifndef NUMSIM_BENCHMARK_PLUGIN_CLASS
+#define NUMSIM_BENCHMARK_PLUGIN_CLASS BenchmarkSimulation
+#endif
+
+// expands the class macro before NUMSIM_DLL_ALIAS pastes it into the alias name
+#define NUMSIM_BENCHMARK_DLL_ALIAS(className) NUMSIM_DLL_ALIAS(className)
+
+namespace NumSimSolver
+{
+    namespace
+    {
+        /**
+         * @brief static data built when the library is loaded, like the property tables of a physics plugin
+         */
+        std::vector<real_t> BuildTable()
+        {
+            std::vector<real_t> table(1 << 18);
+
+            for (std::size_t i = 0; i < table.size(); ++i)
+            {
+                table[i] = std::sin(static_cast<real_t>(i) * 1.0e-3);
+            }
+
+            return table;
+        }
+
+        const std::vector<real_t> propertyTable = BuildTable();
+    }
+
+    class BOOST_SYMBOL_EXPORT NUMSIM_BENCHMARK_PLUGIN_CLASS : public NumSimSimulation
+    {
+    public:
+        NUMSIM_BENCHMARK_PLUGIN_CLASS()
+        {
+            this->className_ = __func__;
+        }
+
+        void Solve() override
+        {
+            this->value_ += propertyTable[this->numSteps_++ % propertyTable.size()];
+        }
+
+        bool IsFinished() const override
+        {
+            return this->numSteps_ >= 1;
+        }
+
+        NUMSIM_DEFINE_FACTORY_METHOD(NUMSIM_BENCHMARK_PLUGIN_CLASS);
+
+    private:
+        std::size_t numSteps_ = 0;
+        real_t value_ = 0.0;
+    };
+}
+
+NUMSIM_BENCHMARK_DLL_ALIAS(NUMSIM_BENCHMARK_PLUGIN_CLASS)
@@ -0,0 +1,230 @@
+#include <algorithm>
+#include <chrono>
+#include <cstdint>
+#include <iostream>
+#include <string>
+#include <vector>
+#include <boost/program_options.hpp>
+
+#include "NumSimComm.h"
+#include "NumSimHaloExchange.h"
+#include "NumSimPartition.h"
+
+namespace
+{
+    /**
+     * @brief structured nx x ny x nz hexahedral mesh in the arrays of NumSimMeshReader
+     */
+    struct HexMesh
+    {
+        std::vector<NumSimSolver::real_t> points;
+        std::vector<std::int64_t> connectivity;
+        std::vector<std::int64_t> offsets;
+
+        HexMesh(std::int64_t nx, std::int64_t ny, std::int64_t nz)
+        {
+            auto pointId = [nx, ny](std::int64_t i, std::int64_t j, std::int64_t k)
+                {
+                    return (k * (ny + 1) + j) * (nx + 1) + i;
+                };
+
+            for (std::int64_t k = 0; k <= nz; ++k)
+            {
+                for (std::int64_t j = 0; j <= ny; ++j)
+                {
+                    for (std::int64_t i = 0; i <= nx; ++i)
+                    {
+                        this->points.push_back(static_cast<NumSimSolver::real_t>(i));
+                        this->points.push_back(static_cast<NumSimSolver::real_t>(j));
+                        this->points.push_back(static_cast<NumSimSolver::real_t>(k));
+                    }
+                }
+            }
+
+            this->offsets.push_back(0);
+
+            for (std::int64_t k = 0; k < nz; ++k)
+            {
+                for (std::int64_t j = 0; j < ny; ++j)
+                {
+                    for (std::int64_t i = 0; i < nx; ++i)
+                    {
+                        std::int64_t hex[8] = {
+                            pointId(i, j, k), pointId(i + 1, j, k), pointId(i + 1, j + 1, k), pointId(i, j + 1, k),
+                            pointId(i, j, k + 1), pointId(i + 1, j, k + 1), pointId(i + 1, j + 1, k + 1), pointId(i, j + 1, k + 1) };
+                        this->connectivity.insert(this->connectivity.end(), hex, hex + 8);
+                        this->offsets.push_back(static_cast<std::int64_t>(this->connectivity.size()));
+                    }
+                }
+            }
+        }
+    };
+
+    /**
+     * @brief average over the cell and its neighbours, repeated to emulate a heavier kernel
+     */
+    inline NumSimSolver::real_t Smooth(const NumSimSolver::NumSimPartition& partition, const std::vector<NumSimSolver::real_t>& u,
+        NumSimSolver::int_t cell, int repeat)
+    {
+        auto& offsets = partition.GetAdjacencyOffsets();
+        auto& adjacency = partition.GetAdjacency();
+        NumSimSolver::real_t value = u[cell];
+
+        for (int r = 0; r < repeat; ++r)
+        {
+            NumSimSolver::real_t sum = u[cell];
+
+            for (auto j = offsets[cell]; j < offsets[cell + 1]; ++j)
+            {
+                sum += u[adjacency[j]];
+            }
+
+            value = 0.5 * value + 0.5 * sum / (offsets[cell + 1] - offsets[cell] + 1);
+        }
+
+        return value;
+    }
+}
+
+int main(int argc, char* argv[])
+{
+    boost::program_options::options_description desc("Allowed options");
+
+    desc.add_options()
+        ("help,h", "produce help message")
+        ("nx", boost::program_options::value<std::int64_t>()->default_value(64), "cells along x")
+        ("ny", boost::program_options::value<std::int64_t>()->default_value(64), "cells along y")
+        ("nz", boost::program_options::value<std::int64_t>()->default_value(64), "cells along z")
+        ("steps", boost::program_options::value<int>()->default_value(50), "smoothing steps")
+        ("repeat", boost::program_options::value<int>()->default_value(4), "stencil evaluations per cell and step")
+        ("threads", boost::program_options::value<unsigned int>()->default_value(1), "threads per rank, 0 for the hardware threads of the node divided by its ranks")
+        ("method", boost::program_options::value<std::string>()->default_value("rcb"), "rcb or block")
+        ("mode", boost::program_options::value<std::string>()->default_value("overlap"), "overlap or blocking");
+
+    boost::program_options::variables_map vm;
+
+    try {
+        boost::program_options::store(boost::program_options::parse_command_line(argc, argv, desc), vm);
+        boost::program_options::notify(vm);
+    } catch (const boost::program_options::error& e) {
+        std::cerr << "Error: " << e.what() << std::endl;
+        std::cout << desc << std::endl;
+        return 1;
+    }
+
+    if (vm.count("help"))
+    {
+        std::cout << desc << std::endl;
+        return 0;
+    }
+
+    std::int64_t nx = vm["nx"].as<std::int64_t>();
+    std::int64_t ny = vm["ny"].as<std::int64_t>();
+    std::int64_t nz = vm["nz"].as<std::int64_t>();
+    int numSteps = vm["steps"].as<int>();
+    int repeat = vm["repeat"].as<int>();
+    unsigned int numThreads = vm["threads"].as<unsigned int>();
+    std::string method = vm["method"].as<std::string>();
+    bool overlap = vm["mode"].as<std::string>() == "overlap";
+
+    boost::json::object numSimSolverJson;
+    NumSimSolver::NumSimComm comm;
+    comm.SetThreadsPerRank(numThreads);
+    comm.Initialize(numSimSolverJson);
+    auto& pool = comm.GetThreadPool();
+
+    double elapsed = 0.0;
+    double partitionTime = 0.0;
+    double checksum = 0.0;
+    std::uint64_t ghosts = 0;
+
+    {
+        HexMesh mesh(nx, ny, nz);
+        auto numCells = static_cast<std::uint64_t>(nx * ny * nz);
+
+        auto start = std::chrono::steady_clock::now();
+        NumSimSolver::NumSimPartition partition;
+        partition.SetMethod(method == "block" ? NumSimSolver::NumSimPartition::Method::Block : NumSimSolver::NumSimPartition::Method::RCB);
+        partition.Build(&comm, numCells, mesh.offsets.data(), mesh.connectivity.data(), mesh.points.data());
+        partitionTime = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+        // initial field: a function of the global id, so every rank count gives the same result
+        std::vector<NumSimSolver::real_t> u(partition.GetNumLocal());
+        std::vector<NumSimSolver::real_t> next(partition.GetNumLocal());
+
+        for (NumSimSolver::int_t i = 0; i < partition.GetNumLocal(); ++i)
+        {
+            u[i] = static_cast<NumSimSolver::real_t>(partition.GetLocalToGlobal()[i] % 97);
+        }
+
+        // one exchange per buffer, since the buffers are swapped every step
+        NumSimSolver::NumSimHaloExchange haloU;
+        NumSimSolver::NumSimHaloExchange haloNext;
+        haloU.Setup(&comm, partition, u.data());
+        haloNext.Setup(&comm, partition, next.data());
+
+        comm.Barrier();
+        start = std::chrono::steady_clock::now();
+
+        for (int step = 0; step < numSteps; ++step)
+        {
+            auto& halo = step % 2 == 0 ? haloU : haloNext;
+            auto& current = step % 2 == 0 ? u : next;
+            auto& updated = step % 2 == 0 ? next : u;
+            auto update = [&](std::int64_t begin, std::int64_t end)
+                {
+                    for (auto i = begin; i < end; ++i)
+                    {
+                        updated[i] = Smooth(partition, current, static_cast<NumSimSolver::int_t>(i), repeat);
+                    }
+                };
+
+            if (overlap)
+            {
+                halo.Begin();
+
+                pool.ParallelFor(0, partition.GetNumInterior(), update);
+
+                halo.End();
+            }
+            else
+            {
+                halo.Exchange();
+
+                pool.ParallelFor(0, partition.GetNumInterior(), update);
+            }
+
+            pool.ParallelFor(partition.GetNumInterior(), partition.GetNumOwned(), update);
+        }
+
+        double localElapsed = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+        MPI_Allreduce(&localElapsed, &elapsed, 1, MPI_DOUBLE, MPI_MAX, comm.GetComm());
+
+        auto& result = numSteps % 2 == 0 ? u : next;
+        double localSum = 0.0;
+
+        for (NumSimSolver::int_t i = 0; i < partition.GetNumOwned(); ++i)
+        {
+            localSum += result[i];
+        }
+
+        MPI_Allreduce(&localSum, &checksum, 1, MPI_DOUBLE, MPI_SUM, comm.GetComm());
+
+        std::uint64_t localGhosts = partition.GetNumLocal() - partition.GetNumOwned();
+        MPI_Allreduce(&localGhosts, &ghosts, 1, MPI_UINT64_T, MPI_SUM, comm.GetComm());
+    }
+
+    // one JSON line for bench_halo.py
+    if (comm.GetMyRank() == 0)
+    {
+        std::cout.precision(17);
+        std::cout << "{\"ranks\": " << comm.GetNumProcs() << ", \"threads\": " << comm.GetThreadsPerRank() << ", \"method\": \"" << method << "\", \"mode\": \""
+                  << (overlap ? "overlap" : "blocking") << "\", \"cells\": " << nx * ny * nz << ", \"ghosts\": " << ghosts
+                  << ", \"partition\": " << partitionTime << ", \"elapsed\": " << elapsed
+                  << ", \"checksum\": " << checksum << "}" << std::endl;
+    }
+
+    comm.Finalize();
+
+    return 0;
+}
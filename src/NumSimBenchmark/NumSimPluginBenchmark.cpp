@@ -0,0 +1,134 @@
+#include <algorithm>
+#include <chrono>
+#include <iostream>
+#include <memory>
+#include <string>
+#include <vector>
+#include <boost/filesystem.hpp>
+#include <boost/program_options.hpp>
+
+#include "NumSimPluginRegistry.h"
+#include "NumSimSimulation.h"
+
+namespace
+{
+    double Seconds(std::chrono::steady_clock::time_point start)
+    {
+        return std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+    }
+}
+
+int main(int argc, char* argv[])
+{
+    boost::program_options::options_description desc("Allowed options");
+
+    desc.add_options()
+        ("help,h", "produce help message")
+        ("directory", boost::program_options::value<std::string>(), "plugin directory")
+        ("use", boost::program_options::value<int>()->default_value(2), "simulation classes created, from the first plugins")
+        ("mode", boost::program_options::value<std::string>()->default_value("registry"), "registry (scan, load on first use) or eager (load every plugin)")
+        ("manifest", boost::program_options::value<std::string>()->default_value(""), "manifest file of the registry, empty for none");
+
+    boost::program_options::variables_map vm;
+
+    try {
+        boost::program_options::store(boost::program_options::parse_command_line(argc, argv, desc), vm);
+        boost::program_options::notify(vm);
+    } catch (const boost::program_options::error& e) {
+        std::cerr << "Error: " << e.what() << std::endl;
+        std::cout << desc << std::endl;
+        return 1;
+    }
+
+    if (vm.count("help") || !vm.count("directory"))
+    {
+        std::cout << desc << std::endl;
+        return vm.count("help") ? 0 : 1;
+    }
+
+    std::string directory = vm["directory"].as<std::string>();
+    int numUsed = vm["use"].as<int>();
+    std::string mode = vm["mode"].as<std::string>();
+
+    std::vector<std::string> classNames;
+    std::vector<std::unique_ptr<NumSimSolver::NumSimSimulation>> simulations;
+    std::size_t numLibraries = 0;
+    std::size_t numLoaded = 0;
+    std::size_t numInspected = 0;
+    double scanTime = 0.0;
+    auto start = std::chrono::steady_clock::now();
+
+    // declared before the simulations, so the libraries are unloaded after them
+    std::vector<boost::dll::shared_library> libraries;
+    NumSimSolver::NumSimPluginRegistry registry;
+
+    if (mode == "eager")
+    {
+        // what the solver did without a registry: load every plugin and look up the classes in all of them
+        std::vector<boost::filesystem::path> paths;
+
+        for (auto& entry : boost::filesystem::directory_iterator(directory))
+        {
+            if (entry.path().extension() == boost::dll::shared_library::suffix())
+            {
+                paths.push_back(entry.path());
+            }
+        }
+
+        std::sort(paths.begin(), paths.end());
+
+        for (auto& path : paths)
+        {
+            libraries.emplace_back(path);
+        }
+
+        scanTime = Seconds(start);
+        numLibraries = numLoaded = libraries.size();
+
+        for (int i = 1; i <= numUsed; ++i)
+        {
+            std::string alias = "CreateBenchmarkSimulation" + std::to_string(i);
+
+            for (auto& library : libraries)
+            {
+                if (library.has(alias))
+                {
+                    simulations.emplace_back(library.get_alias<NumSimSolver::NumSimSimulation*()>(alias)());
+                    break;
+                }
+            }
+        }
+    }
+    else
+    {
+        registry.SetDirectories({ directory });
+        registry.SetManifestFileName(vm["manifest"].as<std::string>());
+        registry.Scan();
+        scanTime = Seconds(start);
+
+        for (int i = 1; i <= numUsed; ++i)
+        {
+            simulations.emplace_back(registry.Create<NumSimSolver::NumSimSimulation>("BenchmarkSimulation" + std::to_string(i)));
+        }
+
+        numLibraries = registry.GetNumLibraries();
+        numLoaded = registry.GetNumLoaded();
+        numInspected = registry.GetNumInspected();
+    }
+
+    double totalTime = Seconds(start);
+
+    for (auto& simulation : simulations)
+    {
+        simulation->Solve();
+    }
+
+    // one JSON line for bench_plugins.py
+    std::cout << "{\"mode\": \"" << mode << "\", \"libraries\": " << numLibraries << ", \"loaded\": " << numLoaded
+              << ", \"inspected\": " << numInspected << ", \"used\": " << simulations.size()
+              << ", \"scan\": " << scanTime << ", \"total\": " << totalTime << "}" << std::endl;
+
+    simulations.clear();
+
+    return 0;
+}
@@ -0,0 +1,199 @@
+#include <algorithm>
+#include <chrono>
+#include <cstdint>
+#include <iostream>
+#include <string>
+#include <thread>
+#include <vector>
+#include <boost/program_options.hpp>
+
+#include "NumSimFramework.h"
+#include "NumSimPostPipeline.h"
+#include "NumSimScheduler.h"
+#include "NumSimSimulation.h"
+
+namespace
+{
+    /**
+     * @brief fixed amount of floating-point work (a dependent chain, so it cannot be vectorized away)
+     */
+    double Work(std::uint64_t iterations)
+    {
+        volatile double seed = 1.0;
+        double x = seed;
+
+        for (std::uint64_t i = 0; i < iterations; ++i)
+        {
+            x = x * 1.0000001 + 1.0e-9;
+        }
+
+        return x;
+    }
+
+    /**
+     * @brief iterations of Work() per microsecond on one core
+     */
+    double CalibrateWork()
+    {
+        const std::uint64_t iterations = 20000000;
+        auto start = std::chrono::steady_clock::now();
+        volatile double result = Work(iterations);
+        (void)result;
+        double elapsed = std::chrono::duration<double, std::micro>(std::chrono::steady_clock::now() - start).count();
+        return iterations / elapsed;
+    }
+
+    /**
+     * @brief simulation whose Solve() performs a fixed amount of CPU work
+     *
+     * @details the work is counted in iterations rather than wall time, so
+     * oversubscribed threads do not finish early. Post() emulates output I/O
+     * by sleeping; with async post the sleep happens in WritePost() on the
+     * I/O thread after the field has been snapshotted.
+     */
+    class DummySimulation : public NumSimSolver::NumSimSimulation
+    {
+    public:
+        DummySimulation(int numSteps, std::uint64_t workIterations, double postMicroseconds, std::size_t fieldSize)
+            : numSteps_(numSteps), workIterations_(workIterations), postMicroseconds_(postMicroseconds), field_(fieldSize, 0.0)
+        {
+            this->className_ = __func__;
+            this->RegisterField("Field", this->field_.data(), this->field_.size());
+        }
+
+        void Solve() override
+        {
+            this->result_ = Work(this->workIterations_);
+            ++this->step_;
+
+            for (auto& value : this->field_)
+            {
+                value = this->step_;
+            }
+        }
+
+        void Post() override
+        {
+            std::this_thread::sleep_for(std::chrono::duration<double, std::micro>(this->postMicroseconds_));
+        }
+
+        bool SupportsAsyncPost() const override
+        {
+            return true;
+        }
+
+        void WritePost(const NumSimSolver::NumSimPostBuffer& buffer) override
+        {
+            std::this_thread::sleep_for(std::chrono::duration<double, std::micro>(this->postMicroseconds_));
+        }
+
+        bool IsFinished() const override
+        {
+            return this->step_ >= this->numSteps_;
+        }
+
+    private:
+        int numSteps_ = 0;
+        int step_ = 0;
+        std::uint64_t workIterations_ = 0;
+        double postMicroseconds_ = 0.0;
+        std::vector<NumSimSolver::real_t> field_;
+        volatile double result_ = 0.0;
+    };
+}
+
+int main(int argc, char* argv[])
+{
+    boost::program_options::options_description desc("Allowed options");
+
+    desc.add_options()
+        ("help,h", "produce help message")
+        ("simulations,n", boost::program_options::value<int>()->default_value(8), "number of dummy simulations")
+        ("steps", boost::program_options::value<int>()->default_value(50), "steps per simulation")
+        ("work-us", boost::program_options::value<double>()->default_value(1000.0), "work per step of the cheapest simulation (microseconds)")
+        ("imbalance", boost::program_options::value<double>()->default_value(0.0), "the last simulation costs (1 + imbalance) times the first")
+        ("coupled", "make every odd simulation depend on the previous one with twice its step interval")
+        ("mode", boost::program_options::value<std::string>()->default_value("parallel"), "serial or parallel")
+        ("post-us", boost::program_options::value<double>()->default_value(0.0), "emulated output I/O time per Post() (microseconds)")
+        ("post-mode", boost::program_options::value<std::string>()->default_value("sync"), "sync or async")
+        ("field-size", boost::program_options::value<std::size_t>()->default_value(100000), "values snapshotted per async Post()")
+        ("threads,t", boost::program_options::value<unsigned int>()->default_value(0), "worker threads, 0 for all hardware threads");
+
+    boost::program_options::variables_map vm;
+
+    try {
+        boost::program_options::store(boost::program_options::parse_command_line(argc, argv, desc), vm);
+        boost::program_options::notify(vm);
+    } catch (const boost::program_options::error& e) {
+        std::cerr << "Error: " << e.what() << std::endl;
+        std::cout << desc << std::endl;
+        return 1;
+    }
+
+    if (vm.count("help"))
+    {
+        std::cout << desc << std::endl;
+        return 0;
+    }
+
+    int numSimulations = vm["simulations"].as<int>();
+    int numSteps = vm["steps"].as<int>();
+    double workMicroseconds = vm["work-us"].as<double>();
+    double imbalance = vm["imbalance"].as<double>();
+    std::string mode = vm["mode"].as<std::string>();
+    unsigned int numThreads = vm["threads"].as<unsigned int>();
+    double postMicroseconds = vm["post-us"].as<double>();
+    std::string postMode = vm["post-mode"].as<std::string>();
+    std::size_t fieldSize = vm["field-size"].as<std::size_t>();
+    double iterationsPerMicrosecond = CalibrateWork();
+
+    auto framework = NumSimSolver::NumSimFramework::Create();
+    auto scheduler = framework->GetScheduler();
+    scheduler->SetMode(mode == "serial" ? NumSimSolver::NumSimScheduler::Mode::Serial : NumSimSolver::NumSimScheduler::Mode::Parallel);
+    scheduler->SetNumThreads(numThreads);
+    framework->GetPostPipeline()->SetMode(postMode == "async" ? NumSimSolver::NumSimPostPipeline::Mode::Async : NumSimSolver::NumSimPostPipeline::Mode::Sync);
+
+    double totalWork = 0.0;
+
+    for (int i = 0; i < numSimulations; ++i)
+    {
+        double scale = numSimulations > 1 ? 1.0 + imbalance * i / (numSimulations - 1) : 1.0;
+        bool coupled = vm.count("coupled") && i % 2 == 1;
+
+        // a coupled simulation takes half as many steps, each covering two ticks of its dependency
+        int simulationSteps = coupled ? numSteps / 2 : numSteps;
+        auto simulation = new DummySimulation(simulationSteps, static_cast<std::uint64_t>(workMicroseconds * scale * iterationsPerMicrosecond), postMicroseconds, fieldSize);
+        simulation->SetObjectName("Dummy" + std::to_string(i));
+
+        if (coupled)
+        {
+            simulation->AddDependency("Dummy" + std::to_string(i - 1));
+            simulation->SetStepInterval(2);
+        }
+
+        totalWork += simulationSteps * workMicroseconds * scale * 1.0e-6;
+        framework->AddSimulation(simulation);
+    }
+
+    auto start = std::chrono::steady_clock::now();
+    framework->Run();
+    double elapsed = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+    if (mode == "serial")
+    {
+        numThreads = 1;
+    }
+    else if (numThreads == 0)
+    {
+        numThreads = std::max(1u, std::thread::hardware_concurrency());
+    }
+
+    // one JSON line for bench_scheduler.py
+    std::cout << "{\"mode\": \"" << mode << "\", \"post_mode\": \"" << postMode << "\", \"threads\": " << numThreads
+              << ", \"simulations\": " << numSimulations << ", \"work\": " << totalWork
+              << ", \"elapsed\": " << elapsed << ", \"post_stall\": " << framework->GetPostPipeline()->GetStallTime() << "}" << std::endl;
+
+    delete framework;
+
+    return 0;
+}
@@ -0,0 +1,106 @@
+"""
+区域分解与 halo 交换的扩展性基准测试
+以 mpirun -np 1..N 在本机运行 NumSimHaloBenchmark（结构化六面体网格上的邻域平均），
+输出强扩展的加速比和并行效率，以及通信与内部计算重叠（overlap）和阻塞交换（blocking）的对比；
+--threads 指定每个进程的线程数，用于比较相同核心数下“多进程”与“少进程多线程”的划分
+
+用法（在 src 目录下，先构建 NumSimBenchmark）：
+    python NumSimBenchmark/bench_halo.py --size 96 --ranks 1 2 4 8
+    python NumSimBenchmark/bench_halo.py --size 96 --ranks 1 2 --threads 4
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+EXECUTABLE_NAME = "NumSimHaloBenchmark"
+
+
+def find_executable():
+    """在 install 目录下查找基准测试程序（优先 Release 构建）"""
+    install_dir = Path(__file__).resolve().parents[2] / "install"
+    suffix = ".exe" if sys.platform == "win32" else ""
+    for config in ("Release", "RelWithDebInfo", "Debug", ""):
+        path = install_dir / config / f"{EXECUTABLE_NAME}{suffix}"
+        if path.is_file():
+            return path
+    return None
+
+
+def run_benchmark(executable, args, ranks, mode):
+    """以 ranks 个进程运行一次基准测试程序，返回 0 号进程输出的 JSON 结果"""
+    command = [
+        args.mpirun, *args.mpirun_args, "-np", str(ranks),
+        str(executable),
+        "--nx", str(args.size),
+        "--ny", str(args.size),
+        "--nz", str(args.size),
+        "--steps", str(args.steps),
+        "--repeat", str(args.repeat),
+        "--threads", str(args.threads),
+        "--method", args.method,
+        "--mode", mode,
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def default_rank_counts():
+    """1, 2, 4, ... 直到核心数"""
+    cores = os.cpu_count() or 1
+    counts = []
+    ranks = 1
+    while ranks < cores:
+        counts.append(ranks)
+        ranks *= 2
+    counts.append(cores)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumSimPartition / NumSimHaloExchange 扩展性基准测试")
+    parser.add_argument("--executable", type=Path, default=None, help="NumSimHaloBenchmark 路径")
+    parser.add_argument("--mpirun", default=shutil.which("mpiexec") or shutil.which("mpirun") or "mpiexec",
+                        help="MPI 启动程序")
+    parser.add_argument("--mpirun-args", nargs=argparse.REMAINDER, default=[],
+                        help="传给 MPI 启动程序的其他参数（放在最后，例如 --oversubscribe）")
+    parser.add_argument("--size", type=int, default=64, help="网格每个方向的单元数")
+    parser.add_argument("--steps", type=int, default=50, help="时间步数")
+    parser.add_argument("--repeat", type=int, default=4, help="每步每个单元的模板计算次数")
+    parser.add_argument("--threads", type=int, default=1, help="每个进程的线程数")
+    parser.add_argument("--method", choices=("rcb", "block"), default="rcb", help="分区方法")
+    parser.add_argument("--ranks", type=int, nargs="+", default=None, help="进程数列表")
+    args = parser.parse_args()
+
+    executable = args.executable or find_executable()
+    if executable is None or not Path(executable).is_file():
+        parser.error(f"未找到 {EXECUTABLE_NAME}，请先构建或通过 --executable 指定")
+
+    print(f"网格: {args.size}^3 = {args.size ** 3} 单元，分区: {args.method}，核心数: {os.cpu_count()}")
+    print(f"{'进程':>6}{'线程':>6}{'ghost 单元':>12}{'分区 (s)':>10}{'blocking (s)':>14}{'overlap (s)':>13}"
+          f"{'加速比':>8}{'效率':>8}")
+
+    baseline = None
+    checksum = None
+    for ranks in args.ranks or default_rank_counts():
+        blocking = run_benchmark(executable, args, ranks, "blocking")
+        overlap = run_benchmark(executable, args, ranks, "overlap")
+        if baseline is None:
+            baseline = overlap["elapsed"]
+            baseline_cores = ranks * overlap["threads"]
+            checksum = overlap["checksum"]
+        # 加速比相对第一行，效率按使用的核心数（进程数 × 线程数）计算；
+        # 不同进程数只有求和顺序不同，结果应在舍入误差内一致
+        if abs(overlap["checksum"] - checksum) > 1.0e-9 * max(1.0, abs(checksum)):
+            print(f"警告: {ranks} 个进程的结果校验和 {overlap['checksum']} 与单进程 {checksum} 不一致")
+        speedup = baseline / overlap["elapsed"]
+        cores = ranks * overlap["threads"]
+        print(f"{ranks:>6}{overlap['threads']:>6}{overlap['ghosts']:>12}{overlap['partition']:>10.3f}{blocking['elapsed']:>14.3f}"
+              f"{overlap['elapsed']:>13.3f}{speedup:>8.2f}{speedup * baseline_cores / cores:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
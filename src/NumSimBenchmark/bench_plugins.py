@@ -0,0 +1,91 @@
+"""
+插件注册表基准测试
+运行 NumSimPluginBenchmark（benchmark_plugins 目录下的 N 个仿真插件，只使用其中几个），
+对比加载全部插件（eager）与注册表按需加载（首次扫描、已有清单）的启动耗时
+
+用法（在 src 目录下，先构建 NumSimBenchmark）：
+    python NumSimBenchmark/bench_plugins.py --use 2
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+EXECUTABLE_NAME = "NumSimPluginBenchmark"
+PLUGIN_DIRECTORY = "benchmark_plugins"
+
+
+def find_executable():
+    """在 install 目录下查找基准测试程序（优先 Release 构建）"""
+    install_dir = Path(__file__).resolve().parents[2] / "install"
+    suffix = ".exe" if sys.platform == "win32" else ""
+    for config in ("Release", "RelWithDebInfo", "Debug", ""):
+        path = install_dir / config / f"{EXECUTABLE_NAME}{suffix}"
+        if path.is_file():
+            return path
+    return None
+
+
+def run_benchmark(executable, directory, use, mode, manifest=""):
+    """运行一次基准测试程序（每次一个新进程，插件都未加载），返回其输出的 JSON 结果"""
+    command = [
+        str(executable),
+        "--directory", str(directory),
+        "--use", str(use),
+        "--mode", mode,
+        "--manifest", str(manifest),
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def best_of(repeat, run):
+    """重复运行，取总耗时最短的一次"""
+    return min((run() for _ in range(repeat)), key=lambda result: result["total"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumSimPluginRegistry 插件加载基准测试")
+    parser.add_argument("--executable", type=Path, default=None, help="NumSimPluginBenchmark 路径")
+    parser.add_argument("--directory", type=Path, default=None, help="插件目录（默认为程序旁的 benchmark_plugins）")
+    parser.add_argument("--use", type=int, default=2, help="配置中使用的仿真类数")
+    parser.add_argument("--repeat", type=int, default=5, help="每种方式的运行次数，取最短耗时")
+    args = parser.parse_args()
+
+    executable = args.executable or find_executable()
+    if executable is None or not Path(executable).is_file():
+        parser.error(f"未找到 {EXECUTABLE_NAME}，请先构建或通过 --executable 指定")
+
+    directory = args.directory or Path(executable).parent / PLUGIN_DIRECTORY
+    if not directory.is_dir():
+        parser.error(f"未找到插件目录 {directory}")
+
+    with tempfile.TemporaryDirectory() as temporary:
+        manifest = Path(temporary) / "numsim_plugins.json"
+
+        def cold():
+            # 删除清单，每次都读取全部插件的符号表
+            manifest.unlink(missing_ok=True)
+            return run_benchmark(executable, directory, args.use, "registry", manifest)
+
+        results = [
+            ("eager", best_of(args.repeat, lambda: run_benchmark(executable, directory, args.use, "eager"))),
+            ("registry (scan)", best_of(args.repeat, cold)),
+        ]
+        run_benchmark(executable, directory, args.use, "registry", manifest)
+        results.append(("registry (manifest)",
+                        best_of(args.repeat, lambda: run_benchmark(executable, directory, args.use, "registry", manifest))))
+
+    eager = results[0][1]
+    print(f"插件数: {eager['libraries']}，使用: {eager['used']}")
+    print(f"{'方式':<22}{'加载':>6}{'读取符号':>10}{'扫描 (ms)':>12}{'启动 (ms)':>12}{'加速比':>10}")
+    for name, result in results:
+        speedup = eager["total"] / result["total"]
+        print(f"{name:<22}{result['loaded']:>6}{result['inspected']:>10}{result['scan'] * 1e3:>12.2f}"
+              f"{result['total'] * 1e3:>12.2f}{speedup:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
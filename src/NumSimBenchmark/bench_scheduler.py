@@ -0,0 +1,94 @@
+"""
+多仿真调度器基准测试
+以不同线程数运行 NumSimSchedulerBenchmark（N 个空仿真，每步固定计算量），
+输出相对串行调度的加速比，以及与核心数的对比
+
+用法（在 src 目录下，先构建 NumSimBenchmark）：
+    python NumSimBenchmark/bench_scheduler.py --simulations 16 --imbalance 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+EXECUTABLE_NAME = "NumSimSchedulerBenchmark"
+
+
+def find_executable():
+    """在 install 目录下查找基准测试程序（优先 Release 构建）"""
+    install_dir = Path(__file__).resolve().parents[2] / "install"
+    suffix = ".exe" if sys.platform == "win32" else ""
+    for config in ("Release", "RelWithDebInfo", "Debug", ""):
+        path = install_dir / config / f"{EXECUTABLE_NAME}{suffix}"
+        if path.is_file():
+            return path
+    return None
+
+
+def run_benchmark(executable, args, mode, threads):
+    """运行一次基准测试程序，返回其输出的 JSON 结果"""
+    command = [
+        str(executable),
+        "--simulations", str(args.simulations),
+        "--steps", str(args.steps),
+        "--work-us", str(args.work_us),
+        "--imbalance", str(args.imbalance),
+        "--mode", mode,
+        "--threads", str(threads),
+        "--post-us", str(args.post_us),
+        "--post-mode", args.post_mode,
+    ]
+    if args.coupled:
+        command.append("--coupled")
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def default_thread_counts():
+    """1, 2, 4, ... 直到核心数"""
+    cores = os.cpu_count() or 1
+    counts = []
+    threads = 1
+    while threads < cores:
+        counts.append(threads)
+        threads *= 2
+    counts.append(cores)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumSimFramework 多仿真调度器基准测试")
+    parser.add_argument("--executable", type=Path, default=None, help="NumSimSchedulerBenchmark 路径")
+    parser.add_argument("--simulations", type=int, default=16, help="仿真数")
+    parser.add_argument("--steps", type=int, default=50, help="每个仿真的步数")
+    parser.add_argument("--work-us", type=float, default=2000.0, help="最快仿真每步的计算量（微秒）")
+    parser.add_argument("--imbalance", type=float, default=3.0, help="最慢仿真每步耗时是最快仿真的 1 + imbalance 倍")
+    parser.add_argument("--coupled", action="store_true", help="奇数编号仿真依赖前一个仿真，步长为其 2 倍")
+    parser.add_argument("--post-us", type=float, default=0.0, help="每次 Post() 模拟的输出 I/O 耗时（微秒）")
+    parser.add_argument("--post-mode", choices=("sync", "async"), default="sync", help="后处理输出方式")
+    parser.add_argument("--threads", type=int, nargs="+", default=None, help="并行调度的线程数列表")
+    args = parser.parse_args()
+
+    executable = args.executable or find_executable()
+    if executable is None or not Path(executable).is_file():
+        parser.error(f"未找到 {EXECUTABLE_NAME}，请先构建或通过 --executable 指定")
+
+    serial = run_benchmark(executable, args, "serial", 1)
+    print(f"仿真数: {args.simulations}，核心数: {os.cpu_count()}，总计算量: {serial['work']:.3f} s，"
+          f"后处理: {args.post_mode}")
+    print(f"{'调度':<10}{'线程':>6}{'耗时 (s)':>12}{'加速比':>10}{'理想加速比':>12}")
+    print(f"{'serial':<10}{1:>6}{serial['elapsed']:>12.3f}{1.0:>10.2f}{1.0:>12.2f}")
+
+    # 最慢仿真只能串行推进，其总耗时是并行调度耗时的下限
+    critical_path = args.steps * args.work_us * (1.0 + args.imbalance) * 1.0e-6
+    for threads in args.threads or default_thread_counts():
+        result = run_benchmark(executable, args, "parallel", threads)
+        ideal = min(threads, os.cpu_count() or 1, serial["work"] / critical_path)
+        speedup = serial["elapsed"] / result["elapsed"]
+        print(f"{'parallel':<10}{result['threads']:>6}{result['elapsed']:>12.3f}{speedup:>10.2f}{ideal:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
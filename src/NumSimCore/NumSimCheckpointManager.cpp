@@ -0,0 +1,711 @@
+#include <algorithm>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include <iostream>
+#include <stdexcept>
+
+#include <mpi.h>
+#include <boost/filesystem.hpp>
+
+#include "NumSimCheckpointManager.h"
+#include "NumSimComm.h"
+#include "NumSimSimulation.h"
+
+namespace NumSimSolver
+{
+    namespace
+    {
+        namespace fs = boost::filesystem;
+
+        const char MAGIC[4] = { 'N', 'S', 'C', 'K' };
+        const std::uint32_t FORMAT_VERSION = 1;
+        const char* const CHECKPOINT_PREFIX = "checkpoint_";
+        const char* const TEMPORARY_SUFFIX = ".tmp";
+        const char* const MANIFEST_FILE_NAME = "checkpoint.json";
+        const char* const SHARED_FILE_NAME = "checkpoint.nsc";
+
+        // largest count passed to a single MPI-IO call
+        const std::size_t MAX_IO_CHUNK = 1 << 30;
+
+        template <typename T>
+        void Append(std::string& out, const T& value)
+        {
+            out.append(reinterpret_cast<const char*>(&value), sizeof(T));
+        }
+
+        void AppendString(std::string& out, const std::string& text)
+        {
+            Append(out, static_cast<std::uint32_t>(text.size()));
+            out += text;
+        }
+
+        void CheckAvailable(const char* position, const char* end, std::size_t size)
+        {
+            if (static_cast<std::size_t>(end - position) < size)
+            {
+                throw std::runtime_error("Corrupt checkpoint: unexpected end of data");
+            }
+        }
+
+        template <typename T>
+        T Read(const char*& position, const char* end)
+        {
+            CheckAvailable(position, end, sizeof(T));
+            T value;
+            std::memcpy(&value, position, sizeof(T));
+            position += sizeof(T);
+            return value;
+        }
+
+        std::string ReadString(const char*& position, const char* end)
+        {
+            auto size = Read<std::uint32_t>(position, end);
+            CheckAvailable(position, end, size);
+            std::string text(position, size);
+            position += size;
+            return text;
+        }
+
+        void AppendHeader(std::string& out)
+        {
+            out.append(MAGIC, sizeof(MAGIC));
+            Append(out, FORMAT_VERSION);
+        }
+
+        void ReadHeader(const char*& position, const char* end, const std::string& path)
+        {
+            CheckAvailable(position, end, sizeof(MAGIC));
+
+            if (std::memcmp(position, MAGIC, sizeof(MAGIC)) != 0)
+            {
+                throw std::runtime_error("Not a checkpoint file: " + path);
+            }
+
+            position += sizeof(MAGIC);
+
+            if (Read<std::uint32_t>(position, end) != FORMAT_VERSION)
+            {
+                throw std::runtime_error("Unsupported checkpoint version: " + path);
+            }
+        }
+
+        std::string CheckpointName(std::uint64_t tick)
+        {
+            char name[64];
+            std::snprintf(name, sizeof(name), "%s%012llu", CHECKPOINT_PREFIX, static_cast<unsigned long long>(tick));
+            return name;
+        }
+
+        std::string RankFileName(int rank)
+        {
+            char name[32];
+            std::snprintf(name, sizeof(name), "rank_%06d.nsc", rank);
+            return name;
+        }
+
+        void CheckMPI(int result, const std::string& what)
+        {
+            if (result != MPI_SUCCESS)
+            {
+                throw std::runtime_error("Checkpoint MPI-IO error: " + what);
+            }
+        }
+
+        bool IsMPIInitialized()
+        {
+            int initialized = 0;
+            int finalized = 0;
+            MPI_Initialized(&initialized);
+            MPI_Finalized(&finalized);
+            return initialized && !finalized;
+        }
+    }
+
+    void NumSimCheckpointData::SetField(const std::string& name, const real_t* data, std::size_t numTuples, int_t numComponents)
+    {
+        auto& field = this->fields_[name];
+        field.data.assign(data, data + numTuples * numComponents);
+        field.numTuples = numTuples;
+        field.numComponents = numComponents;
+    }
+
+    const NumSimCheckpointData::Field* NumSimCheckpointData::GetField(const std::string& name) const
+    {
+        auto field = this->fields_.find(name);
+        return field == this->fields_.end() ? nullptr : &field->second;
+    }
+
+    real_t NumSimCheckpointData::GetValue(const std::string& name, real_t defaultValue) const
+    {
+        auto value = this->values_.find(name);
+        return value == this->values_.end() ? defaultValue : value->second;
+    }
+
+    void NumSimCheckpointData::Serialize(std::string& out) const
+    {
+        Append(out, this->clock_);
+        Append(out, static_cast<std::uint32_t>(this->values_.size()));
+
+        for (auto& value : this->values_)
+        {
+            AppendString(out, value.first);
+            Append(out, value.second);
+        }
+
+        Append(out, static_cast<std::uint32_t>(this->fields_.size()));
+
+        for (auto& field : this->fields_)
+        {
+            AppendString(out, field.first);
+            Append(out, static_cast<std::uint64_t>(field.second.numTuples));
+            Append(out, static_cast<std::int32_t>(field.second.numComponents));
+            out.append(reinterpret_cast<const char*>(field.second.data.data()), field.second.data.size() * sizeof(real_t));
+        }
+    }
+
+    void NumSimCheckpointData::Deserialize(const char*& position, const char* end)
+    {
+        this->fields_.clear();
+        this->values_.clear();
+        this->clock_ = Read<std::uint64_t>(position, end);
+
+        auto numValues = Read<std::uint32_t>(position, end);
+
+        for (std::uint32_t i = 0; i < numValues; ++i)
+        {
+            std::string name = ReadString(position, end);
+            this->values_[name] = Read<real_t>(position, end);
+        }
+
+        auto numFields = Read<std::uint32_t>(position, end);
+
+        for (std::uint32_t i = 0; i < numFields; ++i)
+        {
+            std::string name = ReadString(position, end);
+            auto numTuples = static_cast<std::size_t>(Read<std::uint64_t>(position, end));
+            auto numComponents = static_cast<int_t>(Read<std::int32_t>(position, end));
+            std::size_t size = numTuples * numComponents * sizeof(real_t);
+            CheckAvailable(position, end, size);
+
+            auto& field = this->fields_[name];
+            field.data.resize(numTuples * numComponents);
+            std::memcpy(field.data.data(), position, size);
+            field.numTuples = numTuples;
+            field.numComponents = numComponents;
+            position += size;
+        }
+    }
+
+    NumSimCheckpointManager::NumSimCheckpointManager()
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimCheckpointManager::~NumSimCheckpointManager()
+    {
+    }
+
+    void NumSimCheckpointManager::Initialize(boost::json::object& numSimSolverJson)
+    {
+        auto checkpointValue = numSimSolverJson.if_contains("checkpoint");
+
+        if (!checkpointValue || !checkpointValue->is_object())
+        {
+            return;
+        }
+
+        auto& checkpointJson = checkpointValue->as_object();
+
+        if (auto directory = checkpointJson.if_contains("directory"))
+        {
+            this->directory_ = directory->as_string().c_str();
+        }
+
+        if (auto interval = checkpointJson.if_contains("interval"))
+        {
+            this->interval_ = static_cast<std::uint64_t>(interval->to_number<std::int64_t>());
+        }
+
+        if (auto wallInterval = checkpointJson.if_contains("wall_interval"))
+        {
+            this->wallInterval_ = wallInterval->to_number<double>();
+        }
+
+        if (auto checkInterval = checkpointJson.if_contains("check_interval"))
+        {
+            this->checkInterval_ = static_cast<std::uint64_t>(checkInterval->to_number<std::int64_t>());
+        }
+
+        if (auto keep = checkpointJson.if_contains("keep"))
+        {
+            this->keep_ = static_cast<uint_t>(keep->to_number<std::int64_t>());
+        }
+
+        if (auto io = checkpointJson.if_contains("io"))
+        {
+            std::string ioName(io->as_string().c_str());
+
+            if (ioName == "per_rank")
+            {
+                this->io_ = IO::PerRank;
+            }
+            else if (ioName == "mpiio")
+            {
+                this->io_ = IO::MPIIO;
+            }
+            else
+            {
+                throw std::runtime_error("Unknown checkpoint io: " + ioName);
+            }
+        }
+
+        if (auto restart = checkpointJson.if_contains("restart"))
+        {
+            this->restart_ = restart->as_string().c_str();
+        }
+    }
+
+    void NumSimCheckpointManager::PrintInfo()
+    {
+        std::cout << "Checkpoint: ";
+
+        if (this->IsEnabled())
+        {
+            std::cout << this->directory_ << ", interval: " << this->interval_ << ", wall interval: " << this->wallInterval_
+                << " s, check interval: " << this->GetCheckInterval() << ", keep: " << this->keep_ << ", io: " << (this->io_ == IO::MPIIO ? "mpiio" : "per_rank");
+        }
+        else
+        {
+            std::cout << "disabled";
+        }
+
+        if (!this->restart_.empty())
+        {
+            std::cout << ", restart: " << this->restart_;
+        }
+
+        std::cout << std::endl;
+    }
+
+    bool NumSimCheckpointManager::IsDue(std::uint64_t tick)
+    {
+        bool due = this->interval_ > 0 && tick >= this->lastTick_ + this->interval_;
+
+        if (this->wallInterval_ > 0.0)
+        {
+            double elapsed = std::chrono::duration<double>(std::chrono::steady_clock::now() - this->lastTime_).count();
+            int flag = due || elapsed >= this->wallInterval_ ? 1 : 0;
+
+            // wall time differs between ranks: checkpoint when any rank is due
+            if (this->GetNumProcs() > 1)
+            {
+                MPI_Allreduce(MPI_IN_PLACE, &flag, 1, MPI_INT, MPI_MAX, MPI_COMM_WORLD);
+            }
+
+            due = flag != 0;
+        }
+
+        return due;
+    }
+
+    void NumSimCheckpointManager::Write(const std::vector<NumSimSimulation*>& simulations, const std::vector<std::uint64_t>& clocks, std::uint64_t tick)
+    {
+        std::string blob;
+        Append(blob, static_cast<std::uint32_t>(simulations.size()));
+
+        for (std::size_t i = 0; i < simulations.size(); ++i)
+        {
+            NumSimCheckpointData data;
+            data.SetClock(clocks[i]);
+            simulations[i]->WriteCheckpoint(data);
+
+            AppendString(blob, simulations[i]->GetObjectName());
+            data.Serialize(blob);
+        }
+
+        int myRank = this->GetMyRank();
+        fs::path checkpoint = fs::path(this->directory_) / CheckpointName(tick);
+        fs::path temporary = checkpoint.string() + TEMPORARY_SUFFIX;
+
+        if (myRank == 0)
+        {
+            fs::remove_all(temporary);
+            fs::create_directories(temporary);
+        }
+
+        this->Barrier();
+
+        if (this->io_ == IO::MPIIO)
+        {
+            this->WriteMPIIO((temporary / SHARED_FILE_NAME).string(), blob, tick);
+        }
+        else
+        {
+            this->WritePerRank((temporary / RankFileName(myRank)).string(), blob, tick);
+        }
+
+        this->Barrier();
+
+        // commit: the manifest and the rename mark the checkpoint complete
+        if (myRank == 0)
+        {
+            boost::json::array names;
+
+            for (auto simulation : simulations)
+            {
+                names.push_back(boost::json::value(simulation->GetObjectName()));
+            }
+
+            boost::json::object manifest;
+            manifest["tick"] = tick;
+            manifest["num_procs"] = this->GetNumProcs();
+            manifest["io"] = this->io_ == IO::MPIIO ? "mpiio" : "per_rank";
+            manifest["simulations"] = names;
+
+            std::ofstream manifestFile((temporary / MANIFEST_FILE_NAME).string());
+            manifestFile << boost::json::serialize(manifest);
+            manifestFile.close();
+
+            fs::remove_all(checkpoint);
+            fs::rename(temporary, checkpoint);
+            this->RemoveOldCheckpoints();
+        }
+
+        this->Barrier();
+
+        this->lastTick_ = tick;
+        this->lastTime_ = std::chrono::steady_clock::now();
+
+        if (myRank == 0)
+        {
+            std::cout << "Checkpoint written: " << checkpoint.string() << std::endl;
+        }
+    }
+
+    bool NumSimCheckpointManager::Restore(const std::vector<NumSimSimulation*>& simulations)
+    {
+        if (this->restart_.empty() || this->restart_ == "none")
+        {
+            return false;
+        }
+
+        fs::path checkpoint;
+
+        if (this->restart_ == "latest")
+        {
+            auto checkpoints = this->ListCheckpoints();
+
+            if (checkpoints.empty())
+            {
+                return false;
+            }
+
+            checkpoint = checkpoints.back();
+        }
+        else
+        {
+            checkpoint = fs::path(this->directory_) / this->restart_;
+
+            if (!fs::exists(checkpoint / MANIFEST_FILE_NAME))
+            {
+                throw std::runtime_error("Checkpoint not found: " + checkpoint.string());
+            }
+        }
+
+        std::ifstream manifestFile((checkpoint / MANIFEST_FILE_NAME).string());
+        std::string manifestText((std::istreambuf_iterator<char>(manifestFile)), std::istreambuf_iterator<char>());
+        boost::json::object manifest = boost::json::parse(manifestText).as_object();
+
+        if (manifest.at("num_procs").to_number<std::int64_t>() != this->GetNumProcs())
+        {
+            throw std::runtime_error("Checkpoint " + checkpoint.string() + " was written by "
+                + std::to_string(manifest.at("num_procs").to_number<std::int64_t>()) + " ranks, running on "
+                + std::to_string(this->GetNumProcs()));
+        }
+
+        std::string blob = std::string(manifest.at("io").as_string().c_str()) == "mpiio"
+            ? this->ReadMPIIO((checkpoint / SHARED_FILE_NAME).string())
+            : this->ReadPerRank((checkpoint / RankFileName(this->GetMyRank())).string());
+
+        const char* position = blob.data();
+        const char* end = blob.data() + blob.size();
+        auto numSimulations = Read<std::uint32_t>(position, end);
+
+        this->restartData_.clear();
+        this->restartClocks_.clear();
+
+        for (std::uint32_t i = 0; i < numSimulations; ++i)
+        {
+            std::string name = ReadString(position, end);
+            auto& data = this->restartData_[name];
+            data.Deserialize(position, end);
+            this->restartClocks_[name] = data.GetClock();
+        }
+
+        for (auto simulation : simulations)
+        {
+            auto data = this->restartData_.find(simulation->GetObjectName());
+
+            if (data == this->restartData_.end())
+            {
+                throw std::runtime_error("Checkpoint " + checkpoint.string() + " has no data for simulation " + simulation->GetObjectName());
+            }
+
+            simulation->SetRestartData(&data->second);
+        }
+
+        this->restartTick_ = static_cast<std::uint64_t>(manifest.at("tick").to_number<std::int64_t>());
+        this->lastTick_ = this->restartTick_;
+        this->lastTime_ = std::chrono::steady_clock::now();
+
+        if (this->GetMyRank() == 0)
+        {
+            std::cout << "Restarting from checkpoint: " << checkpoint.string() << std::endl;
+        }
+
+        return true;
+    }
+
+    void NumSimCheckpointManager::ReleaseRestartData(const std::vector<NumSimSimulation*>& simulations)
+    {
+        for (auto simulation : simulations)
+        {
+            simulation->SetRestartData(nullptr);
+        }
+
+        this->restartData_.clear();
+    }
+
+    std::uint64_t NumSimCheckpointManager::GetRestartClock(const NumSimSimulation* simulation) const
+    {
+        auto clock = this->restartClocks_.find(simulation->GetObjectName());
+        return clock == this->restartClocks_.end() ? 0 : clock->second;
+    }
+
+    std::vector<std::string> NumSimCheckpointManager::ListCheckpoints() const
+    {
+        std::vector<std::string> checkpoints;
+        fs::path directory(this->directory_);
+
+        if (!fs::is_directory(directory))
+        {
+            return checkpoints;
+        }
+
+        for (auto& entry : fs::directory_iterator(directory))
+        {
+            std::string name = entry.path().filename().string();
+
+            // the zero-padded tick makes name order chronological
+            if (name.compare(0, std::strlen(CHECKPOINT_PREFIX), CHECKPOINT_PREFIX) == 0
+                && entry.path().extension() != TEMPORARY_SUFFIX
+                && fs::exists(entry.path() / MANIFEST_FILE_NAME))
+            {
+                checkpoints.push_back(entry.path().string());
+            }
+        }
+
+        std::sort(checkpoints.begin(), checkpoints.end());
+        return checkpoints;
+    }
+
+    int NumSimCheckpointManager::GetMyRank() const
+    {
+        if (this->comm_)
+        {
+            return this->comm_->GetMyRank();
+        }
+
+        int myRank = 0;
+
+        if (IsMPIInitialized())
+        {
+            MPI_Comm_rank(MPI_COMM_WORLD, &myRank);
+        }
+
+        return myRank;
+    }
+
+    int NumSimCheckpointManager::GetNumProcs() const
+    {
+        if (this->comm_)
+        {
+            return this->comm_->GetNumProcs();
+        }
+
+        int numProcs = 1;
+
+        if (IsMPIInitialized())
+        {
+            MPI_Comm_size(MPI_COMM_WORLD, &numProcs);
+        }
+
+        return numProcs;
+    }
+
+    void NumSimCheckpointManager::Barrier() const
+    {
+        if (this->GetNumProcs() > 1)
+        {
+            MPI_Barrier(MPI_COMM_WORLD);
+        }
+    }
+
+    void NumSimCheckpointManager::WritePerRank(const std::string& path, const std::string& blob, std::uint64_t tick) const
+    {
+        std::string header;
+        AppendHeader(header);
+        Append(header, static_cast<std::uint32_t>(this->GetMyRank()));
+        Append(header, static_cast<std::uint32_t>(this->GetNumProcs()));
+        Append(header, tick);
+
+        std::ofstream file(path, std::ios::binary);
+        file.write(header.data(), header.size());
+        file.write(blob.data(), blob.size());
+        file.close();
+
+        if (!file)
+        {
+            throw std::runtime_error("Failed to write checkpoint file: " + path);
+        }
+    }
+
+    void NumSimCheckpointManager::WriteMPIIO(const std::string& path, const std::string& blob, std::uint64_t tick) const
+    {
+        if (!IsMPIInitialized())
+        {
+            throw std::runtime_error("Checkpoint io \"mpiio\" requires MPI");
+        }
+
+        int myRank = this->GetMyRank();
+        int numProcs = this->GetNumProcs();
+
+        // offset table: header, then (offset, size) per rank, then the rank blobs in rank order
+        std::uint64_t size = blob.size();
+        std::vector<std::uint64_t> sizes(numProcs);
+        MPI_Allgather(&size, 1, MPI_UINT64_T, sizes.data(), 1, MPI_UINT64_T, MPI_COMM_WORLD);
+
+        std::string header;
+        AppendHeader(header);
+        Append(header, static_cast<std::uint32_t>(numProcs));
+        Append(header, tick);
+
+        std::uint64_t offset = header.size() + numProcs * 2 * sizeof(std::uint64_t);
+        std::uint64_t myOffset = 0;
+
+        for (int rank = 0; rank < numProcs; ++rank)
+        {
+            if (rank == myRank)
+            {
+                myOffset = offset;
+            }
+
+            Append(header, offset);
+            Append(header, sizes[rank]);
+            offset += sizes[rank];
+        }
+
+        MPI_File file;
+        CheckMPI(MPI_File_open(MPI_COMM_WORLD, path.c_str(), MPI_MODE_CREATE | MPI_MODE_WRONLY, MPI_INFO_NULL, &file), "open " + path);
+
+        if (myRank == 0)
+        {
+            CheckMPI(MPI_File_write_at(file, 0, header.data(), static_cast<int>(header.size()), MPI_BYTE, MPI_STATUS_IGNORE), "write header");
+        }
+
+        // collective writes in chunks below the int count limit; every rank makes the same number of calls
+        std::uint64_t numChunks = (size + MAX_IO_CHUNK - 1) / MAX_IO_CHUNK;
+        std::uint64_t maxChunks = 0;
+        MPI_Allreduce(&numChunks, &maxChunks, 1, MPI_UINT64_T, MPI_MAX, MPI_COMM_WORLD);
+
+        for (std::uint64_t chunk = 0; chunk < maxChunks; ++chunk)
+        {
+            std::uint64_t begin = std::min<std::uint64_t>(chunk * MAX_IO_CHUNK, size);
+            std::uint64_t count = std::min<std::uint64_t>(MAX_IO_CHUNK, size - begin);
+            CheckMPI(MPI_File_write_at_all(file, static_cast<MPI_Offset>(myOffset + begin), blob.data() + begin,
+                static_cast<int>(count), MPI_BYTE, MPI_STATUS_IGNORE), "write " + path);
+        }
+
+        CheckMPI(MPI_File_close(&file), "close " + path);
+    }
+
+    std::string NumSimCheckpointManager::ReadPerRank(const std::string& path) const
+    {
+        std::ifstream file(path, std::ios::binary);
+
+        if (!file.is_open())
+        {
+            throw std::runtime_error("Failed to open checkpoint file: " + path);
+        }
+
+        std::string content((std::istreambuf_iterator<char>(file)), std::istreambuf_iterator<char>());
+        const char* position = content.data();
+        const char* end = content.data() + content.size();
+
+        ReadHeader(position, end, path);
+        Read<std::uint32_t>(position, end);
+        Read<std::uint32_t>(position, end);
+        Read<std::uint64_t>(position, end);
+
+        return content.substr(position - content.data());
+    }
+
+    std::string NumSimCheckpointManager::ReadMPIIO(const std::string& path) const
+    {
+        if (!IsMPIInitialized())
+        {
+            throw std::runtime_error("Checkpoint io \"mpiio\" requires MPI");
+        }
+
+        int myRank = this->GetMyRank();
+        int numProcs = this->GetNumProcs();
+
+        MPI_File file;
+        CheckMPI(MPI_File_open(MPI_COMM_WORLD, path.c_str(), MPI_MODE_RDONLY, MPI_INFO_NULL, &file), "open " + path);
+
+        std::string header;
+        AppendHeader(header);
+        std::size_t headerSize = header.size() + sizeof(std::uint32_t) + sizeof(std::uint64_t);
+        std::size_t tableSize = numProcs * 2 * sizeof(std::uint64_t);
+        std::string table(headerSize + tableSize, '\0');
+        CheckMPI(MPI_File_read_at(file, 0, &table[0], static_cast<int>(table.size()), MPI_BYTE, MPI_STATUS_IGNORE), "read header");
+
+        const char* position = table.data();
+        const char* end = table.data() + table.size();
+        ReadHeader(position, end, path);
+        Read<std::uint32_t>(position, end);
+        Read<std::uint64_t>(position, end);
+        position += myRank * 2 * sizeof(std::uint64_t);
+
+        auto offset = Read<std::uint64_t>(position, end);
+        auto size = Read<std::uint64_t>(position, end);
+        std::string blob(size, '\0');
+
+        for (std::uint64_t begin = 0; begin < size; begin += MAX_IO_CHUNK)
+        {
+            std::uint64_t count = std::min<std::uint64_t>(MAX_IO_CHUNK, size - begin);
+            CheckMPI(MPI_File_read_at(file, static_cast<MPI_Offset>(offset + begin), &blob[begin],
+                static_cast<int>(count), MPI_BYTE, MPI_STATUS_IGNORE), "read " + path);
+        }
+
+        CheckMPI(MPI_File_close(&file), "close " + path);
+        return blob;
+    }
+
+    void NumSimCheckpointManager::RemoveOldCheckpoints() const
+    {
+        if (this->keep_ == 0)
+        {
+            return;
+        }
+
+        auto checkpoints = this->ListCheckpoints();
+
+        for (std::size_t i = 0; i + this->keep_ < checkpoints.size(); ++i)
+        {
+            boost::system::error_code ec;
+            fs::remove_all(checkpoints[i], ec);
+        }
+    }
+}
@@ -0,0 +1,322 @@
+#pragma once
+
+#include <chrono>
+#include <cstdint>
+#include <map>
+#include <string>
+#include <vector>
+
+#include "NumSimObject.h"
+
+namespace NumSimSolver
+{
+    class NumSimComm;
+    class NumSimSimulation;
+
+    /**
+     * @brief restart state of one simulation, filled by NumSimSimulation::WriteCheckpoint
+     */
+    class BOOST_SYMBOL_EXPORT NumSimCheckpointData
+    {
+    public:
+        struct Field
+        {
+            std::vector<real_t> data;
+            std::size_t numTuples = 0;
+            int_t numComponents = 1;
+        };
+
+        void SetField(const std::string& name, const real_t* data, std::size_t numTuples, int_t numComponents = 1);
+
+        /**
+         * @return the field, or nullptr
+         */
+        const Field* GetField(const std::string& name) const;
+
+        inline const std::map<std::string, Field>& GetFields() const
+        {
+            return this->fields_;
+        }
+
+        /**
+         * @brief scalar state that is not a field (time, step counters, ...)
+         */
+        inline void SetValue(const std::string& name, real_t value)
+        {
+            this->values_[name] = value;
+        }
+
+        real_t GetValue(const std::string& name, real_t defaultValue = 0.0) const;
+
+        inline const std::map<std::string, real_t>& GetValues() const
+        {
+            return this->values_;
+        }
+
+        /**
+         * @brief scheduler clock of the simulation when the checkpoint was taken
+         */
+        inline std::uint64_t GetClock() const
+        {
+            return this->clock_;
+        }
+
+        inline void SetClock(std::uint64_t clock)
+        {
+            this->clock_ = clock;
+        }
+
+        void Serialize(std::string& out) const;
+
+        /**
+         * @brief read one record written by Serialize() and advance position
+         * @throws std::runtime_error on truncated data
+         */
+        void Deserialize(const char*& position, const char* end);
+
+    private:
+        std::map<std::string, Field> fields_;
+        std::map<std::string, real_t> values_;
+        std::uint64_t clock_ = 0;
+    };
+
+    /**
+     * @brief periodic checkpoints and restart
+     *
+     * @details The scheduler asks IsDue() at every GetCheckInterval()-th
+     * clock tick. It does not start steps past such a tick until the
+     * question is settled, so every simulation reaches the same clock on
+     * every rank, and it calls IsDue() and Write() from one thread per rank
+     * for the same ticks in the same order. When a checkpoint is due it
+     * flushes the post pipeline and calls Write(), so every checkpoint is a
+     * consistent cut of all simulations. Each
+     * simulation contributes NumSimSimulation::WriteCheckpoint (by default its
+     * registered fields).
+     *
+     * A checkpoint is the directory <directory>/checkpoint_<tick>. With
+     * "io": "per_rank" every rank writes rank_<rank>.nsc; with "io": "mpiio"
+     * all ranks write one checkpoint.nsc collectively (rank 0 stores the
+     * offset table). The directory is written under a .tmp name and renamed
+     * by rank 0 once all ranks are done, together with checkpoint.json, so
+     * an interrupted write never replaces a good checkpoint. Only the newest
+     * "keep" checkpoints are kept.
+     *
+     * On restart, Restore() reads the checkpoint before InitFromRestart() and
+     * hands each simulation its data (NumSimSimulation::GetRestartData), and
+     * the scheduler resumes every simulation at its saved clock. Restarting
+     * requires the same number of ranks. "restart": "latest" starts from
+     * scratch when there is no checkpoint yet, so a preempted job can be
+     * resubmitted with an unchanged configuration.
+     *
+     * Configuration:
+     * @code
+     * "checkpoint": {
+     *     "directory": "checkpoints",
+     *     "interval": 100,
+     *     "wall_interval": 3600,
+     *     "check_interval": 10,
+     *     "keep": 3,
+     *     "io": "per_rank",
+     *     "restart": "latest"
+     * }
+     * @endcode
+     * interval is in scheduler clock ticks (steps of a simulation with step
+     * interval 1), wall_interval in seconds; 0 disables either trigger.
+     * check_interval is the number of ticks between the checks (default:
+     * 1 with wall_interval, interval otherwise); with wall_interval the
+     * parallel scheduler keeps the simulations within one check_interval of
+     * each other, so a larger value lets them run further apart.
+     * "restart" is "latest" or the name of a checkpoint directory; keep 0
+     * keeps every checkpoint.
+     *
+     * Files are little-endian and start with "NSCK" and a uint32 version. A
+     * per-rank file continues with uint32 rank, uint32 numProcs and uint64
+     * tick; the shared file with uint32 numProcs, uint64 tick and a (uint64
+     * offset, uint64 size) pair per rank. The data of a rank is uint32
+     * numSimulations followed, for each simulation, by its name, clock,
+     * scalar values and fields (name, uint64 numTuples, int32 numComponents,
+     * raw float64 data).
+     */
+    class BOOST_SYMBOL_EXPORT NumSimCheckpointManager : public NumSimObject
+    {
+    public:
+        enum class IO
+        {
+            PerRank,
+            MPIIO
+        };
+
+        NumSimCheckpointManager();
+        virtual ~NumSimCheckpointManager();
+
+        /**
+         * @brief read the "checkpoint" section of the solver configuration
+         * @throws std::runtime_error on an unknown io mode
+         */
+        void Initialize(boost::json::object& numSimSolverJson);
+
+        void PrintInfo();
+
+        /**
+         * @brief communicator used for the rank and barriers (nullptr: query MPI if initialized)
+         */
+        inline void SetComm(NumSimComm* comm)
+        {
+            this->comm_ = comm;
+        }
+
+        /**
+         * @brief whether a checkpoint should be written at tick
+         *
+         * @details collective across ranks when wall_interval is set, so all
+         * ranks must call it for the same ticks, in the same order and from
+         * one thread per rank while no other thread of the rank is in MPI.
+         */
+        bool IsDue(std::uint64_t tick);
+
+        /**
+         * @brief write a checkpoint of all simulations (collective across ranks)
+         * @param clocks scheduler clock of each simulation
+         */
+        void Write(const std::vector<NumSimSimulation*>& simulations, const std::vector<std::uint64_t>& clocks, std::uint64_t tick);
+
+        /**
+         * @brief load the configured restart checkpoint and pass it to the simulations
+         * @return false if no restart is configured or "latest" found no checkpoint
+         * @throws std::runtime_error on a missing, corrupt or incompatible checkpoint
+         */
+        bool Restore(const std::vector<NumSimSimulation*>& simulations);
+
+        /**
+         * @brief free the restart data once InitFromRestart() has run
+         */
+        void ReleaseRestartData(const std::vector<NumSimSimulation*>& simulations);
+
+        /**
+         * @return clock saved for the simulation, 0 without a restart
+         */
+        std::uint64_t GetRestartClock(const NumSimSimulation* simulation) const;
+
+        inline std::uint64_t GetRestartTick() const
+        {
+            return this->restartTick_;
+        }
+
+        /**
+         * @return complete checkpoint directories, oldest first
+         */
+        std::vector<std::string> ListCheckpoints() const;
+
+        inline bool IsEnabled() const
+        {
+            return this->interval_ > 0 || this->wallInterval_ > 0.0;
+        }
+
+        inline const std::string& GetDirectory() const
+        {
+            return this->directory_;
+        }
+
+        inline void SetDirectory(const std::string& directory)
+        {
+            this->directory_ = directory;
+        }
+
+        inline std::uint64_t GetInterval() const
+        {
+            return this->interval_;
+        }
+
+        inline void SetInterval(std::uint64_t interval)
+        {
+            this->interval_ = interval;
+        }
+
+        inline double GetWallInterval() const
+        {
+            return this->wallInterval_;
+        }
+
+        inline void SetWallInterval(double wallInterval)
+        {
+            this->wallInterval_ = wallInterval;
+        }
+
+        inline std::uint64_t GetCheckInterval() const
+        {
+            if (this->checkInterval_ > 0)
+            {
+                return this->checkInterval_;
+            }
+
+            return this->wallInterval_ > 0.0 || this->interval_ == 0 ? 1 : this->interval_;
+        }
+
+        /**
+         * @param checkInterval ticks between the checks, 0 for the default
+         */
+        inline void SetCheckInterval(std::uint64_t checkInterval)
+        {
+            this->checkInterval_ = checkInterval;
+        }
+
+        inline uint_t GetKeep() const
+        {
+            return this->keep_;
+        }
+
+        inline void SetKeep(uint_t keep)
+        {
+            this->keep_ = keep;
+        }
+
+        inline IO GetIO() const
+        {
+            return this->io_;
+        }
+
+        inline void SetIO(IO io)
+        {
+            this->io_ = io;
+        }
+
+        inline const std::string& GetRestart() const
+        {
+            return this->restart_;
+        }
+
+        /**
+         * @param restart "latest", a checkpoint directory name, or empty for no restart
+         */
+        inline void SetRestart(const std::string& restart)
+        {
+            this->restart_ = restart;
+        }
+
+    private:
+        int GetMyRank() const;
+        int GetNumProcs() const;
+        void Barrier() const;
+
+        void WritePerRank(const std::string& path, const std::string& blob, std::uint64_t tick) const;
+        void WriteMPIIO(const std::string& path, const std::string& blob, std::uint64_t tick) const;
+        std::string ReadPerRank(const std::string& path) const;
+        std::string ReadMPIIO(const std::string& path) const;
+        void RemoveOldCheckpoints() const;
+
+        NumSimComm* comm_ = nullptr;
+        std::string directory_ = "checkpoints";
+        std::uint64_t interval_ = 0;
+        double wallInterval_ = 0.0;
+        std::uint64_t checkInterval_ = 0;
+        uint_t keep_ = 3;
+        IO io_ = IO::PerRank;
+        std::string restart_;
+
+        std::uint64_t lastTick_ = 0;
+        std::chrono::steady_clock::time_point lastTime_ = std::chrono::steady_clock::now();
+        std::uint64_t restartTick_ = 0;
+        std::map<std::string, NumSimCheckpointData> restartData_;
+        std::map<std::string, std::uint64_t> restartClocks_;
+    };
+}
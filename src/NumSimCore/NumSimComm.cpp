@@ -1,9 +1,56 @@
-#include <mpi.h>
+#include <algorithm>
+#include <iostream>
+#include <stdexcept>
+#include <thread>
 
 #include "NumSimComm.h"
 
 namespace NumSimSolver
 {
+    namespace
+    {
+        const NumSimComm::ThreadLevel threadLevels[] = {
+            NumSimComm::ThreadLevel::Single,
+            NumSimComm::ThreadLevel::Funneled,
+            NumSimComm::ThreadLevel::Serialized,
+            NumSimComm::ThreadLevel::Multiple
+        };
+
+        int ToMPIThreadLevel(NumSimComm::ThreadLevel threadLevel)
+        {
+            switch (threadLevel)
+            {
+            case NumSimComm::ThreadLevel::Single: return MPI_THREAD_SINGLE;
+            case NumSimComm::ThreadLevel::Funneled: return MPI_THREAD_FUNNELED;
+            case NumSimComm::ThreadLevel::Serialized: return MPI_THREAD_SERIALIZED;
+            case NumSimComm::ThreadLevel::Multiple: return MPI_THREAD_MULTIPLE;
+            }
+
+            return MPI_THREAD_SINGLE;
+        }
+
+        NumSimComm::ThreadLevel FromMPIThreadLevel(int threadLevel)
+        {
+            // the MPI standard orders the levels, so anything above SERIALIZED is MULTIPLE
+            if (threadLevel >= MPI_THREAD_MULTIPLE)
+            {
+                return NumSimComm::ThreadLevel::Multiple;
+            }
+
+            if (threadLevel >= MPI_THREAD_SERIALIZED)
+            {
+                return NumSimComm::ThreadLevel::Serialized;
+            }
+
+            if (threadLevel >= MPI_THREAD_FUNNELED)
+            {
+                return NumSimComm::ThreadLevel::Funneled;
+            }
+
+            return NumSimComm::ThreadLevel::Single;
+        }
+    }
+
     NumSimComm::NumSimComm()
     {
         this->className_ = __func__;
@@ -13,15 +60,160 @@ namespace NumSimSolver
     {
     }
 
+    const char* NumSimComm::GetThreadLevelName(ThreadLevel threadLevel)
+    {
+        switch (threadLevel)
+        {
+        case ThreadLevel::Single: return "single";
+        case ThreadLevel::Funneled: return "funneled";
+        case ThreadLevel::Serialized: return "serialized";
+        case ThreadLevel::Multiple: return "multiple";
+        }
+
+        return "";
+    }
+
     void NumSimComm::Initialize(boost::json::object& numSimSolverJson)
     {
-        MPI_Init(nullptr, nullptr);
-        MPI_Comm_rank(MPI_COMM_WORLD, &this->myRank_);
-        MPI_Comm_size(MPI_COMM_WORLD, &this->numProcs_);
+        auto commValue = numSimSolverJson.if_contains("comm");
+
+        if (commValue && commValue->is_object())
+        {
+            auto& commJson = commValue->as_object();
+
+            if (auto threadLevel = commJson.if_contains("thread_level"))
+            {
+                std::string threadLevelName(threadLevel->as_string().c_str());
+                auto level = std::find_if(std::begin(threadLevels), std::end(threadLevels),
+                    [&threadLevelName](ThreadLevel level) { return threadLevelName == GetThreadLevelName(level); });
+
+                if (level == std::end(threadLevels))
+                {
+                    throw std::runtime_error("Unknown MPI thread level: " + threadLevelName);
+                }
+
+                this->threadLevel_ = *level;
+
+                if (this->threadLevel_ < this->minThreadLevel_)
+                {
+                    throw std::runtime_error("comm.thread_level " + threadLevelName + " is below "
+                        + GetThreadLevelName(this->minThreadLevel_) + ", which " + this->minThreadLevelReason_ + " needs");
+                }
+            }
+
+            if (auto ranksPerNode = commJson.if_contains("ranks_per_node"))
+            {
+                this->ranksPerNode_ = static_cast<uint_t>(ranksPerNode->to_number<std::int64_t>());
+            }
+
+            if (auto threadsPerRank = commJson.if_contains("threads_per_rank"))
+            {
+                this->threadsPerRank_ = static_cast<uint_t>(threadsPerRank->to_number<std::int64_t>());
+            }
+        }
+
+        this->threadLevel_ = std::max(this->threadLevel_, this->minThreadLevel_);
+
+        int initialized = 0;
+        int finalized = 0;
+        MPI_Initialized(&initialized);
+        MPI_Finalized(&finalized);
+
+        if (finalized)
+        {
+            throw std::runtime_error("MPI cannot be initialized again after it was finalized");
+        }
+
+        int provided = MPI_THREAD_SINGLE;
+
+        if (!initialized)
+        {
+            MPI_Init_thread(nullptr, nullptr, ToMPIThreadLevel(this->threadLevel_), &provided);
+            this->ownsMPI_ = true;
+        }
+        else
+        {
+            MPI_Query_thread(&provided);
+        }
+
+        this->providedThreadLevel_ = FromMPIThreadLevel(provided);
+
+        if (provided < ToMPIThreadLevel(this->threadLevel_))
+        {
+            std::string message = std::string("MPI provides thread level ") + GetThreadLevelName(this->providedThreadLevel_)
+                + ", " + GetThreadLevelName(this->threadLevel_) + " was requested";
+
+            if (provided < ToMPIThreadLevel(this->minThreadLevel_))
+            {
+                message += " (" + this->minThreadLevelReason_ + " needs at least " + GetThreadLevelName(this->minThreadLevel_) + ")";
+            }
+
+            throw std::runtime_error(message);
+        }
+
+        MPI_Comm_rank(this->comm_, &this->myRank_);
+        MPI_Comm_size(this->comm_, &this->numProcs_);
+
+        if (this->nodeComm_ == MPI_COMM_NULL)
+        {
+            MPI_Comm_split_type(this->comm_, MPI_COMM_TYPE_SHARED, this->myRank_, MPI_INFO_NULL, &this->nodeComm_);
+        }
+
+        MPI_Comm_rank(this->nodeComm_, &this->nodeRank_);
+        MPI_Comm_size(this->nodeComm_, &this->numNodeProcs_);
+
+        int isNodeLeader = this->nodeRank_ == 0 ? 1 : 0;
+        MPI_Allreduce(&isNodeLeader, &this->numNodes_, 1, MPI_INT, MPI_SUM, this->comm_);
+
+        if (this->ranksPerNode_ > 0 && static_cast<uint_t>(this->numNodeProcs_) > this->ranksPerNode_)
+        {
+            throw std::runtime_error("Node of rank " + std::to_string(this->myRank_) + " runs " + std::to_string(this->numNodeProcs_)
+                + " ranks, more than ranks_per_node " + std::to_string(this->ranksPerNode_));
+        }
+
+        if (this->threadsPerRank_ == 0)
+        {
+            uint_t ranksPerNode = this->ranksPerNode_ > 0 ? this->ranksPerNode_ : static_cast<uint_t>(this->numNodeProcs_);
+            this->threadsPerRank_ = std::max(1u, std::thread::hardware_concurrency() / ranksPerNode);
+        }
+
+        this->threadPool_.Start(this->threadsPerRank_);
+    }
+
+    void NumSimComm::PrintInfo()
+    {
+        if (this->myRank_ == 0)
+        {
+            std::cout << "Comm: " << this->numProcs_ << " ranks on " << this->numNodes_ << " nodes, "
+                      << this->threadsPerRank_ << " threads per rank, thread level "
+                      << GetThreadLevelName(this->providedThreadLevel_) << std::endl;
+        }
+    }
+
+    void NumSimComm::Barrier() const
+    {
+        MPI_Barrier(this->comm_);
     }
 
     void NumSimComm::Finalize()
     {
-        MPI_Finalize();
+        this->threadPool_.Stop();
+
+        int finalized = 0;
+        MPI_Finalized(&finalized);
+
+        if (!finalized && this->nodeComm_ != MPI_COMM_NULL)
+        {
+            MPI_Comm_free(&this->nodeComm_);
+        }
+
+        this->nodeComm_ = MPI_COMM_NULL;
+
+        if (this->ownsMPI_ && !finalized)
+        {
+            MPI_Finalize();
+        }
+
+        this->ownsMPI_ = false;
     }
-} // namespace NumSimSolver
\ No newline at end of file
+} // namespace NumSimSolver
@@ -1,18 +1,66 @@
 #pragma once
 
+#include <mutex>
 #include <string>
+#include <mpi.h>
 
 #include "NumSimObject.h"
+#include "NumSimThreadPool.h"
 
 namespace NumSimSolver
 {
-    class NumSimComm : public NumSimObject
+    /**
+     * @brief MPI environment of the solver
+     *
+     * @details Initialize() starts MPI with MPI_Init_thread at the configured
+     * thread level unless it is already running (for example when the solver
+     * is embedded in a Python process that imported mpi4py); Finalize() only
+     * shuts MPI down if this object started it. Domain decomposition is done
+     * per mesh by NumSimPartition, halo exchanges by NumSimHaloExchange.
+     *
+     * A run can use many ranks per node with one thread each, or fewer ranks
+     * with a thread pool each (GetThreadPool()): fewer ranks replicate less
+     * mesh and halo data per node. The ranks sharing a node are found with
+     * MPI_Comm_split_type; threads_per_rank 0 divides the hardware threads of
+     * the node by ranks_per_node (0: by the ranks actually on the node).
+     *
+     * Configuration (all keys optional):
+     * @code
+     * "comm": {
+     *     "thread_level": "funneled",
+     *     "ranks_per_node": 8,
+     *     "threads_per_rank": 0
+     * }
+     * @endcode
+     * thread_level is "single", "funneled" (default), "serialized" or
+     * "multiple". The pool workers never call MPI. The parallel scheduler runs
+     * Solve(), and with it the halo exchanges, on several threads, so it raises
+     * the requested level to at least "serialized" (SetMinThreadLevel());
+     * a lower configured level is an error. MPI calls made from those threads
+     * go through LockMPI().
+     */
+    class BOOST_SYMBOL_EXPORT NumSimComm : public NumSimObject
     {
     public:
+        enum class ThreadLevel
+        {
+            Single,
+            Funneled,
+            Serialized,
+            Multiple
+        };
+
         NumSimComm();
         virtual ~NumSimComm();
+
+        /**
+         * @throws std::runtime_error on an invalid "comm" section, if
+         * thread_level is below the minimum level, if MPI was already
+         * finalized, if MPI does not provide the thread level or if a node
+         * runs more ranks than ranks_per_node
+         */
         virtual void Initialize(boost::json::object& numSimSolverJson);
-        virtual void PrintInfo() {}
+        virtual void PrintInfo();
         virtual void Finalize();
 
         inline int GetMyRank() const
@@ -25,9 +73,140 @@ namespace NumSimSolver
             return this->numProcs_;
         }
 
+        /**
+         * @brief communicator spanning all ranks of the solver
+         */
+        inline MPI_Comm GetComm() const
+        {
+            return this->comm_;
+        }
+
+        void Barrier() const;
+
+        /**
+         * @brief serialize an MPI call with the other threads of this rank
+         * @details Below "multiple" only one thread may be inside MPI at a time;
+         * with "multiple" the returned lock does not own the mutex. Do not block
+         * inside MPI while holding the lock, poll with MPI_Test* and release it
+         * in between (see NumSimHaloExchange::End()): a thread waiting in MPI
+         * would keep the other threads from posting the messages it waits for.
+         * @code
+         * auto lock = comm->LockMPI();
+         * MPI_Startall(...);
+         * @endcode
+         */
+        inline std::unique_lock<std::mutex> LockMPI() const
+        {
+            if (this->providedThreadLevel_ == ThreadLevel::Multiple)
+            {
+                return std::unique_lock<std::mutex>(this->mpiMutex_, std::defer_lock);
+            }
+
+            return std::unique_lock<std::mutex>(this->mpiMutex_);
+        }
+
+        /**
+         * @brief communicator of the ranks sharing this node (MPI_COMM_NULL before Initialize())
+         */
+        inline MPI_Comm GetNodeComm() const
+        {
+            return this->nodeComm_;
+        }
+
+        inline int GetNodeRank() const
+        {
+            return this->nodeRank_;
+        }
+
+        inline int GetNumNodeProcs() const
+        {
+            return this->numNodeProcs_;
+        }
+
+        inline int GetNumNodes() const
+        {
+            return this->numNodes_;
+        }
+
+        inline ThreadLevel GetThreadLevel() const
+        {
+            return this->threadLevel_;
+        }
+
+        /**
+         * @param threadLevel level requested from MPI_Init_thread (before Initialize())
+         */
+        inline void SetThreadLevel(ThreadLevel threadLevel)
+        {
+            this->threadLevel_ = threadLevel;
+        }
+
+        /**
+         * @brief lowest thread level the run needs (before Initialize())
+         * @details Initialize() raises the requested level to it, or fails if
+         * thread_level is configured lower or MPI provides less.
+         * @param reason what needs the level, for the error messages
+         */
+        inline void SetMinThreadLevel(ThreadLevel threadLevel, const std::string& reason)
+        {
+            this->minThreadLevel_ = threadLevel;
+            this->minThreadLevelReason_ = reason;
+        }
+
+        /**
+         * @brief thread level MPI provides, which may exceed the requested one
+         */
+        inline ThreadLevel GetProvidedThreadLevel() const
+        {
+            return this->providedThreadLevel_;
+        }
+
+        inline uint_t GetRanksPerNode() const
+        {
+            return this->ranksPerNode_;
+        }
+
+        inline void SetRanksPerNode(uint_t ranksPerNode)
+        {
+            this->ranksPerNode_ = ranksPerNode;
+        }
+
+        /**
+         * @brief threads of this rank's pool (resolved by Initialize() when configured as 0)
+         */
+        inline uint_t GetThreadsPerRank() const
+        {
+            return this->threadsPerRank_;
+        }
+
+        inline void SetThreadsPerRank(uint_t threadsPerRank)
+        {
+            this->threadsPerRank_ = threadsPerRank;
+        }
+
+        inline NumSimThreadPool& GetThreadPool()
+        {
+            return this->threadPool_;
+        }
+
+        static const char* GetThreadLevelName(ThreadLevel threadLevel);
+
     private:
-        // Add communication-specific members here
+        MPI_Comm comm_ = MPI_COMM_WORLD;
+        MPI_Comm nodeComm_ = MPI_COMM_NULL;
         int myRank_ = 0;
         int numProcs_ = 1;
+        int nodeRank_ = 0;
+        int numNodeProcs_ = 1;
+        int numNodes_ = 1;
+        bool ownsMPI_ = false;
+        ThreadLevel threadLevel_ = ThreadLevel::Funneled;
+        ThreadLevel providedThreadLevel_ = ThreadLevel::Single;
+        ThreadLevel minThreadLevel_ = ThreadLevel::Single;
+        std::string minThreadLevelReason_;
+        mutable std::mutex mpiMutex_;
+        uint_t ranksPerNode_ = 0;
+        uint_t threadsPerRank_ = 0;
+        NumSimThreadPool threadPool_;
     };
 } // namespace NumSimSolver
@@ -0,0 +1,450 @@
+#include <cmath>
+#include <fstream>
+#include <sstream>
+#include <stdexcept>
+#include <vector>
+
+#include "NumSimConfigSchema.h"
+
+namespace NumSimSolver
+{
+    namespace
+    {
+        // size of the chunks the configuration file is read and parsed in
+        const std::size_t CHUNK_SIZE = 64 * 1024;
+
+        /**
+         * @brief bound as written in an error message (integers without a fraction)
+         */
+        std::string FormatBound(double bound)
+        {
+            std::ostringstream stream;
+
+            if (std::floor(bound) == bound && std::fabs(bound) < 1.0e15)
+            {
+                stream << static_cast<std::int64_t>(bound);
+            }
+            else
+            {
+                stream << bound;
+            }
+
+            return stream.str();
+        }
+
+        bool IsInteger(const boost::json::value& value)
+        {
+            if (value.is_int64() || value.is_uint64())
+            {
+                return true;
+            }
+
+            return value.is_double() && std::isfinite(value.get_double()) && std::floor(value.get_double()) == value.get_double();
+        }
+
+        void ValidateBounds(const NumSimConfigSchema::Field& field, double number, const std::string& path, std::vector<std::string>& errors)
+        {
+            if (number < field.minimum)
+            {
+                errors.push_back(path + ": must be >= " + FormatBound(field.minimum));
+            }
+            else if (number > field.maximum)
+            {
+                errors.push_back(path + ": must be <= " + FormatBound(field.maximum));
+            }
+        }
+
+        void ValidateObject(const NumSimConfigSchema::Field& field, const boost::json::object& object, const std::string& path,
+            std::vector<std::string>& errors)
+        {
+            for (auto& child : field.fields)
+            {
+                if (auto value = object.if_contains(child.name))
+                {
+                    NumSimConfigSchema::ValidateValue(child, *value, path + "." + child.name, errors);
+                }
+                else if (child.required)
+                {
+                    errors.push_back(path + "." + child.name + ": missing required key");
+                }
+            }
+
+            if (field.open)
+            {
+                return;
+            }
+
+            for (auto& item : object)
+            {
+                bool known = false;
+
+                for (auto& child : field.fields)
+                {
+                    known = known || item.key() == child.name;
+                }
+
+                if (!known)
+                {
+                    errors.push_back(path + "." + std::string(item.key()) + ": unknown key");
+                }
+            }
+        }
+    }
+
+    NumSimConfigSchema::Field NumSimConfigSchema::Boolean(const std::string& name)
+    {
+        Field field;
+        field.name = name;
+        field.type = Type::Boolean;
+        return field;
+    }
+
+    NumSimConfigSchema::Field NumSimConfigSchema::Integer(const std::string& name, double minimum, double maximum)
+    {
+        Field field;
+        field.name = name;
+        field.type = Type::Integer;
+        field.minimum = minimum;
+        field.maximum = maximum;
+        return field;
+    }
+
+    NumSimConfigSchema::Field NumSimConfigSchema::Number(const std::string& name, double minimum, double maximum)
+    {
+        Field field;
+        field.name = name;
+        field.type = Type::Number;
+        field.minimum = minimum;
+        field.maximum = maximum;
+        return field;
+    }
+
+    NumSimConfigSchema::Field NumSimConfigSchema::String(const std::string& name, const std::vector<std::string>& values)
+    {
+        Field field;
+        field.name = name;
+        field.type = Type::String;
+        field.values = values;
+        return field;
+    }
+
+    NumSimConfigSchema::Field NumSimConfigSchema::StringArray(const std::string& name)
+    {
+        Field field;
+        field.name = name;
+        field.type = Type::StringArray;
+        return field;
+    }
+
+    NumSimConfigSchema::Field NumSimConfigSchema::Object(const std::string& name, const std::vector<Field>& fields, bool open)
+    {
+        Field field;
+        field.name = name;
+        field.type = Type::Object;
+        field.fields = fields;
+        field.open = open;
+        return field;
+    }
+
+    NumSimConfigSchema::Field NumSimConfigSchema::Map(const std::string& name, const std::vector<Field>& fields, bool open)
+    {
+        Field field = Object(name, fields, open);
+        field.type = Type::Map;
+        return field;
+    }
+
+    NumSimConfigSchema::Field NumSimConfigSchema::Required(Field field)
+    {
+        field.required = true;
+        return field;
+    }
+
+    void NumSimConfigSchema::AddSection(const Field& section)
+    {
+        this->sections_.push_back(section);
+    }
+
+    std::vector<std::string> NumSimConfigSchema::Validate(const boost::json::object& numSimSolverJson) const
+    {
+        std::vector<std::string> errors;
+
+        for (auto& section : this->sections_)
+        {
+            if (auto value = numSimSolverJson.if_contains(section.name))
+            {
+                ValidateValue(section, *value, section.name, errors);
+            }
+            else if (section.required)
+            {
+                errors.push_back(section.name + ": missing required key");
+            }
+        }
+
+        return errors;
+    }
+
+    void NumSimConfigSchema::Check(const boost::json::object& numSimSolverJson) const
+    {
+        auto errors = this->Validate(numSimSolverJson);
+
+        if (!errors.empty())
+        {
+            throw std::runtime_error(FormatErrors(errors));
+        }
+    }
+
+    void NumSimConfigSchema::ValidateValue(const Field& field, const boost::json::value& value, const std::string& path,
+        std::vector<std::string>& errors)
+    {
+        switch (field.type)
+        {
+        case Type::Boolean:
+            if (!value.is_bool())
+            {
+                errors.push_back(path + ": expected a boolean");
+            }
+            break;
+
+        case Type::Integer:
+            if (!IsInteger(value))
+            {
+                errors.push_back(path + ": expected an integer");
+            }
+            else
+            {
+                ValidateBounds(field, value.to_number<double>(), path, errors);
+            }
+            break;
+
+        case Type::Number:
+            if (!value.is_number())
+            {
+                errors.push_back(path + ": expected a number");
+            }
+            else
+            {
+                ValidateBounds(field, value.to_number<double>(), path, errors);
+            }
+            break;
+
+        case Type::String:
+            if (!value.is_string())
+            {
+                errors.push_back(path + ": expected a string");
+            }
+            else if (!field.values.empty())
+            {
+                bool allowed = false;
+                std::string names;
+
+                for (auto& name : field.values)
+                {
+                    allowed = allowed || value.as_string() == name;
+                    names += (names.empty() ? "" : ", ") + name;
+                }
+
+                if (!allowed)
+                {
+                    errors.push_back(path + ": must be one of " + names);
+                }
+            }
+            break;
+
+        case Type::StringArray:
+        {
+            bool strings = value.is_array();
+
+            if (strings)
+            {
+                for (auto& item : value.as_array())
+                {
+                    strings = strings && item.is_string();
+                }
+            }
+
+            if (!strings)
+            {
+                errors.push_back(path + ": expected an array of strings");
+            }
+            break;
+        }
+
+        case Type::Object:
+            if (!value.is_object())
+            {
+                errors.push_back(path + ": expected an object");
+            }
+            else
+            {
+                ValidateObject(field, value.as_object(), path, errors);
+            }
+            break;
+
+        case Type::Map:
+            if (!value.is_object())
+            {
+                errors.push_back(path + ": expected an object");
+                break;
+            }
+
+            for (auto& item : value.as_object())
+            {
+                std::string entryPath = path + "." + std::string(item.key());
+
+                if (!item.value().is_object())
+                {
+                    errors.push_back(entryPath + ": expected an object");
+                }
+                else
+                {
+                    ValidateObject(field, item.value().as_object(), entryPath, errors);
+                }
+            }
+            break;
+        }
+    }
+
+    std::string NumSimConfigSchema::FormatErrors(const std::vector<std::string>& errors)
+    {
+        std::string message = "Invalid NumSimSolver config:";
+
+        for (auto& error : errors)
+        {
+            message += "\n  " + error;
+        }
+
+        return message;
+    }
+
+    const NumSimConfigSchema& NumSimConfigSchema::GetSolverSchema()
+    {
+        // keep in sync with NumSimGui/config_schema.py
+        static const NumSimConfigSchema schema = []()
+        {
+            const double maxUint = static_cast<double>(std::numeric_limits<uint_t>::max());
+            NumSimConfigSchema solverSchema;
+
+            solverSchema.AddSection(Object("scheduler", {
+                String("mode", { "serial", "parallel" }),
+                Integer("num_threads", 0, maxUint),
+                Map("simulations", {
+                    StringArray("depends_on"),
+                    Integer("step_interval", 0, maxUint)
+                })
+            }));
+
+            solverSchema.AddSection(Object("post", {
+                String("mode", { "sync", "async" }),
+                Integer("buffers", 1, maxUint),
+                Integer("queue_size", 1, maxUint)
+            }));
+
+            solverSchema.AddSection(Object("checkpoint", {
+                String("directory"),
+                Integer("interval", 0),
+                Number("wall_interval", 0.0),
+                Integer("check_interval", 0),
+                Integer("keep", 0, maxUint),
+                String("io", { "per_rank", "mpiio" }),
+                String("restart")
+            }));
+
+            solverSchema.AddSection(Object("cache", {
+                Boolean("enabled"),
+                String("directory"),
+                Number("max_size_mb", 0.0),
+                StringArray("inputs"),
+                StringArray("outputs")
+            }));
+
+            solverSchema.AddSection(Object("partition", {
+                String("method", { "rcb", "block" })
+            }));
+
+            solverSchema.AddSection(Object("comm", {
+                String("thread_level", { "single", "funneled", "serialized", "multiple" }),
+                Integer("ranks_per_node", 0, maxUint),
+                Integer("threads_per_rank", 0, maxUint)
+            }));
+
+            solverSchema.AddSection(Object("profile", {
+                Boolean("enabled"),
+                String("report"),
+                String("trace"),
+                Integer("max_events", 0)
+            }));
+
+            solverSchema.AddSection(Object("telemetry", {
+                Boolean("enabled"),
+                String("address"),
+                Integer("port", 0, 65535),
+                String("port_file"),
+                Integer("capacity", 1)
+            }));
+
+            solverSchema.AddSection(Object("plugins", {
+                StringArray("directories"),
+                String("manifest")
+            }));
+
+            // the other keys of a simulation belong to its plugin
+            solverSchema.AddSection(Map("simulations", {
+                Required(String("class"))
+            }, true));
+
+            return solverSchema;
+        }();
+
+        return schema;
+    }
+
+    boost::json::value NumSimConfigSchema::ParseFile(const std::string& fileName)
+    {
+        std::ifstream inputFileStream(fileName, std::ios::binary);
+
+        if (!inputFileStream.is_open())
+        {
+            throw std::runtime_error("Failed to open NumSimSolver config file: " + fileName);
+        }
+
+        // the parser's own stack lives in this buffer, the values in the monotonic resource
+        unsigned char parserBuffer[4096];
+        boost::json::stream_parser parser(boost::json::storage_ptr(), boost::json::parse_options(), parserBuffer);
+        parser.reset(boost::json::make_shared_resource<boost::json::monotonic_resource>());
+
+        std::vector<char> chunk(CHUNK_SIZE);
+        std::size_t offset = 0;
+        boost::system::error_code ec;
+
+        while (inputFileStream)
+        {
+            inputFileStream.read(chunk.data(), static_cast<std::streamsize>(chunk.size()));
+            auto size = static_cast<std::size_t>(inputFileStream.gcount());
+            auto consumed = parser.write(chunk.data(), size, ec);
+
+            if (ec)
+            {
+                throw std::runtime_error("Failed to parse NumSimSolver config file " + fileName + " at byte "
+                    + std::to_string(offset + consumed) + ": " + ec.message());
+            }
+
+            offset += size;
+        }
+
+        parser.finish(ec);
+
+        if (ec)
+        {
+            throw std::runtime_error("Failed to parse NumSimSolver config file " + fileName + ": " + ec.message());
+        }
+
+        boost::json::value numSimSolverValue = parser.release();
+
+        if (!numSimSolverValue.is_object())
+        {
+            throw std::runtime_error("NumSimSolver config file " + fileName + " is not a JSON object");
+        }
+
+        return numSimSolverValue;
+    }
+}
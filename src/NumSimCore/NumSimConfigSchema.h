@@ -0,0 +1,292 @@
+#pragma once
+
+#include <cstdint>
+#include <functional>
+#include <limits>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "NumSimObject.h"
+
+namespace NumSimSolver
+{
+    /**
+     * @brief schema of the solver configuration, checked once before anything reads it
+     *
+     * @details A schema is a list of top-level sections, each a tree of
+     * typed fields (boolean, integer, number, string with optional allowed
+     * values, array of strings, object, or map of objects keyed by name).
+     * Validate() walks the whole configuration and returns every problem as
+     * "<path>: <message>", e.g. "scheduler.num_threads: expected an
+     * integer"; keys not in a section are reported as unknown. Top-level
+     * sections that are not in the schema (GUI settings, plugin sections)
+     * are not checked.
+     *
+     * GetSolverSchema() describes the sections read by NumSimCore;
+     * NumSimGui.config_schema mirrors it, so the GUI reports the same errors
+     * before it launches the solver.
+     *
+     * ParseFile() reads the configuration with a streaming parser in fixed
+     * size chunks, allocating every value from one monotonic buffer owned by
+     * the returned value, so large configurations with embedded tables are
+     * neither copied into a string first nor allocated node by node.
+     */
+    class BOOST_SYMBOL_EXPORT NumSimConfigSchema
+    {
+    public:
+        enum class Type
+        {
+            Boolean,
+            Integer,
+            Number,
+            String,
+            StringArray,
+            Object,
+            Map
+        };
+
+        struct Field
+        {
+            std::string name;
+            Type type = Type::Object;
+            bool required = false;
+            double minimum = -std::numeric_limits<double>::infinity();
+            double maximum = std::numeric_limits<double>::infinity();
+            std::vector<std::string> values; /**< allowed strings, empty for any */
+            std::vector<Field> fields; /**< keys of an object, or of every entry of a map */
+            bool open = false; /**< an object (map entry) may have keys that are not in fields */
+        };
+
+        static Field Boolean(const std::string& name);
+        static Field Integer(const std::string& name, double minimum = -std::numeric_limits<double>::infinity(),
+            double maximum = std::numeric_limits<double>::infinity());
+        static Field Number(const std::string& name, double minimum = -std::numeric_limits<double>::infinity(),
+            double maximum = std::numeric_limits<double>::infinity());
+        static Field String(const std::string& name, const std::vector<std::string>& values = {});
+        static Field StringArray(const std::string& name);
+        static Field Object(const std::string& name, const std::vector<Field>& fields, bool open = false);
+        static Field Map(const std::string& name, const std::vector<Field>& fields, bool open = false);
+        static Field Required(Field field);
+
+        void AddSection(const Field& section);
+
+        inline const std::vector<Field>& GetSections() const
+        {
+            return this->sections_;
+        }
+
+        /**
+         * @return the problems of the configuration, empty if it is valid
+         */
+        std::vector<std::string> Validate(const boost::json::object& numSimSolverJson) const;
+
+        /**
+         * @throws std::runtime_error listing every problem if the configuration is invalid
+         */
+        void Check(const boost::json::object& numSimSolverJson) const;
+
+        /**
+         * @brief check a value against a field, appending "<path>: <message>" for every problem
+         */
+        static void ValidateValue(const Field& field, const boost::json::value& value, const std::string& path,
+            std::vector<std::string>& errors);
+
+        static std::string FormatErrors(const std::vector<std::string>& errors);
+
+        /**
+         * @brief schema of the sections read by NumSimCore
+         */
+        static const NumSimConfigSchema& GetSolverSchema();
+
+        /**
+         * @brief read and parse a configuration file
+         * @throws std::runtime_error if the file cannot be read or is not a JSON object
+         */
+        static boost::json::value ParseFile(const std::string& fileName);
+
+    private:
+        std::vector<Field> sections_;
+    };
+
+    /**
+     * @brief compiles a configuration section into a flat parameter struct
+     *
+     * @details Declares the fields of a section together with the struct
+     * members they are stored in. Compile() validates the section like
+     * NumSimConfigSchema (reporting every problem at once) and returns the
+     * struct, so the solve loop reads plain members instead of looking up
+     * keys in boost::json. Members keep their default when the key (or the
+     * whole section) is absent.
+     * @code
+     * struct FluidParameters
+     * {
+     *     real_t cfl = 0.5;
+     *     uint_t maxIterations = 100;
+     *     Scheme scheme = Scheme::Upwind;
+     * };
+     *
+     * static const auto fluidSection = NumSimParameterSection<FluidParameters>("fluid")
+     *     .Number("cfl", &FluidParameters::cfl, 0.0, 1.0)
+     *     .Integer("max_iterations", &FluidParameters::maxIterations, 1)
+     *     .Enum("scheme", &FluidParameters::scheme, { { "upwind", Scheme::Upwind }, { "central", Scheme::Central } });
+     *
+     * this->parameters_ = fluidSection.Compile(numSimSolverJson);
+     * @endcode
+     */
+    template <typename Parameters>
+    class NumSimParameterSection
+    {
+    public:
+        explicit NumSimParameterSection(const std::string& name)
+            : section_(NumSimConfigSchema::Object(name, {}))
+        {
+        }
+
+        NumSimParameterSection& Boolean(const std::string& name, bool Parameters::* member)
+        {
+            return this->Add(NumSimConfigSchema::Boolean(name), [member](const boost::json::value& value, Parameters& parameters)
+            {
+                parameters.*member = value.as_bool();
+            });
+        }
+
+        /**
+         * @brief integer member, bounded by its type unless narrower bounds are given
+         */
+        template <typename IntegerType>
+        NumSimParameterSection& Integer(const std::string& name, IntegerType Parameters::* member,
+            double minimum = static_cast<double>(std::numeric_limits<IntegerType>::lowest()),
+            double maximum = static_cast<double>(std::numeric_limits<IntegerType>::max()))
+        {
+            return this->Add(NumSimConfigSchema::Integer(name, minimum, maximum), [member](const boost::json::value& value, Parameters& parameters)
+            {
+                parameters.*member = static_cast<IntegerType>(value.to_number<std::int64_t>());
+            });
+        }
+
+        NumSimParameterSection& Number(const std::string& name, real_t Parameters::* member,
+            double minimum = -std::numeric_limits<double>::infinity(), double maximum = std::numeric_limits<double>::infinity())
+        {
+            return this->Add(NumSimConfigSchema::Number(name, minimum, maximum), [member](const boost::json::value& value, Parameters& parameters)
+            {
+                parameters.*member = static_cast<real_t>(value.to_number<double>());
+            });
+        }
+
+        NumSimParameterSection& String(const std::string& name, std::string Parameters::* member, const std::vector<std::string>& values = {})
+        {
+            return this->Add(NumSimConfigSchema::String(name, values), [member](const boost::json::value& value, Parameters& parameters)
+            {
+                parameters.*member = value.as_string().c_str();
+            });
+        }
+
+        NumSimParameterSection& StringArray(const std::string& name, std::vector<std::string> Parameters::* member)
+        {
+            return this->Add(NumSimConfigSchema::StringArray(name), [member](const boost::json::value& value, Parameters& parameters)
+            {
+                (parameters.*member).clear();
+
+                for (auto& item : value.as_array())
+                {
+                    (parameters.*member).emplace_back(item.as_string().c_str());
+                }
+            });
+        }
+
+        /**
+         * @brief enumeration member, given in the configuration by name
+         */
+        template <typename EnumType>
+        NumSimParameterSection& Enum(const std::string& name, EnumType Parameters::* member, const std::vector<std::pair<std::string, EnumType>>& values)
+        {
+            std::vector<std::string> names;
+
+            for (auto& item : values)
+            {
+                names.push_back(item.first);
+            }
+
+            return this->Add(NumSimConfigSchema::String(name, names), [member, values](const boost::json::value& value, Parameters& parameters)
+            {
+                for (auto& item : values)
+                {
+                    if (value.as_string() == item.first)
+                    {
+                        parameters.*member = item.second;
+                    }
+                }
+            });
+        }
+
+        /**
+         * @brief the last declared key must be given when the section is present
+         */
+        NumSimParameterSection& Required()
+        {
+            this->section_.fields.back().required = true;
+            return *this;
+        }
+
+        /**
+         * @brief allow keys that are not declared
+         */
+        NumSimParameterSection& Open()
+        {
+            this->section_.open = true;
+            return *this;
+        }
+
+        inline const NumSimConfigSchema::Field& GetField() const
+        {
+            return this->section_;
+        }
+
+        /**
+         * @throws std::runtime_error listing every problem if the section is invalid
+         */
+        Parameters Compile(const boost::json::object& numSimSolverJson) const
+        {
+            Parameters parameters;
+            auto sectionValue = numSimSolverJson.if_contains(this->section_.name);
+
+            if (!sectionValue)
+            {
+                return parameters;
+            }
+
+            std::vector<std::string> errors;
+            NumSimConfigSchema::ValidateValue(this->section_, *sectionValue, this->section_.name, errors);
+
+            if (!errors.empty())
+            {
+                throw std::runtime_error(NumSimConfigSchema::FormatErrors(errors));
+            }
+
+            auto& sectionJson = sectionValue->as_object();
+
+            for (std::size_t i = 0; i < this->assigns_.size(); ++i)
+            {
+                if (auto value = sectionJson.if_contains(this->section_.fields[i].name))
+                {
+                    this->assigns_[i](*value, parameters);
+                }
+            }
+
+            return parameters;
+        }
+
+    private:
+        NumSimParameterSection& Add(const NumSimConfigSchema::Field& field, std::function<void(const boost::json::value&, Parameters&)> assign)
+        {
+            this->section_.fields.push_back(field);
+            this->assigns_.push_back(std::move(assign));
+            return *this;
+        }
+
+        NumSimConfigSchema::Field section_;
+        std::vector<std::function<void(const boost::json::value&, Parameters&)>> assigns_;
+    };
+}
@@ -1,17 +1,43 @@
 #include <iostream>
+#include <stdexcept>
 
 #include "NumSimFramework.h"
+#include "NumSimCheckpointManager.h"
 #include "NumSimComm.h"
+#include "NumSimPluginRegistry.h"
+#include "NumSimPostPipeline.h"
+#include "NumSimProfiler.h"
+#include "NumSimScheduler.h"
 #include "NumSimSimulation.h"
+#include "NumSimTelemetry.h"
 
 namespace NumSimSolver 
 {
     NumSimFramework::NumSimFramework()
+        : scheduler_(new NumSimScheduler()),
+          postPipeline_(new NumSimPostPipeline()),
+          checkpointManager_(new NumSimCheckpointManager()),
+          profiler_(new NumSimProfiler()),
+          telemetry_(new NumSimTelemetry()),
+          pluginRegistry_(new NumSimPluginRegistry())
     {
     }
 
     NumSimFramework::~NumSimFramework()
     {
+        // stop the I/O thread before the simulations it writes are deleted
+        if (this->postPipeline_)
+        {
+            delete this->postPipeline_;
+            this->postPipeline_ = nullptr;
+        }
+
+        if (this->telemetry_)
+        {
+            delete this->telemetry_;
+            this->telemetry_ = nullptr;
+        }
+
         if (this->comm_)
         {
             delete this->comm_;
@@ -24,11 +50,84 @@ namespace NumSimSolver
         }
 
         std::vector<NumSimSimulation*>().swap(this->simulations_);
+
+        if (this->scheduler_)
+        {
+            delete this->scheduler_;
+            this->scheduler_ = nullptr;
+        }
+
+        if (this->checkpointManager_)
+        {
+            delete this->checkpointManager_;
+            this->checkpointManager_ = nullptr;
+        }
+
+        if (this->profiler_)
+        {
+            delete this->profiler_;
+            this->profiler_ = nullptr;
+        }
+
+        // unload the plugins after the simulations created from them
+        if (this->pluginRegistry_)
+        {
+            delete this->pluginRegistry_;
+            this->pluginRegistry_ = nullptr;
+        }
     }
 
     void NumSimFramework::Initialize(boost::json::object& numSimSolverJson)
     {
+        if (!this->comm_)
+        {
+            this->comm_ = new NumSimComm();
+        }
+
+        this->scheduler_->Initialize(numSimSolverJson);
+
+        // the parallel scheduler runs Solve(), halo exchanges included, on its worker threads
+        if (this->scheduler_->GetMode() == NumSimScheduler::Mode::Parallel)
+        {
+            this->comm_->SetMinThreadLevel(NumSimComm::ThreadLevel::Serialized, "the parallel scheduler");
+        }
+
+        this->comm_->Initialize(numSimSolverJson);
+
+        // by default the scheduler uses the threads of this rank, not of the whole node
+        if (this->scheduler_->GetNumThreads() == 0)
+        {
+            this->scheduler_->SetNumThreads(this->comm_->GetThreadsPerRank());
+        }
+
+        this->postPipeline_->Initialize(numSimSolverJson);
+        this->checkpointManager_->Initialize(numSimSolverJson);
+        this->profiler_->Initialize(numSimSolverJson);
+        this->telemetry_->Initialize(numSimSolverJson);
+        this->pluginRegistry_->Initialize(numSimSolverJson);
+
+        // only the plugins of the configured classes are loaded
+        auto simulationsValue = numSimSolverJson.if_contains("simulations");
+
+        if (simulationsValue && simulationsValue->is_object())
+        {
+            for (auto& item : simulationsValue->as_object())
+            {
+                std::string objectName(item.key());
+                auto className = item.value().is_object() ? item.value().as_object().if_contains("class") : nullptr;
+
+                if (!className)
+                {
+                    throw std::runtime_error("Simulation " + objectName + " has no class");
+                }
 
+                auto simulation = this->pluginRegistry_->Create<NumSimSimulation>(className->as_string().c_str());
+                simulation->SetObjectName(objectName);
+                simulation->SetNumSimSolverJson(numSimSolverJson);
+                this->AddSimulation(simulation);
+                simulation->Initialize(numSimSolverJson);
+            }
+        }
     }
 
     void NumSimFramework::PrintInfo()
@@ -40,6 +139,13 @@ namespace NumSimSolver
             this->comm_->PrintInfo();
         }
 
+        this->scheduler_->PrintInfo();
+        this->postPipeline_->PrintInfo();
+        this->checkpointManager_->PrintInfo();
+        this->profiler_->PrintInfo();
+        this->telemetry_->PrintInfo();
+        this->pluginRegistry_->PrintInfo();
+
         for (auto simulation : this->simulations_)
         {
             simulation->PrintInfo();
@@ -48,8 +154,28 @@ namespace NumSimSolver
 
     void NumSimFramework::Run()
     {
+        if (this->profiler_->IsEnabled())
+        {
+            this->profiler_->Start(this->comm_);
+        }
+
+        if (this->telemetry_->IsEnabled())
+        {
+            this->telemetry_->Start(this->comm_);
+        }
+
+        this->scheduler_->SetProfiler(this->profiler_);
+        this->scheduler_->SetTelemetry(this->telemetry_);
+        this->postPipeline_->SetProfiler(this->profiler_);
+
         for(auto simulation : this->simulations_)
         {
+            simulation->SetComm(this->comm_);
+            simulation->SetProfiler(this->profiler_);
+            simulation->SetTelemetry(this->telemetry_);
+
+            NumSimProfileScope phaseScope(this->profiler_, "ReadMesh");
+            NumSimProfileScope simulationScope(this->profiler_, simulation->GetObjectName());
             simulation->ReadMesh();
         }
 
@@ -57,6 +183,8 @@ namespace NumSimSolver
         {
             for (auto simulation : this->simulations_)
             {
+                NumSimProfileScope phaseScope(this->profiler_, "InitFields");
+                NumSimProfileScope simulationScope(this->profiler_, simulation->GetObjectName());
                 simulation->InitFields(flag);
             }
         }
@@ -65,44 +193,62 @@ namespace NumSimSolver
         {
             for (auto simulation : this->simulations_)
             {
+                NumSimProfileScope phaseScope(this->profiler_, "InitBoundaries");
+                NumSimProfileScope simulationScope(this->profiler_, simulation->GetObjectName());
                 simulation->InitBoundaries(flag);
             }
         }
 
-        for (auto simulation : this->simulations_)
-        {
-            simulation->InitFromRestart();
-        }
-
-        for (auto simulation : this->simulations_)
-        {
-            simulation->Post();
-        }
+        this->checkpointManager_->SetComm(this->comm_);
 
-        while (true)
         {
-            bool allFinished = true;
+            NumSimProfileScope phaseScope(this->profiler_, "InitFromRestart");
 
-            for (auto simulation : this->simulations_)
             {
-                if (!simulation->IsFinished())
-                {
-                    allFinished = false;
-                    simulation->Solve();
-                    simulation->Post();
-                }
+                NumSimProfileScope restoreScope(this->profiler_, "Restore");
+                this->checkpointManager_->Restore(this->simulations_);
             }
 
-            if (allFinished)
+            for (auto simulation : this->simulations_)
             {
-                break;
+                NumSimProfileScope simulationScope(this->profiler_, simulation->GetObjectName());
+                simulation->InitFromRestart();
             }
         }
 
+        this->checkpointManager_->ReleaseRestartData(this->simulations_);
+
+        this->postPipeline_->Start();
+
+        for (auto simulation : this->simulations_)
+        {
+            NumSimProfileScope phaseScope(this->profiler_, "Post");
+            NumSimProfileScope simulationScope(this->profiler_, simulation->GetObjectName());
+            this->postPipeline_->Post(simulation);
+        }
+
+        this->scheduler_->Run(this->simulations_, this->postPipeline_, this->checkpointManager_);
+
         for (auto simulation : this->simulations_)
         {
-            simulation->Post();
+            NumSimProfileScope phaseScope(this->profiler_, "Post");
+            NumSimProfileScope simulationScope(this->profiler_, simulation->GetObjectName());
+            this->postPipeline_->Post(simulation);
         }
+
+        // write the remaining snapshots before the simulations are finalized
+        this->postPipeline_->Stop();
+        this->telemetry_->Stop();
+
+        if (this->profiler_->IsEnabled())
+        {
+            this->profiler_->Write(this->comm_);
+        }
+    }
+
+    void NumSimFramework::AddSimulation(NumSimSimulation* simulation)
+    {
+        this->simulations_.push_back(simulation);
     }
 
     void NumSimFramework::Finalize()
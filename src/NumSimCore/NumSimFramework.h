@@ -4,8 +4,14 @@
 
 namespace NumSimSolver 
 {
+    class NumSimCheckpointManager;
+    class NumSimPluginRegistry;
     class NumSimComm;
+    class NumSimPostPipeline;
+    class NumSimProfiler;
+    class NumSimScheduler;
     class NumSimSimulation;
+    class NumSimTelemetry;
 
     /**
      * @brief framework
@@ -15,6 +21,12 @@ namespace NumSimSolver
     protected:
         NumSimComm* comm_ = nullptr; /**< ͨŶָ */
         std::vector<NumSimSimulation*> simulations_; /**< б */
+        NumSimScheduler* scheduler_ = nullptr; /**< ʱƽ */
+        NumSimPostPipeline* postPipeline_ = nullptr; /**< ˮ */
+        NumSimCheckpointManager* checkpointManager_ = nullptr; /**<  */
+        NumSimProfiler* profiler_ = nullptr; /**< ʱܷ */
+        NumSimTelemetry* telemetry_ = nullptr; /**< м */
+        NumSimPluginRegistry* pluginRegistry_ = nullptr; /**< ⣨Ĺ */
 
     public:
         NumSimFramework();
@@ -23,6 +35,8 @@ namespace NumSimSolver
     public:
         /**
          * @brief á
+         * @details õ simulations еķɵĲ
+         * "simulations": { "Fluid": { "class": "FluidSimulation" } }
          * @param numSimSolverJson Jsonö
          */
         void Initialize(boost::json::object& numSimSolverJson);
@@ -42,6 +56,50 @@ namespace NumSimSolver
          */
         void Finalize();
 
+        /**
+         * @brief ӷɿܸͷţ
+         * @param simulation ָ롣
+         */
+        void AddSimulation(NumSimSimulation* simulation);
+
+        /**
+         * @brief MPI Initialize ֮ǰΪ nullptr
+         */
+        inline NumSimComm* GetComm() const
+        {
+            return this->comm_;
+        }
+
+        inline NumSimScheduler* GetScheduler() const
+        {
+            return this->scheduler_;
+        }
+
+        inline NumSimPostPipeline* GetPostPipeline() const
+        {
+            return this->postPipeline_;
+        }
+
+        inline NumSimCheckpointManager* GetCheckpointManager() const
+        {
+            return this->checkpointManager_;
+        }
+
+        inline NumSimProfiler* GetProfiler() const
+        {
+            return this->profiler_;
+        }
+
+        inline NumSimTelemetry* GetTelemetry() const
+        {
+            return this->telemetry_;
+        }
+
+        inline NumSimPluginRegistry* GetPluginRegistry() const
+        {
+            return this->pluginRegistry_;
+        }
+
     public:
         NUMSIM_DEFINE_FACTORY_METHOD(NumSimFramework);
     }; 
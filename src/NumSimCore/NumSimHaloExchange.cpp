@@ -0,0 +1,140 @@
+#include <stdexcept>
+#include <thread>
+
+#include "NumSimHaloExchange.h"
+#include "NumSimComm.h"
+#include "NumSimPartition.h"
+
+namespace NumSimSolver
+{
+    NumSimHaloExchange::NumSimHaloExchange()
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimHaloExchange::~NumSimHaloExchange()
+    {
+        this->Free();
+    }
+
+    void NumSimHaloExchange::Setup(const NumSimComm* comm, const NumSimPartition& partition, real_t* data, int_t numComponents, int tag)
+    {
+        this->Free();
+        this->data_ = data;
+        this->numComponents_ = numComponents;
+        this->sendIndices_.clear();
+        this->comm_ = comm;
+
+        if (!comm || comm->GetNumProcs() == 1)
+        {
+            this->sendBuffer_.clear();
+            return;
+        }
+
+        for (auto& sendList : partition.GetSendLists())
+        {
+            this->sendIndices_.insert(this->sendIndices_.end(), sendList.second.begin(), sendList.second.end());
+        }
+
+        // the requests keep pointers into the buffer, so it is never resized after this
+        this->sendBuffer_.assign(this->sendIndices_.size() * numComponents, 0.0);
+
+        auto lock = comm->LockMPI();
+
+        for (auto& range : partition.GetReceiveRanges())
+        {
+            MPI_Request request;
+            MPI_Recv_init(data + static_cast<std::size_t>(range.second.first) * numComponents, range.second.second * numComponents,
+                MPI_DOUBLE, range.first, tag, comm->GetComm(), &request);
+            this->requests_.push_back(request);
+        }
+
+        std::size_t offset = 0;
+
+        for (auto& sendList : partition.GetSendLists())
+        {
+            auto count = sendList.second.size() * numComponents;
+            MPI_Request request;
+            MPI_Send_init(this->sendBuffer_.data() + offset, static_cast<int>(count), MPI_DOUBLE, sendList.first, tag,
+                comm->GetComm(), &request);
+            this->requests_.push_back(request);
+            offset += count;
+        }
+    }
+
+    void NumSimHaloExchange::Begin()
+    {
+        if (this->active_)
+        {
+            throw std::runtime_error("Halo exchange started twice without End()");
+        }
+
+        auto buffer = this->sendBuffer_.data();
+
+        for (auto index : this->sendIndices_)
+        {
+            auto values = this->data_ + static_cast<std::size_t>(index) * this->numComponents_;
+
+            for (int_t c = 0; c < this->numComponents_; ++c)
+            {
+                *buffer++ = values[c];
+            }
+        }
+
+        if (!this->requests_.empty())
+        {
+            auto lock = this->comm_->LockMPI();
+            MPI_Startall(static_cast<int>(this->requests_.size()), this->requests_.data());
+        }
+
+        this->active_ = true;
+    }
+
+    void NumSimHaloExchange::End()
+    {
+        if (!this->active_)
+        {
+            return;
+        }
+
+        // poll so that other threads can make their MPI calls while this exchange is in flight
+        for (int done = this->requests_.empty() ? 1 : 0; !done; )
+        {
+            {
+                auto lock = this->comm_->LockMPI();
+                MPI_Testall(static_cast<int>(this->requests_.size()), this->requests_.data(), &done, MPI_STATUSES_IGNORE);
+            }
+
+            if (!done)
+            {
+                std::this_thread::yield();
+            }
+        }
+
+        this->active_ = false;
+    }
+
+    void NumSimHaloExchange::Free()
+    {
+        int finalized = 0;
+        MPI_Finalized(&finalized);
+
+        if (!finalized)
+        {
+            this->End();
+
+            if (!this->requests_.empty())
+            {
+                auto lock = this->comm_->LockMPI();
+
+                for (auto& request : this->requests_)
+                {
+                    MPI_Request_free(&request);
+                }
+            }
+        }
+
+        this->requests_.clear();
+        this->active_ = false;
+    }
+}
@@ -0,0 +1,94 @@
+#pragma once
+
+#include <vector>
+#include <mpi.h>
+
+#include "NumSimObject.h"
+
+namespace NumSimSolver
+{
+    class NumSimComm;
+    class NumSimPartition;
+
+    /**
+     * @brief persistent non-blocking ghost cell update of one field
+     *
+     * @details Setup() creates persistent MPI requests once for a field laid
+     * out in the local numbering of a NumSimPartition (GetNumLocal() tuples of
+     * numComponents values). Ghosts are received in place, since the ghosts
+     * of each neighbour are contiguous; owned values are packed into a send
+     * buffer. Every exchange then only starts and completes the requests, so
+     * a time step can overlap the communication with the interior cells:
+     * @code
+     * halo.Begin();
+     * for (int_t i = 0; i < partition.GetNumInterior(); ++i) { ... }
+     * halo.End();
+     * for (int_t i = partition.GetNumInterior(); i < partition.GetNumOwned(); ++i) { ... }
+     * @endcode
+     * The field must not be reallocated while the exchange is set up, and the
+     * ghosts must not be read between Begin() and End(). Several fields
+     * exchanged at the same time need different tags.
+     *
+     * The MPI calls hold NumSimComm::LockMPI(), and End() polls the requests
+     * instead of blocking in MPI_Waitall, so simulations running on the
+     * threads of the parallel scheduler can exchange at the same time.
+     */
+    class BOOST_SYMBOL_EXPORT NumSimHaloExchange : public NumSimObject
+    {
+    public:
+        NumSimHaloExchange();
+        virtual ~NumSimHaloExchange();
+
+        NumSimHaloExchange(const NumSimHaloExchange&) = delete;
+        NumSimHaloExchange& operator=(const NumSimHaloExchange&) = delete;
+
+        /**
+         * @brief create the persistent requests for a field
+         * @param comm ranks of the partition, nullptr for a single rank (no communication)
+         */
+        void Setup(const NumSimComm* comm, const NumSimPartition& partition, real_t* data, int_t numComponents = 1, int tag = 0);
+
+        /**
+         * @brief pack the owned boundary values and start all sends and receives
+         */
+        void Begin();
+
+        /**
+         * @brief wait until the ghosts are up to date and the send buffer is free
+         */
+        void End();
+
+        inline void Exchange()
+        {
+            this->Begin();
+            this->End();
+        }
+
+        /**
+         * @brief free the persistent requests
+         */
+        void Free();
+
+        inline bool IsActive() const
+        {
+            return this->active_;
+        }
+
+        /**
+         * @brief values sent per exchange by this rank
+         */
+        inline std::size_t GetSendSize() const
+        {
+            return this->sendBuffer_.size();
+        }
+
+    private:
+        const NumSimComm* comm_ = nullptr;
+        real_t* data_ = nullptr;
+        int_t numComponents_ = 1;
+        std::vector<int_t> sendIndices_;
+        std::vector<real_t> sendBuffer_;
+        std::vector<MPI_Request> requests_;
+        bool active_ = false;
+    };
+}
@@ -0,0 +1,324 @@
+#include <algorithm>
+#include <iostream>
+#include <limits>
+#include <set>
+#include <stdexcept>
+
+#include "NumSimPartition.h"
+#include "NumSimComm.h"
+
+namespace NumSimSolver
+{
+    NumSimPartition::NumSimPartition()
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimPartition::~NumSimPartition()
+    {
+    }
+
+    void NumSimPartition::Initialize(boost::json::object& numSimSolverJson)
+    {
+        auto partitionValue = numSimSolverJson.if_contains("partition");
+
+        if (!partitionValue || !partitionValue->is_object())
+        {
+            return;
+        }
+
+        auto& partitionJson = partitionValue->as_object();
+
+        if (auto method = partitionJson.if_contains("method"))
+        {
+            std::string methodName(method->as_string().c_str());
+
+            if (methodName == "rcb")
+            {
+                this->method_ = Method::RCB;
+            }
+            else if (methodName == "block")
+            {
+                this->method_ = Method::Block;
+            }
+            else
+            {
+                throw std::runtime_error("Unknown partition method: " + methodName);
+            }
+        }
+    }
+
+    void NumSimPartition::PrintInfo()
+    {
+        std::cout << "Partition: method " << (this->method_ == Method::RCB ? "rcb" : "block")
+                  << ", rank " << this->myRank_ << " owns " << this->numOwned_ << " cells ("
+                  << this->numInterior_ << " interior), " << this->GetNumLocal() - this->numOwned_
+                  << " ghosts from " << this->receiveRanges_.size() << " neighbours" << std::endl;
+    }
+
+    void NumSimPartition::Build(const NumSimComm* comm, std::uint64_t numCells, const std::int64_t* offsets,
+        const std::int64_t* connectivity, const real_t* points)
+    {
+        int numProcs = comm ? comm->GetNumProcs() : 1;
+        this->myRank_ = comm ? comm->GetMyRank() : 0;
+
+        if (this->method_ == Method::RCB && numProcs > 1)
+        {
+            this->AssignRCB(numCells, offsets, connectivity, points, numProcs);
+        }
+        else
+        {
+            this->AssignBlocks(numCells, numProcs);
+        }
+
+        // cells around each point
+        std::int64_t numPoints = 0;
+
+        for (std::int64_t i = 0; i < offsets[numCells]; ++i)
+        {
+            if (connectivity[i] < 0)
+            {
+                throw std::runtime_error("Negative point id in the mesh connectivity");
+            }
+
+            numPoints = std::max(numPoints, connectivity[i] + 1);
+        }
+
+        std::vector<std::int64_t> pointCellOffsets(numPoints + 1, 0);
+
+        for (std::int64_t i = 0; i < offsets[numCells]; ++i)
+        {
+            ++pointCellOffsets[connectivity[i] + 1];
+        }
+
+        for (std::int64_t i = 0; i < numPoints; ++i)
+        {
+            pointCellOffsets[i + 1] += pointCellOffsets[i];
+        }
+
+        std::vector<std::int64_t> pointCells(pointCellOffsets[numPoints]);
+        std::vector<std::int64_t> position(pointCellOffsets.begin(), pointCellOffsets.end() - 1);
+
+        for (std::uint64_t cell = 0; cell < numCells; ++cell)
+        {
+            for (std::int64_t i = offsets[cell]; i < offsets[cell + 1]; ++i)
+            {
+                pointCells[position[connectivity[i]]++] = static_cast<std::int64_t>(cell);
+            }
+        }
+
+        // neighbours (global ids) of every owned cell, in ascending global id
+        std::vector<std::int64_t> owned;
+        std::vector<std::int64_t> neighbourOffsets(1, 0);
+        std::vector<std::int64_t> neighbours;
+        std::vector<std::int64_t> stamp(numCells, -1);
+
+        for (std::uint64_t cell = 0; cell < numCells; ++cell)
+        {
+            if (this->cellOwners_[cell] != this->myRank_)
+            {
+                continue;
+            }
+
+            owned.push_back(static_cast<std::int64_t>(cell));
+            stamp[cell] = static_cast<std::int64_t>(cell);
+
+            for (std::int64_t i = offsets[cell]; i < offsets[cell + 1]; ++i)
+            {
+                auto point = connectivity[i];
+
+                for (std::int64_t j = pointCellOffsets[point]; j < pointCellOffsets[point + 1]; ++j)
+                {
+                    auto neighbour = pointCells[j];
+
+                    if (stamp[neighbour] != static_cast<std::int64_t>(cell))
+                    {
+                        stamp[neighbour] = static_cast<std::int64_t>(cell);
+                        neighbours.push_back(neighbour);
+                    }
+                }
+            }
+
+            neighbourOffsets.push_back(static_cast<std::int64_t>(neighbours.size()));
+        }
+
+        // classify owned cells and collect the halo in both directions
+        std::vector<std::int64_t> interior;
+        std::vector<std::int64_t> boundary;
+        std::set<std::pair<int, std::int64_t>> ghosts;
+        std::map<int, std::set<std::int64_t>> sends;
+
+        for (std::size_t k = 0; k < owned.size(); ++k)
+        {
+            bool isBoundary = false;
+
+            for (auto j = neighbourOffsets[k]; j < neighbourOffsets[k + 1]; ++j)
+            {
+                int owner = this->cellOwners_[neighbours[j]];
+
+                if (owner != this->myRank_)
+                {
+                    isBoundary = true;
+                    ghosts.insert(std::make_pair(owner, neighbours[j]));
+                    sends[owner].insert(owned[k]);
+                }
+            }
+
+            (isBoundary ? boundary : interior).push_back(owned[k]);
+        }
+
+        // local numbering: interior, boundary, ghosts by (owner, global id)
+        this->numInterior_ = static_cast<int_t>(interior.size());
+        this->numOwned_ = static_cast<int_t>(owned.size());
+        this->localToGlobal_ = interior;
+        this->localToGlobal_.insert(this->localToGlobal_.end(), boundary.begin(), boundary.end());
+        this->receiveRanges_.clear();
+
+        for (auto& ghost : ghosts)
+        {
+            auto range = this->receiveRanges_.emplace(ghost.first, std::make_pair(this->GetNumLocal(), 0)).first;
+            ++range->second.second;
+            this->localToGlobal_.push_back(ghost.second);
+        }
+
+        this->globalToLocal_.clear();
+
+        for (std::size_t i = 0; i < this->localToGlobal_.size(); ++i)
+        {
+            this->globalToLocal_[this->localToGlobal_[i]] = static_cast<int_t>(i);
+        }
+
+        // adjacency of the owned cells in local ids
+        this->adjacencyOffsets_.assign(1, 0);
+        this->adjacency_.clear();
+
+        for (int_t i = 0; i < this->numOwned_; ++i)
+        {
+            auto k = std::lower_bound(owned.begin(), owned.end(), this->localToGlobal_[i]) - owned.begin();
+
+            for (auto j = neighbourOffsets[k]; j < neighbourOffsets[k + 1]; ++j)
+            {
+                if (neighbours[j] != owned[k])
+                {
+                    this->adjacency_.push_back(this->globalToLocal_.at(neighbours[j]));
+                }
+            }
+
+            this->adjacencyOffsets_.push_back(static_cast<int_t>(this->adjacency_.size()));
+        }
+
+        // the receiver orders the ghosts of each owner by global id as well
+        this->sendLists_.clear();
+
+        for (auto& send : sends)
+        {
+            auto& sendList = this->sendLists_[send.first];
+
+            for (auto globalId : send.second)
+            {
+                sendList.push_back(this->globalToLocal_.at(globalId));
+            }
+        }
+    }
+
+    int_t NumSimPartition::GetLocalId(std::int64_t globalId) const
+    {
+        auto it = this->globalToLocal_.find(globalId);
+        return it == this->globalToLocal_.end() ? -1 : it->second;
+    }
+
+    void NumSimPartition::AssignBlocks(std::uint64_t numCells, int numProcs)
+    {
+        this->cellOwners_.resize(numCells);
+
+        for (std::uint64_t cell = 0; cell < numCells; ++cell)
+        {
+            this->cellOwners_[cell] = static_cast<int_t>(cell * numProcs / numCells);
+        }
+    }
+
+    void NumSimPartition::AssignRCB(std::uint64_t numCells, const std::int64_t* offsets, const std::int64_t* connectivity,
+        const real_t* points, int numProcs)
+    {
+        std::vector<real_t> centroids(3 * numCells, 0.0);
+
+        for (std::uint64_t cell = 0; cell < numCells; ++cell)
+        {
+            auto numCellPoints = offsets[cell + 1] - offsets[cell];
+
+            for (std::int64_t i = offsets[cell]; i < offsets[cell + 1]; ++i)
+            {
+                for (int d = 0; d < 3; ++d)
+                {
+                    centroids[3 * cell + d] += points[3 * connectivity[i] + d] / numCellPoints;
+                }
+            }
+        }
+
+        std::vector<std::int64_t> cells(numCells);
+
+        for (std::uint64_t cell = 0; cell < numCells; ++cell)
+        {
+            cells[cell] = static_cast<std::int64_t>(cell);
+        }
+
+        this->cellOwners_.resize(numCells);
+        this->Bisect(cells.begin(), cells.end(), centroids, 0, numProcs);
+    }
+
+    void NumSimPartition::Bisect(std::vector<std::int64_t>::iterator first, std::vector<std::int64_t>::iterator last,
+        const std::vector<real_t>& centroids, int firstPart, int numParts)
+    {
+        if (numParts == 1)
+        {
+            for (auto it = first; it != last; ++it)
+            {
+                this->cellOwners_[*it] = firstPart;
+            }
+
+            return;
+        }
+
+        real_t lower[3];
+        real_t upper[3];
+
+        for (int d = 0; d < 3; ++d)
+        {
+            lower[d] = std::numeric_limits<real_t>::max();
+            upper[d] = std::numeric_limits<real_t>::lowest();
+        }
+
+        for (auto it = first; it != last; ++it)
+        {
+            for (int d = 0; d < 3; ++d)
+            {
+                lower[d] = std::min(lower[d], centroids[3 * *it + d]);
+                upper[d] = std::max(upper[d], centroids[3 * *it + d]);
+            }
+        }
+
+        int axis = 0;
+
+        for (int d = 1; d < 3; ++d)
+        {
+            if (upper[d] - lower[d] > upper[axis] - lower[axis])
+            {
+                axis = d;
+            }
+        }
+
+        // ties are broken by global id so that every rank computes the same split
+        int leftParts = numParts / 2;
+        auto middle = first + static_cast<std::ptrdiff_t>(static_cast<std::uint64_t>(last - first) * leftParts / numParts);
+
+        std::nth_element(first, middle, last, [&centroids, axis](std::int64_t a, std::int64_t b)
+            {
+                auto ca = centroids[3 * a + axis];
+                auto cb = centroids[3 * b + axis];
+                return ca < cb || (ca == cb && a < b);
+            });
+
+        this->Bisect(first, middle, centroids, firstPart, leftParts);
+        this->Bisect(middle, last, centroids, firstPart + leftParts, numParts - leftParts);
+    }
+}
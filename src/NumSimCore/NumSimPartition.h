@@ -0,0 +1,187 @@
+#pragma once
+
+#include <cstdint>
+#include <map>
+#include <string>
+#include <vector>
+
+#include "NumSimObject.h"
+
+namespace NumSimSolver
+{
+    class NumSimComm;
+
+    /**
+     * @brief cell-based domain decomposition of an unstructured mesh
+     *
+     * @details Build() assigns every cell to one rank and derives the local
+     * view of the calling rank: its owned cells, one layer of ghost cells
+     * (cells of other ranks sharing a node with an owned cell), the cell
+     * adjacency in local indices and the send and receive lists used by
+     * NumSimHaloExchange.
+     *
+     * Partitioning is replicated: every rank reads the same (memory-mapped)
+     * mesh and computes the same assignment, so no mesh data is
+     * communicated. "rcb" is recursive coordinate bisection of the cell
+     * centroids: the cells are split along the longest axis of their
+     * bounding box in proportion to the number of ranks on either side, so
+     * any number of ranks gets balanced, compact parts. "block" assigns
+     * contiguous ranges of cell ids and is only useful for meshes whose
+     * numbering is already spatially ordered.
+     *
+     * Local cells are numbered [interior | boundary | ghosts]: interior cells
+     * have no ghost neighbour and can be updated while the halo exchange is
+     * in flight, boundary cells need the ghosts. Ghosts are grouped by owner
+     * rank and sorted by global id, so each neighbour's halo is received
+     * into one contiguous block.
+     *
+     * Typical use from a simulation:
+     * @code
+     * void MySimulation::ReadMesh()
+     * {
+     *     this->meshReader_.Open(meshFileName);
+     *     this->partition_.Initialize(*this->GetNumSimSolverJson());
+     *     this->partition_.Build(this->GetComm(), this->meshReader_.GetNumberOfCells(),
+     *         this->meshReader_.GetOffsets(), this->meshReader_.GetConnectivity(), this->meshReader_.GetPoints());
+     *     ...
+     * }
+     * @endcode
+     *
+     * Configuration:
+     * @code
+     * "partition": {
+     *     "method": "rcb"
+     * }
+     * @endcode
+     */
+    class BOOST_SYMBOL_EXPORT NumSimPartition : public NumSimObject
+    {
+    public:
+        enum class Method
+        {
+            RCB,
+            Block
+        };
+
+        NumSimPartition();
+        virtual ~NumSimPartition();
+
+        /**
+         * @brief read the "partition" section of the solver configuration
+         * @throws std::runtime_error on an unknown method
+         */
+        void Initialize(boost::json::object& numSimSolverJson);
+
+        void PrintInfo();
+
+        /**
+         * @brief partition a mesh and build the local view of this rank
+         * @param comm ranks to partition for, nullptr for a single rank
+         * @param offsets cell offsets into the connectivity, numCells + 1 values
+         * @param points interleaved xyz coordinates (only read by "rcb")
+         * @throws std::runtime_error if the connectivity references a point out of range
+         */
+        void Build(const NumSimComm* comm, std::uint64_t numCells, const std::int64_t* offsets,
+            const std::int64_t* connectivity, const real_t* points);
+
+        /**
+         * @brief owned cells whose neighbours are all owned, local ids [0, GetNumInterior())
+         */
+        inline int_t GetNumInterior() const
+        {
+            return this->numInterior_;
+        }
+
+        /**
+         * @brief owned cells, local ids [0, GetNumOwned())
+         */
+        inline int_t GetNumOwned() const
+        {
+            return this->numOwned_;
+        }
+
+        /**
+         * @brief owned and ghost cells, ghosts have local ids [GetNumOwned(), GetNumLocal())
+         */
+        inline int_t GetNumLocal() const
+        {
+            return static_cast<int_t>(this->localToGlobal_.size());
+        }
+
+        inline const std::vector<std::int64_t>& GetLocalToGlobal() const
+        {
+            return this->localToGlobal_;
+        }
+
+        /**
+         * @return local id of a global cell id, -1 if the cell is neither owned nor a ghost
+         */
+        int_t GetLocalId(std::int64_t globalId) const;
+
+        /**
+         * @brief owner rank of every global cell
+         */
+        inline const std::vector<int_t>& GetCellOwners() const
+        {
+            return this->cellOwners_;
+        }
+
+        /**
+         * @brief neighbours of owned cell i are GetAdjacency()[GetAdjacencyOffsets()[i] .. GetAdjacencyOffsets()[i + 1]) (local ids)
+         */
+        inline const std::vector<int_t>& GetAdjacencyOffsets() const
+        {
+            return this->adjacencyOffsets_;
+        }
+
+        inline const std::vector<int_t>& GetAdjacency() const
+        {
+            return this->adjacency_;
+        }
+
+        /**
+         * @brief local ids of the owned cells each neighbour rank holds as ghosts, by rank
+         */
+        inline const std::map<int, std::vector<int_t>>& GetSendLists() const
+        {
+            return this->sendLists_;
+        }
+
+        /**
+         * @brief first local id and count of the ghosts owned by each neighbour rank, by rank
+         */
+        inline const std::map<int, std::pair<int_t, int_t>>& GetReceiveRanges() const
+        {
+            return this->receiveRanges_;
+        }
+
+        inline Method GetMethod() const
+        {
+            return this->method_;
+        }
+
+        inline void SetMethod(Method method)
+        {
+            this->method_ = method;
+        }
+
+    private:
+        void AssignBlocks(std::uint64_t numCells, int numProcs);
+        void AssignRCB(std::uint64_t numCells, const std::int64_t* offsets, const std::int64_t* connectivity,
+            const real_t* points, int numProcs);
+        void Bisect(std::vector<std::int64_t>::iterator first, std::vector<std::int64_t>::iterator last,
+            const std::vector<real_t>& centroids, int firstPart, int numParts);
+
+        Method method_ = Method::RCB;
+        int myRank_ = 0;
+        int_t numInterior_ = 0;
+        int_t numOwned_ = 0;
+        std::vector<int_t> cellOwners_;
+        std::vector<std::int64_t> localToGlobal_;
+        std::map<std::int64_t, int_t> globalToLocal_;
+        std::vector<int_t> adjacencyOffsets_;
+        std::vector<int_t> adjacency_;
+        std::map<int, std::vector<int_t>> sendLists_;
+        std::map<int, std::pair<int_t, int_t>> receiveRanges_;
+    };
+}
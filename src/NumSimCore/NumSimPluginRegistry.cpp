@@ -0,0 +1,354 @@
+#include <algorithm>
+#include <fstream>
+#include <iostream>
+#include <iterator>
+#include <stdexcept>
+#include <boost/dll/library_info.hpp>
+#include <boost/filesystem.hpp>
+
+#include "NumSimPluginRegistry.h"
+
+namespace NumSimSolver
+{
+    namespace
+    {
+        namespace fs = boost::filesystem;
+
+        const char* const MANIFEST_FILE_NAME = "numsim_plugins.json";
+        const std::int64_t MANIFEST_VERSION = 1;
+
+        // prefix of the factory aliases exported by NUMSIM_DLL_ALIAS
+        const std::string FACTORY_PREFIX = "Create";
+
+        // section that BOOST_DLL_ALIAS puts the aliases in
+        const char* const ALIAS_SECTION = "boostdll";
+
+        /**
+         * @brief factory aliases in the symbol table of a library, read without loading it
+         */
+        std::vector<std::string> ReadAliases(const fs::path& path)
+        {
+            std::vector<std::string> aliases;
+
+            try
+            {
+                boost::dll::library_info info(path);
+
+                for (auto& symbol : info.symbols(ALIAS_SECTION))
+                {
+                    if (symbol.size() > FACTORY_PREFIX.size() && symbol.compare(0, FACTORY_PREFIX.size(), FACTORY_PREFIX) == 0)
+                    {
+                        aliases.push_back(symbol);
+                    }
+                }
+            }
+            catch (const std::exception& e)
+            {
+                std::cerr << "Plugins: cannot read the symbols of " << path.string() << ": " << e.what() << std::endl;
+            }
+
+            std::sort(aliases.begin(), aliases.end());
+            aliases.erase(std::unique(aliases.begin(), aliases.end()), aliases.end());
+
+            return aliases;
+        }
+    }
+
+    NumSimPluginRegistry::NumSimPluginRegistry()
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimPluginRegistry::~NumSimPluginRegistry()
+    {
+    }
+
+    void NumSimPluginRegistry::Initialize(boost::json::object& numSimSolverJson)
+    {
+        auto pluginsValue = numSimSolverJson.if_contains("plugins");
+
+        if (pluginsValue && pluginsValue->is_object())
+        {
+            auto& pluginsJson = pluginsValue->as_object();
+
+            if (auto directories = pluginsJson.if_contains("directories"))
+            {
+                this->directories_.clear();
+
+                for (auto& directory : directories->as_array())
+                {
+                    this->directories_.emplace_back(directory.as_string().c_str());
+                }
+            }
+
+            if (auto manifest = pluginsJson.if_contains("manifest"))
+            {
+                this->SetManifestFileName(manifest->as_string().c_str());
+            }
+        }
+
+        this->Scan();
+    }
+
+    void NumSimPluginRegistry::PrintInfo()
+    {
+        std::cout << "Plugins: " << this->libraries_.size() << " libraries, " << this->classLibraries_.size() << " classes";
+
+        if (!this->directories_.empty())
+        {
+            std::cout << ", " << this->numInspected_ << " inspected, " << this->GetNumLoaded() << " loaded"
+                      << ", manifest: " << (this->ResolveManifestFileName().empty() ? "-" : this->ResolveManifestFileName());
+        }
+
+        std::cout << std::endl;
+    }
+
+    void NumSimPluginRegistry::Scan()
+    {
+        if (this->scanned_)
+        {
+            return;
+        }
+
+        std::string manifestFileName = this->ResolveManifestFileName();
+        auto manifest = this->ReadManifest(manifestFileName);
+        bool changed = false;
+        std::size_t numReused = 0;
+
+        for (auto& directory : this->directories_)
+        {
+            boost::system::error_code error;
+
+            if (!fs::is_directory(directory, error))
+            {
+                std::cerr << "Plugins: directory " << directory << " not found" << std::endl;
+                continue;
+            }
+
+            // file name order, so the library used for a duplicated class does not depend on the file system
+            std::vector<fs::path> paths;
+
+            for (auto& entry : fs::directory_iterator(directory))
+            {
+                if (fs::is_regular_file(entry.path()) && entry.path().extension() == boost::dll::shared_library::suffix())
+                {
+                    paths.push_back(fs::absolute(entry.path()).lexically_normal());
+                }
+            }
+
+            std::sort(paths.begin(), paths.end());
+
+            for (auto& path : paths)
+            {
+                Library library;
+                library.path = path.string();
+                library.size = static_cast<std::uint64_t>(fs::file_size(path));
+                library.modified = static_cast<std::int64_t>(fs::last_write_time(path));
+
+                auto cached = manifest.find(library.path);
+
+                if (cached != manifest.end() && cached->second.size == library.size && cached->second.modified == library.modified)
+                {
+                    library.aliases = std::move(cached->second.aliases);
+                    ++numReused;
+                }
+                else
+                {
+                    library.aliases = ReadAliases(path);
+                    ++this->numInspected_;
+                    changed = true;
+                }
+
+                for (auto& alias : library.aliases)
+                {
+                    std::string className = alias.substr(FACTORY_PREFIX.size());
+                    auto inserted = this->classLibraries_.emplace(className, this->libraries_.size());
+
+                    if (!inserted.second)
+                    {
+                        std::cerr << "Plugins: class " << className << " of " << library.path << " is already exported by "
+                                  << this->libraries_[inserted.first->second].path << ", ignored" << std::endl;
+                    }
+                }
+
+                this->libraries_.push_back(std::move(library));
+            }
+        }
+
+        // libraries removed since the manifest was written
+        changed = changed || numReused != manifest.size();
+
+        if (changed && !manifestFileName.empty())
+        {
+            this->WriteManifest(manifestFileName);
+        }
+
+        this->scanned_ = true;
+    }
+
+    std::vector<std::string> NumSimPluginRegistry::GetClassNames() const
+    {
+        std::vector<std::string> classNames;
+
+        for (auto& item : this->classLibraries_)
+        {
+            classNames.push_back(item.first);
+        }
+
+        return classNames;
+    }
+
+    const std::string& NumSimPluginRegistry::GetLibraryPath(const std::string& className) const
+    {
+        auto item = this->classLibraries_.find(className);
+
+        if (item == this->classLibraries_.end())
+        {
+            throw std::runtime_error("No plugin exports class " + className);
+        }
+
+        return this->libraries_[item->second].path;
+    }
+
+    boost::dll::shared_library& NumSimPluginRegistry::GetLibrary(const std::string& className)
+    {
+        auto& path = this->GetLibraryPath(className);
+        auto& library = this->libraries_[this->classLibraries_.at(className)];
+        std::lock_guard<std::mutex> lock(this->mutex_);
+
+        if (!library.handle)
+        {
+            try
+            {
+                library.handle = std::make_unique<boost::dll::shared_library>(path);
+            }
+            catch (const std::exception& e)
+            {
+                throw std::runtime_error("Cannot load plugin " + path + " for class " + className + ": " + e.what());
+            }
+        }
+
+        return *library.handle;
+    }
+
+    std::size_t NumSimPluginRegistry::GetNumLoaded() const
+    {
+        std::lock_guard<std::mutex> lock(this->mutex_);
+
+        return static_cast<std::size_t>(std::count_if(this->libraries_.begin(), this->libraries_.end(),
+            [](const Library& library) { return library.handle != nullptr; }));
+    }
+
+    std::string NumSimPluginRegistry::ResolveManifestFileName() const
+    {
+        if (this->hasManifestFileName_)
+        {
+            return this->manifestFileName_;
+        }
+
+        if (this->directories_.empty())
+        {
+            return "";
+        }
+
+        return (fs::path(this->directories_.front()) / MANIFEST_FILE_NAME).string();
+    }
+
+    std::map<std::string, NumSimPluginRegistry::Library> NumSimPluginRegistry::ReadManifest(const std::string& manifestFileName) const
+    {
+        std::map<std::string, Library> manifest;
+        std::ifstream manifestFile(manifestFileName);
+
+        if (manifestFileName.empty() || !manifestFile.is_open())
+        {
+            return manifest;
+        }
+
+        std::string content((std::istreambuf_iterator<char>(manifestFile)), std::istreambuf_iterator<char>());
+        boost::system::error_code ec;
+        auto manifestValue = boost::json::parse(content, ec);
+
+        // an unreadable manifest or one of another version is rebuilt
+        if (ec || !manifestValue.is_object() || !manifestValue.as_object().if_contains("version")
+            || manifestValue.as_object().at("version").to_number<std::int64_t>() != MANIFEST_VERSION)
+        {
+            std::cerr << "Plugins: ignoring invalid manifest " << manifestFileName << std::endl;
+            return manifest;
+        }
+
+        try
+        {
+            for (auto& item : manifestValue.as_object().at("libraries").as_array())
+            {
+                auto& libraryJson = item.as_object();
+                Library library;
+                library.path = libraryJson.at("path").as_string().c_str();
+                library.size = libraryJson.at("size").to_number<std::uint64_t>();
+                library.modified = libraryJson.at("modified").to_number<std::int64_t>();
+
+                for (auto& alias : libraryJson.at("aliases").as_array())
+                {
+                    library.aliases.emplace_back(alias.as_string().c_str());
+                }
+
+                manifest.emplace(library.path, std::move(library));
+            }
+        }
+        catch (const std::exception&)
+        {
+            std::cerr << "Plugins: ignoring invalid manifest " << manifestFileName << std::endl;
+            manifest.clear();
+        }
+
+        return manifest;
+    }
+
+    void NumSimPluginRegistry::WriteManifest(const std::string& manifestFileName) const
+    {
+        boost::json::array libraries;
+
+        for (auto& library : this->libraries_)
+        {
+            boost::json::array aliases;
+
+            for (auto& alias : library.aliases)
+            {
+                aliases.push_back(boost::json::value(alias));
+            }
+
+            boost::json::object libraryJson;
+            libraryJson["path"] = library.path;
+            libraryJson["size"] = library.size;
+            libraryJson["modified"] = library.modified;
+            libraryJson["aliases"] = aliases;
+            libraries.push_back(libraryJson);
+        }
+
+        boost::json::object manifestJson;
+        manifestJson["version"] = MANIFEST_VERSION;
+        manifestJson["libraries"] = libraries;
+
+        // write a temporary file and rename it, so that a concurrent run never reads a partial manifest
+        boost::system::error_code ec;
+        fs::path temporary = fs::path(manifestFileName).parent_path() / fs::unique_path("numsim_plugins-%%%%%%%%.tmp");
+
+        {
+            std::ofstream manifestFile(temporary.string());
+            manifestFile << boost::json::serialize(manifestJson);
+
+            if (!manifestFile)
+            {
+                std::cerr << "Plugins: cannot write manifest " << manifestFileName << std::endl;
+                return;
+            }
+        }
+
+        fs::rename(temporary, manifestFileName, ec);
+
+        if (ec)
+        {
+            std::cerr << "Plugins: cannot write manifest " << manifestFileName << ": " << ec.message() << std::endl;
+            fs::remove(temporary, ec);
+        }
+    }
+}
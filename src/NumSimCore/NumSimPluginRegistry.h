@@ -0,0 +1,163 @@
+#pragma once
+
+#include <cstdint>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+
+#include "NumSimObject.h"
+
+namespace NumSimSolver
+{
+    /**
+     * @brief finds the classes exported by plugin libraries and loads each library on first use
+     *
+     * @details Scan() lists the shared libraries of the plugin directories
+     * once and reads the NUMSIM_DLL_ALIAS factories ("Create<Class>") each
+     * one exports from its symbol table, without loading it. The result is
+     * kept in a manifest file (path, size, modification time and aliases of
+     * every library); a later scan only inspects libraries that were added
+     * or changed since. GetLibrary() loads the library of a class when it is
+     * first requested and keeps the handle, so simulations of the same
+     * plugin share it and unreferenced plugins are never loaded. Symbols are
+     * bound lazily (the default load mode of boost::dll).
+     *
+     * The registry can stand in for the map of NUMSIM_CREATE_OBJECT:
+     * @code
+     * auto simulation = NUMSIM_CREATE_OBJECT(registry, NumSimSimulation, className)
+     * @endcode
+     * Loaded libraries stay loaded until the registry is destroyed, which
+     * must happen after every object created from them.
+     *
+     * Configuration:
+     * @code
+     * "plugins": {
+     *     "directories": ["plugins"],
+     *     "manifest": "plugins/numsim_plugins.json"
+     * }
+     * @endcode
+     * Relative directories are relative to the working directory. Without
+     * "manifest" the manifest is numsim_plugins.json in the first
+     * directory; an empty name disables it. When two libraries export the
+     * same class, the first one (in directory order, then by file name) is
+     * used.
+     */
+    class BOOST_SYMBOL_EXPORT NumSimPluginRegistry : public NumSimObject
+    {
+    public:
+        NumSimPluginRegistry();
+        virtual ~NumSimPluginRegistry();
+
+        /**
+         * @brief read the "plugins" section of the solver configuration and scan the directories
+         */
+        void Initialize(boost::json::object& numSimSolverJson);
+
+        void PrintInfo();
+
+        /**
+         * @brief find the classes of the plugin libraries (only the first call scans)
+         * @details a manifest that cannot be read or written is only reported, it is a cache.
+         */
+        void Scan();
+
+        inline bool HasClass(const std::string& className) const
+        {
+            return this->classLibraries_.count(className) > 0;
+        }
+
+        std::vector<std::string> GetClassNames() const;
+
+        /**
+         * @return path of the library exporting the class
+         * @throws std::runtime_error if no plugin exports the class
+         */
+        const std::string& GetLibraryPath(const std::string& className) const;
+
+        /**
+         * @brief the library exporting the class, loaded on the first request; thread-safe
+         * @throws std::runtime_error if no plugin exports the class or the library cannot be loaded
+         */
+        boost::dll::shared_library& GetLibrary(const std::string& className);
+
+        /**
+         * @brief same as GetLibrary(), for NUMSIM_CREATE_OBJECT
+         */
+        inline boost::dll::shared_library& operator[](const std::string& className)
+        {
+            return this->GetLibrary(className);
+        }
+
+        /**
+         * @brief create an object with the Create<Class> factory of its plugin
+         */
+        template <typename BaseClass>
+        BaseClass* Create(const std::string& className)
+        {
+            auto& registry = *this;
+            return NUMSIM_CREATE_OBJECT(registry, BaseClass, className)
+        }
+
+        inline const std::vector<std::string>& GetDirectories() const
+        {
+            return this->directories_;
+        }
+
+        inline void SetDirectories(const std::vector<std::string>& directories)
+        {
+            this->directories_ = directories;
+        }
+
+        inline const std::string& GetManifestFileName() const
+        {
+            return this->manifestFileName_;
+        }
+
+        inline void SetManifestFileName(const std::string& manifestFileName)
+        {
+            this->manifestFileName_ = manifestFileName;
+            this->hasManifestFileName_ = true;
+        }
+
+        inline std::size_t GetNumLibraries() const
+        {
+            return this->libraries_.size();
+        }
+
+        /**
+         * @brief libraries whose symbols were read by the last scan (not taken from the manifest)
+         */
+        inline std::size_t GetNumInspected() const
+        {
+            return this->numInspected_;
+        }
+
+        std::size_t GetNumLoaded() const;
+
+    private:
+        struct Library
+        {
+            std::string path;
+            std::uint64_t size = 0;
+            std::int64_t modified = 0;
+            std::vector<std::string> aliases;
+            std::unique_ptr<boost::dll::shared_library> handle;
+        };
+
+        std::string ResolveManifestFileName() const;
+        std::map<std::string, Library> ReadManifest(const std::string& manifestFileName) const;
+        void WriteManifest(const std::string& manifestFileName) const;
+
+        std::vector<std::string> directories_;
+        std::string manifestFileName_;
+        bool hasManifestFileName_ = false;
+
+        bool scanned_ = false;
+        std::size_t numInspected_ = 0;
+        std::vector<Library> libraries_;
+        std::map<std::string, std::size_t> classLibraries_;
+        mutable std::mutex mutex_;
+    };
+}
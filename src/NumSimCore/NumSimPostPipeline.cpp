@@ -0,0 +1,252 @@
+#include <chrono>
+#include <iostream>
+#include <stdexcept>
+
+#include "NumSimPostPipeline.h"
+#include "NumSimProfiler.h"
+#include "NumSimSimulation.h"
+
+namespace NumSimSolver
+{
+    void NumSimPostBuffer::SetField(const std::string& name, const real_t* data, std::size_t numTuples, int_t numComponents)
+    {
+        auto& field = this->fields_[name];
+        field.data.assign(data, data + numTuples * numComponents);
+        field.numTuples = numTuples;
+        field.numComponents = numComponents;
+    }
+
+    const NumSimPostBuffer::Field* NumSimPostBuffer::GetField(const std::string& name) const
+    {
+        auto field = this->fields_.find(name);
+        return field == this->fields_.end() ? nullptr : &field->second;
+    }
+
+    NumSimPostPipeline::NumSimPostPipeline()
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimPostPipeline::~NumSimPostPipeline()
+    {
+        try
+        {
+            this->Stop();
+        }
+        catch (const std::exception& e)
+        {
+            std::cerr << "Post pipeline error: " << e.what() << std::endl;
+        }
+    }
+
+    void NumSimPostPipeline::Initialize(boost::json::object& numSimSolverJson)
+    {
+        auto postValue = numSimSolverJson.if_contains("post");
+
+        if (!postValue || !postValue->is_object())
+        {
+            return;
+        }
+
+        auto& postJson = postValue->as_object();
+
+        if (auto mode = postJson.if_contains("mode"))
+        {
+            std::string modeName(mode->as_string().c_str());
+
+            if (modeName == "sync")
+            {
+                this->mode_ = Mode::Sync;
+            }
+            else if (modeName == "async")
+            {
+                this->mode_ = Mode::Async;
+            }
+            else
+            {
+                throw std::runtime_error("Unknown post mode: " + modeName);
+            }
+        }
+
+        if (auto buffers = postJson.if_contains("buffers"))
+        {
+            this->buffersPerSimulation_ = static_cast<uint_t>(buffers->to_number<std::int64_t>());
+        }
+
+        if (auto queueSize = postJson.if_contains("queue_size"))
+        {
+            this->queueSize_ = static_cast<uint_t>(queueSize->to_number<std::int64_t>());
+        }
+
+        if (this->buffersPerSimulation_ == 0 || this->queueSize_ == 0)
+        {
+            throw std::runtime_error("Post buffers and queue_size must be positive");
+        }
+    }
+
+    void NumSimPostPipeline::PrintInfo()
+    {
+        std::cout << "Post: " << (this->mode_ == Mode::Async ? "async" : "sync");
+
+        if (this->mode_ == Mode::Async)
+        {
+            std::cout << ", buffers: " << this->buffersPerSimulation_ << ", queue size: " << this->queueSize_;
+        }
+
+        std::cout << std::endl;
+    }
+
+    void NumSimPostPipeline::Start()
+    {
+        std::lock_guard<std::mutex> lock(this->mutex_);
+
+        if (this->mode_ == Mode::Async && !this->writer_.joinable())
+        {
+            this->stopping_ = false;
+            this->writer_ = std::thread(&NumSimPostPipeline::WriterLoop, this);
+        }
+    }
+
+    void NumSimPostPipeline::Post(NumSimSimulation* simulation)
+    {
+        if (this->mode_ == Mode::Sync || !simulation->SupportsAsyncPost())
+        {
+            simulation->Post();
+            return;
+        }
+
+        this->Start();
+
+        std::unique_lock<std::mutex> lock(this->mutex_);
+        auto& channel = this->channels_[simulation];
+
+        if (channel.buffers.empty())
+        {
+            for (uint_t i = 0; i < this->buffersPerSimulation_; ++i)
+            {
+                channel.buffers.emplace_back(new NumSimPostBuffer());
+                channel.freeBuffers.push_back(channel.buffers.back().get());
+            }
+        }
+
+        // backpressure: wait for a free buffer and room in the queue
+        auto start = std::chrono::steady_clock::now();
+
+        this->condition_.wait(lock, [&]()
+        {
+            return this->error_ || (!channel.freeBuffers.empty() && this->queue_.size() < this->queueSize_);
+        });
+
+        this->stallTime_ += std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+        this->RethrowError();
+
+        auto buffer = channel.freeBuffers.back();
+        channel.freeBuffers.pop_back();
+        buffer->SetStep(channel.step++);
+        lock.unlock();
+
+        try
+        {
+            simulation->Snapshot(*buffer);
+        }
+        catch (...)
+        {
+            lock.lock();
+            channel.freeBuffers.push_back(buffer);
+            throw;
+        }
+
+        lock.lock();
+        this->queue_.push_back({ simulation, buffer });
+        this->condition_.notify_all();
+    }
+
+    void NumSimPostPipeline::Flush()
+    {
+        std::unique_lock<std::mutex> lock(this->mutex_);
+
+        this->condition_.wait(lock, [&]()
+        {
+            return !this->writer_.joinable() || (this->queue_.empty() && this->numWriting_ == 0);
+        });
+
+        this->RethrowError();
+    }
+
+    void NumSimPostPipeline::Stop()
+    {
+        {
+            std::lock_guard<std::mutex> lock(this->mutex_);
+            this->stopping_ = true;
+            this->condition_.notify_all();
+        }
+
+        if (this->writer_.joinable())
+        {
+            this->writer_.join();
+        }
+
+        std::lock_guard<std::mutex> lock(this->mutex_);
+        this->stopping_ = false;
+        this->RethrowError();
+    }
+
+    void NumSimPostPipeline::WriterLoop()
+    {
+        std::unique_lock<std::mutex> lock(this->mutex_);
+
+        while (true)
+        {
+            this->condition_.wait(lock, [&]()
+            {
+                return this->stopping_ || !this->queue_.empty();
+            });
+
+            // stop only after the queue is drained
+            if (this->queue_.empty())
+            {
+                break;
+            }
+
+            Entry entry = this->queue_.front();
+            this->queue_.pop_front();
+            ++this->numWriting_;
+            lock.unlock();
+
+            std::exception_ptr writeError;
+
+            try
+            {
+                NumSimProfileScope phaseScope(this->profiler_, "WritePost");
+                NumSimProfileScope simulationScope(this->profiler_, entry.simulation->GetObjectName());
+                entry.simulation->WritePost(*entry.buffer);
+            }
+            catch (...)
+            {
+                writeError = std::current_exception();
+            }
+
+            lock.lock();
+            --this->numWriting_;
+            this->channels_[entry.simulation].freeBuffers.push_back(entry.buffer);
+
+            if (writeError && !this->error_)
+            {
+                this->error_ = writeError;
+            }
+
+            this->condition_.notify_all();
+        }
+    }
+
+    void NumSimPostPipeline::RethrowError()
+    {
+        // called with mutex_ held; the error is reported once
+        if (this->error_)
+        {
+            std::exception_ptr error = this->error_;
+            this->error_ = nullptr;
+            std::rethrow_exception(error);
+        }
+    }
+}
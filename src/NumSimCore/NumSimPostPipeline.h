@@ -0,0 +1,207 @@
+#pragma once
+
+#include <condition_variable>
+#include <deque>
+#include <exception>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+#include "NumSimObject.h"
+
+namespace NumSimSolver
+{
+    class NumSimProfiler;
+    class NumSimSimulation;
+
+    /**
+     * @brief snapshot of a simulation's output data, filled by NumSimSimulation::Snapshot
+     *
+     * @details buffers are reused between steps: SetField() copies into the
+     * existing storage, so after the first step a snapshot does not allocate.
+     */
+    class BOOST_SYMBOL_EXPORT NumSimPostBuffer
+    {
+    public:
+        struct Field
+        {
+            std::vector<real_t> data;
+            std::size_t numTuples = 0;
+            int_t numComponents = 1;
+        };
+
+        void SetField(const std::string& name, const real_t* data, std::size_t numTuples, int_t numComponents = 1);
+
+        /**
+         * @return the field, or nullptr
+         */
+        const Field* GetField(const std::string& name) const;
+
+        inline const std::map<std::string, Field>& GetFields() const
+        {
+            return this->fields_;
+        }
+
+        /**
+         * @brief index of the Post() call this snapshot belongs to (0 for the initial post)
+         */
+        inline std::uint64_t GetStep() const
+        {
+            return this->step_;
+        }
+
+        inline void SetStep(std::uint64_t step)
+        {
+            this->step_ = step;
+        }
+
+    private:
+        std::map<std::string, Field> fields_;
+        std::uint64_t step_ = 0;
+    };
+
+    /**
+     * @brief post-processing stage between the solve loop and output I/O
+     *
+     * @details In sync mode Post() simply calls NumSimSimulation::Post(). In
+     * async mode, for simulations that support it, Post() snapshots the output
+     * data into one of the simulation's buffers on the calling thread and
+     * returns; a dedicated I/O thread calls WritePost() with the buffer and then
+     * returns it. With two buffers per simulation the solver fills one while
+     * the other is written. When all buffers of a simulation are in flight, or
+     * the queue is full, Post() blocks until the I/O thread catches up
+     * (backpressure), so memory use stays bounded. Writes of one simulation
+     * happen in order.
+     *
+     * Configuration (all keys optional):
+     * @code
+     * "post": {
+     *     "mode": "async",
+     *     "buffers": 2,
+     *     "queue_size": 8
+     * }
+     * @endcode
+     */
+    class BOOST_SYMBOL_EXPORT NumSimPostPipeline : public NumSimObject
+    {
+    public:
+        enum class Mode
+        {
+            Sync,
+            Async
+        };
+
+        NumSimPostPipeline();
+        virtual ~NumSimPostPipeline();
+
+        /**
+         * @brief read the "post" section of the solver configuration
+         * @throws std::runtime_error on an unknown mode or a zero buffer/queue size
+         */
+        void Initialize(boost::json::object& numSimSolverJson);
+
+        void PrintInfo();
+
+        /**
+         * @brief start the I/O thread (async mode only)
+         */
+        void Start();
+
+        /**
+         * @brief post-process one step of a simulation
+         * @throws rethrows an exception raised by an earlier WritePost()
+         */
+        void Post(NumSimSimulation* simulation);
+
+        /**
+         * @brief wait until all queued snapshots are written
+         */
+        void Flush();
+
+        /**
+         * @brief write the remaining snapshots and stop the I/O thread
+         */
+        void Stop();
+
+        inline Mode GetMode() const
+        {
+            return this->mode_;
+        }
+
+        inline void SetMode(Mode mode)
+        {
+            this->mode_ = mode;
+        }
+
+        inline uint_t GetBuffersPerSimulation() const
+        {
+            return this->buffersPerSimulation_;
+        }
+
+        inline void SetBuffersPerSimulation(uint_t buffersPerSimulation)
+        {
+            this->buffersPerSimulation_ = buffersPerSimulation;
+        }
+
+        inline uint_t GetQueueSize() const
+        {
+            return this->queueSize_;
+        }
+
+        inline void SetQueueSize(uint_t queueSize)
+        {
+            this->queueSize_ = queueSize;
+        }
+
+        /**
+         * @brief total time Post() callers waited for free buffers (seconds)
+         */
+        inline double GetStallTime() const
+        {
+            return this->stallTime_;
+        }
+
+        /**
+         * @brief timers for the WritePost scope of the I/O thread, may be nullptr
+         */
+        inline void SetProfiler(NumSimProfiler* profiler)
+        {
+            this->profiler_ = profiler;
+        }
+
+    private:
+        struct Entry
+        {
+            NumSimSimulation* simulation = nullptr;
+            NumSimPostBuffer* buffer = nullptr;
+        };
+
+        struct Channel
+        {
+            std::vector<std::unique_ptr<NumSimPostBuffer>> buffers;
+            std::vector<NumSimPostBuffer*> freeBuffers;
+            std::uint64_t step = 0;
+        };
+
+        void WriterLoop();
+        void RethrowError();
+
+        Mode mode_ = Mode::Sync;
+        uint_t buffersPerSimulation_ = 2;
+        uint_t queueSize_ = 8;
+        double stallTime_ = 0.0;
+        NumSimProfiler* profiler_ = nullptr;
+
+        std::mutex mutex_;
+        std::condition_variable condition_;
+        std::deque<Entry> queue_;
+        std::map<NumSimSimulation*, Channel> channels_;
+        std::thread writer_;
+        std::size_t numWriting_ = 0;
+        bool stopping_ = false;
+        std::exception_ptr error_;
+    };
+}
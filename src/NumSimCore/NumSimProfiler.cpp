@@ -0,0 +1,542 @@
+#include <algorithm>
+#include <atomic>
+#include <cstdio>
+#include <fstream>
+#include <iomanip>
+#include <iostream>
+#include <limits>
+#include <sstream>
+#include <stdexcept>
+#include <mpi.h>
+
+#include "NumSimProfiler.h"
+#include "NumSimComm.h"
+
+namespace NumSimSolver
+{
+    namespace
+    {
+        // separates the scope names of a path in the gathered text
+        constexpr char pathSeparator = '\x1f';
+
+        std::atomic<std::uint64_t> nextGeneration{ 1 };
+
+        struct PathStats
+        {
+            std::uint64_t count = 0;
+            double total = 0.0;
+            double callMin = std::numeric_limits<double>::max();
+            double callMax = 0.0;
+        };
+
+        struct ReportNode
+        {
+            std::string name;
+            std::uint64_t count = 0;
+            int ranks = 0;
+            double totalMin = std::numeric_limits<double>::max();
+            double totalMax = 0.0;
+            double totalSum = 0.0;
+            double callMin = std::numeric_limits<double>::max();
+            double callMax = 0.0;
+            std::map<std::string, ReportNode> children;
+        };
+
+        std::string SanitizeName(std::string_view name)
+        {
+            std::string sanitized(name);
+
+            for (auto& c : sanitized)
+            {
+                if (c == '\t' || c == '\n' || c == pathSeparator)
+                {
+                    c = ' ';
+                }
+            }
+
+            return sanitized;
+        }
+
+        void AppendJsonString(std::ostream& out, const std::string& text)
+        {
+            out << '"';
+
+            for (unsigned char c : text)
+            {
+                if (c == '"' || c == '\\')
+                {
+                    out << '\\' << c;
+                }
+                else if (c < 0x20)
+                {
+                    char escaped[8];
+                    std::snprintf(escaped, sizeof(escaped), "\\u%04x", c);
+                    out << escaped;
+                }
+                else
+                {
+                    out << c;
+                }
+            }
+
+            out << '"';
+        }
+
+        /**
+         * @brief text of every rank on rank 0 (the own text elsewhere)
+         */
+        std::vector<std::string> GatherText(const NumSimComm* comm, const std::string& text)
+        {
+            if (!comm || comm->GetNumProcs() == 1)
+            {
+                return { text };
+            }
+
+            int numProcs = comm->GetNumProcs();
+            int size = static_cast<int>(text.size());
+            std::vector<int> sizes(numProcs, 0);
+            MPI_Gather(&size, 1, MPI_INT, sizes.data(), 1, MPI_INT, 0, comm->GetComm());
+
+            std::vector<int> displacements(numProcs, 0);
+
+            for (int rank = 1; rank < numProcs; ++rank)
+            {
+                displacements[rank] = displacements[rank - 1] + sizes[rank - 1];
+            }
+
+            std::string gathered(comm->GetMyRank() == 0 ? displacements.back() + sizes.back() : 0, '\0');
+            MPI_Gatherv(text.data(), size, MPI_CHAR, &gathered[0], sizes.data(), displacements.data(), MPI_CHAR, 0, comm->GetComm());
+
+            if (comm->GetMyRank() != 0)
+            {
+                return { text };
+            }
+
+            std::vector<std::string> texts;
+
+            for (int rank = 0; rank < numProcs; ++rank)
+            {
+                texts.push_back(gathered.substr(displacements[rank], sizes[rank]));
+            }
+
+            return texts;
+        }
+
+        /**
+         * @brief average total time over the ranks that ran the scope (0 for a scope still open everywhere)
+         */
+        double Average(const ReportNode& node)
+        {
+            return node.ranks > 0 ? node.totalSum / node.ranks : 0.0;
+        }
+
+        std::vector<const ReportNode*> SortedChildren(const ReportNode& node)
+        {
+            std::vector<const ReportNode*> children;
+
+            for (auto& child : node.children)
+            {
+                children.push_back(&child.second);
+            }
+
+            std::stable_sort(children.begin(), children.end(), [](const ReportNode* a, const ReportNode* b)
+                {
+                    return Average(*a) > Average(*b);
+                });
+
+            return children;
+        }
+
+        void WriteReportNode(std::ostream& out, const ReportNode& node)
+        {
+            bool ran = node.ranks > 0;
+            out << "{\"name\": ";
+            AppendJsonString(out, node.name);
+            out << ", \"count\": " << node.count << ", \"ranks\": " << node.ranks
+                << ", \"total\": {\"min\": " << (ran ? node.totalMin : 0.0) << ", \"max\": " << node.totalMax << ", \"avg\": " << Average(node) << "}"
+                << ", \"call\": {\"min\": " << (ran ? node.callMin : 0.0) << ", \"max\": " << node.callMax << "}, \"children\": [";
+
+            bool first = true;
+
+            for (auto child : SortedChildren(node))
+            {
+                out << (first ? "" : ", ");
+                WriteReportNode(out, *child);
+                first = false;
+            }
+
+            out << "]}";
+        }
+
+        void PrintReportNode(const ReportNode& node, int depth, double elapsed)
+        {
+            bool ran = node.ranks > 0;
+            std::ostringstream line;
+            line << std::left << std::setw(40) << std::string(2 * depth, ' ') + node.name << std::right << std::setw(10) << node.count
+                 << std::fixed << std::setprecision(4) << std::setw(12) << Average(node)
+                 << std::setw(12) << (ran ? node.totalMin : 0.0) << std::setw(12) << node.totalMax
+                 << std::setprecision(1) << std::setw(8) << (elapsed > 0.0 ? 100.0 * Average(node) / elapsed : 0.0) << "%";
+            std::cout << line.str() << std::endl;
+
+            for (auto child : SortedChildren(node))
+            {
+                PrintReportNode(*child, depth + 1, elapsed);
+            }
+        }
+    }
+
+    NumSimProfiler::NumSimProfiler()
+        : generation_(nextGeneration++)
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimProfiler::~NumSimProfiler()
+    {
+    }
+
+    void NumSimProfiler::Initialize(boost::json::object& numSimSolverJson)
+    {
+        auto profileValue = numSimSolverJson.if_contains("profile");
+
+        if (!profileValue || !profileValue->is_object())
+        {
+            return;
+        }
+
+        auto& profileJson = profileValue->as_object();
+        this->enabled_ = true;
+
+        if (auto enabled = profileJson.if_contains("enabled"))
+        {
+            this->enabled_ = enabled->as_bool();
+        }
+
+        if (auto report = profileJson.if_contains("report"))
+        {
+            this->reportFileName_ = report->as_string().c_str();
+        }
+
+        if (auto trace = profileJson.if_contains("trace"))
+        {
+            this->traceFileName_ = trace->as_string().c_str();
+        }
+
+        if (auto maxEvents = profileJson.if_contains("max_events"))
+        {
+            this->maxEvents_ = static_cast<std::uint64_t>(maxEvents->to_number<std::int64_t>());
+        }
+    }
+
+    void NumSimProfiler::PrintInfo()
+    {
+        std::cout << "Profiler: " << (this->enabled_ ? "enabled" : "disabled");
+
+        if (this->enabled_)
+        {
+            std::cout << ", report: " << (this->reportFileName_.empty() ? "-" : this->reportFileName_)
+                      << ", trace: " << (this->traceFileName_.empty() ? "-" : this->traceFileName_)
+                      << ", max events: " << this->maxEvents_;
+        }
+
+        std::cout << std::endl;
+    }
+
+    void NumSimProfiler::Start(const NumSimComm* comm)
+    {
+        {
+            std::lock_guard<std::mutex> lock(this->mutex_);
+            this->threads_.clear();
+            this->generation_ = nextGeneration++;
+        }
+
+        // a common origin lines up the trace tracks of the ranks
+        if (comm && comm->GetNumProcs() > 1)
+        {
+            comm->Barrier();
+        }
+
+        this->origin_ = std::chrono::steady_clock::now();
+    }
+
+    void NumSimProfiler::Begin(std::string_view name)
+    {
+        double now = this->Now();
+        auto& thread = this->GetThreadData();
+        std::size_t parent = thread.open.empty() ? 0 : thread.open.back().first;
+        std::size_t node = 0;
+
+        for (auto child : thread.nodes[parent].children)
+        {
+            if (thread.nodes[child].name == name)
+            {
+                node = child;
+                break;
+            }
+        }
+
+        if (node == 0)
+        {
+            node = thread.nodes.size();
+            thread.nodes.emplace_back();
+            thread.nodes.back().name = std::string(name);
+            thread.nodes.back().parent = parent;
+            thread.nodes[parent].children.push_back(node);
+        }
+
+        thread.open.emplace_back(node, now);
+    }
+
+    void NumSimProfiler::End()
+    {
+        double now = this->Now();
+        auto& thread = this->GetThreadData();
+
+        if (thread.open.empty())
+        {
+            return;
+        }
+
+        auto scope = thread.open.back();
+        thread.open.pop_back();
+
+        double duration = now - scope.second;
+        auto& node = thread.nodes[scope.first];
+        node.min = node.count == 0 ? duration : std::min(node.min, duration);
+        node.max = std::max(node.max, duration);
+        node.total += duration;
+        ++node.count;
+
+        if (thread.events.size() < this->maxEvents_)
+        {
+            thread.events.push_back({ scope.first, scope.second, duration });
+        }
+        else
+        {
+            ++thread.droppedEvents;
+        }
+    }
+
+    void NumSimProfiler::Write(const NumSimComm* comm)
+    {
+        int myRank = comm ? comm->GetMyRank() : 0;
+        int numProcs = comm ? comm->GetNumProcs() : 1;
+        double localElapsed = this->Now();
+        double elapsed = localElapsed;
+
+        if (numProcs > 1)
+        {
+            MPI_Allreduce(&localElapsed, &elapsed, 1, MPI_DOUBLE, MPI_MAX, comm->GetComm());
+        }
+
+        auto trees = GatherText(comm, this->SerializeTree());
+        std::vector<std::string> events;
+
+        if (!this->traceFileName_.empty())
+        {
+            events = GatherText(comm, this->SerializeEvents(myRank));
+        }
+
+        if (myRank != 0)
+        {
+            return;
+        }
+
+        // merge the paths of all ranks into one tree
+        ReportNode root;
+
+        for (auto& tree : trees)
+        {
+            std::istringstream lines(tree);
+            std::string line;
+
+            while (std::getline(lines, line))
+            {
+                std::istringstream fields(line);
+                std::string path;
+                PathStats stats;
+                std::getline(fields, path, '\t');
+                fields >> stats.count >> stats.total >> stats.callMin >> stats.callMax;
+
+                ReportNode* node = &root;
+                std::istringstream names(path);
+                std::string name;
+
+                while (std::getline(names, name, pathSeparator))
+                {
+                    node = &node->children[name];
+                    node->name = name;
+                }
+
+                node->count += stats.count;
+                node->ranks += 1;
+                node->totalMin = std::min(node->totalMin, stats.total);
+                node->totalMax = std::max(node->totalMax, stats.total);
+                node->totalSum += stats.total;
+                node->callMin = std::min(node->callMin, stats.callMin);
+                node->callMax = std::max(node->callMax, stats.callMax);
+            }
+        }
+
+        std::cout << "Profile (" << numProcs << " ranks, " << elapsed << " s):" << std::endl;
+        std::cout << std::left << std::setw(40) << "scope" << std::right << std::setw(10) << "calls" << std::setw(12) << "avg (s)"
+                  << std::setw(12) << "min (s)" << std::setw(12) << "max (s)" << std::setw(9) << "avg %" << std::endl;
+
+        for (auto child : SortedChildren(root))
+        {
+            PrintReportNode(*child, 0, elapsed);
+        }
+
+        if (!this->reportFileName_.empty())
+        {
+            std::ofstream report(this->reportFileName_);
+
+            if (!report.is_open())
+            {
+                throw std::runtime_error("Failed to write profile report: " + this->reportFileName_);
+            }
+
+            report << std::setprecision(9) << "{\"ranks\": " << numProcs << ", \"elapsed\": " << elapsed << ", \"scopes\": [";
+            bool first = true;
+
+            for (auto child : SortedChildren(root))
+            {
+                report << (first ? "" : ", ");
+                WriteReportNode(report, *child);
+                first = false;
+            }
+
+            report << "]}" << std::endl;
+        }
+
+        if (!this->traceFileName_.empty())
+        {
+            std::ofstream trace(this->traceFileName_);
+
+            if (!trace.is_open())
+            {
+                throw std::runtime_error("Failed to write profile trace: " + this->traceFileName_);
+            }
+
+            trace << "{\"displayTimeUnit\": \"ms\", \"otherData\": {\"report\": ";
+            AppendJsonString(trace, this->reportFileName_);
+            trace << "}, \"traceEvents\": [";
+            bool first = true;
+
+            for (auto& rankEvents : events)
+            {
+                if (!rankEvents.empty())
+                {
+                    trace << (first ? "\n" : ",\n") << rankEvents;
+                    first = false;
+                }
+            }
+
+            trace << "\n]}" << std::endl;
+        }
+    }
+
+    NumSimProfiler::ThreadData& NumSimProfiler::GetThreadData()
+    {
+        // one lookup per thread and Start(), later calls hit the cache
+        thread_local std::uint64_t cachedGeneration = 0;
+        thread_local ThreadData* cachedData = nullptr;
+
+        if (cachedGeneration == this->generation_)
+        {
+            return *cachedData;
+        }
+
+        std::lock_guard<std::mutex> lock(this->mutex_);
+        auto& thread = this->threads_[std::this_thread::get_id()];
+
+        if (!thread)
+        {
+            thread.reset(new ThreadData());
+            thread->index = static_cast<int>(this->threads_.size()) - 1;
+            thread->nodes.emplace_back();
+        }
+
+        cachedGeneration = this->generation_;
+        cachedData = thread.get();
+
+        return *thread;
+    }
+
+    double NumSimProfiler::Now() const
+    {
+        return std::chrono::duration<double>(std::chrono::steady_clock::now() - this->origin_).count();
+    }
+
+    std::string NumSimProfiler::SerializeTree() const
+    {
+        std::map<std::string, PathStats> paths;
+
+        for (auto& thread : this->threads_)
+        {
+            auto& nodes = thread.second->nodes;
+            std::vector<std::string> nodePaths(nodes.size());
+
+            // children are always created after their parent
+            for (std::size_t i = 1; i < nodes.size(); ++i)
+            {
+                auto& node = nodes[i];
+                nodePaths[i] = node.parent == 0 ? SanitizeName(node.name) : nodePaths[node.parent] + pathSeparator + SanitizeName(node.name);
+
+                if (node.count == 0)
+                {
+                    continue;
+                }
+
+                auto& stats = paths[nodePaths[i]];
+                stats.count += node.count;
+                stats.total += node.total;
+                stats.callMin = std::min(stats.callMin, node.min);
+                stats.callMax = std::max(stats.callMax, node.max);
+            }
+        }
+
+        std::ostringstream out;
+        out << std::setprecision(17);
+
+        for (auto& path : paths)
+        {
+            out << path.first << '\t' << path.second.count << ' ' << path.second.total << ' '
+                << path.second.callMin << ' ' << path.second.callMax << '\n';
+        }
+
+        return out.str();
+    }
+
+    std::string NumSimProfiler::SerializeEvents(int rank) const
+    {
+        std::ostringstream out;
+        out << std::fixed << std::setprecision(3);
+        out << "{\"name\": \"process_name\", \"ph\": \"M\", \"pid\": " << rank << ", \"args\": {\"name\": \"Rank " << rank << "\"}}";
+
+        for (auto& thread : this->threads_)
+        {
+            auto& data = *thread.second;
+            out << ",\n{\"name\": \"thread_name\", \"ph\": \"M\", \"pid\": " << rank << ", \"tid\": " << data.index
+                << ", \"args\": {\"name\": \"Thread " << data.index << "\"";
+
+            if (data.droppedEvents > 0)
+            {
+                out << ", \"dropped_events\": " << data.droppedEvents;
+            }
+
+            out << "}}";
+
+            // microseconds, as expected by the Chrome trace format
+            for (auto& event : data.events)
+            {
+                out << ",\n{\"name\": ";
+                AppendJsonString(out, data.nodes[event.node].name);
+                out << ", \"ph\": \"X\", \"pid\": " << rank << ", \"tid\": " << data.index
+                    << ", \"ts\": " << event.start * 1.0e6 << ", \"dur\": " << event.duration * 1.0e6 << "}";
+            }
+        }
+
+        return out.str();
+    }
+}
@@ -0,0 +1,213 @@
+#pragma once
+
+#include <chrono>
+#include <cstdint>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <string_view>
+#include <thread>
+
+#include "NumSimObject.h"
+
+namespace NumSimSolver
+{
+    class NumSimComm;
+
+    /**
+     * @brief hierarchical wall-clock timers of a run
+     *
+     * @details Begin() and End() (or a NumSimProfileScope) time a named
+     * scope; scopes opened while another one is open on the same thread
+     * become its children, so every thread builds a tree of call paths with
+     * count, total, min and max time. NumSimFramework::Run times ReadMesh,
+     * InitFields, InitBoundaries, InitFromRestart, Solve and Post with one
+     * child per simulation, and simulations add nested scopes for their
+     * kernels through NumSimSimulation::GetProfiler():
+     * @code
+     * void MySimulation::Solve()
+     * {
+     *     NUMSIM_PROFILE_SCOPE(this->GetProfiler(), "Flux");
+     *     ...
+     * }
+     * @endcode
+     * Scopes opened on other threads (the parallel scheduler's workers, the
+     * post pipeline's I/O thread, NumSimThreadPool workers) are roots of
+     * their own thread's tree; trees of the same paths are merged in the
+     * report, so times of concurrent scopes add up.
+     *
+     * Write() is collective: rank 0 gathers every rank's tree and writes
+     * the report (per path: call count and the min, max and average total
+     * time over the ranks that ran it) and a Chrome trace ("X" events, one
+     * process per rank and one track per thread) that NumSimGui,
+     * chrome://tracing or Perfetto display as a flame chart. At most
+     * max_events events are kept per rank for the trace; the report always
+     * covers every call. A disabled profiler costs one branch per scope.
+     *
+     * Configuration:
+     * @code
+     * "profile": {
+     *     "enabled": true,
+     *     "report": "profile.json",
+     *     "trace": "profile_trace.json",
+     *     "max_events": 100000
+     * }
+     * @endcode
+     * The profiler is enabled when the section is present, unless "enabled"
+     * is false; an empty file name skips that output.
+     */
+    class BOOST_SYMBOL_EXPORT NumSimProfiler : public NumSimObject
+    {
+    public:
+        NumSimProfiler();
+        virtual ~NumSimProfiler();
+
+        /**
+         * @brief read the "profile" section of the solver configuration
+         */
+        void Initialize(boost::json::object& numSimSolverJson);
+
+        void PrintInfo();
+
+        /**
+         * @brief discard all timings and restart the clock (collective when comm has several ranks)
+         */
+        void Start(const NumSimComm* comm);
+
+        /**
+         * @brief open a scope on the calling thread
+         */
+        void Begin(std::string_view name);
+
+        /**
+         * @brief close the innermost open scope of the calling thread
+         */
+        void End();
+
+        /**
+         * @brief gather the timings of all ranks, print the timing tree and write the report and trace on rank 0
+         * @details collective; every thread must have closed its scopes.
+         * @throws std::runtime_error if an output file cannot be written
+         */
+        void Write(const NumSimComm* comm);
+
+        inline bool IsEnabled() const
+        {
+            return this->enabled_;
+        }
+
+        inline void SetEnabled(bool enabled)
+        {
+            this->enabled_ = enabled;
+        }
+
+        inline const std::string& GetReportFileName() const
+        {
+            return this->reportFileName_;
+        }
+
+        inline void SetReportFileName(const std::string& reportFileName)
+        {
+            this->reportFileName_ = reportFileName;
+        }
+
+        inline const std::string& GetTraceFileName() const
+        {
+            return this->traceFileName_;
+        }
+
+        inline void SetTraceFileName(const std::string& traceFileName)
+        {
+            this->traceFileName_ = traceFileName;
+        }
+
+        inline std::uint64_t GetMaxEvents() const
+        {
+            return this->maxEvents_;
+        }
+
+        inline void SetMaxEvents(std::uint64_t maxEvents)
+        {
+            this->maxEvents_ = maxEvents;
+        }
+
+    private:
+        struct Node
+        {
+            std::string name;
+            std::size_t parent = 0;
+            std::vector<std::size_t> children;
+            std::uint64_t count = 0;
+            double total = 0.0;
+            double min = 0.0;
+            double max = 0.0;
+        };
+
+        struct Event
+        {
+            std::size_t node = 0;
+            double start = 0.0;
+            double duration = 0.0;
+        };
+
+        struct ThreadData
+        {
+            int index = 0;
+            std::vector<Node> nodes;
+            std::vector<std::pair<std::size_t, double>> open;
+            std::vector<Event> events;
+            std::uint64_t droppedEvents = 0;
+        };
+
+        ThreadData& GetThreadData();
+        double Now() const;
+        std::string SerializeTree() const;
+        std::string SerializeEvents(int rank) const;
+
+        bool enabled_ = false;
+        std::string reportFileName_ = "profile.json";
+        std::string traceFileName_ = "profile_trace.json";
+        std::uint64_t maxEvents_ = 100000;
+
+        std::uint64_t generation_ = 0;
+        std::chrono::steady_clock::time_point origin_ = std::chrono::steady_clock::now();
+        std::mutex mutex_;
+        std::map<std::thread::id, std::unique_ptr<ThreadData>> threads_;
+    };
+
+    /**
+     * @brief times the enclosing block; does nothing if profiler is nullptr or disabled
+     */
+    class NumSimProfileScope
+    {
+    public:
+        inline NumSimProfileScope(NumSimProfiler* profiler, std::string_view name)
+            : profiler_(profiler && profiler->IsEnabled() ? profiler : nullptr)
+        {
+            if (this->profiler_)
+            {
+                this->profiler_->Begin(name);
+            }
+        }
+
+        inline ~NumSimProfileScope()
+        {
+            if (this->profiler_)
+            {
+                this->profiler_->End();
+            }
+        }
+
+        NumSimProfileScope(const NumSimProfileScope&) = delete;
+        NumSimProfileScope& operator=(const NumSimProfileScope&) = delete;
+
+    private:
+        NumSimProfiler* profiler_;
+    };
+
+#define NUMSIM_PROFILE_CONCAT_IMPL(a, b) a##b
+#define NUMSIM_PROFILE_CONCAT(a, b) NUMSIM_PROFILE_CONCAT_IMPL(a, b)
+#define NUMSIM_PROFILE_SCOPE(profiler, name) \
+    NumSimSolver::NumSimProfileScope NUMSIM_PROFILE_CONCAT(numSimProfileScope, __LINE__)(profiler, name)
+}
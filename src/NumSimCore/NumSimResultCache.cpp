@@ -0,0 +1,593 @@
+#include <algorithm>
+#include <cstdio>
+#include <ctime>
+#include <fstream>
+#include <iostream>
+#include <stdexcept>
+
+#include <boost/filesystem.hpp>
+
+#include "NumSimResultCache.h"
+
+namespace NumSimSolver
+{
+    namespace
+    {
+        namespace fs = boost::filesystem;
+
+        const char* const KEY_VERSION = "NumSimResultCache 1";
+        const char* const ENTRY_FILE_NAME = "entry.json";
+        const char* const FILES_DIRECTORY_NAME = "files";
+
+        // top-level keys that do not affect the results
+        const char* const IGNORED_KEYS[] = { "cache", "created", "modified" };
+
+        /**
+         * @brief incremental SHA-256 (FIPS 180-4)
+         */
+        class Sha256Context
+        {
+        public:
+            void Update(const unsigned char* data, std::size_t size)
+            {
+                for (std::size_t i = 0; i < size; ++i)
+                {
+                    this->block_[this->blockSize_++] = data[i];
+
+                    if (this->blockSize_ == 64)
+                    {
+                        this->Transform();
+                        this->blockSize_ = 0;
+                    }
+                }
+
+                this->length_ += size;
+            }
+
+            std::string HexDigest()
+            {
+                std::uint64_t bitLength = this->length_ * 8;
+                unsigned char padding = 0x80;
+                this->Update(&padding, 1);
+                padding = 0;
+
+                while (this->blockSize_ != 56)
+                {
+                    this->Update(&padding, 1);
+                }
+
+                unsigned char lengthBytes[8];
+
+                for (int i = 0; i < 8; ++i)
+                {
+                    lengthBytes[i] = static_cast<unsigned char>(bitLength >> (56 - 8 * i));
+                }
+
+                this->Update(lengthBytes, 8);
+
+                char hex[65];
+
+                for (int i = 0; i < 8; ++i)
+                {
+                    std::snprintf(hex + 8 * i, 9, "%08x", this->state_[i]);
+                }
+
+                return std::string(hex, 64);
+            }
+
+        private:
+            static std::uint32_t Rotate(std::uint32_t x, int n)
+            {
+                return (x >> n) | (x << (32 - n));
+            }
+
+            void Transform()
+            {
+                static const std::uint32_t k[64] =
+                {
+                    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+                    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+                    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+                    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+                    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+                    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+                    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+                    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+                };
+
+                std::uint32_t w[64];
+
+                for (int i = 0; i < 16; ++i)
+                {
+                    w[i] = (std::uint32_t(this->block_[4 * i]) << 24) | (std::uint32_t(this->block_[4 * i + 1]) << 16)
+                        | (std::uint32_t(this->block_[4 * i + 2]) << 8) | std::uint32_t(this->block_[4 * i + 3]);
+                }
+
+                for (int i = 16; i < 64; ++i)
+                {
+                    std::uint32_t s0 = Rotate(w[i - 15], 7) ^ Rotate(w[i - 15], 18) ^ (w[i - 15] >> 3);
+                    std::uint32_t s1 = Rotate(w[i - 2], 17) ^ Rotate(w[i - 2], 19) ^ (w[i - 2] >> 10);
+                    w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+                }
+
+                std::uint32_t a = this->state_[0], b = this->state_[1], c = this->state_[2], d = this->state_[3];
+                std::uint32_t e = this->state_[4], f = this->state_[5], g = this->state_[6], h = this->state_[7];
+
+                for (int i = 0; i < 64; ++i)
+                {
+                    std::uint32_t t1 = h + (Rotate(e, 6) ^ Rotate(e, 11) ^ Rotate(e, 25)) + ((e & f) ^ (~e & g)) + k[i] + w[i];
+                    std::uint32_t t2 = (Rotate(a, 2) ^ Rotate(a, 13) ^ Rotate(a, 22)) + ((a & b) ^ (a & c) ^ (b & c));
+                    h = g;
+                    g = f;
+                    f = e;
+                    e = d + t1;
+                    d = c;
+                    c = b;
+                    b = a;
+                    a = t1 + t2;
+                }
+
+                this->state_[0] += a;
+                this->state_[1] += b;
+                this->state_[2] += c;
+                this->state_[3] += d;
+                this->state_[4] += e;
+                this->state_[5] += f;
+                this->state_[6] += g;
+                this->state_[7] += h;
+            }
+
+            std::uint32_t state_[8] =
+            {
+                0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+            };
+            unsigned char block_[64] = {};
+            std::size_t blockSize_ = 0;
+            std::uint64_t length_ = 0;
+        };
+
+        void AppendString(std::string& out, boost::json::string_view text)
+        {
+            out += '"';
+
+            for (char ch : text)
+            {
+                auto c = static_cast<unsigned char>(ch);
+
+                if (c == '"' || c == '\\')
+                {
+                    out += '\\';
+                    out += ch;
+                }
+                else if (c < 0x20)
+                {
+                    char escaped[7];
+                    std::snprintf(escaped, sizeof(escaped), "\\u%04x", c);
+                    out += escaped;
+                }
+                else
+                {
+                    out += ch;
+                }
+            }
+
+            out += '"';
+        }
+
+        void AppendCanonical(std::string& out, const boost::json::value& value)
+        {
+            switch (value.kind())
+            {
+            case boost::json::kind::null:
+                out += "null";
+                break;
+            case boost::json::kind::bool_:
+                out += value.as_bool() ? "true" : "false";
+                break;
+            case boost::json::kind::int64:
+                out += std::to_string(value.as_int64());
+                break;
+            case boost::json::kind::uint64:
+                out += std::to_string(value.as_uint64());
+                break;
+            case boost::json::kind::double_:
+            {
+                char number[32];
+                std::snprintf(number, sizeof(number), "%.17g", value.as_double());
+                out += number;
+                break;
+            }
+            case boost::json::kind::string:
+                AppendString(out, value.as_string());
+                break;
+            case boost::json::kind::array:
+            {
+                out += '[';
+                bool first = true;
+
+                for (auto& element : value.as_array())
+                {
+                    if (!first)
+                    {
+                        out += ',';
+                    }
+
+                    first = false;
+                    AppendCanonical(out, element);
+                }
+
+                out += ']';
+                break;
+            }
+            case boost::json::kind::object:
+            {
+                std::vector<const boost::json::key_value_pair*> members;
+
+                for (auto& member : value.as_object())
+                {
+                    members.push_back(&member);
+                }
+
+                // UTF-8 byte order is code point order
+                std::sort(members.begin(), members.end(), [](const boost::json::key_value_pair* a, const boost::json::key_value_pair* b)
+                {
+                    return a->key() < b->key();
+                });
+
+                out += '{';
+                bool first = true;
+
+                for (auto member : members)
+                {
+                    if (!first)
+                    {
+                        out += ',';
+                    }
+
+                    first = false;
+                    AppendString(out, member->key());
+                    out += ':';
+                    AppendCanonical(out, member->value());
+                }
+
+                out += '}';
+                break;
+            }
+            }
+        }
+
+        std::vector<std::string> ReadStringArray(const boost::json::object& json, const char* name)
+        {
+            std::vector<std::string> strings;
+
+            if (auto array = json.if_contains(name))
+            {
+                for (auto& element : array->as_array())
+                {
+                    strings.emplace_back(element.as_string().c_str());
+                }
+            }
+
+            return strings;
+        }
+
+        void CopyPath(const fs::path& from, const fs::path& to)
+        {
+            if (fs::is_directory(from))
+            {
+                fs::create_directories(to);
+
+                for (auto& entry : fs::directory_iterator(from))
+                {
+                    CopyPath(entry.path(), to / entry.path().filename());
+                }
+            }
+            else
+            {
+                if (to.has_parent_path())
+                {
+                    fs::create_directories(to.parent_path());
+                }
+
+                fs::copy_file(from, to, fs::copy_options::overwrite_existing);
+            }
+        }
+
+        std::uint64_t DirectorySize(const fs::path& directory)
+        {
+            std::uint64_t size = 0;
+
+            for (auto& entry : fs::recursive_directory_iterator(directory))
+            {
+                if (fs::is_regular_file(entry.path()))
+                {
+                    size += fs::file_size(entry.path());
+                }
+            }
+
+            return size;
+        }
+    }
+
+    NumSimResultCache::NumSimResultCache()
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimResultCache::~NumSimResultCache()
+    {
+    }
+
+    void NumSimResultCache::Initialize(boost::json::object& numSimSolverJson)
+    {
+        auto cacheValue = numSimSolverJson.if_contains("cache");
+
+        if (!cacheValue || !cacheValue->is_object())
+        {
+            return;
+        }
+
+        auto& cacheJson = cacheValue->as_object();
+
+        this->enabled_ = true;
+
+        if (auto enabled = cacheJson.if_contains("enabled"))
+        {
+            this->enabled_ = enabled->as_bool();
+        }
+
+        if (auto directory = cacheJson.if_contains("directory"))
+        {
+            this->directory_ = directory->as_string().c_str();
+        }
+
+        if (auto maxSize = cacheJson.if_contains("max_size_mb"))
+        {
+            this->maxSize_ = static_cast<std::uint64_t>(maxSize->to_number<double>() * 1024 * 1024);
+        }
+
+        this->inputs_ = ReadStringArray(cacheJson, "inputs");
+        this->outputs_ = ReadStringArray(cacheJson, "outputs");
+
+        for (auto& output : this->outputs_)
+        {
+            if (output.empty() || fs::path(output).is_absolute())
+            {
+                throw std::runtime_error("Cache output paths must be relative: " + output);
+            }
+        }
+    }
+
+    void NumSimResultCache::PrintInfo()
+    {
+        std::cout << "Result cache: ";
+
+        if (this->enabled_)
+        {
+            std::cout << this->directory_ << ", max size: " << this->maxSize_ / (1024 * 1024) << " MB"
+                << ", inputs: " << this->inputs_.size() << ", outputs: " << this->outputs_.size();
+        }
+        else
+        {
+            std::cout << "disabled";
+        }
+
+        std::cout << std::endl;
+    }
+
+    std::string NumSimResultCache::ComputeKey(const boost::json::object& numSimSolverJson) const
+    {
+        boost::json::object config = numSimSolverJson;
+
+        for (auto key : IGNORED_KEYS)
+        {
+            config.erase(key);
+        }
+
+        std::string text = KEY_VERSION;
+        text += '\n';
+        text += CanonicalJson(config);
+
+        for (auto& input : this->inputs_)
+        {
+            text += '\n';
+            text += input;
+            text += ' ';
+            text += FileDigest(input);
+        }
+
+        return Sha256(text);
+    }
+
+    bool NumSimResultCache::Restore(const std::string& key)
+    {
+        fs::path entry(this->EntryPath(key));
+
+        if (!fs::exists(entry / ENTRY_FILE_NAME))
+        {
+            return false;
+        }
+
+        fs::path files = entry / FILES_DIRECTORY_NAME;
+
+        if (fs::exists(files))
+        {
+            for (auto& item : fs::directory_iterator(files))
+            {
+                CopyPath(item.path(), item.path().filename());
+            }
+        }
+
+        // most recently used
+        fs::last_write_time(entry / ENTRY_FILE_NAME, std::time(nullptr));
+
+        return true;
+    }
+
+    bool NumSimResultCache::Store(const std::string& key)
+    {
+        for (auto& output : this->outputs_)
+        {
+            if (!fs::exists(output))
+            {
+                std::cerr << "Result cache: output " << output << " not found, result not cached" << std::endl;
+                return false;
+            }
+        }
+
+        fs::path entry(this->EntryPath(key));
+
+        if (fs::exists(entry / ENTRY_FILE_NAME))
+        {
+            return true;
+        }
+
+        // fill a temporary directory, then rename it into place so that a
+        // concurrent Restore() never sees a partial entry
+        fs::path temporary = fs::path(this->directory_) / fs::unique_path("tmp-%%%%%%%%%%%%");
+        fs::create_directories(temporary / FILES_DIRECTORY_NAME);
+
+        try
+        {
+            for (auto& output : this->outputs_)
+            {
+                CopyPath(output, temporary / FILES_DIRECTORY_NAME / output);
+            }
+
+            boost::json::array outputs;
+
+            for (auto& output : this->outputs_)
+            {
+                outputs.push_back(boost::json::value(output));
+            }
+
+            boost::json::object entryJson;
+            entryJson["key"] = key;
+            entryJson["outputs"] = outputs;
+
+            std::ofstream entryFile((temporary / ENTRY_FILE_NAME).string());
+            entryFile << boost::json::serialize(entryJson);
+            entryFile.close();
+
+            fs::create_directories(entry.parent_path());
+            boost::system::error_code ec;
+            fs::rename(temporary, entry, ec);
+
+            if (ec)
+            {
+                // another process stored the same key first
+                fs::remove_all(temporary);
+            }
+        }
+        catch (...)
+        {
+            boost::system::error_code ec;
+            fs::remove_all(temporary, ec);
+            throw;
+        }
+
+        this->Evict();
+
+        return true;
+    }
+
+    void NumSimResultCache::Evict()
+    {
+        struct Entry
+        {
+            fs::path path;
+            std::time_t lastUsed;
+            std::uint64_t size;
+        };
+
+        fs::path directory(this->directory_);
+
+        if (!fs::exists(directory))
+        {
+            return;
+        }
+
+        std::vector<Entry> entries;
+        std::uint64_t totalSize = 0;
+
+        for (auto& prefix : fs::directory_iterator(directory))
+        {
+            if (!fs::is_directory(prefix.path()) || prefix.path().filename().string().size() != 2)
+            {
+                continue;
+            }
+
+            for (auto& item : fs::directory_iterator(prefix.path()))
+            {
+                fs::path entryFile = item.path() / ENTRY_FILE_NAME;
+
+                if (fs::exists(entryFile))
+                {
+                    entries.push_back({ item.path(), fs::last_write_time(entryFile), DirectorySize(item.path()) });
+                    totalSize += entries.back().size;
+                }
+            }
+        }
+
+        std::sort(entries.begin(), entries.end(), [](const Entry& a, const Entry& b)
+        {
+            return a.lastUsed < b.lastUsed;
+        });
+
+        for (auto& entry : entries)
+        {
+            if (totalSize <= this->maxSize_)
+            {
+                break;
+            }
+
+            boost::system::error_code ec;
+            fs::remove_all(entry.path, ec);
+
+            if (!ec)
+            {
+                totalSize -= entry.size;
+            }
+        }
+    }
+
+    std::string NumSimResultCache::CanonicalJson(const boost::json::value& value)
+    {
+        std::string out;
+        AppendCanonical(out, value);
+        return out;
+    }
+
+    std::string NumSimResultCache::Sha256(const std::string& data)
+    {
+        Sha256Context sha256;
+        sha256.Update(reinterpret_cast<const unsigned char*>(data.data()), data.size());
+        return sha256.HexDigest();
+    }
+
+    std::string NumSimResultCache::FileDigest(const std::string& path)
+    {
+        std::ifstream file(path, std::ios::binary);
+
+        if (!file.is_open())
+        {
+            throw std::runtime_error("Failed to open cache input file: " + path);
+        }
+
+        Sha256Context sha256;
+        std::vector<char> buffer(1 << 20);
+
+        while (file)
+        {
+            file.read(buffer.data(), buffer.size());
+            sha256.Update(reinterpret_cast<const unsigned char*>(buffer.data()), static_cast<std::size_t>(file.gcount()));
+        }
+
+        return sha256.HexDigest();
+    }
+
+    std::string NumSimResultCache::EntryPath(const std::string& key) const
+    {
+        return (fs::path(this->directory_) / key.substr(0, 2) / key).string();
+    }
+}
@@ -0,0 +1,158 @@
+#pragma once
+
+#include <cstdint>
+#include <string>
+#include <vector>
+
+#include "NumSimObject.h"
+
+namespace NumSimSolver
+{
+    /**
+     * @brief content-addressed cache of solver outputs
+     *
+     * @details The key is the SHA-256 of the canonical form of the
+     * configuration (object keys sorted, no whitespace, doubles printed with
+     * 17 significant digits, the "cache" section and the "created"/"modified"
+     * timestamps left out) followed by the SHA-256 of every input file (mesh
+     * files). Two configurations that differ only in key order or formatting
+     * share a key; any change of a value or of an input file's contents gives
+     * a new key.
+     *
+     * After a run Store() copies the output files into
+     * <directory>/<key[0:2]>/<key>/files; Restore() copies them back in place
+     * of a run. Entries are evicted least recently used first (the
+     * modification time of entry.json, refreshed on every hit) once the
+     * cache is larger than max_size_mb. Relative input and output paths are
+     * resolved against the working directory. NumSimGui.result_cache
+     * computes the same keys and reads and writes the same layout;
+     * NumSimGui/tests/test_result_cache.py holds a fixed configuration with
+     * its canonical text and key that both implementations must reproduce
+     * (the C++ side through NumSimPython's Config.canonical_dumps()).
+     *
+     * Configuration:
+     * @code
+     * "cache": {
+     *     "enabled": true,
+     *     "directory": ".numsim_cache",
+     *     "max_size_mb": 1024,
+     *     "inputs": ["mesh/plate.msh"],
+     *     "outputs": ["results.json", "post"]
+     * }
+     * @endcode
+     * The cache is enabled when the section is present, unless "enabled" is
+     * false.
+     */
+    class BOOST_SYMBOL_EXPORT NumSimResultCache : public NumSimObject
+    {
+    public:
+        NumSimResultCache();
+        virtual ~NumSimResultCache();
+
+        /**
+         * @brief read the "cache" section of the solver configuration
+         * @throws std::runtime_error on an absolute or empty output path
+         */
+        void Initialize(boost::json::object& numSimSolverJson);
+
+        void PrintInfo();
+
+        /**
+         * @brief cache key of a configuration and the current input files
+         * @throws std::runtime_error if an input file cannot be read
+         */
+        std::string ComputeKey(const boost::json::object& numSimSolverJson) const;
+
+        /**
+         * @brief copy the cached outputs of key into the working directory
+         * @return false on a cache miss
+         */
+        bool Restore(const std::string& key);
+
+        /**
+         * @brief copy the outputs into the cache and evict old entries
+         * @return false if an output is missing (nothing is stored)
+         */
+        bool Store(const std::string& key);
+
+        /**
+         * @brief remove least recently used entries until the cache fits max_size_mb
+         */
+        void Evict();
+
+        /**
+         * @brief compact JSON with sorted object keys, the text hashed by ComputeKey
+         */
+        static std::string CanonicalJson(const boost::json::value& value);
+
+        /**
+         * @return lowercase hex SHA-256 of data
+         */
+        static std::string Sha256(const std::string& data);
+
+        /**
+         * @return lowercase hex SHA-256 of a file's contents
+         * @throws std::runtime_error if the file cannot be read
+         */
+        static std::string FileDigest(const std::string& path);
+
+        inline bool IsEnabled() const
+        {
+            return this->enabled_;
+        }
+
+        inline void SetEnabled(bool enabled)
+        {
+            this->enabled_ = enabled;
+        }
+
+        inline const std::string& GetDirectory() const
+        {
+            return this->directory_;
+        }
+
+        inline void SetDirectory(const std::string& directory)
+        {
+            this->directory_ = directory;
+        }
+
+        inline std::uint64_t GetMaxSize() const
+        {
+            return this->maxSize_;
+        }
+
+        inline void SetMaxSize(std::uint64_t maxSize)
+        {
+            this->maxSize_ = maxSize;
+        }
+
+        inline const std::vector<std::string>& GetInputs() const
+        {
+            return this->inputs_;
+        }
+
+        inline void SetInputs(const std::vector<std::string>& inputs)
+        {
+            this->inputs_ = inputs;
+        }
+
+        inline const std::vector<std::string>& GetOutputs() const
+        {
+            return this->outputs_;
+        }
+
+        inline void SetOutputs(const std::vector<std::string>& outputs)
+        {
+            this->outputs_ = outputs;
+        }
+
+    private:
+        std::string EntryPath(const std::string& key) const;
+
+        bool enabled_ = false;
+        std::string directory_ = ".numsim_cache";
+        std::uint64_t maxSize_ = 1024ull * 1024 * 1024;
+        std::vector<std::string> inputs_;
+        std::vector<std::string> outputs_;
+    };
+}
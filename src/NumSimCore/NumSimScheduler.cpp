@@ -0,0 +1,590 @@
+#include <algorithm>
+#include <chrono>
+#include <condition_variable>
+#include <exception>
+#include <iostream>
+#include <limits>
+#include <mutex>
+#include <stdexcept>
+#include <thread>
+
+#include "NumSimCheckpointManager.h"
+#include "NumSimPostPipeline.h"
+#include "NumSimProfiler.h"
+#include "NumSimScheduler.h"
+#include "NumSimSimulation.h"
+#include "NumSimTelemetry.h"
+
+namespace NumSimSolver
+{
+    namespace
+    {
+        void Post(NumSimSimulation* simulation, NumSimPostPipeline* postPipeline)
+        {
+            if (postPipeline)
+            {
+                postPipeline->Post(simulation);
+            }
+            else
+            {
+                simulation->Post();
+            }
+        }
+
+        /**
+         * @brief one step of a simulation, timed as Solve/<name> and Post/<name>
+         */
+        void Step(NumSimSimulation* simulation, NumSimPostPipeline* postPipeline, NumSimProfiler* profiler, NumSimTelemetry* telemetry)
+        {
+            {
+                auto start = std::chrono::steady_clock::now();
+                NumSimProfileScope phaseScope(profiler, "Solve");
+                NumSimProfileScope simulationScope(profiler, simulation->GetObjectName());
+                simulation->Solve();
+
+                if (telemetry && telemetry->IsActive())
+                {
+                    telemetry->RecordStep(simulation->GetObjectName(), std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count());
+                }
+            }
+
+            NumSimProfileScope phaseScope(profiler, "Post");
+            NumSimProfileScope simulationScope(profiler, simulation->GetObjectName());
+            Post(simulation, postPipeline);
+        }
+
+        void WriteCheckpoint(const std::vector<NumSimSimulation*>& simulations, const std::vector<std::uint64_t>& clocks,
+            std::uint64_t tick, NumSimPostPipeline* postPipeline, NumSimCheckpointManager* checkpointManager, NumSimProfiler* profiler)
+        {
+            NumSimProfileScope scope(profiler, "Checkpoint");
+
+            // outputs up to the checkpoint are on disk before it is committed
+            if (postPipeline)
+            {
+                postPipeline->Flush();
+            }
+
+            checkpointManager->Write(simulations, clocks, tick);
+        }
+    }
+
+    NumSimScheduler::NumSimScheduler()
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimScheduler::~NumSimScheduler()
+    {
+    }
+
+    void NumSimScheduler::Initialize(boost::json::object& numSimSolverJson)
+    {
+        auto schedulerValue = numSimSolverJson.if_contains("scheduler");
+
+        if (!schedulerValue || !schedulerValue->is_object())
+        {
+            return;
+        }
+
+        auto& schedulerJson = schedulerValue->as_object();
+
+        if (auto mode = schedulerJson.if_contains("mode"))
+        {
+            std::string modeName(mode->as_string().c_str());
+
+            if (modeName == "serial")
+            {
+                this->mode_ = Mode::Serial;
+            }
+            else if (modeName == "parallel")
+            {
+                this->mode_ = Mode::Parallel;
+            }
+            else
+            {
+                throw std::runtime_error("Unknown scheduler mode: " + modeName);
+            }
+        }
+
+        if (auto numThreads = schedulerJson.if_contains("num_threads"))
+        {
+            this->numThreads_ = static_cast<uint_t>(numThreads->to_number<std::int64_t>());
+        }
+
+        if (auto simulations = schedulerJson.if_contains("simulations"))
+        {
+            for (auto& item : simulations->as_object())
+            {
+                auto& simulationJson = item.value().as_object();
+                SimulationSchedule schedule;
+
+                if (auto dependsOn = simulationJson.if_contains("depends_on"))
+                {
+                    schedule.overrideDependencies = true;
+
+                    for (auto& dependency : dependsOn->as_array())
+                    {
+                        schedule.dependencies.emplace_back(dependency.as_string().c_str());
+                    }
+                }
+
+                if (auto stepInterval = simulationJson.if_contains("step_interval"))
+                {
+                    schedule.stepInterval = static_cast<uint_t>(stepInterval->to_number<std::int64_t>());
+                }
+
+                this->schedules_[std::string(item.key())] = schedule;
+            }
+        }
+    }
+
+    void NumSimScheduler::PrintInfo()
+    {
+        std::cout << "Scheduler: " << (this->mode_ == Mode::Parallel ? "parallel" : "serial");
+
+        if (this->mode_ == Mode::Parallel)
+        {
+            std::cout << ", threads: " << this->ResolveNumThreads(0);
+        }
+
+        std::cout << std::endl;
+    }
+
+    void NumSimScheduler::Run(const std::vector<NumSimSimulation*>& simulations, NumSimPostPipeline* postPipeline,
+        NumSimCheckpointManager* checkpointManager)
+    {
+        if (this->mode_ == Mode::Parallel)
+        {
+            this->RunParallel(simulations, postPipeline, checkpointManager);
+        }
+        else
+        {
+            this->RunSerial(simulations, postPipeline, checkpointManager);
+        }
+    }
+
+    void NumSimScheduler::RunSerial(const std::vector<NumSimSimulation*>& simulations, NumSimPostPipeline* postPipeline,
+        NumSimCheckpointManager* checkpointManager)
+    {
+        // in serial mode the clock counts rounds
+        std::uint64_t tick = checkpointManager ? checkpointManager->GetRestartTick() : 0;
+
+        while (true)
+        {
+            bool allFinished = true;
+
+            for (auto simulation : simulations)
+            {
+                if (!simulation->IsFinished())
+                {
+                    allFinished = false;
+                    Step(simulation, postPipeline, this->profiler_, this->telemetry_);
+                }
+            }
+
+            if (allFinished)
+            {
+                break;
+            }
+
+            ++tick;
+
+            if (checkpointManager && tick % checkpointManager->GetCheckInterval() == 0 && checkpointManager->IsDue(tick))
+            {
+                WriteCheckpoint(simulations, std::vector<std::uint64_t>(simulations.size(), tick), tick, postPipeline, checkpointManager, this->profiler_);
+            }
+        }
+    }
+
+    void NumSimScheduler::RunParallel(const std::vector<NumSimSimulation*>& simulations, NumSimPostPipeline* postPipeline,
+        NumSimCheckpointManager* checkpointManager)
+    {
+        std::vector<Task> tasks = this->BuildTasks(simulations);
+        std::size_t numUnfinished = 0;
+
+        for (auto& task : tasks)
+        {
+            if (checkpointManager)
+            {
+                task.clock = checkpointManager->GetRestartClock(task.simulation);
+            }
+
+            task.finished = task.simulation->IsFinished();
+
+            if (!task.finished)
+            {
+                ++numUnfinished;
+            }
+        }
+
+        if (numUnfinished == 0)
+        {
+            return;
+        }
+
+        std::mutex mutex;
+        std::condition_variable condition;
+        std::size_t numRunning = 0;
+        std::exception_ptr error;
+
+        // next tick at which to ask for a due checkpoint: a multiple of the check interval, the
+        // same on every rank, so the collective IsDue() and Write() are called for the same ticks
+        bool checkpoints = checkpointManager && checkpointManager->IsEnabled();
+        std::uint64_t checkInterval = checkpoints ? checkpointManager->GetCheckInterval() : 1;
+        std::uint64_t checkTick = checkpoints ? (checkpointManager->GetRestartTick() / checkInterval + 1) * checkInterval : 0;
+        std::vector<bool> released(tasks.size(), true);
+
+        // steps may start below the check tick, and past it only where a released dependent still
+        // needs the data; every simulation thus stops at the first clock the coupling allows at or
+        // after the check tick, independent of which thread ran which step
+        auto updateReleased = [&]()
+        {
+            bool changed = true;
+
+            for (std::size_t i = 0; i < tasks.size(); ++i)
+            {
+                released[i] = !checkpoints || (!tasks[i].finished && tasks[i].clock < checkTick);
+            }
+
+            while (checkpoints && changed)
+            {
+                changed = false;
+
+                for (std::size_t i = 0; i < tasks.size(); ++i)
+                {
+                    if (released[i] || tasks[i].finished)
+                    {
+                        continue;
+                    }
+
+                    for (auto dependent : tasks[i].dependents)
+                    {
+                        const Task& consumer = tasks[dependent];
+
+                        if (released[dependent] && tasks[i].clock < consumer.clock + consumer.stepInterval)
+                        {
+                            released[i] = true;
+                            changed = true;
+                            break;
+                        }
+                    }
+                }
+            }
+        };
+
+        // smallest clock of the unfinished simulations
+        auto minClock = [&]()
+        {
+            std::uint64_t clock = std::numeric_limits<std::uint64_t>::max();
+
+            for (auto& task : tasks)
+            {
+                if (!task.finished)
+                {
+                    clock = std::min(clock, task.clock);
+                }
+            }
+
+            return clock;
+        };
+
+        // every simulation has reached the check tick and no step runs
+        auto atCheckTick = [&]()
+        {
+            return checkpoints && numRunning == 0 && std::find(released.begin(), released.end(), true) == released.end();
+        };
+
+        // pick the ready step with the smallest clock so coupled simulations stay close in time;
+        // when nothing runs and strict coupling blocks every step, let a producer run ahead
+        auto findNext = [&]() -> std::size_t
+        {
+            std::size_t next = tasks.size();
+            updateReleased();
+
+            for (bool strict : { true, false })
+            {
+                for (std::size_t i = 0; i < tasks.size(); ++i)
+                {
+                    if (released[i] && this->IsReady(tasks, i, strict) && (next == tasks.size() || tasks[i].clock < tasks[next].clock))
+                    {
+                        next = i;
+                    }
+                }
+
+                if (next != tasks.size() || numRunning > 0)
+                {
+                    break;
+                }
+            }
+
+            return next;
+        };
+
+        // the calling thread (isMain) asks for and writes the checkpoints, so the collectives
+        // are made by one thread per rank while the other workers wait
+        auto worker = [&](bool isMain)
+        {
+            std::unique_lock<std::mutex> lock(mutex);
+
+            while (true)
+            {
+                std::size_t next = tasks.size();
+
+                condition.wait(lock, [&]()
+                {
+                    if (error || numUnfinished == 0)
+                    {
+                        return true;
+                    }
+
+                    next = findNext();
+                    return next != tasks.size() || (isMain && atCheckTick());
+                });
+
+                if (error || numUnfinished == 0)
+                {
+                    break;
+                }
+
+                if (next == tasks.size())
+                {
+                    // the simulations are at a consistent cut
+                    try
+                    {
+                        if (checkpointManager->IsDue(checkTick))
+                        {
+                            std::vector<std::uint64_t> clocks;
+
+                            for (auto& task : tasks)
+                            {
+                                clocks.push_back(task.clock);
+                            }
+
+                            WriteCheckpoint(simulations, clocks, checkTick, postPipeline, checkpointManager, this->profiler_);
+                        }
+                    }
+                    catch (...)
+                    {
+                        error = std::current_exception();
+                    }
+
+                    // the clocks at the cut are the same on every rank, so is the next check tick
+                    checkTick = (minClock() / checkInterval + 1) * checkInterval;
+                    condition.notify_all();
+                    continue;
+                }
+
+                Task& task = tasks[next];
+                task.running = true;
+                ++numRunning;
+                lock.unlock();
+
+                bool finished = false;
+                std::exception_ptr stepError;
+
+                try
+                {
+                    Step(task.simulation, postPipeline, this->profiler_, this->telemetry_);
+                    finished = task.simulation->IsFinished();
+                }
+                catch (...)
+                {
+                    stepError = std::current_exception();
+                }
+
+                lock.lock();
+                task.running = false;
+                --numRunning;
+                task.clock += task.stepInterval;
+
+                if (stepError && !error)
+                {
+                    error = stepError;
+                }
+
+                if (finished)
+                {
+                    task.finished = true;
+                    --numUnfinished;
+                }
+
+                condition.notify_all();
+            }
+
+            condition.notify_all();
+        };
+
+        // the calling thread is one of the workers
+        uint_t numThreads = this->ResolveNumThreads(numUnfinished);
+        std::vector<std::thread> threads;
+
+        for (uint_t i = 1; i < numThreads; ++i)
+        {
+            threads.emplace_back(worker, false);
+        }
+
+        worker(true);
+
+        for (auto& thread : threads)
+        {
+            thread.join();
+        }
+
+        if (error)
+        {
+            std::rethrow_exception(error);
+        }
+    }
+
+    std::vector<NumSimScheduler::Task> NumSimScheduler::BuildTasks(const std::vector<NumSimSimulation*>& simulations) const
+    {
+        std::vector<Task> tasks(simulations.size());
+        std::map<std::string, std::size_t> indices;
+
+        for (std::size_t i = 0; i < simulations.size(); ++i)
+        {
+            if (!indices.emplace(simulations[i]->GetObjectName(), i).second)
+            {
+                throw std::runtime_error("Duplicate simulation name: " + simulations[i]->GetObjectName());
+            }
+        }
+
+        for (std::size_t i = 0; i < simulations.size(); ++i)
+        {
+            auto simulation = simulations[i];
+            auto& task = tasks[i];
+            std::vector<std::string> dependencies = simulation->GetDependencies();
+            task.simulation = simulation;
+            task.stepInterval = simulation->GetStepInterval();
+
+            auto schedule = this->schedules_.find(simulation->GetObjectName());
+
+            if (schedule != this->schedules_.end())
+            {
+                if (schedule->second.overrideDependencies)
+                {
+                    dependencies = schedule->second.dependencies;
+                }
+
+                if (schedule->second.stepInterval > 0)
+                {
+                    task.stepInterval = schedule->second.stepInterval;
+                }
+            }
+
+            if (task.stepInterval == 0)
+            {
+                throw std::runtime_error("Step interval of simulation " + simulation->GetObjectName() + " must be positive");
+            }
+
+            for (auto& name : dependencies)
+            {
+                auto index = indices.find(name);
+
+                if (index == indices.end())
+                {
+                    throw std::runtime_error("Simulation " + simulation->GetObjectName() + " depends on unknown simulation: " + name);
+                }
+
+                if (index->second != i && std::find(task.dependencies.begin(), task.dependencies.end(), index->second) == task.dependencies.end())
+                {
+                    task.dependencies.push_back(index->second);
+                    tasks[index->second].dependents.push_back(i);
+                }
+            }
+        }
+
+        // Kahn's algorithm: every simulation must be reachable without a cycle
+        std::vector<std::size_t> numPending(tasks.size());
+        std::vector<std::size_t> queue;
+
+        for (std::size_t i = 0; i < tasks.size(); ++i)
+        {
+            numPending[i] = tasks[i].dependencies.size();
+
+            if (numPending[i] == 0)
+            {
+                queue.push_back(i);
+            }
+        }
+
+        for (std::size_t head = 0; head < queue.size(); ++head)
+        {
+            for (auto dependent : tasks[queue[head]].dependents)
+            {
+                if (--numPending[dependent] == 0)
+                {
+                    queue.push_back(dependent);
+                }
+            }
+        }
+
+        if (queue.size() != tasks.size())
+        {
+            std::string names;
+
+            for (std::size_t i = 0; i < tasks.size(); ++i)
+            {
+                if (numPending[i] > 0)
+                {
+                    names += (names.empty() ? "" : ", ") + tasks[i].simulation->GetObjectName();
+                }
+            }
+
+            throw std::runtime_error("Cyclic simulation dependencies: " + names);
+        }
+
+        return tasks;
+    }
+
+    bool NumSimScheduler::IsReady(const std::vector<Task>& tasks, std::size_t index, bool strict) const
+    {
+        const Task& task = tasks[index];
+
+        if (task.running || task.finished)
+        {
+            return false;
+        }
+
+        // dependencies must have produced data up to the end of this step
+        for (auto dependency : task.dependencies)
+        {
+            const Task& producer = tasks[dependency];
+
+            if (producer.running || (!producer.finished && producer.clock < task.clock + task.stepInterval))
+            {
+                return false;
+            }
+        }
+
+        // do not overwrite data that a dependent has not consumed yet
+        for (auto dependent : task.dependents)
+        {
+            const Task& consumer = tasks[dependent];
+
+            if (consumer.running || (strict && !consumer.finished && task.clock >= consumer.clock + consumer.stepInterval))
+            {
+                return false;
+            }
+        }
+
+        return true;
+    }
+
+    uint_t NumSimScheduler::ResolveNumThreads(std::size_t numSimulations) const
+    {
+        uint_t numThreads = this->numThreads_;
+
+        if (numThreads == 0)
+        {
+            numThreads = std::max(1u, std::thread::hardware_concurrency());
+        }
+
+        if (numSimulations > 0)
+        {
+            numThreads = static_cast<uint_t>(std::min<std::size_t>(numThreads, numSimulations));
+        }
+
+        return numThreads;
+    }
+}
@@ -0,0 +1,174 @@
+#pragma once
+
+#include <map>
+#include <string>
+#include <vector>
+
+#include "NumSimObject.h"
+
+namespace NumSimSolver
+{
+    class NumSimCheckpointManager;
+    class NumSimPostPipeline;
+    class NumSimProfiler;
+    class NumSimSimulation;
+    class NumSimTelemetry;
+
+    /**
+     * @brief time-stepping scheduler used by NumSimFramework::Run
+     *
+     * @details In serial mode every unfinished simulation runs Solve() and
+     * Post() in turn, round after round. In parallel mode each step of each
+     * simulation is a task on a thread pool; there is no barrier between
+     * rounds, so a worker that finishes a cheap step immediately picks up the
+     * next ready step of any simulation instead of waiting for the slowest one.
+     *
+     * Coupling is described by a dependency graph between simulations
+     * (NumSimSimulation::GetDependencies, by object name) and per-simulation
+     * step intervals: a simulation with interval k advances its clock by k
+     * ticks per step. A step of simulation A covering [t, t + k] starts only
+     * when every dependency has reached t + k, and a dependency does not run
+     * ahead of what its dependents need. Coupled simulations never run at the
+     * same time; independent ones run concurrently. The graph must be acyclic.
+     * If strict coupling blocks every step (possible with mismatched intervals
+     * in diamond-shaped graphs), the step with the smallest clock runs ahead.
+     *
+     * Configuration (all keys optional):
+     * @code
+     * "scheduler": {
+     *     "mode": "parallel",
+     *     "num_threads": 0,
+     *     "simulations": {
+     *         "Fluid": { "step_interval": 1 },
+     *         "Thermal": { "depends_on": ["Fluid"], "step_interval": 4 }
+     *     }
+     * }
+     * @endcode
+     * num_threads 0 uses the threads of the rank (NumSimComm threads_per_rank,
+     * all hardware threads when run without a comm). Entries under "simulations"
+     * override the values set on the simulation objects.
+     *
+     * With a checkpoint manager, the scheduler checks for a due checkpoint at
+     * every NumSimCheckpointManager::GetCheckInterval()-th tick (in serial
+     * mode, after the round reaching it). In parallel mode no step starts
+     * past the check tick unless a dependent below it still needs the data;
+     * once every simulation has stopped there, the calling thread asks
+     * IsDue() and writes the checkpoint while the other workers wait. The
+     * clocks at the check tick do not depend on thread timing, so all ranks
+     * make the collective calls for the same ticks and save the same cut.
+     * After a restart every simulation resumes at its saved clock.
+     */
+    class BOOST_SYMBOL_EXPORT NumSimScheduler : public NumSimObject
+    {
+    public:
+        enum class Mode
+        {
+            Serial,
+            Parallel
+        };
+
+        NumSimScheduler();
+        virtual ~NumSimScheduler();
+
+        /**
+         * @brief read the "scheduler" section of the solver configuration
+         * @throws std::runtime_error on an unknown mode
+         */
+        void Initialize(boost::json::object& numSimSolverJson);
+
+        void PrintInfo();
+
+        /**
+         * @brief step all simulations until every one reports IsFinished()
+         * @param postPipeline post-processing stage for each step, nullptr to call Post() directly
+         * @param checkpointManager periodic checkpoints and restart clocks, may be nullptr
+         * @throws std::runtime_error on unknown or cyclic dependencies; an
+         * exception thrown by a simulation is rethrown after all workers stop
+         */
+        void Run(const std::vector<NumSimSimulation*>& simulations, NumSimPostPipeline* postPipeline = nullptr,
+            NumSimCheckpointManager* checkpointManager = nullptr);
+
+        inline Mode GetMode() const
+        {
+            return this->mode_;
+        }
+
+        inline void SetMode(Mode mode)
+        {
+            this->mode_ = mode;
+        }
+
+        inline uint_t GetNumThreads() const
+        {
+            return this->numThreads_;
+        }
+
+        /**
+         * @param numThreads worker threads in parallel mode, 0 for all hardware threads
+         */
+        inline void SetNumThreads(uint_t numThreads)
+        {
+            this->numThreads_ = numThreads;
+        }
+
+        /**
+         * @brief timers for the Solve, Post and Checkpoint scopes, may be nullptr
+         */
+        inline NumSimProfiler* GetProfiler() const
+        {
+            return this->profiler_;
+        }
+
+        inline void SetProfiler(NumSimProfiler* profiler)
+        {
+            this->profiler_ = profiler;
+        }
+
+        /**
+         * @brief stream for the step time and memory use after every step, may be nullptr
+         */
+        inline NumSimTelemetry* GetTelemetry() const
+        {
+            return this->telemetry_;
+        }
+
+        inline void SetTelemetry(NumSimTelemetry* telemetry)
+        {
+            this->telemetry_ = telemetry;
+        }
+
+    private:
+        struct Task
+        {
+            NumSimSimulation* simulation = nullptr;
+            uint_t stepInterval = 1;
+            std::vector<std::size_t> dependencies;
+            std::vector<std::size_t> dependents;
+            std::uint64_t clock = 0;
+            bool running = false;
+            bool finished = false;
+        };
+
+        struct SimulationSchedule
+        {
+            bool overrideDependencies = false;
+            std::vector<std::string> dependencies;
+            uint_t stepInterval = 0;
+        };
+
+        void RunSerial(const std::vector<NumSimSimulation*>& simulations, NumSimPostPipeline* postPipeline,
+            NumSimCheckpointManager* checkpointManager);
+        void RunParallel(const std::vector<NumSimSimulation*>& simulations, NumSimPostPipeline* postPipeline,
+            NumSimCheckpointManager* checkpointManager);
+
+        std::vector<Task> BuildTasks(const std::vector<NumSimSimulation*>& simulations) const;
+        bool IsReady(const std::vector<Task>& tasks, std::size_t index, bool strict) const;
+        uint_t ResolveNumThreads(std::size_t numSimulations) const;
+
+        Mode mode_ = Mode::Serial;
+        uint_t numThreads_ = 0;
+        NumSimProfiler* profiler_ = nullptr;
+        NumSimTelemetry* telemetry_ = nullptr;
+        std::map<std::string, SimulationSchedule> schedules_;
+    };
+}
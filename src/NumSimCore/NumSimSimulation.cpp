@@ -1,4 +1,10 @@
+#include <algorithm>
+#include <stdexcept>
+
 #include "NumSimSimulation.h"
+#include "NumSimCheckpointManager.h"
+#include "NumSimComm.h"
+#include "NumSimPostPipeline.h"
 
 namespace NumSimSolver
 {
@@ -10,4 +16,86 @@ namespace NumSimSolver
     NumSimSimulation::~NumSimSimulation()
     {
     }
+
+    void NumSimSimulation::InitFromRestart()
+    {
+        if (this->restartData_)
+        {
+            this->ReadCheckpoint(*this->restartData_);
+        }
+    }
+
+    NumSimThreadPool* NumSimSimulation::GetThreadPool() const
+    {
+        return this->comm_ ? &this->comm_->GetThreadPool() : nullptr;
+    }
+
+    void NumSimSimulation::WriteCheckpoint(NumSimCheckpointData& data) const
+    {
+        for (auto& field : this->fields_)
+        {
+            data.SetField(field.name, field.data, field.numTuples, field.numComponents);
+        }
+    }
+
+    void NumSimSimulation::ReadCheckpoint(const NumSimCheckpointData& data)
+    {
+        for (auto& field : this->fields_)
+        {
+            auto saved = data.GetField(field.name);
+
+            if (!saved)
+            {
+                throw std::runtime_error("Checkpoint of simulation " + this->GetObjectName() + " has no field " + field.name);
+            }
+
+            if (saved->numTuples != field.numTuples || saved->numComponents != field.numComponents)
+            {
+                throw std::runtime_error("Checkpoint field " + field.name + " of simulation " + this->GetObjectName() + " has a different size");
+            }
+
+            std::copy(saved->data.begin(), saved->data.end(), field.data);
+        }
+    }
+
+    void NumSimSimulation::Snapshot(NumSimPostBuffer& buffer)
+    {
+        for (auto& field : this->fields_)
+        {
+            buffer.SetField(field.name, field.data, field.numTuples, field.numComponents);
+        }
+    }
+
+    void NumSimSimulation::RegisterField(const std::string& name, real_t* data, std::size_t numTuples, int_t numComponents)
+    {
+        NumSimField field;
+        field.name = name;
+        field.data = data;
+        field.numTuples = numTuples;
+        field.numComponents = numComponents;
+
+        for (auto& registered : this->fields_)
+        {
+            if (registered.name == name)
+            {
+                registered = field;
+                return;
+            }
+        }
+
+        this->fields_.push_back(field);
+    }
+
+    const NumSimField* NumSimSimulation::GetField(const std::string& name) const
+    {
+        for (auto& field : this->fields_)
+        {
+            if (field.name == name)
+            {
+                return &field;
+            }
+        }
+
+        return nullptr;
+    }
 }
\ No newline at end of file
@@ -4,6 +4,24 @@
 
 namespace NumSimSolver
 {
+    class NumSimCheckpointData;
+    class NumSimComm;
+    class NumSimPostBuffer;
+    class NumSimProfiler;
+    class NumSimTelemetry;
+    class NumSimThreadPool;
+
+    /**
+     * @brief a field array owned by a simulation (numTuples x numComponents, row-major)
+     */
+    struct NumSimField
+    {
+        std::string name;
+        real_t* data = nullptr;
+        std::size_t numTuples = 0;
+        int_t numComponents = 1;
+    };
+
     class BOOST_SYMBOL_EXPORT NumSimSimulation : public NumSimObject
     {
     public:
@@ -15,10 +33,177 @@ namespace NumSimSolver
         virtual void ReadMesh() {}
         virtual void InitFields(int flag) {}
         virtual void InitBoundaries(int flag) {}
-        virtual void InitFromRestart() {}
+
+        /**
+         * @brief restore the state saved in a checkpoint
+         *
+         * @details called after InitFields() and InitBoundaries(). The
+         * default calls ReadCheckpoint() with the restart data, if any.
+         */
+        virtual void InitFromRestart();
+
         virtual void Solve() {}
         virtual void Post() {}
         virtual void Finalize() {}
         virtual bool IsFinished() const { return true; }
+
+        /**
+         * @brief whether Post() is split into Snapshot() and WritePost()
+         *
+         * @details when true and the post pipeline is asynchronous, the
+         * framework calls Snapshot() on the solver thread and WritePost() on
+         * the I/O thread instead of Post(). WritePost() must only read the
+         * buffer, never the live simulation state.
+         */
+        virtual bool SupportsAsyncPost() const { return false; }
+
+        /**
+         * @brief copy the data needed for output into buffer (default: all registered fields)
+         */
+        virtual void Snapshot(NumSimPostBuffer& buffer);
+
+        /**
+         * @brief write a snapshot taken by Snapshot()
+         */
+        virtual void WritePost(const NumSimPostBuffer& buffer) {}
+
+        /**
+         * @brief save the restart state into data (default: all registered fields)
+         */
+        virtual void WriteCheckpoint(NumSimCheckpointData& data) const;
+
+        /**
+         * @brief restore the state saved by WriteCheckpoint() (default: copy into the registered fields)
+         * @throws std::runtime_error if a registered field is missing or has a different size
+         */
+        virtual void ReadCheckpoint(const NumSimCheckpointData& data);
+
+        /**
+         * @brief checkpoint data to restart from, nullptr outside InitFromRestart() or without a restart
+         */
+        inline const NumSimCheckpointData* GetRestartData() const
+        {
+            return this->restartData_;
+        }
+
+        inline void SetRestartData(const NumSimCheckpointData* restartData)
+        {
+            this->restartData_ = restartData;
+        }
+
+        /**
+         * @brief MPI environment set by the framework before ReadMesh(), nullptr when run standalone
+         */
+        inline NumSimComm* GetComm() const
+        {
+            return this->comm_;
+        }
+
+        inline void SetComm(NumSimComm* comm)
+        {
+            this->comm_ = comm;
+        }
+
+        /**
+         * @brief worker threads of this rank (NumSimComm::GetThreadPool), nullptr without a comm
+         *
+         * @details shared by all simulations of the rank; the size is set by
+         * threads_per_rank in the "comm" section.
+         */
+        NumSimThreadPool* GetThreadPool() const;
+
+        /**
+         * @brief timers of the run set by the framework before ReadMesh(), nullptr when run standalone
+         *
+         * @details use NUMSIM_PROFILE_SCOPE(this->GetProfiler(), "Kernel")
+         * to time a kernel as a child of the current Solve() or Post() scope.
+         */
+        inline NumSimProfiler* GetProfiler() const
+        {
+            return this->profiler_;
+        }
+
+        inline void SetProfiler(NumSimProfiler* profiler)
+        {
+            this->profiler_ = profiler;
+        }
+
+        /**
+         * @brief live monitoring stream set by the framework before ReadMesh(), nullptr when run standalone
+         *
+         * @details record per-step values such as residuals with
+         * Record(this->GetObjectName() + "/residual", value); samples are
+         * kept on rank 0 only.
+         */
+        inline NumSimTelemetry* GetTelemetry() const
+        {
+            return this->telemetry_;
+        }
+
+        inline void SetTelemetry(NumSimTelemetry* telemetry)
+        {
+            this->telemetry_ = telemetry;
+        }
+
+        /**
+         * @brief register a field array so that it can be snapshotted and exposed without copies
+         *
+         * @details the memory stays owned by the simulation and must remain
+         * valid until the field is re-registered or the simulation is destroyed.
+         */
+        void RegisterField(const std::string& name, real_t* data, std::size_t numTuples, int_t numComponents = 1);
+
+        inline const std::vector<NumSimField>& GetFields() const
+        {
+            return this->fields_;
+        }
+
+        /**
+         * @return the registered field, or nullptr
+         */
+        const NumSimField* GetField(const std::string& name) const;
+
+        /**
+         * @brief object names of the simulations whose results this one reads
+         *
+         * @details used by the parallel scheduler: a step starts only after
+         * its dependencies have reached the end of the step.
+         */
+        inline const std::vector<std::string>& GetDependencies() const
+        {
+            return this->dependencies_;
+        }
+
+        inline void SetDependencies(const std::vector<std::string>& dependencies)
+        {
+            this->dependencies_ = dependencies;
+        }
+
+        inline void AddDependency(const std::string& objectName)
+        {
+            this->dependencies_.push_back(objectName);
+        }
+
+        /**
+         * @brief scheduler ticks covered by one Solve() step (default 1)
+         */
+        inline uint_t GetStepInterval() const
+        {
+            return this->stepInterval_;
+        }
+
+        inline void SetStepInterval(uint_t stepInterval)
+        {
+            this->stepInterval_ = stepInterval;
+        }
+
+    protected:
+        std::vector<NumSimField> fields_;
+        std::vector<std::string> dependencies_;
+        uint_t stepInterval_ = 1;
+        const NumSimCheckpointData* restartData_ = nullptr;
+        NumSimComm* comm_ = nullptr;
+        NumSimProfiler* profiler_ = nullptr;
+        NumSimTelemetry* telemetry_ = nullptr;
     };
 }
@@ -0,0 +1,462 @@
+#include <algorithm>
+#include <cstdio>
+#include <fstream>
+#include <iostream>
+#include <memory>
+#include <stdexcept>
+#include <vector>
+#include <boost/asio.hpp>
+
+#if defined(_WIN32)
+#ifndef NOMINMAX
+#define NOMINMAX
+#endif
+#include <windows.h>
+#include <psapi.h>
+#elif defined(__APPLE__)
+#include <mach/mach.h>
+#endif
+
+#include "NumSimTelemetry.h"
+#include "NumSimComm.h"
+
+namespace NumSimSolver
+{
+    namespace
+    {
+        // samples formatted per write, so one client cannot hold the ring buffer lock for long
+        constexpr std::uint64_t batchSize = 4096;
+
+        // time the remaining samples are sent for after the run before slow clients are dropped
+        constexpr auto stopTimeout = std::chrono::seconds(5);
+
+        /**
+         * @brief resident set size of this process in MiB, 0 if unknown
+         */
+        double ResidentMemory()
+        {
+#if defined(_WIN32)
+            PROCESS_MEMORY_COUNTERS counters;
+
+            if (GetProcessMemoryInfo(GetCurrentProcess(), &counters, sizeof(counters)))
+            {
+                return static_cast<double>(counters.WorkingSetSize) / (1024.0 * 1024.0);
+            }
+#elif defined(__APPLE__)
+            mach_task_basic_info_data_t info;
+            mach_msg_type_number_t count = MACH_TASK_BASIC_INFO_COUNT;
+
+            if (task_info(mach_task_self(), MACH_TASK_BASIC_INFO, reinterpret_cast<task_info_t>(&info), &count) == KERN_SUCCESS)
+            {
+                return static_cast<double>(info.resident_size) / (1024.0 * 1024.0);
+            }
+#else
+            // the "VmRSS:" line is given in kB
+            std::ifstream status("/proc/self/status");
+            std::string line;
+
+            while (std::getline(status, line))
+            {
+                if (line.compare(0, 6, "VmRSS:") == 0)
+                {
+                    return std::stod(line.substr(6)) / 1024.0;
+                }
+            }
+#endif
+            return 0.0;
+        }
+
+        void AppendJsonString(std::string& out, const std::string& text)
+        {
+            out += '"';
+
+            for (unsigned char c : text)
+            {
+                if (c == '"' || c == '\\')
+                {
+                    out += '\\';
+                    out += static_cast<char>(c);
+                }
+                else if (c < 0x20)
+                {
+                    char escaped[8];
+                    std::snprintf(escaped, sizeof(escaped), "\\u%04x", c);
+                    out += escaped;
+                }
+                else
+                {
+                    out += static_cast<char>(c);
+                }
+            }
+
+            out += '"';
+        }
+
+        void AppendNumber(std::string& out, double value)
+        {
+            // JSON has no inf or nan
+            if (value != value || value > 1.0e308 || value < -1.0e308)
+            {
+                out += "null";
+                return;
+            }
+
+            char text[32];
+            std::snprintf(text, sizeof(text), "%.9g", value);
+            out += text;
+        }
+
+        struct Client
+        {
+            boost::asio::ip::tcp::socket socket;
+            std::uint64_t next = 0;
+            std::string pending;
+            std::size_t written = 0;
+            bool ended = false;
+            bool failed = false;
+        };
+    }
+
+    NumSimTelemetry::NumSimTelemetry()
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimTelemetry::~NumSimTelemetry()
+    {
+        this->Stop();
+    }
+
+    void NumSimTelemetry::Initialize(boost::json::object& numSimSolverJson)
+    {
+        auto telemetryValue = numSimSolverJson.if_contains("telemetry");
+
+        if (!telemetryValue || !telemetryValue->is_object())
+        {
+            return;
+        }
+
+        auto& telemetryJson = telemetryValue->as_object();
+        this->enabled_ = true;
+
+        if (auto enabled = telemetryJson.if_contains("enabled"))
+        {
+            this->enabled_ = enabled->as_bool();
+        }
+
+        if (auto address = telemetryJson.if_contains("address"))
+        {
+            this->address_ = address->as_string().c_str();
+        }
+
+        if (auto port = telemetryJson.if_contains("port"))
+        {
+            this->port_ = static_cast<int>(port->to_number<std::int64_t>());
+        }
+
+        if (auto portFile = telemetryJson.if_contains("port_file"))
+        {
+            this->portFileName_ = portFile->as_string().c_str();
+        }
+
+        if (auto capacity = telemetryJson.if_contains("capacity"))
+        {
+            this->capacity_ = static_cast<std::uint64_t>(capacity->to_number<std::int64_t>());
+        }
+    }
+
+    void NumSimTelemetry::PrintInfo()
+    {
+        std::cout << "Telemetry: " << (this->enabled_ ? "enabled" : "disabled");
+
+        if (this->enabled_)
+        {
+            std::cout << ", address: " << this->address_ << ":" << this->port_
+                      << ", port file: " << (this->portFileName_.empty() ? "-" : this->portFileName_)
+                      << ", capacity: " << this->capacity_;
+        }
+
+        std::cout << std::endl;
+    }
+
+    void NumSimTelemetry::Start(const NumSimComm* comm)
+    {
+        this->Stop();
+
+        if (comm && comm->GetMyRank() != 0)
+        {
+            return;
+        }
+
+        if (this->capacity_ == 0)
+        {
+            throw std::runtime_error("Telemetry capacity must be positive");
+        }
+
+        auto ioContext = std::make_shared<boost::asio::io_context>();
+        auto acceptor = std::make_shared<boost::asio::ip::tcp::acceptor>(*ioContext);
+
+        try
+        {
+            boost::asio::ip::tcp::endpoint endpoint(boost::asio::ip::make_address(this->address_), static_cast<unsigned short>(this->port_));
+            acceptor->open(endpoint.protocol());
+            acceptor->set_option(boost::asio::ip::tcp::acceptor::reuse_address(true));
+            acceptor->bind(endpoint);
+            acceptor->listen();
+            acceptor->non_blocking(true);
+        }
+        catch (const boost::system::system_error& e)
+        {
+            throw std::runtime_error("Cannot listen for telemetry clients on " + this->address_ + ":" + std::to_string(this->port_) + ": " + e.what());
+        }
+
+        this->boundPort_ = acceptor->local_endpoint().port();
+
+        if (!this->portFileName_.empty())
+        {
+            std::ofstream portFile(this->portFileName_);
+            std::string text = "{\"address\": ";
+            AppendJsonString(text, this->address_);
+            text += ", \"port\": " + std::to_string(this->boundPort_) + "}\n";
+            portFile << text;
+
+            if (!portFile)
+            {
+                throw std::runtime_error("Cannot write telemetry port file: " + this->portFileName_);
+            }
+        }
+
+        {
+            std::lock_guard<std::mutex> lock(this->mutex_);
+            this->samples_.assign(this->capacity_, Sample());
+            this->numSamples_ = 0;
+            this->channelIds_.clear();
+            this->channelNames_.clear();
+            this->channelCounts_.clear();
+            this->stopping_ = false;
+        }
+
+        this->origin_ = std::chrono::steady_clock::now();
+        this->active_ = true;
+
+        this->sender_ = std::thread([this, ioContext, acceptor]()
+            {
+                std::vector<std::unique_ptr<Client>> clients;
+                std::vector<Sample> batch;
+                std::vector<std::string> channelNames;
+                std::chrono::steady_clock::time_point deadline;
+                bool draining = false;
+
+                while (true)
+                {
+                    // every connection gets the samples still in the ring buffer
+                    while (true)
+                    {
+                        boost::system::error_code error;
+                        auto client = std::make_unique<Client>(Client{ boost::asio::ip::tcp::socket(*ioContext) });
+                        acceptor->accept(client->socket, error);
+
+                        if (error)
+                        {
+                            break;
+                        }
+
+                        client->socket.non_blocking(true, error);
+                        client->socket.set_option(boost::asio::ip::tcp::no_delay(true), error);
+
+                        std::lock_guard<std::mutex> lock(this->mutex_);
+                        client->next = this->numSamples_ > this->capacity_ ? this->numSamples_ - this->capacity_ : 0;
+                        clients.push_back(std::move(client));
+                    }
+
+                    bool idle = true;
+
+                    for (auto& client : clients)
+                    {
+                        while (!client->failed)
+                        {
+                            if (client->written == client->pending.size())
+                            {
+                                client->pending.clear();
+                                client->written = 0;
+                                std::uint64_t dropped = 0;
+                                bool stopping = false;
+
+                                {
+                                    std::lock_guard<std::mutex> lock(this->mutex_);
+                                    std::uint64_t oldest = this->numSamples_ > this->capacity_ ? this->numSamples_ - this->capacity_ : 0;
+
+                                    if (client->next < oldest)
+                                    {
+                                        dropped = oldest - client->next;
+                                        client->next = oldest;
+                                    }
+
+                                    std::uint64_t count = std::min(batchSize, this->numSamples_ - client->next);
+                                    batch.clear();
+
+                                    for (std::uint64_t i = client->next; i < client->next + count; ++i)
+                                    {
+                                        batch.push_back(this->samples_[i % this->capacity_]);
+                                    }
+
+                                    client->next += count;
+
+                                    if (channelNames.size() != this->channelNames_.size())
+                                    {
+                                        channelNames = this->channelNames_;
+                                    }
+
+                                    stopping = this->stopping_;
+                                }
+
+                                if (dropped > 0)
+                                {
+                                    client->pending += "{\"dropped\":" + std::to_string(dropped) + "}\n";
+                                }
+
+                                for (auto& sample : batch)
+                                {
+                                    client->pending += "{\"c\":";
+                                    AppendJsonString(client->pending, channelNames[sample.channel]);
+                                    client->pending += ",\"s\":" + std::to_string(sample.step) + ",\"t\":";
+                                    AppendNumber(client->pending, sample.time);
+                                    client->pending += ",\"v\":";
+                                    AppendNumber(client->pending, sample.value);
+                                    client->pending += "}\n";
+                                }
+
+                                if (stopping && batch.empty() && !client->ended)
+                                {
+                                    client->pending += "{\"end\":true}\n";
+                                    client->ended = true;
+                                }
+
+                                if (client->pending.empty())
+                                {
+                                    break;
+                                }
+                            }
+
+                            // a client that does not read only delays itself
+                            boost::system::error_code error;
+                            std::size_t size = client->socket.write_some(
+                                boost::asio::buffer(client->pending.data() + client->written, client->pending.size() - client->written), error);
+
+                            if (error == boost::asio::error::would_block || error == boost::asio::error::try_again)
+                            {
+                                break;
+                            }
+
+                            if (error)
+                            {
+                                client->failed = true;
+                                break;
+                            }
+
+                            client->written += size;
+                            idle = false;
+                        }
+                    }
+
+                    clients.erase(std::remove_if(clients.begin(), clients.end(),
+                        [](const std::unique_ptr<Client>& client) { return client->failed; }), clients.end());
+
+                    std::unique_lock<std::mutex> lock(this->mutex_);
+
+                    if (this->stopping_)
+                    {
+                        if (!draining)
+                        {
+                            draining = true;
+                            deadline = std::chrono::steady_clock::now() + stopTimeout;
+                        }
+
+                        bool finished = std::all_of(clients.begin(), clients.end(), [](const std::unique_ptr<Client>& client)
+                            {
+                                return client->ended && client->written == client->pending.size();
+                            });
+
+                        if (finished || std::chrono::steady_clock::now() > deadline)
+                        {
+                            break;
+                        }
+                    }
+
+                    if (idle)
+                    {
+                        this->condition_.wait_for(lock, std::chrono::milliseconds(this->stopping_ ? 10 : 50));
+                    }
+                }
+
+                for (auto& client : clients)
+                {
+                    boost::system::error_code error;
+                    client->socket.shutdown(boost::asio::ip::tcp::socket::shutdown_both, error);
+                    client->socket.close(error);
+                }
+            });
+    }
+
+    void NumSimTelemetry::Stop()
+    {
+        if (!this->sender_.joinable())
+        {
+            return;
+        }
+
+        this->active_ = false;
+
+        {
+            std::lock_guard<std::mutex> lock(this->mutex_);
+            this->stopping_ = true;
+        }
+
+        this->condition_.notify_all();
+        this->sender_.join();
+
+        if (!this->portFileName_.empty())
+        {
+            std::remove(this->portFileName_.c_str());
+        }
+
+        this->boundPort_ = 0;
+    }
+
+    void NumSimTelemetry::Record(std::string_view channel, double value)
+    {
+        if (!this->active_)
+        {
+            return;
+        }
+
+        double time = std::chrono::duration<double>(std::chrono::steady_clock::now() - this->origin_).count();
+        std::lock_guard<std::mutex> lock(this->mutex_);
+        auto channelId = this->channelIds_.find(channel);
+
+        if (channelId == this->channelIds_.end())
+        {
+            channelId = this->channelIds_.emplace(std::string(channel), static_cast<std::uint32_t>(this->channelNames_.size())).first;
+            this->channelNames_.emplace_back(channel);
+            this->channelCounts_.push_back(0);
+        }
+
+        auto& sample = this->samples_[this->numSamples_ % this->capacity_];
+        sample.channel = channelId->second;
+        sample.step = this->channelCounts_[channelId->second]++;
+        sample.time = time;
+        sample.value = value;
+        ++this->numSamples_;
+    }
+
+    void NumSimTelemetry::RecordStep(const std::string& simulationName, double seconds)
+    {
+        if (!this->active_)
+        {
+            return;
+        }
+
+        this->Record(simulationName + "/step_time", seconds);
+        this->Record("memory", ResidentMemory());
+    }
+}
@@ -0,0 +1,195 @@
+#pragma once
+
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <map>
+#include <mutex>
+#include <string>
+#include <string_view>
+#include <thread>
+
+#include "NumSimObject.h"
+
+namespace NumSimSolver
+{
+    class NumSimComm;
+
+    /**
+     * @brief live stream of per-step samples from a run to monitoring clients (NumSimGui)
+     *
+     * @details Record() appends a sample (channel name, step, wall time
+     * since Start(), value) to a ring buffer; the scheduler records
+     * "<simulation>/step_time" (seconds of Solve()) and "memory" (resident
+     * set size of the rank in MiB) after every step, and simulations add
+     * their own channels, e.g. residuals:
+     * @code
+     * void MySimulation::Solve()
+     * {
+     *     ...
+     *     if (auto telemetry = this->GetTelemetry())
+     *     {
+     *         telemetry->Record(this->GetObjectName() + "/residual", residual);
+     *     }
+     * }
+     * @endcode
+     * The step of a sample is the number of earlier samples of its channel,
+     * so a channel recorded once per Solve() counts the steps.
+     *
+     * Only rank 0 streams; Record() does nothing on other ranks, so record
+     * globally reduced values. A sender thread listens on a TCP socket and
+     * writes every sample as one JSON line to each connected client:
+     * @code
+     * {"c":"Fluid/residual","s":41,"t":12.5,"v":1.2e-05}
+     * @endcode
+     * Recording only copies the sample under a mutex and never waits for a
+     * client. A client that connects late first receives the samples still
+     * in the ring buffer; one that falls more than capacity samples behind
+     * skips the overwritten ones and receives {"dropped":n}. When the run
+     * ends the remaining samples are sent, followed by {"end":true}.
+     *
+     * Configuration:
+     * @code
+     * "telemetry": {
+     *     "enabled": true,
+     *     "address": "127.0.0.1",
+     *     "port": 0,
+     *     "port_file": "telemetry.json",
+     *     "capacity": 65536
+     * }
+     * @endcode
+     * Telemetry is enabled when the section is present, unless "enabled" is
+     * false. Port 0 picks a free port; the address and port are written to
+     * port_file (removed at the end of the run) for clients to find.
+     */
+    class BOOST_SYMBOL_EXPORT NumSimTelemetry : public NumSimObject
+    {
+    public:
+        NumSimTelemetry();
+        virtual ~NumSimTelemetry();
+
+        /**
+         * @brief read the "telemetry" section of the solver configuration
+         */
+        void Initialize(boost::json::object& numSimSolverJson);
+
+        void PrintInfo();
+
+        /**
+         * @brief discard the samples and, on rank 0, open the socket and start the sender thread
+         * @throws std::runtime_error if the socket cannot be opened or the port file cannot be written
+         */
+        void Start(const NumSimComm* comm);
+
+        /**
+         * @brief send the remaining samples, close the connections and stop the sender thread
+         */
+        void Stop();
+
+        /**
+         * @brief append a sample of channel; thread-safe, does nothing unless started on rank 0
+         */
+        void Record(std::string_view channel, double value);
+
+        /**
+         * @brief record the Solve() time of a simulation step and the memory use of the rank
+         */
+        void RecordStep(const std::string& simulationName, double seconds);
+
+        /**
+         * @brief whether Record() keeps samples (started on rank 0)
+         */
+        inline bool IsActive() const
+        {
+            return this->active_;
+        }
+
+        /**
+         * @brief port the sender listens on, 0 when not started
+         */
+        inline int GetBoundPort() const
+        {
+            return this->boundPort_;
+        }
+
+        inline bool IsEnabled() const
+        {
+            return this->enabled_;
+        }
+
+        inline void SetEnabled(bool enabled)
+        {
+            this->enabled_ = enabled;
+        }
+
+        inline const std::string& GetAddress() const
+        {
+            return this->address_;
+        }
+
+        inline void SetAddress(const std::string& address)
+        {
+            this->address_ = address;
+        }
+
+        inline int GetPort() const
+        {
+            return this->port_;
+        }
+
+        inline void SetPort(int port)
+        {
+            this->port_ = port;
+        }
+
+        inline const std::string& GetPortFileName() const
+        {
+            return this->portFileName_;
+        }
+
+        inline void SetPortFileName(const std::string& portFileName)
+        {
+            this->portFileName_ = portFileName;
+        }
+
+        inline std::uint64_t GetCapacity() const
+        {
+            return this->capacity_;
+        }
+
+        inline void SetCapacity(std::uint64_t capacity)
+        {
+            this->capacity_ = capacity;
+        }
+
+    private:
+        struct Sample
+        {
+            std::uint32_t channel = 0;
+            std::uint64_t step = 0;
+            double time = 0.0;
+            double value = 0.0;
+        };
+
+        bool enabled_ = false;
+        std::string address_ = "127.0.0.1";
+        int port_ = 0;
+        std::string portFileName_ = "telemetry.json";
+        std::uint64_t capacity_ = 65536;
+
+        bool active_ = false;
+        bool stopping_ = false;
+        int boundPort_ = 0;
+        std::chrono::steady_clock::time_point origin_ = std::chrono::steady_clock::now();
+        std::mutex mutex_;
+        std::condition_variable condition_;
+        std::thread sender_;
+
+        // ring buffer: sample i is at samples_[i % capacity], numSamples_ counts all recorded samples
+        std::vector<Sample> samples_;
+        std::uint64_t numSamples_ = 0;
+        std::map<std::string, std::uint32_t, std::less<>> channelIds_;
+        std::vector<std::string> channelNames_;
+        std::vector<std::uint64_t> channelCounts_;
+    };
+}
@@ -0,0 +1,165 @@
+#include <algorithm>
+
+#include "NumSimThreadPool.h"
+
+namespace NumSimSolver
+{
+    NumSimThreadPool::NumSimThreadPool()
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimThreadPool::~NumSimThreadPool()
+    {
+        this->Stop();
+    }
+
+    void NumSimThreadPool::Start(uint_t numThreads)
+    {
+        this->Stop();
+        this->stopping_ = false;
+
+        for (uint_t i = 1; i < numThreads; ++i)
+        {
+            this->workers_.emplace_back(&NumSimThreadPool::Work, this);
+        }
+    }
+
+    void NumSimThreadPool::Stop()
+    {
+        {
+            std::lock_guard<std::mutex> lock(this->mutex_);
+            this->stopping_ = true;
+        }
+
+        this->condition_.notify_all();
+
+        for (auto& worker : this->workers_)
+        {
+            worker.join();
+        }
+
+        this->workers_.clear();
+    }
+
+    void NumSimThreadPool::ParallelFor(std::int64_t first, std::int64_t last, const std::function<void(std::int64_t, std::int64_t)>& body,
+        std::int64_t grainSize)
+    {
+        if (last <= first)
+        {
+            return;
+        }
+
+        std::int64_t numThreads = this->GetNumThreads();
+
+        if (grainSize <= 0)
+        {
+            grainSize = std::max<std::int64_t>(1, (last - first + 4 * numThreads - 1) / (4 * numThreads));
+        }
+
+        if (numThreads == 1 || last - first <= grainSize)
+        {
+            body(first, last);
+            return;
+        }
+
+        auto job = std::make_shared<Job>();
+        job->body = &body;
+        job->first = first;
+        job->last = last;
+        job->chunkSize = grainSize;
+        job->numChunks = (last - first + grainSize - 1) / grainSize;
+
+        {
+            std::lock_guard<std::mutex> lock(this->mutex_);
+            this->jobs_.push_back(job);
+        }
+
+        this->condition_.notify_all();
+
+        // the caller works on its own loop, so it finishes even if all workers are busy elsewhere
+        RunChunks(*job);
+
+        std::unique_lock<std::mutex> lock(job->mutex);
+        job->condition.wait(lock, [&job]() { return job->numCompleted == job->numChunks; });
+
+        if (job->error)
+        {
+            std::rethrow_exception(job->error);
+        }
+    }
+
+    void NumSimThreadPool::Work()
+    {
+        while (true)
+        {
+            std::shared_ptr<Job> job;
+
+            {
+                std::unique_lock<std::mutex> lock(this->mutex_);
+
+                while (true)
+                {
+                    // loops whose chunks have all been taken need no more workers
+                    while (!this->jobs_.empty() && this->jobs_.front()->nextChunk >= this->jobs_.front()->numChunks)
+                    {
+                        this->jobs_.pop_front();
+                    }
+
+                    if (!this->jobs_.empty())
+                    {
+                        job = this->jobs_.front();
+                        break;
+                    }
+
+                    if (this->stopping_)
+                    {
+                        return;
+                    }
+
+                    this->condition_.wait(lock);
+                }
+            }
+
+            RunChunks(*job);
+        }
+    }
+
+    void NumSimThreadPool::RunChunks(Job& job)
+    {
+        while (true)
+        {
+            auto chunk = job.nextChunk++;
+
+            if (chunk >= job.numChunks)
+            {
+                return;
+            }
+
+            auto begin = job.first + chunk * job.chunkSize;
+            auto end = std::min(job.last, begin + job.chunkSize);
+            std::exception_ptr error;
+
+            try
+            {
+                (*job.body)(begin, end);
+            }
+            catch (...)
+            {
+                error = std::current_exception();
+            }
+
+            std::lock_guard<std::mutex> lock(job.mutex);
+
+            if (error && !job.error)
+            {
+                job.error = error;
+            }
+
+            if (++job.numCompleted == job.numChunks)
+            {
+                job.condition.notify_all();
+            }
+        }
+    }
+}
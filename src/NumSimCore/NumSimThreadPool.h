@@ -0,0 +1,100 @@
+#pragma once
+
+#include <atomic>
+#include <condition_variable>
+#include <cstdint>
+#include <deque>
+#include <exception>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <thread>
+
+#include "NumSimObject.h"
+
+namespace NumSimSolver
+{
+    /**
+     * @brief worker threads of one MPI rank for loop-level parallelism inside a simulation
+     *
+     * @details ParallelFor() splits an index range into chunks that the
+     * workers and the calling thread process together; it returns when all
+     * chunks are done. Calls from several threads at once (simulations run
+     * by the parallel scheduler) share the workers, and since the caller
+     * always works on its own loop, nested calls cannot deadlock. The
+     * workers never call MPI, so any MPI thread level is sufficient for the
+     * pool itself. Owned by NumSimComm, which sizes it from the "comm"
+     * section of the configuration.
+     *
+     * Typical use from a simulation:
+     * @code
+     * void MySimulation::Solve()
+     * {
+     *     this->GetThreadPool()->ParallelFor(0, numCells, [&](std::int64_t begin, std::int64_t end)
+     *         {
+     *             for (auto i = begin; i < end; ++i) { ... }
+     *         });
+     * }
+     * @endcode
+     */
+    class BOOST_SYMBOL_EXPORT NumSimThreadPool : public NumSimObject
+    {
+    public:
+        NumSimThreadPool();
+        virtual ~NumSimThreadPool();
+
+        NumSimThreadPool(const NumSimThreadPool&) = delete;
+        NumSimThreadPool& operator=(const NumSimThreadPool&) = delete;
+
+        /**
+         * @brief start numThreads - 1 workers (the calling thread of ParallelFor is the last one)
+         */
+        void Start(uint_t numThreads);
+
+        /**
+         * @brief join the workers, ParallelFor then runs on the calling thread only
+         */
+        void Stop();
+
+        /**
+         * @brief threads working on a loop, including the caller
+         */
+        inline uint_t GetNumThreads() const
+        {
+            return static_cast<uint_t>(this->workers_.size()) + 1;
+        }
+
+        /**
+         * @brief run body(begin, end) over consecutive chunks of [first, last)
+         * @param grainSize indices per chunk, 0 for about four chunks per thread
+         * @details the first exception thrown by body is rethrown once all
+         * chunks have finished.
+         */
+        void ParallelFor(std::int64_t first, std::int64_t last, const std::function<void(std::int64_t, std::int64_t)>& body,
+            std::int64_t grainSize = 0);
+
+    private:
+        struct Job
+        {
+            const std::function<void(std::int64_t, std::int64_t)>* body = nullptr;
+            std::int64_t first = 0;
+            std::int64_t last = 0;
+            std::int64_t chunkSize = 1;
+            std::int64_t numChunks = 0;
+            std::atomic<std::int64_t> nextChunk{ 0 };
+            std::int64_t numCompleted = 0;
+            std::exception_ptr error;
+            std::mutex mutex;
+            std::condition_variable condition;
+        };
+
+        void Work();
+        static void RunChunks(Job& job);
+
+        std::vector<std::thread> workers_;
+        std::deque<std::shared_ptr<Job>> jobs_;
+        std::mutex mutex_;
+        std::condition_variable condition_;
+        bool stopping_ = false;
+    };
+}
@@ -4,7 +4,12 @@ NumSimGui - 基于 PySide6 的图形用户界面模块
 
 __version__ = "0.1.0"
 
-from .main_window import MainWindow
-
 __all__ = ["MainWindow"]
 
+
+def __getattr__(name):
+    # 按需导入主窗口，导入 NumSimGui 的其他模块（如 mesh_file、batch_render）时不加载 PySide6
+    if name == "MainWindow":
+        from .main_window import MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,6 @@
+"""
+python -m NumSimGui 入口
+"""
+from .main import main
+
+main()
@@ -0,0 +1,239 @@
+"""
+无界面批量渲染
+使用离屏 vtkRenderWindow（EGL / OSMesa，无需显示器和 GUI）按相机和场变量设置批量输出 PNG，
+帧在进程池中并行渲染，每个工作进程只读取一次数据集。
+
+用法：
+    python -m NumSimGui.batch_render NumSimSolver.json frames.json --output-dir frames --processes 8
+
+帧设置文件（frames.json）示例：
+    {
+        "dataset": "result.nsm",
+        "size": [1920, 1080],
+        "frames": [
+            {
+                "output": "pressure_iso.png",
+                "camera": {"azimuth": 30, "elevation": 20, "zoom": 1.2},
+                "field": {"name": "pressure", "association": "cell", "range": [0.0, 1.0]}
+            }
+        ]
+    }
+
+dataset 为相对路径时相对于帧设置文件所在目录；缺省时使用项目文件中的 "dataset" 项。
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+DEFAULT_SIZE = (1920, 1080)
+DEFAULT_BACKGROUND = (0.2, 0.2, 0.2)
+
+# --backend 对应的 VTK 渲染窗口类（VTK 9.4 起可在运行时选择）
+RENDER_WINDOW_BACKENDS = {
+    "egl": "vtkEGLRenderWindow",
+    "osmesa": "vtkOSOpenGLRenderWindow",
+}
+
+# 工作进程内的渲染状态（每个进程初始化一次）
+_worker = None
+
+
+def read_dataset(path):
+    """读取原生网格文件或 VTK 数据文件"""
+    from . import mesh_file
+    from .vtk_mesh import create_vtk_reader
+
+    if mesh_file.is_mesh_file(path):
+        return mesh_file.open_mesh(path).to_vtk()
+
+    reader = create_vtk_reader(path)
+    reader.Update()
+    dataset = reader.GetOutputDataObject(0)
+    if dataset is None:
+        raise ValueError(f"无法读取数据集: {path}")
+    return dataset
+
+
+class OffscreenRenderer:
+    """单个工作进程中的离屏渲染管线"""
+
+    def __init__(self, dataset_path, size, background=DEFAULT_BACKGROUND):
+        from vtkmodules.vtkCommonCore import vtkLookupTable
+        from vtkmodules.vtkRenderingCore import (
+            vtkActor, vtkPolyDataMapper, vtkRenderer, vtkRenderWindow, vtkWindowToImageFilter
+        )
+        from vtkmodules.vtkIOImage import vtkPNGWriter
+        import vtkmodules.vtkRenderingOpenGL2  # noqa: F401  注册 OpenGL 渲染后端
+        from .vtk_lod import extract_surface
+
+        self.surface = extract_surface(read_dataset(dataset_path))
+
+        self.lookup_table = vtkLookupTable()
+        self.lookup_table.SetHueRange(0.667, 0.0)
+        self.lookup_table.Build()
+
+        self.mapper = vtkPolyDataMapper()
+        self.mapper.SetInputData(self.surface)
+        self.mapper.SetLookupTable(self.lookup_table)
+        self.mapper.ScalarVisibilityOff()
+
+        self.actor = vtkActor()
+        self.actor.SetMapper(self.mapper)
+        self.actor.GetProperty().SetColor(0.8, 0.8, 0.8)
+
+        self.renderer = vtkRenderer()
+        self.renderer.SetBackground(*background)
+        self.renderer.AddActor(self.actor)
+
+        self.render_window = vtkRenderWindow()
+        self.render_window.SetOffScreenRendering(1)
+        self.render_window.SetSize(*size)
+        self.render_window.AddRenderer(self.renderer)
+
+        self.image_filter = vtkWindowToImageFilter()
+        self.image_filter.SetInput(self.render_window)
+        self.image_filter.ReadFrontBufferOff()
+
+        self.writer = vtkPNGWriter()
+        self.writer.SetInputConnection(self.image_filter.GetOutputPort())
+
+    def apply_camera(self, spec):
+        """设置相机；未指定 position 时先重置到能看到整个模型的位置"""
+        self.renderer.ResetCamera()
+        camera = self.renderer.GetActiveCamera()
+        if "position" in spec:
+            camera.SetPosition(*spec["position"])
+        if "focal_point" in spec:
+            camera.SetFocalPoint(*spec["focal_point"])
+        if "view_up" in spec:
+            camera.SetViewUp(*spec["view_up"])
+        if "view_angle" in spec:
+            camera.SetViewAngle(spec["view_angle"])
+        if "parallel_scale" in spec:
+            camera.ParallelProjectionOn()
+            camera.SetParallelScale(spec["parallel_scale"])
+        camera.Azimuth(spec.get("azimuth", 0.0))
+        camera.Elevation(spec.get("elevation", 0.0))
+        camera.OrthogonalizeViewUp()
+        camera.Zoom(spec.get("zoom", 1.0))
+        self.renderer.ResetCameraClippingRange()
+
+    def apply_field(self, spec):
+        """按场变量着色；spec 为空时使用单色"""
+        if not spec:
+            self.mapper.ScalarVisibilityOff()
+            return
+
+        name = spec["name"]
+        if spec.get("association", "point") == "cell":
+            self.mapper.SetScalarModeToUseCellFieldData()
+            array = self.surface.GetCellData().GetArray(name)
+        else:
+            self.mapper.SetScalarModeToUsePointFieldData()
+            array = self.surface.GetPointData().GetArray(name)
+        if array is None:
+            raise ValueError(f"数据集中没有场变量: {name}")
+
+        component = spec.get("component", -1)
+        if component < 0:
+            self.lookup_table.SetVectorModeToMagnitude()
+        else:
+            self.lookup_table.SetVectorModeToComponent()
+            self.lookup_table.SetVectorComponent(component)
+
+        self.mapper.ScalarVisibilityOn()
+        self.mapper.SelectColorArray(name)
+        self.mapper.SetScalarRange(*spec.get("range", array.GetRange(component)))
+
+    def render(self, frame, output_path):
+        self.apply_camera(frame.get("camera", {}))
+        self.apply_field(frame.get("field"))
+        self.render_window.Render()
+        self.image_filter.Modified()
+        self.writer.SetFileName(str(output_path))
+        self.writer.Write()
+
+
+def _init_worker(dataset_path, size, backend):
+    """工作进程初始化：选择离屏后端并构建渲染管线"""
+    global _worker
+    if backend:
+        os.environ["VTK_DEFAULT_OPENGL_WINDOW"] = RENDER_WINDOW_BACKENDS[backend]
+    _worker = OffscreenRenderer(dataset_path, size)
+
+
+def _render_frame(job):
+    """在工作进程中渲染一帧，返回 (输出路径, 耗时)"""
+    frame, output_path = job
+    start = time.perf_counter()
+    _worker.render(frame, output_path)
+    return str(output_path), time.perf_counter() - start
+
+
+def load_frame_specs(project_path, specs_path):
+    """读取帧设置并解析数据集路径"""
+    with open(specs_path, "r", encoding="utf-8") as f:
+        specs = json.load(f)
+    if isinstance(specs, list):
+        specs = {"frames": specs}
+
+    with open(project_path, "r", encoding="utf-8") as f:
+        project = json.load(f)
+
+    dataset = specs.get("dataset") or project.get("dataset")
+    if not dataset:
+        raise ValueError("帧设置文件和项目文件中都没有指定 dataset")
+    base_dir = Path(specs_path).parent if specs.get("dataset") else Path(project_path).parent
+    dataset_path = Path(dataset) if Path(dataset).is_absolute() else base_dir / dataset
+
+    return dataset_path, tuple(specs.get("size", DEFAULT_SIZE)), specs.get("frames", [])
+
+
+def render_frames(project_path, specs_path, output_dir, processes=None, backend=None):
+    """
+    并行渲染全部帧
+
+    Returns:
+        [(输出路径, 耗时)] 列表
+    """
+    dataset_path, size, frames = load_frame_specs(project_path, specs_path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = [
+        (frame, output_dir / frame.get("output", f"frame_{index:05d}.png"))
+        for index, frame in enumerate(frames)
+    ]
+    processes = max(1, min(processes or os.cpu_count() or 1, len(jobs)))
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(str(dataset_path), size, backend)
+    ) as executor:
+        # 按块分发，减少进程间通信次数
+        chunksize = max(1, len(jobs) // (processes * 4))
+        return list(executor.map(_render_frame, jobs, chunksize=chunksize))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumSimSolver 无界面批量渲染")
+    parser.add_argument("project", help="项目文件（NumSimSolver.json）")
+    parser.add_argument("frames", help="帧设置文件（JSON）")
+    parser.add_argument("--output-dir", "-o", default="frames", help="PNG 输出目录")
+    parser.add_argument("--processes", "-j", type=int, default=None, help="并行进程数，默认为 CPU 核数")
+    parser.add_argument("--backend", choices=sorted(RENDER_WINDOW_BACKENDS), default=None,
+                        help="离屏渲染后端，默认由 VTK 自动选择")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = render_frames(args.project, args.frames, args.output_dir, args.processes, args.backend)
+    elapsed = time.perf_counter() - start
+    print(f"已渲染 {len(results)} 帧，用时 {elapsed:.2f} 秒")
+
+
+if __name__ == "__main__":
+    main()
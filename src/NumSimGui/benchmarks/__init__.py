@@ -0,0 +1,3 @@
+"""
+NumSimGui 基准测试
+"""
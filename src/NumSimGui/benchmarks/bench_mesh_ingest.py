@@ -0,0 +1,92 @@
+"""
+NumPy 到 VTK 网格导入基准测试
+按单元数统计 numpy_to_unstructured_grid 的耗时和常驻内存（RSS）增量
+
+用法：
+    python -m NumSimGui.benchmarks.bench_mesh_ingest --cells 100000 1000000 10000000
+"""
+import argparse
+import gc
+import os
+import time
+
+import numpy as np
+from vtkmodules.util import numpy_support
+
+from ..vtk_mesh import numpy_to_unstructured_grid
+
+VTK_HEXAHEDRON = 12
+
+
+def current_rss():
+    """返回当前进程的常驻内存（字节）"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        # 无 psutil 时读取 /proc（仅 Linux）
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def make_hex_mesh(num_cells):
+    """生成约 num_cells 个六面体单元的结构化网格数组（全部向量化）"""
+    n = max(1, round(num_cells ** (1.0 / 3.0)))
+    np1 = n + 1
+
+    axis = np.linspace(0.0, 1.0, np1)
+    x, y, z = np.meshgrid(axis, axis, axis, indexing="ij")
+    points = np.column_stack((x.ravel(), y.ravel(), z.ravel()))
+
+    i, j, k = np.meshgrid(np.arange(n), np.arange(n), np.arange(n), indexing="ij")
+    base = (i * np1 * np1 + j * np1 + k).ravel().astype(np.int64)
+    corner_offsets = np.array([
+        0, np1 * np1, np1 * np1 + np1, np1,
+        1, np1 * np1 + 1, np1 * np1 + np1 + 1, np1 + 1
+    ], dtype=np.int64)
+    connectivity = (base[:, None] + corner_offsets[None, :]).ravel()
+
+    cell_count = base.size
+    offsets = np.arange(0, 8 * (cell_count + 1), 8, dtype=np.int64)
+    cell_types = np.full(cell_count, VTK_HEXAHEDRON, dtype=np.uint8)
+    return points, connectivity, offsets, cell_types
+
+
+def run(cell_counts):
+    """对每个单元数执行一次导入并输出结果表"""
+    print(f"{'cells':>12} {'points':>12} {'arrays MB':>10} {'ingest s':>10} {'dRSS MB':>10} {'zero-copy':>10}")
+    for requested in cell_counts:
+        points, connectivity, offsets, cell_types = make_hex_mesh(requested)
+        array_bytes = points.nbytes + connectivity.nbytes + offsets.nbytes + cell_types.nbytes
+        gc.collect()
+
+        rss_before = current_rss()
+        start = time.perf_counter()
+        grid = numpy_to_unstructured_grid(points, connectivity, offsets, cell_types)
+        elapsed = time.perf_counter() - start
+        rss_delta = current_rss() - rss_before
+
+        shared = (
+            numpy_support.vtk_to_numpy(grid.GetPoints().GetData()).ctypes.data == points.ctypes.data
+            and numpy_support.vtk_to_numpy(grid.GetCells().GetConnectivityArray()).ctypes.data
+            == connectivity.ctypes.data
+        )
+
+        print(f"{grid.GetNumberOfCells():>12} {grid.GetNumberOfPoints():>12} "
+              f"{array_bytes / 2**20:>10.1f} {elapsed:>10.4f} {rss_delta / 2**20:>10.1f} {str(shared):>10}")
+
+        del grid, points, connectivity, offsets, cell_types
+        gc.collect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy 到 VTK 网格导入基准测试")
+    parser.add_argument("--cells", type=float, nargs="+",
+                        default=[1e4, 1e5, 1e6, 1e7],
+                        help="测试的单元数列表")
+    args = parser.parse_args()
+    run([int(c) for c in args.cells])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+项目文件读写基准测试
+构造包含设置树和探针数据的项目，比较 JSON 与二进制（*.nsp）格式的保存、读取耗时和文件大小
+
+用法（在 src 目录下）：
+    python -m NumSimGui.benchmarks.bench_project_io --probes 100 --samples 10000
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ..project_format import read_project, write_project
+
+
+def make_project(num_probes, num_samples, num_settings=2000):
+    """构造测试项目：数值数据为 Python 列表，与读取 JSON 项目得到的结构一致"""
+    rng = np.random.default_rng(0)
+    settings = {
+        f"group_{j // 100}": {
+            f"item_{i}": {"value": float(i) * 0.5, "unit": "m", "enabled": i % 2 == 0}
+            for i in range(j, j + 100)
+        }
+        for j in range(0, num_settings, 100)
+    }
+    probes = {
+        f"probe_{i}": {
+            "location": [float(i), 0.0, 0.0],
+            "time": np.linspace(0.0, 1.0, num_samples).tolist(),
+            "values": rng.standard_normal(num_samples).tolist(),
+        }
+        for i in range(num_probes)
+    }
+    return {
+        "version": "1.0.0",
+        "application": "NumSimSolver",
+        "format_version": "1.0",
+        "settings": settings,
+        "probes": probes,
+        "visual_views": [{"title": "Visual View", "index": 0}],
+    }
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="项目文件读写基准测试")
+    parser.add_argument("--probes", type=int, default=100, help="探针数")
+    parser.add_argument("--samples", type=int, default=10000, help="每个探针的采样数")
+    args = parser.parse_args()
+
+    project = make_project(args.probes, args.samples)
+    print(f"{'format':>8} {'save s':>10} {'load s':>10} {'size MB':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, suffix in (("json", ".json"), ("binary", ".nsp")):
+            path = Path(directory) / f"project{suffix}"
+            _, save_time = _timed(write_project, path, project)
+            loaded, load_time = _timed(read_project, path)
+            size = os.path.getsize(path) / 1024 ** 2
+            print(f"{name:>8} {save_time:>10.3f} {load_time:>10.3f} {size:>10.1f}")
+
+            if name == "binary":
+                # 读取后的数组直接写回（无需列表到数组的转换）
+                _, resave_time = _timed(write_project, path, loaded)
+                print(f"{'binary*':>8} {resave_time:>10.3f} {'':>10} {'':>10}  (* 数组已是 NumPy 数组)")
+                values = loaded["probes"]["probe_0"]["values"]
+                expected = project["probes"]["probe_0"]["values"]
+                assert np.array_equal(values, expected), "二进制项目读写结果不一致"
+
+
+if __name__ == "__main__":
+    main()
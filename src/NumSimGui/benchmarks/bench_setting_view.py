@@ -0,0 +1,125 @@
+"""
+Setting View 基准测试
+生成有 N 个节点的配置（每个边界和区域一组设置），测量加载、展开最大分区、搜索和定位的耗时，
+以及 Configuration 面板在边界之间切换（重新绑定缓存的表单）的耗时
+
+用法（在 src 目录下）：
+    python -m NumSimGui.benchmarks.bench_setting_view --nodes 1e5 --budget-ms 50
+"""
+import argparse
+import sys
+import time
+
+from PySide6.QtWidgets import QApplication
+
+from ..config_editor import ConfigPanel
+from ..setting_view import SettingView
+
+# 每个边界 / 区域的设置数（加上自身一个节点）
+SETTINGS_PER_ENTRY = 4
+
+
+def make_config(num_nodes):
+    """约 num_nodes 个节点的配置，四分之三为边界、四分之一为区域"""
+    num_entries = max(1, num_nodes // (SETTINGS_PER_ENTRY + 1))
+    num_boundaries = num_entries * 3 // 4
+    boundaries = {
+        f"wall_{i}": {"type": "wall" if i % 5 else "inlet", "temperature": 300.0 + i % 17, "roughness": 1.0e-5,
+                      "velocity": [0.0, 0.0, float(i % 3)]}
+        for i in range(num_boundaries)
+    }
+    zones = {
+        f"zone_{i}": {"material": f"steel_{i % 11}", "porosity": 0.1, "source": 0.0, "active": True}
+        for i in range(num_entries - num_boundaries)
+    }
+    return {"version": "1.0.0", "settings": {"boundaries": boundaries, "zones": zones}}
+
+
+def elapsed_ms(function):
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1e3, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Setting View 基准测试")
+    parser.add_argument("--nodes", type=float, default=1e5, help="配置的节点数")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="展开和搜索的耗时预算（毫秒）")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    config = make_config(int(args.nodes))
+    view = SettingView()
+    view.resize(300, 800)
+    view.show()
+    app.processEvents()
+
+    def expand(path):
+        index = view.model.index_for_path(path)
+        view.tree.expand(index)
+        app.processEvents()
+        return view.model.rowCount(index)
+
+    def search(text):
+        view.set_filter(text)
+        app.processEvents()
+        return view.search_model.num_matches
+
+    timings = []
+    timings.append(("load",) + elapsed_ms(lambda: (view.set_config(config), app.processEvents())))
+    timings.append(("expand settings",) + elapsed_ms(lambda: expand(("settings",))))
+    timings.append(("expand boundaries",) + elapsed_ms(lambda: expand(("settings", "boundaries"))))
+    # 搜索索引在空闲时分步构建，这里等待构建完成（总耗时，不阻塞界面）
+    def build_index():
+        while not view.model.search_index().is_complete:
+            app.processEvents()
+        return len(view.model.search_index())
+
+    timings.append(("index (idle)",) + elapsed_ms(build_index))
+    timings.append(("search 'w'",) + elapsed_ms(lambda: search("w")))
+    timings.append(("search 'wall_1'",) + elapsed_ms(lambda: search("wall_1")))
+    timings.append(("search 'wall_12'",) + elapsed_ms(lambda: search("wall_12")))
+    timings.append(("search 'inlet'",) + elapsed_ms(lambda: search("inlet")))
+    timings.append(("search ''",) + elapsed_ms(lambda: search("")))
+    last = f"wall_{len(config['settings']['boundaries']) - 1}"
+    timings.append(("reveal last",) + elapsed_ms(
+        lambda: (view.reveal(("settings", "boundaries", last, "temperature")), app.processEvents())
+    ))
+
+    view.model.set_values([(("settings", "boundaries", "wall_1", "temperature"), 0.0)])
+    changes = [(("settings", "boundaries", f"wall_{i}", "roughness"), 2.0e-5) for i in range(1000)]
+    timings.append(("set 1000 values",) + elapsed_ms(lambda: (view.model.set_values(changes), app.processEvents())))
+
+    # Configuration 面板：逐个点击 100 个边界的叶子，结构相同的边界共用一个缓存的表单
+    panel = ConfigPanel(view.model)
+    panel.show()
+    num_boundaries = min(100, len(config["settings"]["boundaries"]))
+
+    def click_boundaries():
+        for i in range(num_boundaries):
+            panel.bind(("settings", "boundaries", f"wall_{i}", "temperature"))
+            app.processEvents()
+        return panel.num_cached_forms
+
+    timings.append(("config panel first",) + elapsed_ms(
+        lambda: (panel.bind(("settings", "zones", "zone_0", "porosity")), app.processEvents())
+    ))
+    ms, forms = elapsed_ms(click_boundaries)
+    timings.append(("config panel rebind", ms / num_boundaries, forms))
+
+    print(f"节点数: {int(args.nodes)}")
+    print(f"{'操作':<24}{'耗时 (ms)':>12}{'行数':>10}")
+    over_budget = []
+    for name, ms, rows in timings:
+        rows = rows if isinstance(rows, int) else "-"
+        print(f"{name:<24}{ms:>12.1f}{rows:>10}")
+        if name.startswith(("expand", "search")) and ms > args.budget_ms:
+            over_budget.append(name)
+    if over_budget:
+        print(f"超出预算 {args.budget_ms} ms: {', '.join(over_budget)}")
+        sys.exit(1)
+    del app
+
+
+if __name__ == "__main__":
+    main()
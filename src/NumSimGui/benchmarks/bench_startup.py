@@ -0,0 +1,106 @@
+"""
+GUI 启动时间基准测试
+在新的 Python 进程中以 -X importtime 导入 NumSimGui.main_window 并创建 MainWindow（offscreen 平台），
+统计导入耗时和累计耗时最多的模块。导入耗时超过预算，或启动阶段导入了 VTK / NumPy 时返回非零状态码，
+可直接用于 CI 检查冷启动是否退化。
+
+用法（在 src 目录下）：
+    python -m NumSimGui.benchmarks.bench_startup --budget-ms 500 --repeat 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# 默认导入耗时预算（毫秒）
+DEFAULT_BUDGET_MS = 500.0
+# 启动阶段不允许导入的模块（应推迟到第一次显示 Visual View 时）
+DEFERRED_MODULES = ("vtkmodules", "vtk", "numpy")
+
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from PySide6.QtWidgets import QApplication
+from NumSimGui.main_window import MainWindow
+app = QApplication(sys.argv)
+window = MainWindow()
+elapsed = time.perf_counter() - start
+print(json.dumps({"startup": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def parse_importtime(stderr):
+    """
+    解析 -X importtime 输出
+
+    Returns:
+        [(模块名, 自身耗时 us, 累计耗时 us, 嵌套深度)] 列表
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def measure_startup():
+    """在新进程中测量一次启动，返回 (导入记录, 启动耗时 s, 已导入模块列表)"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        cwd=Path(__file__).resolve().parents[2],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    summary = json.loads(result.stdout.strip().splitlines()[-1])
+    return parse_importtime(result.stderr), summary["startup"], summary["modules"]
+
+
+def find_deferred_modules(modules):
+    """返回启动阶段被导入、但应推迟导入的模块"""
+    return sorted(
+        name for name in modules
+        if any(name == prefix or name.startswith(prefix + ".") for prefix in DEFERRED_MODULES)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumSimGui 启动时间基准测试")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="导入耗时预算（毫秒）")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数，取最小值")
+    parser.add_argument("--top", type=int, default=10, help="列出累计耗时最多的模块数")
+    args = parser.parse_args()
+
+    runs = [measure_startup() for _ in range(max(1, args.repeat))]
+    records, startup, modules = min(runs, key=lambda run: sum(r[1] for r in run[0]))
+    import_ms = sum(r[1] for r in records) / 1000.0
+
+    print(f"{'模块':<48}{'累计 (ms)':>12}")
+    top_level = sorted((r for r in records if r[3] == 0), key=lambda r: r[2], reverse=True)
+    for name, _, cumulative_us, _ in top_level[:args.top]:
+        print(f"{name:<48}{cumulative_us / 1000.0:>12.1f}")
+    print()
+    print(f"导入耗时: {import_ms:.1f} ms（预算 {args.budget_ms:.1f} ms）")
+    print(f"导入并创建主窗口: {startup * 1000.0:.1f} ms")
+
+    failed = False
+    if import_ms > args.budget_ms:
+        print("失败: 导入耗时超出预算")
+        failed = True
+    deferred = find_deferred_modules(modules)
+    if deferred:
+        print(f"失败: 启动阶段导入了应推迟的模块: {', '.join(deferred[:10])}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+运行监视基准测试
+构造与求解器相同格式的数据流，测量解析吞吐量，以及数据量增大时曲线重绘（抽稀 + 绘制）的耗时
+
+用法（在 src 目录下）：
+    python -m NumSimGui.benchmarks.bench_telemetry --steps 1e4 1e5 1e6
+"""
+import argparse
+import math
+import time
+
+from PySide6.QtWidgets import QApplication
+
+from ..telemetry_dock import TelemetryPlot, TelemetryStream
+
+
+def make_stream(num_steps, chunk_steps=4096):
+    """按块生成数据流，每步三个通道（残差、单步耗时、内存），与求解器输出格式相同"""
+    for first in range(0, num_steps, chunk_steps):
+        lines = []
+        for step in range(first, min(first + chunk_steps, num_steps)):
+            time_value = step * 1.0e-3
+            lines.append(f'{{"c":"Fluid/residual","s":{step},"t":{time_value:.9g},"v":{math.exp(-step * 1.0e-5):.9g}}}\n')
+            lines.append(f'{{"c":"Fluid/step_time","s":{step},"t":{time_value:.9g},"v":{1.0e-3 + (step % 7) * 1.0e-5:.9g}}}\n')
+            lines.append(f'{{"c":"memory","s":{step},"t":{time_value:.9g},"v":{512.0 + step * 1.0e-4:.9g}}}\n')
+        yield "".join(lines).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="运行监视基准测试")
+    parser.add_argument("--steps", type=float, nargs="+", default=[1e4, 1e5, 1e6], help="步数")
+    parser.add_argument("--width", type=int, default=1200, help="曲线宽度（像素）")
+    parser.add_argument("--repeat", type=int, default=10, help="重绘次数")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    print(f"{'steps':>10} {'parse s':>10} {'samples/s':>12} {'repaint ms':>12}")
+    for num_steps in (int(steps) for steps in args.steps):
+        chunks = list(make_stream(num_steps))
+        stream = TelemetryStream()
+        start = time.perf_counter()
+        for chunk in chunks:
+            stream.feed(chunk)
+        parse_time = time.perf_counter() - start
+        assert stream.num_samples == 3 * num_steps, "解析的样本数不一致"
+
+        plot = TelemetryPlot(stream)
+        plot.set_channels(list(stream.series))
+        plot.log_scale.add("Fluid/residual")
+        plot.resize(args.width, 600)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            plot.grab()
+        repaint_time = (time.perf_counter() - start) / args.repeat
+        print(f"{num_steps:>10} {parse_time:>10.3f} {stream.num_samples / parse_time:>12.0f} {repaint_time * 1e3:>12.1f}")
+    del app
+
+
+if __name__ == "__main__":
+    main()
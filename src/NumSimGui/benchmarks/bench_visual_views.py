@@ -0,0 +1,71 @@
+"""
+多个 Visual View 切换基准测试
+在第一个视图中显示约 N 个六面体单元的网格，新建若干个视图（共享同一数据集），
+测量首次显示和再次切换到各视图的耗时、常驻内存（RSS）以及持有 GL 上下文的视图数
+
+用法（在 src 目录下）：
+    python -m NumSimGui.benchmarks.bench_visual_views --views 10 --cells 1e6 --max-live 4
+"""
+import argparse
+import time
+
+from PySide6.QtWidgets import QApplication
+
+from ..main_window import MainWindow
+from .bench_mesh_ingest import current_rss, make_hex_mesh
+
+# 等待视图完成初始化的最长时间（秒）
+INITIALIZE_TIMEOUT = 10.0
+
+
+def switch_to(app, window, index):
+    """切换到第 index 个视图并等待其完成渲染，返回耗时（毫秒）"""
+    tab_widget = window.visual_view_tab_widget
+    start = time.perf_counter()
+    tab_widget.setCurrentIndex(index)
+    view_id = tab_widget.tabText(index)
+    while time.perf_counter() - start < INITIALIZE_TIMEOUT:
+        app.processEvents()
+        vtk_data = window.vtk_widgets.get(view_id)
+        if vtk_data and vtk_data['widget']._vtk_initialized:
+            break
+    return (time.perf_counter() - start) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多个 Visual View 切换基准测试")
+    parser.add_argument("--views", type=int, default=10, help="视图数")
+    parser.add_argument("--cells", type=float, default=1e6, help="网格单元数")
+    parser.add_argument("--max-live", type=int, default=4, help="同时持有 GL 上下文的视图数上限")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    window = MainWindow()
+    window.view_manager.max_live_views = args.max_live
+    window.resize(1280, 800)
+    window.show()
+    switch_to(app, window, 0)
+
+    window.load_mesh_arrays(*make_hex_mesh(int(args.cells)))
+    app.processEvents()
+    for _ in range(args.views - 1):
+        window.new_visual_view()
+    rss_start = current_rss()
+
+    tab_widget = window.visual_view_tab_widget
+    first = [switch_to(app, window, index) for index in range(tab_widget.count())]
+    again = [switch_to(app, window, index) for index in range(tab_widget.count())]
+    rss_end = current_rss()
+
+    print(f"视图数: {tab_widget.count()}, 单元数: {int(args.cells)}, GL 上下文上限: {args.max_live}")
+    print(f"{'':<16}{'平均 (ms)':>12}{'最大 (ms)':>12}")
+    for name, timings in (("首次显示", first), ("再次切换", again)):
+        print(f"{name:<16}{sum(timings) / len(timings):>12.1f}{max(timings):>12.1f}")
+    print(f"持有 GL 上下文的视图: {window.view_manager.num_live_views}")
+    print(f"切换期间 RSS 增量: {(rss_end - rss_start) / 1024 ** 2:.1f} MB")
+    window.close()
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Configuration 面板
+编辑 Setting View 中选中叶子所在对象的全部叶子（如某个边界的 type、temperature、roughness），
+用于在数百个结构相同的边界 / 区域之间逐个点击修改。
+
+- 表单按布局（键、编辑器类型、取值范围）缓存，结构相同的对象共用一个表单，点击时只把值重新绑定到编辑器，
+  不重新创建控件；最多缓存 MAX_CACHED_FORMS 个表单，超出时删除最久未使用的。
+- 编辑器类型由值的类型和求解器配置模式（config_schema.find_field）决定：布尔为复选框，有取值范围的字符串为下拉框，
+  整数为 QSpinBox，浮点数和字符串为输入框，标量数组以 JSON 文本编辑，其他值（NumPy 数组等）只读。
+- 修改先记录在面板中，FLUSH_INTERVAL_MS 内的修改（以及切换到其他对象、保存之前）一次性通过
+  SettingTreeModel.set_values 写回配置（复制被修改路径上的容器，不原地修改 ProjectStore 持有的对象），随后发出
+  sections_changed，由主窗口把新的分区对象交给 ProjectStore.set_section。
+"""
+import json
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtGui import QDoubleValidator
+from PySide6.QtWidgets import (
+    QCheckBox, QComboBox, QFormLayout, QLabel, QLineEdit, QSpinBox, QStackedWidget, QVBoxLayout, QWidget
+)
+
+from .config_schema import find_field
+from .setting_view import format_path, format_value, is_container
+
+# 修改写回配置前等待的时间（毫秒），期间的修改合并为一批
+FLUSH_INTERVAL_MS = 300
+# 缓存的表单数
+MAX_CACHED_FORMS = 16
+# 对象的叶子超过此数时只编辑被点击的叶子
+MAX_FORM_FIELDS = 64
+# 以 JSON 文本编辑的数组的最大长度
+MAX_ARRAY_LENGTH = 64
+
+INT_MIN = -2 ** 31
+INT_MAX = 2 ** 31 - 1
+
+
+def _is_scalar(value):
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+def editor_spec(path, value):
+    """
+    叶子的编辑器类型
+
+    Returns:
+        (类型, 参数)：类型为 boolean、choice、integer、number、text、json 或 readonly，
+        参数为 choice 的取值或 integer 的范围
+    """
+    if getattr(value, "ndim", None) == 0:
+        # *.nsp 项目中的 NumPy 标量
+        value = value.tolist()
+    field = find_field(path)
+    if isinstance(value, bool):
+        return "boolean", ()
+    if isinstance(value, int):
+        if field is not None and field.type == "integer":
+            minimum, maximum = max(field.minimum, INT_MIN), min(field.maximum, INT_MAX)
+        else:
+            minimum, maximum = INT_MIN, INT_MAX
+        if minimum <= value <= maximum:
+            return "integer", (int(minimum), int(maximum))
+        return "json", ()
+    if isinstance(value, float):
+        return "number", ()
+    if isinstance(value, str):
+        if field is not None and field.values:
+            return "choice", field.values
+        return "text", ()
+    if value is None or (isinstance(value, (list, tuple)) and len(value) <= MAX_ARRAY_LENGTH
+                         and all(_is_scalar(item) for item in value)):
+        return "json", ()
+    return "readonly", ()
+
+
+class FieldEditor:
+    """一个叶子的编辑控件，set_value 不触发修改回调"""
+
+    def __init__(self, kind, options, on_edited):
+        self.kind = kind
+        self.options = options
+        if kind == "boolean":
+            self.widget = QCheckBox()
+            self.widget.toggled.connect(on_edited)
+        elif kind == "choice":
+            self.widget = QComboBox()
+            self.widget.addItems(list(options))
+            self.widget.activated.connect(on_edited)
+        elif kind == "integer":
+            self.widget = QSpinBox()
+            self.widget.setRange(*options)
+            # 输入时不逐个字符提交，按回车或离开时提交
+            self.widget.setKeyboardTracking(False)
+            self.widget.valueChanged.connect(on_edited)
+        elif kind == "readonly":
+            self.widget = QLabel()
+            self.widget.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        else:
+            self.widget = QLineEdit()
+            if kind == "number":
+                self.widget.setValidator(QDoubleValidator(self.widget))
+            self.widget.editingFinished.connect(on_edited)
+        self.bound = None  # 绑定（或最近一次提交）的值
+
+    def set_value(self, value):
+        self.bound = value
+        widget = self.widget
+        widget.blockSignals(True)
+        if self.kind == "boolean":
+            widget.setChecked(bool(value))
+        elif self.kind == "choice":
+            # 不在取值范围内的值（配置无效）不选中任何项
+            widget.setCurrentIndex(self.options.index(value) if value in self.options else -1)
+        elif self.kind == "integer":
+            widget.setValue(int(value))
+        elif self.kind == "readonly":
+            widget.setText(format_value(value))
+        elif self.kind == "number":
+            widget.setText(repr(float(value)))
+        elif self.kind == "json":
+            widget.setText(json.dumps(value))
+        else:
+            widget.setText(value)
+        widget.blockSignals(False)
+
+    def value(self):
+        """
+        编辑器中的值
+
+        Raises:
+            ValueError: 输入无法转换为原值的类型
+        """
+        widget = self.widget
+        if self.kind == "boolean":
+            return widget.isChecked()
+        if self.kind == "choice":
+            return widget.currentText()
+        if self.kind == "integer":
+            return widget.value()
+        if self.kind == "number":
+            return float(widget.text())
+        if self.kind == "json":
+            value = json.loads(widget.text())
+            if isinstance(self.bound, (list, tuple)):
+                if not isinstance(value, list) or not all(_is_scalar(item) for item in value):
+                    raise ValueError("expected an array")
+            elif self.bound is not None and type(value) is not type(self.bound):
+                raise ValueError(f"expected {type(self.bound).__name__}")
+            return value
+        if self.kind == "text":
+            return widget.text()
+        return self.bound
+
+    def is_modified(self):
+        try:
+            return self.value() != self.bound
+        except ValueError:
+            return True
+
+
+class ConfigForm(QWidget):
+    """一种布局的表单，可重新绑定到布局相同的任意对象"""
+
+    def __init__(self, layout_key, on_edited, parent=None):
+        super().__init__(parent)
+        self.layout_key = layout_key
+        self.parent_path = ()
+        self.editors = {}
+        self.labels = {}
+        self._current_key = None
+
+        form_layout = QFormLayout()
+        form_layout.setSpacing(10)
+        form_layout.setContentsMargins(10, 10, 10, 10)
+        for key, kind, options in layout_key:
+            label = QLabel(str(key))
+            editor = FieldEditor(kind, options, lambda *args, key=key: on_edited(self, key))
+            form_layout.addRow(label, editor.widget)
+            self.labels[key] = label
+            self.editors[key] = editor
+        self.setLayout(form_layout)
+
+    def bind(self, parent_path, container, current_key):
+        """显示 container 中各键的值，突出显示被点击的键"""
+        self.parent_path = tuple(parent_path)
+        for key, editor in self.editors.items():
+            editor.set_value(container[key])
+        if self._current_key != current_key:
+            if self._current_key in self.labels:
+                self.labels[self._current_key].setStyleSheet("")
+            self.labels[current_key].setStyleSheet("font-weight: bold;")
+            self._current_key = current_key
+
+
+class ConfigPanel(QWidget):
+    """Configuration 停靠窗口的内容：当前对象的路径和缓存的表单"""
+
+    # 修改已写回配置：值被修改的顶层分区名集合
+    sections_changed = Signal(object)
+
+    def __init__(self, model, parent=None):
+        """
+        Args:
+            model: Setting View 的 SettingTreeModel，修改通过它写回配置
+        """
+        super().__init__(parent)
+        self.model = model
+        self.path = None
+        self._forms = OrderedDict()  # 布局 -> ConfigForm，按使用顺序排列
+        self._pending = {}  # 路径 -> 尚未写回的值
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.path_label = QLabel()
+        self.path_label.setStyleSheet("font-weight: bold; padding: 10px 10px 0 10px;")
+        self.path_label.setWordWrap(True)
+        layout.addWidget(self.path_label)
+        self.stack = QStackedWidget()
+        self._empty = QWidget()
+        self.stack.addWidget(self._empty)
+        layout.addWidget(self.stack)
+        layout.addStretch()
+        self.setLayout(layout)
+
+        # 配置被整体替换后原路径失效
+        model.modelReset.connect(self.clear)
+
+    @property
+    def num_cached_forms(self):
+        return len(self._forms)
+
+    @property
+    def current_form(self):
+        widget = self.stack.currentWidget()
+        return widget if widget is not self._empty else None
+
+    def bind(self, path):
+        """编辑叶子所在的对象，先写回尚未写回的修改"""
+        self.flush()
+        path = tuple(path)
+        try:
+            parent = self._resolve(path[:-1])
+            key = path[-1]
+            parent[key]
+        except (KeyError, IndexError, TypeError):
+            self.clear()
+            return
+        keys = [child for child in self._keys(parent) if not is_container(parent[child])]
+        if not path[:-1] or len(keys) > MAX_FORM_FIELDS:
+            # 顶层叶子或叶子过多的对象只编辑被点击的叶子
+            keys = [key]
+        layout_key = tuple((child, *editor_spec(path[:-1] + (child,), parent[child])) for child in keys)
+
+        form = self._forms.get(layout_key)
+        if form is None:
+            form = ConfigForm(layout_key, self._on_edited)
+            self._forms[layout_key] = form
+            self.stack.addWidget(form)
+            if len(self._forms) > MAX_CACHED_FORMS:
+                _, evicted = self._forms.popitem(last=False)
+                self.stack.removeWidget(evicted)
+                evicted.deleteLater()
+        else:
+            self._forms.move_to_end(layout_key)
+        form.bind(path[:-1], parent, key)
+        self.stack.setCurrentWidget(form)
+        self.path_label.setText(format_path(path))
+        self.path = path
+
+    def refresh(self):
+        """配置在面板之外被修改后重新显示当前对象"""
+        if self.path is not None:
+            self.bind(self.path)
+
+    def clear(self):
+        """不再编辑任何对象，丢弃尚未写回的修改"""
+        self._pending.clear()
+        self._flush_timer.stop()
+        self.path = None
+        self.path_label.clear()
+        self.stack.setCurrentWidget(self._empty)
+
+    def flush(self):
+        """
+        把尚未写回的修改一次性写回配置
+
+        Returns:
+            值被修改的顶层分区名集合
+        """
+        self._flush_timer.stop()
+        if not self._pending:
+            return set()
+        changes = []
+        for path, value in self._pending.items():
+            try:
+                self._resolve(path[:-1])[path[-1]]
+            except (KeyError, IndexError, TypeError):
+                continue  # 分区已被替换，路径不再存在
+            changes.append((path, value))
+        self._pending.clear()
+        sections = self.model.set_values(changes)
+        if sections:
+            self.sections_changed.emit(sections)
+        return sections
+
+    def _on_edited(self, form, key):
+        editor = form.editors[key]
+        if not editor.is_modified():
+            return
+        try:
+            value = editor.value()
+        except ValueError:
+            # 无法转换的输入恢复为原值
+            editor.set_value(editor.bound)
+            return
+        editor.bound = value
+        self._pending[form.parent_path + (key,)] = value
+        self._flush_timer.start()
+
+    def _resolve(self, path):
+        value = self.model.config
+        for key in path:
+            value = value[key]
+        return value
+
+    @staticmethod
+    def _keys(container):
+        if isinstance(container, dict):
+            return list(container)
+        if isinstance(container, (list, tuple)):
+            return list(range(len(container)))
+        raise TypeError("not a container")
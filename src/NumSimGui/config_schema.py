@@ -0,0 +1,258 @@
+"""
+求解器配置模式
+与求解器的 NumSimConfigSchema::GetSolverSchema() 相同的配置检查，GUI 在启动求解器之前调用，
+错误信息与求解器一致（"<路径>: <说明>"，如 "scheduler.num_threads: expected an integer"）。
+
+只检查求解器读取的顶层分区（scheduler、post、checkpoint 等），分区中未定义的键报告为 unknown key；
+其他顶层分区（GUI 设置、插件自己的分区）不检查。simulations 中每个仿真必须有 class，其余键属于插件。
+
+用法（在 src 目录下）：
+    python -m NumSimGui.config_schema NumSimSolver.json
+"""
+import argparse
+import json
+import math
+import sys
+
+MAX_UINT = 2 ** 32 - 1
+
+
+class Field:
+    """配置中的一个键"""
+
+    def __init__(self, name, type, required=False, minimum=-math.inf, maximum=math.inf, values=(), fields=(),
+                 open=False):
+        """
+        Args:
+            type: boolean、integer、number、string、string_array、object 或 map（以名称为键的对象集合）
+            values: 字符串允许的取值，为空时不限
+            fields: 对象的键，或 map 中每个对象的键
+            open: 对象（map 中的对象）是否允许 fields 以外的键
+        """
+        self.name = name
+        self.type = type
+        self.required = required
+        self.minimum = minimum
+        self.maximum = maximum
+        self.values = tuple(values)
+        self.fields = tuple(fields)
+        self.open = open
+
+
+def boolean(name):
+    return Field(name, "boolean")
+
+
+def integer(name, minimum=-math.inf, maximum=math.inf):
+    return Field(name, "integer", minimum=minimum, maximum=maximum)
+
+
+def number(name, minimum=-math.inf, maximum=math.inf):
+    return Field(name, "number", minimum=minimum, maximum=maximum)
+
+
+def string(name, values=()):
+    return Field(name, "string", values=values)
+
+
+def string_array(name):
+    return Field(name, "string_array")
+
+
+def object_(name, fields, open=False):
+    return Field(name, "object", fields=fields, open=open)
+
+
+def map_(name, fields, open=False):
+    return Field(name, "map", fields=fields, open=open)
+
+
+def required(field):
+    field.required = True
+    return field
+
+
+# 与 NumSimCore/NumSimConfigSchema.cpp 保持一致
+SOLVER_SCHEMA = (
+    object_("scheduler", [
+        string("mode", ("serial", "parallel")),
+        integer("num_threads", 0, MAX_UINT),
+        map_("simulations", [
+            string_array("depends_on"),
+            integer("step_interval", 0, MAX_UINT),
+        ]),
+    ]),
+    object_("post", [
+        string("mode", ("sync", "async")),
+        integer("buffers", 1, MAX_UINT),
+        integer("queue_size", 1, MAX_UINT),
+    ]),
+    object_("checkpoint", [
+        string("directory"),
+        integer("interval", 0),
+        number("wall_interval", 0.0),
+        integer("check_interval", 0),
+        integer("keep", 0, MAX_UINT),
+        string("io", ("per_rank", "mpiio")),
+        string("restart"),
+    ]),
+    object_("cache", [
+        boolean("enabled"),
+        string("directory"),
+        number("max_size_mb", 0.0),
+        string_array("inputs"),
+        string_array("outputs"),
+    ]),
+    object_("partition", [
+        string("method", ("rcb", "block")),
+    ]),
+    object_("comm", [
+        string("thread_level", ("single", "funneled", "serialized", "multiple")),
+        integer("ranks_per_node", 0, MAX_UINT),
+        integer("threads_per_rank", 0, MAX_UINT),
+    ]),
+    object_("profile", [
+        boolean("enabled"),
+        string("report"),
+        string("trace"),
+        integer("max_events", 0),
+    ]),
+    object_("telemetry", [
+        boolean("enabled"),
+        string("address"),
+        integer("port", 0, 65535),
+        string("port_file"),
+        integer("capacity", 1),
+    ]),
+    object_("plugins", [
+        string_array("directories"),
+        string("manifest"),
+    ]),
+    # 仿真的其他键属于其插件
+    map_("simulations", [
+        required(string("class")),
+    ], open=True),
+)
+
+
+class ConfigError(ValueError):
+    """配置不符合模式，errors 为全部错误"""
+
+    def __init__(self, errors):
+        super().__init__("Invalid NumSimSolver config:" + "".join(f"\n  {error}" for error in errors))
+        self.errors = list(errors)
+
+
+def _format_bound(bound):
+    if float(bound).is_integer() and abs(bound) < 1e15:
+        return str(int(bound))
+    return format(bound, "g")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_integer(value):
+    if isinstance(value, float):
+        return math.isfinite(value) and value.is_integer()
+    return _is_number(value)
+
+
+def _validate_object(field, data, path, errors):
+    for child in field.fields:
+        if child.name in data:
+            validate_value(child, data[child.name], f"{path}.{child.name}", errors)
+        elif child.required:
+            errors.append(f"{path}.{child.name}: missing required key")
+    if not field.open:
+        names = {child.name for child in field.fields}
+        errors.extend(f"{path}.{key}: unknown key" for key in data if key not in names)
+
+
+def validate_value(field, value, path, errors):
+    """按 field 检查一个值，每个错误以 "<路径>: <说明>" 追加到 errors"""
+    if hasattr(value, "tolist"):
+        # *.nsp 项目中的 NumPy 数组和标量
+        value = value.tolist()
+
+    if field.type == "boolean":
+        if not isinstance(value, bool):
+            errors.append(f"{path}: expected a boolean")
+    elif field.type in ("integer", "number"):
+        if not (_is_integer(value) if field.type == "integer" else _is_number(value)):
+            errors.append(f"{path}: expected {'an integer' if field.type == 'integer' else 'a number'}")
+        elif value < field.minimum:
+            errors.append(f"{path}: must be >= {_format_bound(field.minimum)}")
+        elif value > field.maximum:
+            errors.append(f"{path}: must be <= {_format_bound(field.maximum)}")
+    elif field.type == "string":
+        if not isinstance(value, str):
+            errors.append(f"{path}: expected a string")
+        elif field.values and value not in field.values:
+            errors.append(f"{path}: must be one of {', '.join(field.values)}")
+    elif field.type == "string_array":
+        if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+            errors.append(f"{path}: expected an array of strings")
+    elif not isinstance(value, dict):
+        errors.append(f"{path}: expected an object")
+    elif field.type == "object":
+        _validate_object(field, value, path, errors)
+    else:
+        for key, entry in value.items():
+            if isinstance(entry, dict):
+                _validate_object(field, entry, f"{path}.{key}", errors)
+            else:
+                errors.append(f"{path}.{key}: expected an object")
+
+
+def validate(config, schema=SOLVER_SCHEMA):
+    """返回配置的全部错误，配置有效时为空列表"""
+    errors = []
+    if not isinstance(config, dict):
+        return ["expected a JSON object"]
+    for section in schema:
+        if section.name in config:
+            validate_value(section, config[section.name], section.name, errors)
+        elif section.required:
+            errors.append(f"{section.name}: missing required key")
+    return errors
+
+
+def check(config, schema=SOLVER_SCHEMA):
+    """配置无效时抛出 ConfigError"""
+    errors = validate(config, schema)
+    if errors:
+        raise ConfigError(errors)
+
+
+def find_field(path, schema=SOLVER_SCHEMA):
+    """路径（键的元组）对应的 Field，模式中没有定义时返回 None"""
+    fields = schema
+    keys = iter(path)
+    for key in keys:
+        field = next((field for field in fields if field.name == key), None)
+        if field is None or field.type not in ("object", "map"):
+            return field if next(keys, None) is None else None
+        if field.type == "map" and next(keys, None) is None:
+            return field
+        fields = field.fields
+    return field if path else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检查 NumSimSolver 配置文件")
+    parser.add_argument("config", help="配置文件（NumSimSolver.json）")
+    args = parser.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        errors = validate(json.load(f))
+    for error in errors:
+        print(error)
+    if errors:
+        sys.exit(1)
+    print(f"Config OK: {args.config}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Visual View 共享数据集注册表
+以文件路径和修改时间为键缓存 VTK 数据集及其 LOD 表面，多个视图引用同一份数据。
+每个条目记录引用它的视图，不再被任何视图引用的条目按 LRU 顺序在超出内存预算时被淘汰。
+"""
+from collections import OrderedDict
+from pathlib import Path
+
+# 默认内存预算（字节）
+DEFAULT_MEMORY_BUDGET = 4 * 1024 ** 3
+
+
+def _data_object_memory(data_object):
+    """VTK 数据对象占用的内存（字节）"""
+    return data_object.GetActualMemorySize() * 1024
+
+
+class DatasetEntry:
+    """注册表中的一个数据集"""
+
+    def __init__(self, key, dataset, lod_levels):
+        self.key = key
+        self.dataset = dataset
+        self.lod_levels = lod_levels
+        self.views = set()
+        # 第 0 级 LOD 可能就是数据集本身（多边形数据），避免重复计算
+        objects = {id(dataset): dataset}
+        objects.update((id(level), level) for level in lod_levels)
+        self.memory_size = sum(_data_object_memory(obj) for obj in objects.values())
+
+
+class DatasetRegistry:
+    """按 (路径, 修改时间) 共享数据集，按视图引用计数，超出内存预算时 LRU 淘汰"""
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self._entries = OrderedDict()  # 从最久未使用到最近使用
+
+    @staticmethod
+    def file_key(path):
+        """文件数据集的键；文件不存在时返回 None"""
+        try:
+            resolved = Path(path).resolve()
+            return ("file", str(resolved), resolved.stat().st_mtime_ns)
+        except OSError:
+            return None
+
+    @staticmethod
+    def memory_key(dataset):
+        """内存中构建的数据集（没有对应文件）的键"""
+        return ("memory", id(dataset))
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_memory(self):
+        return sum(entry.memory_size for entry in self._entries.values())
+
+    def get(self, key):
+        """查找条目并将其标记为最近使用"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def add(self, key, dataset, lod_levels):
+        """登记数据集（键已存在时返回已有条目）"""
+        entry = self.get(key)
+        if entry is None:
+            entry = DatasetEntry(key, dataset, lod_levels)
+            self._entries[key] = entry
+            # 新条目尚未被视图引用，淘汰时跳过它，以便调用方随后 acquire
+            self.evict(protect=key)
+        return entry
+
+    def acquire(self, key, view_id):
+        """视图开始引用条目"""
+        entry = self.get(key)
+        if entry is None:
+            raise KeyError(f"数据集未登记: {key}")
+        entry.views.add(view_id)
+        return entry
+
+    def release(self, key, view_id):
+        """视图不再引用条目，随后按内存预算淘汰"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.views.discard(view_id)
+            self.evict()
+
+    def set_memory_budget(self, memory_budget):
+        self.memory_budget = memory_budget
+        self.evict()
+
+    def key_of(self, dataset):
+        """查找已登记数据集对象的键"""
+        for key, entry in self._entries.items():
+            if entry.dataset is dataset:
+                return key
+        return None
+
+    def evict(self, protect=None):
+        """超出内存预算时，从最久未使用的未引用条目开始淘汰"""
+        total = self.total_memory
+        for key in list(self._entries):
+            if total <= self.memory_budget:
+                break
+            entry = self._entries[key]
+            if entry.views or key == protect:
+                continue
+            total -= entry.memory_size
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,203 @@
+"""
+后台加载服务
+在 QThreadPool 中解析项目文件、读取网格并构建 VTK 数据集（含 LOD 金字塔），
+通过 Qt 信号报告进度、取消和完成，GUI 线程只负责接收结果并显示。
+"""
+import threading
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+# 可通过 VTK 读取器加载的文件后缀
+VTK_READER_SUFFIXES = {".vtu", ".vtp", ".vts", ".vtr", ".vti", ".vtm", ".vtk"}
+
+
+class LoadCancelled(Exception):
+    """加载任务被取消"""
+
+
+class LoadResult:
+    """加载结果"""
+
+    def __init__(self, path, kind, data, lod_levels=None):
+        self.path = path
+        self.kind = kind  # "project" 或 "dataset"
+        self.data = data  # 项目字典或 vtkDataObject
+        self.lod_levels = lod_levels
+
+
+class LoadSignals(QObject):
+    """加载任务的信号（在 GUI 线程中创建，跨线程发射时自动排队）"""
+    progress = Signal(int, str)
+    finished = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class LoadTask(QRunnable):
+    """单个后台加载任务"""
+
+    def __init__(self, path, loader):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.path = str(path)
+        self.loader = loader
+        self.signals = LoadSignals()
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+
+    def cancel(self):
+        """请求取消，正在执行的 VTK 算法会在下一次进度回调时中止"""
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def wait(self, timeout=None):
+        """等待任务结束（主要用于测试和关闭窗口时）"""
+        return self._done_event.wait(timeout)
+
+    def report(self, percent, message=""):
+        """报告进度，同时检查是否已被取消"""
+        self.check_cancelled()
+        self.signals.progress.emit(int(percent), message)
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise LoadCancelled()
+
+    def run_algorithm(self, algorithm, start, end, message):
+        """执行 VTK 算法，将其进度映射到 [start, end] 并支持中途取消"""
+        def on_progress(caller, event):
+            if self._cancel_event.is_set():
+                caller.SetAbortExecute(1)
+                return
+            self.signals.progress.emit(int(start + (end - start) * caller.GetProgress()), message)
+
+        observer = algorithm.AddObserver("ProgressEvent", on_progress)
+        try:
+            algorithm.Update()
+        finally:
+            algorithm.RemoveObserver(observer)
+        self.check_cancelled()
+        return algorithm.GetOutputDataObject(0)
+
+    def run(self):
+        try:
+            self.check_cancelled()
+            result = self.loader(self.path, self)
+            self.check_cancelled()
+            self.signals.progress.emit(100, "")
+            self.signals.finished.emit(result)
+        except LoadCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        finally:
+            self._done_event.set()
+
+
+def load_project(path, task):
+    """在后台线程中读取项目文件（JSON 或二进制格式）"""
+    from .project_format import read_project
+    
+    task.report(0, "读取项目")
+    return LoadResult(path, "project", read_project(path))
+
+
+def _build_lod(dataset, task, start):
+    """计算包围盒并构建 LOD 金字塔，避免 GUI 线程首次显示时遍历全部数据"""
+    from .vtk_lod import build_lod_levels
+
+    task.report(start, "计算包围盒")
+    dataset.GetBounds()
+    task.report(start + 5, "构建 LOD")
+    levels = build_lod_levels(dataset)
+    for level in levels:
+        level.GetBounds()
+    return levels
+
+
+def load_native_mesh(path, task):
+    """在后台线程中映射原生网格文件并构建 VTK 数据集"""
+    from . import mesh_file
+
+    task.report(0, "映射网格文件")
+    mesh = mesh_file.open_mesh(path)
+    task.report(10, "构建数据集")
+    dataset = mesh.to_vtk()
+    return LoadResult(path, "dataset", dataset, _build_lod(dataset, task, 30))
+
+
+def load_vtk_file(path, task):
+    """在后台线程中使用 VTK 读取器加载数据集"""
+    from .vtk_mesh import create_vtk_reader
+
+    reader = create_vtk_reader(path)
+    dataset = task.run_algorithm(reader, 0, 60, "读取数据集")
+    if dataset is None:
+        raise ValueError(f"无法读取数据集: {path}")
+
+    return LoadResult(path, "dataset", dataset, _build_lod(dataset, task, 60))
+
+
+def select_loader(path):
+    """根据文件内容或后缀选择加载函数"""
+    from . import mesh_file
+
+    if mesh_file.is_mesh_file(path):
+        return load_native_mesh
+    if Path(path).suffix.lower() in VTK_READER_SUFFIXES:
+        return load_vtk_file
+    return load_project
+
+
+class LoaderService(QObject):
+    """基于 QThreadPool 的后台加载服务"""
+
+    def __init__(self, parent=None, max_threads=None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        if max_threads:
+            self.thread_pool.setMaxThreadCount(max_threads)
+        self._tasks = []
+
+    def submit(self, path, loader=None) -> LoadTask:
+        """
+        提交加载任务
+
+        Args:
+            path: 文件路径
+            loader: 加载函数 loader(path, task) -> LoadResult，缺省时根据文件自动选择
+
+        Returns:
+            LoadTask，调用方应在启动前连接其 signals
+        """
+        task = LoadTask(path, loader or select_loader(path))
+        self._tasks.append(task)
+        task.signals.finished.connect(lambda *_, t=task: self._forget(t))
+        task.signals.failed.connect(lambda *_, t=task: self._forget(t))
+        task.signals.cancelled.connect(lambda t=task: self._forget(t))
+        return task
+
+    def start(self, task):
+        self.thread_pool.start(task)
+
+    def _forget(self, task):
+        if task in self._tasks:
+            self._tasks.remove(task)
+
+    @property
+    def active_tasks(self):
+        return list(self._tasks)
+
+    def cancel_all(self):
+        for task in self._tasks:
+            task.cancel()
+
+    def shutdown(self, timeout_ms=5000):
+        """取消全部任务并等待线程池退出"""
+        self.cancel_all()
+        self.thread_pool.clear()
+        self.thread_pool.waitForDone(timeout_ms)
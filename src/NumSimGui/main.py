@@ -2,14 +2,9 @@
 NumSimGui 主程序入口
 """
 import sys
-import os
-from pathlib import Path
 from PySide6.QtWidgets import QApplication
 
-# 添加当前目录到路径，以便导入模块
-sys.path.insert(0, str(Path(__file__).parent))
-
-from main_window import MainWindow
+from .main_window import MainWindow
 
 
 def main():
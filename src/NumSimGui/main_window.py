@@ -4,207 +4,61 @@ NumSimGui 主窗口
 """
 from PySide6.QtWidgets import (
     QMainWindow, QMenuBar, QStatusBar, QDockWidget,
-    QWidget, QMessageBox, QFileDialog, QApplication, QTreeWidget, QTreeWidgetItem, QVBoxLayout,
-    QLabel, QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QFormLayout, QScrollArea, QToolBar, QPushButton,
-    QTabWidget
+    QWidget, QMessageBox, QFileDialog, QApplication, QVBoxLayout,
+    QLabel, QScrollArea, QToolBar, QPushButton,
+    QTabWidget, QProgressBar
 )
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont, QPainter, QColor, QAction, QKeySequence, QIcon, QPixmap
 from pathlib import Path
-import json
+import importlib.util
 from datetime import datetime
 
-# VTK 导入
-try:
-    from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
-    import vtk
-    VTK_AVAILABLE = True
-    
-    # 创建自定义错误输出窗口来过滤关闭时的OpenGL错误
-    class FilteredVTKOutputWindow(vtk.vtkOutputWindow):
-        def __init__(self):
-            super().__init__()
-            self._closing = False
-        
-        def DisplayErrorText(self, text):
-            # 如果正在关闭，忽略所有OpenGL相关错误
-            if self._closing:
-                if "wglMakeCurrent failed" in text or "句柄无效" in text or "error: 6" in text:
-                    return
-            # 正常情况下的错误仍然输出
-            super().DisplayErrorText(text)
-        
-        def DisplayWarningText(self, text):
-            # 警告也过滤关闭时的错误
-            if self._closing:
-                if "wglMakeCurrent failed" in text or "句柄无效" in text:
-                    return
-            super().DisplayWarningText(text)
-        
-        def DisplayGenericWarningText(self, text):
-            if self._closing:
-                if "wglMakeCurrent failed" in text or "句柄无效" in text:
-                    return
-            super().DisplayGenericWarningText(text)
-        
-        def DisplayDebugText(self, text):
-            if self._closing:
-                if "wglMakeCurrent failed" in text or "句柄无效" in text:
-                    return
-            super().DisplayDebugText(text)
-        
-        def set_closing(self, closing):
-            self._closing = closing
-    
-    # 创建并设置自定义错误输出窗口
-    _filtered_output = FilteredVTKOutputWindow()
-    vtk.vtkOutputWindow.SetInstance(_filtered_output)
-    
-except ImportError:
-    VTK_AVAILABLE = False
+from .loader_service import LoaderService
+from .dataset_registry import DatasetRegistry
+from .project_store import APPLICATION_NAME, FORMAT_VERSION, ProjectAutosave, ProjectStore
+from .config_editor import ConfigPanel
+from .setting_view import SettingView
+from .view_manager import ViewManager
+
+# VTK 在首次显示 Visual View 时才导入（见 load_vtk_view），这里只检查是否已安装
+VTK_AVAILABLE = importlib.util.find_spec("vtkmodules") is not None
+_vtk_view = None
+
+
+def load_vtk_view():
+    """导入 VTK 渲染组件模块（只在第一次调用时真正导入），VTK 不可用时返回 None"""
+    global VTK_AVAILABLE, _vtk_view
+    if _vtk_view is None and VTK_AVAILABLE:
+        try:
+            from . import vtk_view
+            _vtk_view = vtk_view
+        except ImportError:
+            VTK_AVAILABLE = False
+            print("警告: VTK 未安装，Visual View 将使用占位符")
+    return _vtk_view
+
+
+if not VTK_AVAILABLE:
     print("警告: VTK 未安装，Visual View 将使用占位符")
-    _filtered_output = None
 
 
-class DelayedVTKWidget(QVTKRenderWindowInteractor if VTK_AVAILABLE else QWidget):
-    """延迟初始化的VTK Widget"""
+class LazyViewHost(QWidget):
+    """Visual View 中 VTK 视图的容器，第一次显示时才创建 VTK widget"""
     
-    def __init__(self, parent=None):
-        if VTK_AVAILABLE:
-            super().__init__(parent)
-            self._vtk_initialized = False
-            self._renderer = None
-            self._actor = None
-        else:
-            QWidget.__init__(self, parent)
+    def __init__(self, on_first_show, parent=None):
+        super().__init__(parent)
+        self._on_first_show = on_first_show
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
     
     def showEvent(self, event):
-        """重写showEvent，延迟初始化VTK"""
-        if VTK_AVAILABLE and not self._vtk_initialized:
-            super().showEvent(event)
-            # 使用QTimer延迟初始化，确保窗口完全显示
-            QTimer.singleShot(100, self._initialize_vtk)
-        else:
-            if VTK_AVAILABLE:
-                super().showEvent(event)
-            else:
-                QWidget.showEvent(self, event)
-    
-    def resizeEvent(self, event):
-        """重写resizeEvent，更新VTK窗口大小"""
-        if VTK_AVAILABLE and self._vtk_initialized:
-            super().resizeEvent(event)
-            if self.width() > 0 and self.height() > 0:
-                try:
-                    render_window = self.GetRenderWindow()
-                    if render_window:
-                        render_window.SetSize(self.width(), self.height())
-                except:
-                    pass
-        else:
-            if VTK_AVAILABLE:
-                super().resizeEvent(event)
-            else:
-                QWidget.resizeEvent(self, event)
-    
-    def closeEvent(self, event):
-        """重写closeEvent，清理VTK资源"""
-        # 先标记为已关闭，防止后续操作
-        self._vtk_initialized = False
-        
-        if VTK_AVAILABLE:
-            try:
-                # 停止交互（如果已初始化）
-                if hasattr(self, 'Stop'):
-                    try:
-                        self.Stop()
-                    except:
-                        pass
-                
-                # 清理渲染窗口
-                try:
-                    render_window = self.GetRenderWindow()
-                    if render_window:
-                        # 禁用渲染窗口，避免后续操作
-                        try:
-                            # 设置窗口为未映射状态
-                            render_window.SetMapped(0)
-                            # 移除所有渲染器
-                            render_window.RemoveAllRenderers()
-                            # 禁用渲染
-                            render_window.SetOffScreenRendering(1)
-                            # 释放窗口资源
-                            render_window.SetWindowId(None)
-                        except:
-                            pass
-                except:
-                    pass
-            except Exception:
-                # 忽略所有清理错误
-                pass
-        QWidget.closeEvent(self, event)
-    
-    def cleanup_vtk(self):
-        """清理VTK资源（在窗口销毁前调用）"""
-        if VTK_AVAILABLE and self._vtk_initialized:
-            try:
-                # 停止交互
-                if hasattr(self, 'Stop'):
-                    try:
-                        self.Stop()
-                    except:
-                        pass
-                
-                # 清理渲染窗口
-                try:
-                    render_window = self.GetRenderWindow()
-                    if render_window:
-                        render_window.RemoveAllRenderers()
-                        render_window.Finalize()
-                except:
-                    pass
-                
-                self._vtk_initialized = False
-            except:
-                pass
-    
-    def _initialize_vtk(self):
-        """初始化VTK渲染"""
-        if not VTK_AVAILABLE or self._vtk_initialized:
-            return
-        
-        try:
-            # 确保widget已经显示且大小有效
-            if not self.isVisible() or self.width() <= 0 or self.height() <= 0:
-                # 如果widget不可见或大小无效，再延迟一次
-                QTimer.singleShot(100, self._initialize_vtk)
-                return
-            
-            # 确保widget的父widget也已经显示（特别是tab widget）
-            parent = self.parent()
-            while parent:
-                if hasattr(parent, 'isVisible') and not parent.isVisible():
-                    QTimer.singleShot(100, self._initialize_vtk)
-                    return
-                parent = parent.parent()
-            
-            # 设置窗口大小
-            if self.width() > 0 and self.height() > 0:
-                self.GetRenderWindow().SetSize(self.width(), self.height())
-            
-            # 初始化交互（只在窗口完全准备好后）
-            if not self._vtk_initialized:
-                self.Initialize()
-                self.Start()
-                
-                # 触发渲染
-                self.GetRenderWindow().Render()
-                
-                self._vtk_initialized = True
-        except Exception as e:
-            print(f"警告: VTK初始化失败: {e}")
-            # 如果初始化失败，标记为已初始化以避免无限重试
-            self._vtk_initialized = True
+        super().showEvent(event)
+        if self._on_first_show:
+            callback, self._on_first_show = self._on_first_show, None
+            # 先完成窗口绘制，再导入VTK并创建视图
+            QTimer.singleShot(0, callback)
 
 
 class QtLogoWidget(QWidget):
@@ -252,11 +106,31 @@ class MainWindow(QMainWindow):
         self.version = "1.0.0"  # 版本号
         self.setting_view_dock = None  # Setting View dock widget
         self.config_dock = None  # 配置 dock widget
+        self.config_panel = None  # 配置 dock widget 中缓存的表单
+        self.setting_view = None  # Setting View 中的配置树和搜索
         self.setting_tree = None  # Setting View 中的树形控件
         self.visual_view_tab_widget = None  # Visual View tab widget
         self.visual_view_counter = 0  # Visual View 计数器（从1开始）
         # VTK 相关引用（存储所有VTK widget的引用）
         self.vtk_widgets = {}  # 存储每个Visual View的VTK widget
+        self.vtk_view_hosts = {}  # 尚未创建VTK widget的Visual View容器（首次显示时创建）
+        self.view_manager = ViewManager()  # 隐藏视图挂起渲染，限制同时持有GL上下文的视图数
+        self.dataset_registry = DatasetRegistry()  # 各Visual View共享的数据集及LOD表面
+        self.placeholder_source = None  # 各Visual View共享的示例几何体数据源
+        self.frame_budget = None  # 交互时的帧时间预算（秒），None 表示使用 vtk_lod.DEFAULT_FRAME_BUDGET
+        self.frame_time_label = None  # 状态栏中的帧时间显示
+        self.loader_service = LoaderService(self)  # 后台加载服务
+        self.load_progress_bar = None  # 状态栏中的加载进度条
+        self.load_cancel_button = None  # 状态栏中的取消加载按钮
+        self.project_store = None  # 当前项目的分区存储
+        # 后台自动保存（每次保存前在GUI线程中收集软件数据）
+        self.project_autosave = ProjectAutosave(self, collect=self._collect_for_autosave)
+        self.project_autosave.saved.connect(
+            lambda path: self.statusBar().showMessage(f"已自动保存: {path}", 3000)
+        )
+        self.project_autosave.failed.connect(
+            lambda message: self.statusBar().showMessage(f"自动保存失败: {message}", 5000)
+        )
         self.init_ui()
         
     def init_ui(self):
@@ -401,6 +275,20 @@ class MainWindow(QMainWindow):
         new_visual_view_action.triggered.connect(self.new_visual_view)
         view_menu.addAction(new_visual_view_action)
         
+        # Run Monitor
+        run_monitor_action = QAction("Run Monitor", self)
+        run_monitor_action.triggered.connect(self.show_run_monitor)
+        view_menu.addAction(run_monitor_action)
+        
+        # Tools 菜单
+        tools_menu = menubar.addMenu("Tools")
+        sweep_action = QAction("参数扫描", self)
+        sweep_action.triggered.connect(self.show_sweep_dialog)
+        tools_menu.addAction(sweep_action)
+        profile_action = QAction("性能分析", self)
+        profile_action.triggered.connect(self.show_profile_dialog)
+        tools_menu.addAction(profile_action)
+        
         # Help 菜单
         help_menu = menubar.addMenu("Help")
         help_action = help_menu.addAction("Help")
@@ -439,23 +327,15 @@ class MainWindow(QMainWindow):
             if reply == QMessageBox.No:
                 return
         
-        # 创建版本信息
-        version_info = {
-            "version": self.version,
-            "created": datetime.now().isoformat(),
-            "modified": datetime.now().isoformat(),
-            "application": "NumSimSolver",
-            "format_version": "1.0"
-        }
-        
         try:
-            # 写入 JSON 文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(version_info, f, indent=4, ensure_ascii=False)
+            # 创建版本信息并写入 JSON 文件
+            store = ProjectStore.create(file_path, self.version)
+            store.commit(force=True)
+            self.set_project_store(store)
             
             # 更新当前文件路径（保存为字符串，方便后续使用）
             self.current_file_path = str(file_path)
-            
+
             # 更新窗口标题
             self.setWindowTitle(f"NumSimSolver - {file_path.name}")
             
@@ -483,64 +363,139 @@ class MainWindow(QMainWindow):
             self,
             "打开文件",
             "",
-            "JSON 文件 (*.json);;所有文件 (*.*)"
+            "项目文件 (*.json *.nsp);;网格文件 (*.nsm *.vtu *.vtp *.vtk);;所有文件 (*.*)"
         )
         if file_path:
+            # 在后台线程中解析和构建，完成后由 on_load_finished 恢复状态
+            self.load_file_in_background(file_path)
+    
+    def open_mesh_file(self, file_path, view_id=None):
+        """在后台加载网格文件（原生 *.nsm 或 VTK 格式）并显示在 Visual View 中"""
+        return self.load_file_in_background(file_path, view_id)
+    
+    def load_file_in_background(self, file_path, view_id=None):
+        """提交后台加载任务，进度显示在状态栏，完成后在GUI线程中显示结果"""
+        # 同一文件（路径和修改时间均相同）已被其他视图加载时直接共享
+        dataset_key = DatasetRegistry.file_key(file_path)
+        entry = self.dataset_registry.get(dataset_key) if dataset_key else None
+        if entry is not None:
+            self.show_dataset(entry.dataset, view_id, key=dataset_key)
+            self.statusBar().showMessage(f"已打开: {file_path}（共享已加载的数据）", 3000)
+            return None
+        
+        task = self.loader_service.submit(file_path)
+        task.signals.progress.connect(self.on_load_progress)
+        task.signals.finished.connect(
+            lambda result, vid=view_id, key=dataset_key: self.on_load_finished(result, vid, key)
+        )
+        task.signals.failed.connect(lambda message, path=file_path: self.on_load_failed(path, message))
+        task.signals.cancelled.connect(self.on_load_cancelled)
+        
+        if self.load_progress_bar:
+            self.load_progress_bar.setValue(0)
+            self.load_progress_bar.setVisible(True)
+            self.load_cancel_button.setVisible(True)
+        self.statusBar().showMessage(f"正在加载: {file_path}")
+        
+        self.loader_service.start(task)
+        return task
+    
+    def on_load_progress(self, percent, message):
+        """更新加载进度"""
+        if self.load_progress_bar:
+            self.load_progress_bar.setValue(percent)
+            if message:
+                self.load_progress_bar.setFormat(f"{message} %p%")
+    
+    def on_load_finished(self, result, view_id=None, dataset_key=None):
+        """后台加载完成（在GUI线程中执行）"""
+        self._update_load_progress_visibility()
+        
+        if result.kind == "project":
             # 设置当前文件路径
-            self.current_file_path = file_path
-            
+            self.current_file_path = result.path
+            self.set_project_store(ProjectStore(result.path, result.data))
+
             # 更新窗口标题
-            file_name = Path(file_path).name
+            file_name = Path(result.path).name
             self.setWindowTitle(f"NumSimSolver - {file_name}")
             
-            # TODO: 实现打开文件逻辑，加载数据
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                # TODO: 根据加载的数据恢复应用程序状态
-                self.statusBar().showMessage(f"已打开: {file_path}", 3000)
-            except Exception as e:
-                QMessageBox.critical(
-                    self,
-                    "错误",
-                    f"打开文件失败:\n{str(e)}"
-                )
+            # TODO: 根据加载的数据恢复应用程序状态
+            self.statusBar().showMessage(f"已打开: {result.path}", 3000)
+            return
+        
+        if load_vtk_view() is not None:
+            from .vtk_lod import build_lod_levels
+            
+            if dataset_key is None:
+                dataset_key = DatasetRegistry.memory_key(result.data)
+            self.dataset_registry.add(dataset_key, result.data, result.lod_levels or build_lod_levels(result.data))
+            self.show_dataset(result.data, view_id, key=dataset_key)
+        
+        message = f"已打开: {result.path}"
+        if result.data.IsA("vtkDataSet"):
+            message += f" ({result.data.GetNumberOfPoints()} 点, {result.data.GetNumberOfCells()} 单元)"
+        self.statusBar().showMessage(message, 3000)
+    
+    def on_load_failed(self, file_path, message):
+        """后台加载失败"""
+        self._update_load_progress_visibility()
+        self.statusBar().clearMessage()
+        QMessageBox.critical(
+            self,
+            "错误",
+            f"打开文件失败:\n{file_path}\n{message}"
+        )
+    
+    def on_load_cancelled(self):
+        """后台加载被取消"""
+        self._update_load_progress_visibility()
+        self.statusBar().showMessage("加载已取消", 3000)
+    
+    def cancel_loading(self):
+        """取消所有正在进行的后台加载"""
+        self.loader_service.cancel_all()
+    
+    def _update_load_progress_visibility(self):
+        """没有进行中的加载任务时隐藏进度条"""
+        if self.load_progress_bar and not self.loader_service.active_tasks:
+            self.load_progress_bar.setVisible(False)
+            self.load_cancel_button.setVisible(False)
             
+    def set_project_store(self, store):
+        """切换当前项目存储并启用自动保存"""
+        if self.config_panel is not None:
+            # 尚未写回的修改属于之前的项目
+            self.config_panel.flush()
+        if self.project_store is not None and self.project_store is not store:
+            self.project_autosave.set_store(None)
+        self.project_store = store
+        self.project_autosave.set_store(store)
+        if self.setting_view is not None:
+            self.setting_view.set_config(store.sections() if store is not None else {})
+    
+    def update_project_sections(self, sections):
+        """更新当前项目的分区，Setting View 只刷新变化的分区"""
+        if self.config_panel is not None:
+            self.config_panel.flush()
+        self.project_store.update(sections)
+        if self.setting_view is not None:
+            self.setting_view.update_sections(sections)
+        if self.config_panel is not None:
+            self.config_panel.refresh()
+    
     def save_file(self):
-        """保存文件"""
-        if self.current_file_path:
+        """保存文件（只写入有修改的分区）"""
+        if self.project_store is not None:
             try:
-                # 读取现有文件内容（如果存在）
-                existing_data = {}
-                file_path = Path(self.current_file_path)
-                if file_path.exists():
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            existing_data = json.load(f)
-                    except:
-                        pass  # 如果读取失败，使用空字典
-                
-                # 收集需要保存的软件数据
-                software_data = self._collect_software_data()
-                
-                # 合并数据（保留版本信息，更新修改时间和数据）
-                save_data = {
-                    **existing_data,  # 保留原有数据
-                    **software_data,  # 添加/更新软件数据
-                    "modified": datetime.now().isoformat(),  # 更新修改时间
-                }
+                # 收集需要保存的软件数据，只有发生变化的分区会被重新序列化
+                self.update_project_sections(self._collect_software_data())
                 
                 # 如果原有数据中没有版本信息，添加它
-                if "version" not in save_data:
-                    save_data["version"] = self.version
-                if "application" not in save_data:
-                    save_data["application"] = "NumSimSolver"
-                if "format_version" not in save_data:
-                    save_data["format_version"] = "1.0"
+                self.project_store.ensure_header(self.version)
                 
-                # 写入文件
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(save_data, f, indent=4, ensure_ascii=False)
+                # 原子写入文件
+                self.project_store.commit()
                 
                 self.statusBar().showMessage(f"已保存: {self.current_file_path}", 3000)
             except Exception as e:
@@ -552,7 +507,7 @@ class MainWindow(QMainWindow):
         else:
             # 如果没有当前文件路径，调用另存为
             self.save_file_as()
-            
+    
     def save_file_as(self):
         """另存为"""
         # 如果已有文件路径，使用其目录作为默认路径
@@ -560,17 +515,17 @@ class MainWindow(QMainWindow):
         if self.current_file_path:
             default_path = str(Path(self.current_file_path).parent)
         
-        file_path, _ = QFileDialog.getSaveFileName(
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "另存为",
             default_path,
-            "JSON 文件 (*.json);;所有文件 (*.*)"
+            "JSON 文件 (*.json);;二进制项目文件 (*.nsp);;所有文件 (*.*)"
         )
         if file_path:
-            # 确保文件扩展名是 .json
-            if not file_path.endswith('.json'):
-                file_path += '.json'
-            
+            # 确保文件扩展名是 .json 或 .nsp（写入格式由扩展名决定）
+            if not file_path.endswith(('.json', '.nsp')):
+                file_path += '.nsp' if '*.nsp' in selected_filter else '.json'
+
             # 设置当前文件路径
             self.current_file_path = file_path
             
@@ -578,24 +533,20 @@ class MainWindow(QMainWindow):
             file_name = Path(file_path).name
             self.setWindowTitle(f"NumSimSolver - {file_name}")
             
-            # 保存数据（复用 save_file 的逻辑）
             try:
-                # 收集需要保存的软件数据
-                software_data = self._collect_software_data()
-                
-                # 创建保存数据
-                save_data = {
-                    **software_data,
+                # 保留当前项目的全部分区，更新软件数据和版本信息
+                store = self.project_store or ProjectStore.create(file_path, self.version)
+                store.update(self._collect_software_data())
+                store.update({
                     "version": self.version,
                     "created": datetime.now().isoformat(),
-                    "modified": datetime.now().isoformat(),
-                    "application": "NumSimSolver",
-                    "format_version": "1.0"
-                }
-                
-                # 写入文件
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(save_data, f, indent=4, ensure_ascii=False)
+                    "application": APPLICATION_NAME,
+                    "format_version": FORMAT_VERSION
+                })
+
+                # 写入新文件（原子替换），之后的保存和自动保存都写入新文件
+                store.commit(file_path, force=True)
+                self.set_project_store(store)
                 
                 self.statusBar().showMessage(f"已保存: {file_path}", 3000)
             except Exception as e:
@@ -604,14 +555,24 @@ class MainWindow(QMainWindow):
                     "错误",
                     f"保存文件失败:\n{str(e)}"
                 )
-    
+
+    def _collect_for_autosave(self):
+        """自动保存前写入软件数据，经 update_project_sections 同时刷新 Setting View，因此不再返回分区"""
+        if self.project_store is not None:
+            self.update_project_sections(self._collect_software_data())
+        return {}
+
     def _collect_software_data(self):
-        """收集需要保存的软件数据"""
+        """
+        收集需要保存的软件数据
+
+        只包含由界面状态生成的分区；settings 等求解器配置分区由 Setting View 和 Configuration 面板编辑，
+        不在这里覆盖。
+        """
         data = {
             # 可以在这里添加需要保存的数据
-            # 例如：设置、视图状态、模型数据等
+            # 例如：视图状态、模型数据等
             "visual_views": [],
-            "settings": {},
         }
         
         # 收集 Visual View 信息
@@ -655,23 +616,12 @@ class MainWindow(QMainWindow):
             self.visual_view_tab_widget.setTabsClosable(tab_count > 1)
     
     def on_tab_changed(self, index):
-        """处理tab切换事件，确保VTK widget正确初始化"""
+        """处理tab切换事件：挂起之前的视图，恢复（必要时重新初始化）当前视图"""
         if index < 0 or not self.visual_view_tab_widget:
             return
         
-        widget = self.visual_view_tab_widget.widget(index)
-        if widget and VTK_AVAILABLE:
-            # 查找VTK widget
-            vtk_widget = None
-            for child in widget.findChildren(DelayedVTKWidget if VTK_AVAILABLE else QWidget):
-                if isinstance(child, DelayedVTKWidget):
-                    vtk_widget = child
-                    break
-            
-            # 如果VTK widget存在但未初始化，触发初始化
-            if vtk_widget and not getattr(vtk_widget, '_vtk_initialized', False):
-                # 延迟触发初始化
-                QTimer.singleShot(200, vtk_widget._initialize_vtk)
+        # 尚未首次显示的视图还没有创建VTK widget，创建后由 ensure_vtk_view 登记并激活
+        self.view_manager.activate(self.visual_view_tab_widget.tabText(index))
     
     def close_visual_view_tab(self, index):
         """关闭 Visual View tab"""
@@ -681,10 +631,13 @@ class MainWindow(QMainWindow):
             tab_title = self.visual_view_tab_widget.tabText(index)
             self.visual_view_tab_widget.removeTab(index)
             # 清理 VTK widget
+            self.vtk_view_hosts.pop(tab_title, None)
+            self.view_manager.remove(tab_title)
             if widget:
                 # 查找并清理 VTK widget引用
                 if tab_title in self.vtk_widgets:
-                    del self.vtk_widgets[tab_title]
+                    vtk_data = self.vtk_widgets.pop(tab_title)
+                    self._release_view_dataset(vtk_data, tab_title)
                 widget.deleteLater()
             
             # 更新关闭按钮状态
@@ -709,8 +662,15 @@ class MainWindow(QMainWindow):
         self.visual_view_counter += 1
         title = f"Visual View {self.visual_view_counter}"
         
+        # 新视图默认显示当前视图的数据集（共享同一份数据，用于对比）
+        current_data = self.get_current_vtk_data()
+        current_key = current_data.get('dataset_key') if current_data else None
+        current_entry = self.dataset_registry.get(current_key) if current_key else None
+        
         # 创建新的 Visual View widget
         view_widget = self.create_visual_view_widget(view_id=title)
+        if current_entry is not None:
+            self.show_dataset(current_entry.dataset, title, key=current_key)
         
         # 添加到 tab widget
         self.visual_view_tab_widget.addTab(view_widget, title)
@@ -721,6 +681,44 @@ class MainWindow(QMainWindow):
         # 更新关闭按钮状态（现在有多个tab，应该显示关闭按钮）
         self.update_tab_close_buttons()
             
+    def show_run_monitor(self):
+        """显示运行监视停靠窗口（第一次显示时创建）"""
+        if getattr(self, "run_monitor_dock", None) is None:
+            # 运行监视依赖 numpy 和 QtNetwork，第一次使用时才导入
+            from .telemetry_dock import TelemetryDock
+            
+            default_dir = str(Path(self.current_file_path).parent) if self.current_file_path else ""
+            self.run_monitor_dock = TelemetryDock(default_dir, self)
+            self.addDockWidget(Qt.BottomDockWidgetArea, self.run_monitor_dock)
+        self.run_monitor_dock.show()
+        self.run_monitor_dock.raise_()
+    
+    def show_sweep_dialog(self):
+        """以当前项目为基础项目打开参数扫描对话框"""
+        if self.project_store is None:
+            QMessageBox.information(self, "参数扫描", "请先新建或打开项目")
+            return
+        
+        # 对话框在第一次使用时才导入
+        from .sweep_dialog import SweepDialog
+        
+        self.update_project_sections(self._collect_software_data())
+        project_path = Path(self.current_file_path)
+        output_dir = project_path.parent / f"{project_path.stem}_sweep"
+        dialog = SweepDialog(self.project_store.sections(), str(output_dir), self, base_dir=str(project_path.parent))
+        dialog.exec()
+    
+    def show_profile_dialog(self):
+        """打开性能分析对话框，显示求解器输出的计时报告和 trace"""
+        # 对话框在第一次使用时才导入
+        from .profile_view import ProfileDialog
+        
+        if getattr(self, "_profile_dialog", None) is None:
+            default_dir = str(Path(self.current_file_path).parent) if self.current_file_path else ""
+            self._profile_dialog = ProfileDialog(default_dir, self)
+        self._profile_dialog.show()
+        self._profile_dialog.raise_()
+    
     def show_help(self):
         """显示帮助对话框"""
         QMessageBox.information(
@@ -776,71 +774,34 @@ class MainWindow(QMainWindow):
         self.config_dock.setVisible(False)  # 初始隐藏
         
     def create_setting_view_dock(self) -> QDockWidget:
-        """创建 Setting View 停靠窗口（带树形控件）"""
+        """创建 Setting View 停靠窗口（以项目配置为数据源的树形视图）"""
         dock = QDockWidget("Setting View", self)
         dock.setAllowedAreas(
             Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea |
             Qt.TopDockWidgetArea | Qt.BottomDockWidgetArea
         )
         
-        # 创建内容组件容器
-        container = QWidget()
-        layout = QVBoxLayout()
-        layout.setContentsMargins(0, 0, 0, 0)
-        
-        # 创建树形控件
-        tree = QTreeWidget()
-        tree.setHeaderHidden(True)  # 隐藏 header
-        tree.setStyleSheet("""
-            QTreeWidget {
-                background-color: white;
-                border: none;
-            }
-        """)
+        # 节点按需创建，数万个设置项的配置也能立即展开和搜索
+        self.setting_view = SettingView()
+        self.setting_view.setting_activated.connect(self.on_setting_activated)
+        if self.project_store is not None:
+            self.setting_view.set_config(self.project_store.sections())
         
         # 保存树形控件引用，以便后续使用
-        self.setting_tree = tree
-        
-        # 连接树形控件的点击事件
-        tree.itemClicked.connect(self.on_tree_item_clicked)
-        
-        # 添加一些示例节点
-        root_item = tree.invisibleRootItem()
-        
-        # 添加示例分类
-        category1 = QTreeWidgetItem(tree, ["General"])
-        category2 = QTreeWidgetItem(tree, ["Solver"])
-        category3 = QTreeWidgetItem(tree, ["Mesh"])
+        self.setting_tree = self.setting_view.tree
         
-        # 添加示例子项（叶子节点）
-        QTreeWidgetItem(category1, ["Setting 1"])
-        QTreeWidgetItem(category1, ["Setting 2"])
-        QTreeWidgetItem(category2, ["Setting 3"])
-        QTreeWidgetItem(category2, ["Setting 4"])
-        QTreeWidgetItem(category3, ["Setting 5"])
-        
-        # 展开所有节点
-        tree.expandAll()
-        
-        layout.addWidget(tree)
-        container.setLayout(layout)
-        dock.setWidget(container)
+        dock.setWidget(self.setting_view)
         
         return dock
     
-    def on_tree_item_clicked(self, item: QTreeWidgetItem, column: int):
-        """处理树形控件节点点击事件"""
-        # 检查是否为叶子节点（没有子节点）
-        if item.childCount() == 0:
-            # 显示配置 dock widget
-            if self.config_dock:
-                self.config_dock.setVisible(True)
-                # 更新配置项内容
-                self.update_config_widget(item.text(0))
-        else:
-            # 如果是父节点，隐藏配置 dock widget
-            if self.config_dock:
-                self.config_dock.setVisible(False)
+    def on_setting_activated(self, path, value, is_leaf):
+        """处理 Setting View 节点点击事件"""
+        if not self.config_dock:
+            return
+        # 叶子节点显示配置 dock widget，父节点隐藏
+        self.config_dock.setVisible(is_leaf)
+        if is_leaf:
+            self.update_config_widget(path)
     
     def create_config_dock(self) -> QDockWidget:
         """创建配置 dock widget"""
@@ -860,15 +821,12 @@ class MainWindow(QMainWindow):
             }
         """)
         
-        # 创建配置内容容器
-        config_widget = QWidget()
-        config_widget.setStyleSheet("background-color: white;")
-        self.config_form_layout = QFormLayout()
-        self.config_form_layout.setSpacing(10)
-        self.config_form_layout.setContentsMargins(10, 10, 10, 10)
-        config_widget.setLayout(self.config_form_layout)
+        # 表单按布局缓存，点击叶子时只重新绑定值，修改分批写回配置
+        self.config_panel = ConfigPanel(self.setting_view.model)
+        self.config_panel.setStyleSheet("background-color: white;")
+        self.config_panel.sections_changed.connect(self.on_config_edited)
         
-        scroll_area.setWidget(config_widget)
+        scroll_area.setWidget(self.config_panel)
         dock.setWidget(scroll_area)
         
         # 设置最小和最大宽度（允许调整大小，与 Setting View 对齐）
@@ -885,44 +843,17 @@ class MainWindow(QMainWindow):
         
         return dock
     
-    def update_config_widget(self, setting_name: str):
-        """更新配置 widget 的内容"""
-        # 清除现有内容
-        while self.config_form_layout.count():
-            child = self.config_form_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        # 根据设置名称创建不同的配置项
-        # 这里可以根据实际需求自定义配置项
-        
-        # 示例：添加一些通用配置项
-        name_label = QLabel("Setting Name:")
-        name_value = QLabel(setting_name)
-        name_value.setStyleSheet("font-weight: bold;")
-        self.config_form_layout.addRow(name_label, name_value)
-        
-        # 添加示例配置项
-        value_label = QLabel("Value:")
-        value_input = QLineEdit()
-        value_input.setPlaceholderText("Enter value...")
-        self.config_form_layout.addRow(value_label, value_input)
-        
-        numeric_label = QLabel("Numeric Value:")
-        numeric_input = QDoubleSpinBox()
-        numeric_input.setRange(0.0, 1000.0)
-        numeric_input.setValue(0.0)
-        numeric_input.setDecimals(2)
-        self.config_form_layout.addRow(numeric_label, numeric_input)
-        
-        option_label = QLabel("Option:")
-        option_combo = QComboBox()
-        option_combo.addItems(["Option 1", "Option 2", "Option 3"])
-        self.config_form_layout.addRow(option_label, option_combo)
-        
-        # 添加一个分隔符（空白行）
-        self.config_form_layout.addRow(QLabel(""), QLabel(""))
-        
+    def update_config_widget(self, path):
+        """在配置 widget 中编辑路径对应叶子所在的对象"""
+        self.config_panel.bind(path)
+    
+    def on_config_edited(self, sections):
+        """Configuration 面板的修改已写回配置，将变化的分区交给项目存储"""
+        if self.project_store is None:
+            return
+        config = self.setting_view.model.config
+        for name in sections:
+            self.project_store.set_section(name, config[name])
     
     def create_visual_view_widget(self, view_id=None) -> QWidget:
         """创建 Visual View 组件（包含工具条和 VTK 视图）"""
@@ -974,53 +905,81 @@ class MainWindow(QMainWindow):
         wireframe_btn.clicked.connect(lambda checked, vid=view_id: self.toggle_wireframe_by_id(vid))
         toolbar.addWidget(wireframe_btn)
         
-        # 创建 VTK 视图区域
-        if VTK_AVAILABLE:
-            vtk_widget = DelayedVTKWidget()
-            self.setup_vtk_widget(vtk_widget, view_id)
-        else:
-            # 如果 VTK 不可用，创建占位符
-            vtk_widget = QWidget()
-            vtk_widget.setStyleSheet("background-color: #2b2b2b;")
-            placeholder_label = QLabel("VTK View\n(VTK not installed)")
-            placeholder_label.setAlignment(Qt.AlignCenter)
-            placeholder_label.setStyleSheet("""
-                QLabel {
-                    color: white;
-                    font-size: 16px;
-                    background-color: transparent;
-                }
-            """)
-            placeholder_layout = QVBoxLayout()
-            placeholder_layout.addWidget(placeholder_label)
-            vtk_widget.setLayout(placeholder_layout)
-        
+        # 创建 VTK 视图区域（VTK widget 在第一次显示时创建，届时才导入VTK）
+        vtk_host = LazyViewHost(lambda vid=view_id: self.ensure_vtk_view(vid))
+        self.vtk_view_hosts[view_id] = vtk_host
+
         # 添加到布局
         layout.addWidget(toolbar)
-        layout.addWidget(vtk_widget, 1)  # 设置拉伸因子为1，占据剩余空间
+        layout.addWidget(vtk_host, 1)  # 设置拉伸因子为1，占据剩余空间
         
         container.setLayout(layout)
         return container
     
-    def setup_vtk_widget(self, vtk_widget, view_id=None):
-        """设置VTK widget的渲染内容"""
-        if not VTK_AVAILABLE:
+    def ensure_vtk_view(self, view_id):
+        """创建尚未创建的VTK widget（VTK不可用时显示占位符），返回视图的VTK数据"""
+        if view_id in self.vtk_widgets:
+            return self.vtk_widgets[view_id]
+        host = self.vtk_view_hosts.pop(view_id, None)
+        if host is None:
+            return None
+        
+        vtk_view = load_vtk_view()
+        if vtk_view is None:
+            host.layout().addWidget(self.create_vtk_placeholder())
+            return None
+        
+        vtk_widget = vtk_view.DelayedVTKWidget()
+        self.setup_vtk_widget(vtk_widget, view_id)
+        host.layout().addWidget(vtk_widget)
+        self.view_manager.add(view_id, vtk_widget)
+        # 第一个视图显示时没有发生tab切换
+        tab_widget = self.visual_view_tab_widget
+        if (self.view_manager.active_view != view_id and tab_widget and tab_widget.currentIndex() >= 0
+                and tab_widget.tabText(tab_widget.currentIndex()) == view_id):
+            self.view_manager.activate(view_id)
+        return self.vtk_widgets[view_id]
+    
+    @staticmethod
+    def create_vtk_placeholder() -> QWidget:
+        """VTK 不可用时的占位组件"""
+        vtk_widget = QWidget()
+        vtk_widget.setStyleSheet("background-color: #2b2b2b;")
+        placeholder_label = QLabel("VTK View\n(VTK not installed)")
+        placeholder_label.setAlignment(Qt.AlignCenter)
+        placeholder_label.setStyleSheet("""
+            QLabel {
+                color: white;
+                font-size: 16px;
+                background-color: transparent;
+            }
+        """)
+        placeholder_layout = QVBoxLayout()
+        placeholder_layout.addWidget(placeholder_label)
+        vtk_widget.setLayout(placeholder_layout)
+        return vtk_widget
+    
+    def setup_vtk_widget(self, vtk_widget, view_id=None, dataset=None):
+        """设置VTK widget的渲染内容（未指定dataset时显示示例球体）"""
+        vtk_view = load_vtk_view()
+        if vtk_view is None:
             return
         
         # 创建 VTK 渲染器
-        renderer = vtk.vtkRenderer()
+        renderer = vtk_view.vtkRenderer()
         renderer.SetBackground(0.2, 0.2, 0.2)  # 深灰色背景
         
-        # 创建示例几何体（一个球体）
-        sphere = vtk.vtkSphereSource()
-        sphere.SetRadius(1.0)
-        sphere.SetThetaResolution(50)
-        sphere.SetPhiResolution(50)
+        # 示例几何体（一个球体），所有视图共享同一个数据源，指定dataset时随后替换
+        if self.placeholder_source is None:
+            self.placeholder_source = vtk_view.vtkSphereSource()
+            self.placeholder_source.SetRadius(1.0)
+            self.placeholder_source.SetThetaResolution(50)
+            self.placeholder_source.SetPhiResolution(50)
         
-        mapper = vtk.vtkPolyDataMapper()
-        mapper.SetInputConnection(sphere.GetOutputPort())
+        mapper = vtk_view.vtkPolyDataMapper()
+        mapper.SetInputConnection(self.placeholder_source.GetOutputPort())
         
-        actor = vtk.vtkActor()
+        actor = vtk_view.vtkActor()
         actor.SetMapper(mapper)
         actor.GetProperty().SetColor(0.8, 0.8, 0.8)  # 浅灰色
         
@@ -1048,20 +1007,102 @@ class MainWindow(QMainWindow):
             self.current_vtk_widget = vtk_widget
             self.current_vtk_renderer = renderer
             self.current_vtk_actor = actor
+        
+        if dataset is not None:
+            self.show_dataset(dataset, view_id)
+    
+    def show_dataset(self, dataset, view_id=None, key=None):
+        """
+        在指定（或当前激活的）Visual View 中显示数据集，交互时自动切换LOD级别
+        
+        数据集及其LOD表面登记在 dataset_registry 中，多个视图显示同一数据集时共享同一份数据。
+        key 缺省时按数据集对象本身登记。
+        """
+        vtk_data = self.get_current_vtk_data(view_id)
+        if not vtk_data:
+            return
+        from .vtk_lod import DEFAULT_FRAME_BUDGET, LodController, build_lod_levels
+        
+        view_key = next(k for k, value in self.vtk_widgets.items() if value is vtk_data)
+        
+        if key is None:
+            key = self.dataset_registry.key_of(dataset) or DatasetRegistry.memory_key(dataset)
+        entry = self.dataset_registry.get(key)
+        if entry is None:
+            # 提取表面并构建LOD金字塔
+            entry = self.dataset_registry.add(key, dataset, build_lod_levels(dataset))
+        
+        # 先引用新数据集再释放旧数据集，避免同一数据集被提前淘汰
+        self.dataset_registry.acquire(key, view_key)
+        if vtk_data.get('dataset_key') != key:
+            self._release_view_dataset(vtk_data, view_key)
+        elif vtk_data.get('lod'):
+            vtk_data.pop('lod').detach()
+        
+        mapper = _vtk_view.vtkPolyDataMapper()
+        vtk_data['actor'].SetMapper(mapper)
+        vtk_data['dataset_key'] = key
+        vtk_data['lod'] = LodController(
+            vtk_data['widget'].GetRenderWindow(), mapper, entry.lod_levels,
+            frame_budget=self.frame_budget or DEFAULT_FRAME_BUDGET,
+            on_frame=lambda frame_time, level, count, vid=view_key:
+                self.on_view_frame_rendered(vid, frame_time, level, count)
+        )
+        vtk_data['renderer'].ResetCamera()
+        # 隐藏的视图在激活时再渲染
+        vtk_data['widget'].render()
+    
+    def _release_view_dataset(self, vtk_data, view_id):
+        """断开视图与其当前数据集的LOD控制，并释放视图对数据集的引用"""
+        controller = vtk_data.pop('lod', None)
+        if controller:
+            controller.detach()
+        key = vtk_data.pop('dataset_key', None)
+        if key is not None:
+            self.dataset_registry.release(key, view_id)
+    
+    def on_view_frame_rendered(self, view_id, frame_time, level, level_count):
+        """在状态栏显示当前激活视图的帧时间和LOD级别"""
+        if not self.frame_time_label or not self.visual_view_tab_widget:
+            return
+        current_index = self.visual_view_tab_widget.currentIndex()
+        if current_index < 0 or self.visual_view_tab_widget.tabText(current_index) != view_id:
+            return
+        self.frame_time_label.setText(
+            f"{view_id}: {frame_time * 1000:.1f} ms (LOD {level}/{level_count - 1})"
+        )
+    
+    def load_mesh_arrays(self, points, connectivity, offsets, cell_types, view_id=None,
+                         point_data=None, cell_data=None):
+        """
+        由 NumPy 数组零拷贝构建非结构网格并显示在 Visual View 中
+        
+        数组布局见 vtk_mesh.numpy_to_unstructured_grid
+        """
+        if load_vtk_view() is None:
+            return None
+        from .vtk_mesh import numpy_to_unstructured_grid
+        
+        grid = numpy_to_unstructured_grid(
+            points, connectivity, offsets, cell_types,
+            point_data=point_data, cell_data=cell_data
+        )
+        self.show_dataset(grid, view_id)
+        return grid
     
     def get_current_vtk_data(self, view_id=None):
         """获取指定view_id的VTK数据，如果没有指定则使用当前激活的tab"""
-        if view_id and view_id in self.vtk_widgets:
-            return self.vtk_widgets[view_id]
+        if view_id and (view_id in self.vtk_widgets or view_id in self.vtk_view_hosts):
+            return self.ensure_vtk_view(view_id)
         
-        # 如果没有指定view_id，使用当前激活的tab
+        # 如果没有指定view_id，使用当前激活的tab（尚未显示过的视图此时创建VTK widget）
         if self.visual_view_tab_widget:
             current_index = self.visual_view_tab_widget.currentIndex()
             if current_index >= 0:
                 current_tab_title = self.visual_view_tab_widget.tabText(current_index)
-                if current_tab_title in self.vtk_widgets:
-                    return self.vtk_widgets[current_tab_title]
-        
+                if current_tab_title in self.vtk_widgets or current_tab_title in self.vtk_view_hosts:
+                    return self.ensure_vtk_view(current_tab_title)
+
         # 如果都没有，返回第一个
         if self.vtk_widgets:
             return next(iter(self.vtk_widgets.values()))
@@ -1073,14 +1114,14 @@ class MainWindow(QMainWindow):
         vtk_data = self.get_current_vtk_data()
         if vtk_data:
             vtk_data['renderer'].ResetCamera()
-            vtk_data['widget'].GetRenderWindow().Render()
+            vtk_data['widget'].render()
     
     def reset_vtk_view_by_id(self, view_id):
         """根据view_id重置VTK视图"""
         vtk_data = self.get_current_vtk_data(view_id)
         if vtk_data:
             vtk_data['renderer'].ResetCamera()
-            vtk_data['widget'].GetRenderWindow().Render()
+            vtk_data['widget'].render()
     
     def zoom_in_vtk_view(self):
         """放大 VTK 视图（使用当前激活的tab）"""
@@ -1088,7 +1129,7 @@ class MainWindow(QMainWindow):
         if vtk_data:
             camera = vtk_data['renderer'].GetActiveCamera()
             camera.Zoom(1.2)
-            vtk_data['widget'].GetRenderWindow().Render()
+            vtk_data['widget'].render()
     
     def zoom_in_vtk_view_by_id(self, view_id):
         """根据view_id放大VTK视图"""
@@ -1096,7 +1137,7 @@ class MainWindow(QMainWindow):
         if vtk_data:
             camera = vtk_data['renderer'].GetActiveCamera()
             camera.Zoom(1.2)
-            vtk_data['widget'].GetRenderWindow().Render()
+            vtk_data['widget'].render()
     
     def zoom_out_vtk_view(self):
         """缩小 VTK 视图（使用当前激活的tab）"""
@@ -1104,7 +1145,7 @@ class MainWindow(QMainWindow):
         if vtk_data:
             camera = vtk_data['renderer'].GetActiveCamera()
             camera.Zoom(0.8)
-            vtk_data['widget'].GetRenderWindow().Render()
+            vtk_data['widget'].render()
     
     def zoom_out_vtk_view_by_id(self, view_id):
         """根据view_id缩小VTK视图"""
@@ -1112,42 +1153,64 @@ class MainWindow(QMainWindow):
         if vtk_data:
             camera = vtk_data['renderer'].GetActiveCamera()
             camera.Zoom(0.8)
-            vtk_data['widget'].GetRenderWindow().Render()
+            vtk_data['widget'].render()
     
     def toggle_wireframe(self):
         """切换线框模式（使用当前激活的tab）"""
         vtk_data = self.get_current_vtk_data()
-        if vtk_data and VTK_AVAILABLE:
+        if vtk_data:
             prop = vtk_data['actor'].GetProperty()
-            if prop.GetRepresentation() == vtk.VTK_SURFACE:
-                prop.SetRepresentation(vtk.VTK_WIREFRAME)
+            if prop.GetRepresentation() == _vtk_view.VTK_SURFACE:
+                prop.SetRepresentation(_vtk_view.VTK_WIREFRAME)
             else:
-                prop.SetRepresentation(vtk.VTK_SURFACE)
-            vtk_data['widget'].GetRenderWindow().Render()
+                prop.SetRepresentation(_vtk_view.VTK_SURFACE)
+            vtk_data['widget'].render()
     
     def toggle_wireframe_by_id(self, view_id):
         """根据view_id切换线框模式"""
         vtk_data = self.get_current_vtk_data(view_id)
-        if vtk_data and VTK_AVAILABLE:
+        if vtk_data:
             prop = vtk_data['actor'].GetProperty()
-            if prop.GetRepresentation() == vtk.VTK_SURFACE:
-                prop.SetRepresentation(vtk.VTK_WIREFRAME)
+            if prop.GetRepresentation() == _vtk_view.VTK_SURFACE:
+                prop.SetRepresentation(_vtk_view.VTK_WIREFRAME)
             else:
-                prop.SetRepresentation(vtk.VTK_SURFACE)
-            vtk_data['widget'].GetRenderWindow().Render()
+                prop.SetRepresentation(_vtk_view.VTK_SURFACE)
+            vtk_data['widget'].render()
         
     def create_status_bar(self):
         """创建状态栏"""
         statusbar = QStatusBar()
         statusbar.showMessage("Status Bar")
+        
+        # 后台加载进度和取消按钮（仅在加载时显示）
+        self.load_progress_bar = QProgressBar()
+        self.load_progress_bar.setMaximumWidth(240)
+        self.load_progress_bar.setVisible(False)
+        statusbar.addPermanentWidget(self.load_progress_bar)
+        
+        self.load_cancel_button = QPushButton("取消")
+        self.load_cancel_button.setVisible(False)
+        self.load_cancel_button.clicked.connect(self.cancel_loading)
+        statusbar.addPermanentWidget(self.load_cancel_button)
+        
+        # 帧时间显示（永久显示在状态栏右侧）
+        self.frame_time_label = QLabel()
+        statusbar.addPermanentWidget(self.frame_time_label)
+        
         self.setStatusBar(statusbar)
     
     def closeEvent(self, event):
         """重写closeEvent，在关闭窗口前清理所有VTK资源"""
+        # 取消并等待后台加载任务
+        self.loader_service.shutdown()
+        
+        # 等待进行中的自动保存，并提交最后的修改
+        self.project_autosave.shutdown()
+
         # 设置VTK错误输出为关闭状态，忽略关闭时的错误
-        if VTK_AVAILABLE and _filtered_output:
+        if _vtk_view is not None:
             try:
-                _filtered_output.set_closing(True)
+                _vtk_view.filtered_output.set_closing(True)
             except:
                 pass
         
@@ -1155,7 +1218,7 @@ class MainWindow(QMainWindow):
         self.hide()
         
         # 清理所有VTK widget
-        if VTK_AVAILABLE and hasattr(self, 'vtk_widgets'):
+        if _vtk_view is not None and hasattr(self, 'vtk_widgets'):
             for view_id, vtk_data in list(self.vtk_widgets.items()):
                 try:
                     vtk_widget = vtk_data.get('widget')
@@ -1211,9 +1274,9 @@ class MainWindow(QMainWindow):
         super().closeEvent(event)
         
         # 恢复VTK错误输出（虽然窗口已经关闭）
-        if VTK_AVAILABLE and _filtered_output:
+        if _vtk_view is not None:
             try:
-                _filtered_output.set_closing(False)
+                _vtk_view.filtered_output.set_closing(False)
             except:
                 pass
 
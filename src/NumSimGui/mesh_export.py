@@ -0,0 +1,340 @@
+"""
+分块流式网格导出
+按块接收网格和场数据，写出 VTU（appended raw / zlib）或原生网格文件（*.nsm）。
+每个数组先顺序写入同目录下的临时文件，全部块写完后再按目标格式拼接，
+峰值内存只与单个块的大小相关，与网格总大小无关。
+
+块是一个字典，可包含以下键（均可省略，各块之间按顺序拼接）：
+    "points"        (n, 3) 点坐标
+    "connectivity"  全局点索引
+    "offsets"       块内偏移，长度为块内单元数 + 1，从 0 开始
+    "cell_types"    VTK 单元类型
+    "zones"         区域编号
+    "point/<名称>"  点数据
+    "cell/<名称>"   单元数据
+"""
+import shutil
+import tempfile
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from . import mesh_file
+
+# 拼接临时文件时使用的缓冲区大小
+COPY_BUFFER_SIZE = 16 * 1024 * 1024
+# VTU zlib 压缩块的未压缩大小
+ZLIB_BLOCK_SIZE = 1024 * 1024
+# 补齐缺省数组时每次写入的元素数
+FILL_CHUNK_SIZE = 1024 * 1024
+
+VTU_TYPE_NAMES = {
+    np.dtype("<u1"): "UInt8",
+    np.dtype("<i4"): "Int32",
+    np.dtype("<i8"): "Int64",
+    np.dtype("<f4"): "Float32",
+    np.dtype("<f8"): "Float64",
+}
+
+MESH_ARRAYS = ("points", "connectivity", "offsets", "cell_types", "zones")
+
+
+class _ArraySpool:
+    """单个数组的临时文件，按块追加数据，可选 zlib 分块压缩"""
+
+    def __init__(self, directory, index, dtype, num_components, compress=False):
+        self.dtype = dtype
+        self.num_components = num_components
+        self.num_tuples = 0
+        self.num_bytes = 0
+        self._compress = compress
+        self._pending = bytearray()
+        self._block_sizes = []
+        self._path = Path(directory) / f"array_{index}.bin"
+        self._file = open(self._path, "wb")
+
+    def append(self, values):
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self.num_tuples += len(values)
+        self.num_bytes += values.nbytes
+        if not self._compress:
+            values.tofile(self._file)
+            return
+
+        self._pending += memoryview(values).cast("B")
+        while len(self._pending) >= ZLIB_BLOCK_SIZE:
+            self._write_block(self._pending[:ZLIB_BLOCK_SIZE])
+            del self._pending[:ZLIB_BLOCK_SIZE]
+
+    def _write_block(self, data):
+        compressed = zlib.compress(data)
+        self._block_sizes.append(len(compressed))
+        self._file.write(compressed)
+
+    def finish(self):
+        if self._compress and self._pending:
+            self._write_block(bytes(self._pending))
+            self._pending = bytearray()
+        self._file.close()
+
+    def vtu_header(self):
+        """VTU appended 数据块的 UInt64 头"""
+        if not self._compress:
+            return np.array([self.num_bytes], dtype="<u8").tobytes()
+        last_block = self.num_bytes % ZLIB_BLOCK_SIZE
+        header = [len(self._block_sizes), ZLIB_BLOCK_SIZE, last_block] + self._block_sizes
+        return np.array(header, dtype="<u8").tobytes()
+
+    def stored_size(self):
+        """临时文件中的字节数（压缩后大小）"""
+        return sum(self._block_sizes) if self._compress else self.num_bytes
+
+    def copy_to(self, f):
+        with open(self._path, "rb") as src:
+            shutil.copyfileobj(src, f, COPY_BUFFER_SIZE)
+
+    def discard(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class MeshExporter:
+    """
+    分块流式网格导出器
+
+    用法：
+        with MeshExporter("result.vtu", compression="zlib") as exporter:
+            for block in blocks:
+                exporter.write_block(block)
+    """
+
+    def __init__(self, path, file_format=None, compression=None):
+        self.path = Path(path)
+        self.file_format = file_format or ("nsm" if self.path.suffix == mesh_file.MESH_FILE_SUFFIX else "vtu")
+        if self.file_format not in ("vtu", "nsm"):
+            raise ValueError(f"不支持的导出格式: {self.file_format}")
+        if compression not in (None, "zlib"):
+            raise ValueError(f"不支持的压缩方式: {compression}")
+        if compression and self.file_format != "vtu":
+            raise ValueError("只有 VTU 格式支持压缩")
+        self.compression = compression
+
+        self._temp_dir = tempfile.TemporaryDirectory(dir=self.path.parent, prefix=".export_")
+        self._spools = {}
+        self._connectivity_size = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    @property
+    def num_points(self):
+        spool = self._spools.get("points")
+        return spool.num_tuples if spool else 0
+
+    @property
+    def num_cells(self):
+        spool = self._spools.get("cell_types")
+        return spool.num_tuples if spool else 0
+
+    def _spool(self, name, values):
+        spool = self._spools.get(name)
+        if spool is None:
+            if name == "points":
+                dtype = np.dtype("<f8")
+            elif name in mesh_file.REQUIRED_ARRAYS:
+                dtype = mesh_file.REQUIRED_ARRAYS[name]
+            else:
+                dtype = values.dtype.newbyteorder("<")
+            if dtype not in mesh_file.DATA_TYPE_CODES:
+                raise ValueError(f"不支持的数组类型 {values.dtype}: {name}")
+            num_components = int(np.prod(values.shape[1:])) if values.ndim > 1 else 1
+            spool = _ArraySpool(self._temp_dir.name, len(self._spools), dtype, num_components,
+                                compress=self.compression == "zlib")
+            self._spools[name] = spool
+            if name == "offsets" and self.file_format == "nsm":
+                # 原生格式的 offsets 以 0 开头，VTU 的 offsets 只记录每个单元的结束位置
+                spool.append(np.zeros(1, dtype=dtype))
+        return spool
+
+    def write_block(self, block):
+        """写入一个数据块，数据立即落盘，调用方随后即可释放该块"""
+        if self._closed:
+            raise ValueError("导出器已关闭")
+
+        block = {name: np.asarray(values) for name, values in block.items()}
+        for name in block:
+            if name not in MESH_ARRAYS and not name.startswith(("point/", "cell/")):
+                raise ValueError(f"未知的数组名称: {name}")
+
+        if "offsets" in block:
+            offsets = block["offsets"].astype(np.int64, copy=False).ravel()
+            if offsets.size == 0 or offsets[0] != 0:
+                raise ValueError("块内 offsets 应从 0 开始")
+            if "connectivity" not in block or offsets[-1] != block["connectivity"].size:
+                raise ValueError("块内 offsets 末元素应等于该块 connectivity 的长度")
+            block["offsets"] = offsets[1:] + self._connectivity_size
+            self._connectivity_size += int(offsets[-1])
+        elif "connectivity" in block:
+            raise ValueError("connectivity 必须与 offsets 一起写入")
+
+        if "points" in block:
+            block["points"] = block["points"].reshape(-1, 3)
+
+        for name, values in block.items():
+            values = values.reshape(len(values), -1) if values.ndim > 1 else values.ravel()
+            self._spool(name, values).append(values)
+
+    def close(self):
+        """完成导出：校验数组长度并按目标格式拼接临时文件"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self.file_format == "nsm" and "zones" not in self._spools and self.num_cells:
+                zones = self._spool("zones", np.zeros(0, dtype=mesh_file.REQUIRED_ARRAYS["zones"]))
+                for start in range(0, self.num_cells, FILL_CHUNK_SIZE):
+                    count = min(FILL_CHUNK_SIZE, self.num_cells - start)
+                    zones.append(np.zeros(count, dtype=zones.dtype))
+
+            for spool in self._spools.values():
+                spool.finish()
+            self._validate()
+
+            if self.file_format == "nsm":
+                self._assemble_native()
+            else:
+                self._assemble_vtu()
+        finally:
+            self._temp_dir.cleanup()
+
+    def discard(self):
+        """放弃导出并删除临时文件"""
+        self._closed = True
+        for spool in self._spools.values():
+            spool.discard()
+        self._temp_dir.cleanup()
+
+    def _validate(self):
+        for name in ("points", "connectivity", "offsets", "cell_types"):
+            if name not in self._spools:
+                raise ValueError(f"导出的网格缺少数组 {name}")
+
+        num_points = self.num_points
+        num_cells = self.num_cells
+
+        expected_offsets = num_cells + (1 if self.file_format == "nsm" else 0)
+        if self._spools["offsets"].num_tuples != expected_offsets:
+            raise ValueError("offsets 与 cell_types 的单元数不一致")
+
+        for name, spool in self._spools.items():
+            if name == "zones" or name.startswith("cell/"):
+                expected = num_cells
+            elif name.startswith("point/"):
+                expected = num_points
+            else:
+                continue
+            if spool.num_tuples != expected:
+                raise ValueError(f"数组 {name} 的长度为 {spool.num_tuples}，应为 {expected}")
+
+    def _ordered_names(self):
+        names = [name for name in MESH_ARRAYS if name in self._spools]
+        return names + [name for name in self._spools if name not in MESH_ARRAYS]
+
+    def _assemble_native(self):
+        names = self._ordered_names()
+        layout = []
+        for name in names:
+            spool = self._spools[name]
+            shape = (spool.num_tuples, spool.num_components) if spool.num_components > 1 else (spool.num_tuples,)
+            layout.append((name, spool.dtype, shape))
+        header, table = mesh_file.build_layout(layout, self.num_points, self.num_cells)
+
+        with open(self.path, "wb") as f:
+            f.write(header.tobytes())
+            f.write(table.tobytes())
+            for name, entry in zip(names, table):
+                f.seek(int(entry["offset"]))
+                self._spools[name].copy_to(f)
+
+    def _assemble_vtu(self):
+        names = self._ordered_names()
+        offsets = {}
+        position = 0
+        for name in names:
+            offsets[name] = position
+            spool = self._spools[name]
+            position += len(spool.vtu_header()) + spool.stored_size()
+
+        def data_array(name, vtk_name=None):
+            spool = self._spools[name]
+            attributes = f'type="{VTU_TYPE_NAMES[spool.dtype]}"'
+            if vtk_name:
+                attributes += f' Name="{vtk_name}"'
+            if spool.num_components > 1:
+                attributes += f' NumberOfComponents="{spool.num_components}"'
+            return f'        <DataArray {attributes} format="appended" offset="{offsets[name]}"/>\n'
+
+        point_fields = [name for name in names if name.startswith("point/")]
+        cell_fields = [name for name in names if name.startswith("cell/")]
+
+        compressor = ' compressor="vtkZLibDataCompressor"' if self.compression == "zlib" else ""
+        xml = [
+            '<?xml version="1.0"?>\n',
+            f'<VTKFile type="UnstructuredGrid" version="1.0" byte_order="LittleEndian" header_type="UInt64"{compressor}>\n',
+            '  <UnstructuredGrid>\n',
+            f'    <Piece NumberOfPoints="{self.num_points}" NumberOfCells="{self.num_cells}">\n',
+            '      <PointData>\n',
+            *[data_array(name, name[len("point/"):]) for name in point_fields],
+            '      </PointData>\n',
+            '      <CellData>\n',
+            *([data_array("zones", "zone")] if "zones" in self._spools else []),
+            *[data_array(name, name[len("cell/"):]) for name in cell_fields],
+            '      </CellData>\n',
+            '      <Points>\n',
+            data_array("points", "Points"),
+            '      </Points>\n',
+            '      <Cells>\n',
+            data_array("connectivity", "connectivity"),
+            data_array("offsets", "offsets"),
+            data_array("cell_types", "types"),
+            '      </Cells>\n',
+            '    </Piece>\n',
+            '  </UnstructuredGrid>\n',
+            '  <AppendedData encoding="raw">\n',
+            '   _',
+        ]
+
+        with open(self.path, "wb") as f:
+            f.write("".join(xml).encode("utf-8"))
+            for name in names:
+                spool = self._spools[name]
+                f.write(spool.vtu_header())
+                spool.copy_to(f)
+            f.write(b"\n  </AppendedData>\n</VTKFile>\n")
+
+
+def export_mesh(path, blocks, file_format=None, compression=None):
+    """
+    将块生成器导出为网格文件
+
+    Args:
+        path: 输出路径，后缀 .nsm 为原生格式，其余为 VTU
+        blocks: 产生块字典的可迭代对象（通常是生成器）
+        file_format: "vtu" 或 "nsm"，缺省时根据后缀判断
+        compression: None 或 "zlib"（仅 VTU）
+
+    Returns:
+        (点数, 单元数)
+    """
+    with MeshExporter(path, file_format=file_format, compression=compression) as exporter:
+        for block in blocks:
+            exporter.write_block(block)
+    return exporter.num_points, exporter.num_cells
@@ -0,0 +1,257 @@
+"""
+NumSim 原生网格文件（*.nsm）读写
+文件布局与 NumSimMeshImport/NumSimMeshFormat.h 一致：64 字节文件头、64 字节数组表项、
+按 64 字节对齐的连续小端数组。读取时通过 numpy.memmap 映射，打开文件的开销与网格大小无关，
+数据页只在真正访问（例如 Visual View 渲染）时才被加载。
+"""
+from pathlib import Path
+
+import numpy as np
+
+MESH_FILE_SUFFIX = ".nsm"
+MAGIC = b"NSMESH\x00\x00"
+VERSION = 1
+ALIGNMENT = 64
+ARRAY_NAME_SIZE = 32
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("header_size", "<u4"),
+    ("num_points", "<u8"),
+    ("num_cells", "<u8"),
+    ("num_arrays", "<u8"),
+    ("table_offset", "<u8"),
+    ("data_offset", "<u8"),
+    ("reserved", "<u8"),
+])
+
+ARRAY_ENTRY_DTYPE = np.dtype([
+    ("name", f"S{ARRAY_NAME_SIZE}"),
+    ("data_type", "<u4"),
+    ("num_components", "<u4"),
+    ("num_tuples", "<u8"),
+    ("offset", "<u8"),
+    ("num_bytes", "<u8"),
+])
+
+# 数据类型编码（与 NumSimMeshFormat::DataType 对应）
+DATA_TYPES = {
+    1: np.dtype("<u1"),
+    2: np.dtype("<i4"),
+    3: np.dtype("<i8"),
+    4: np.dtype("<f4"),
+    5: np.dtype("<f8"),
+}
+DATA_TYPE_CODES = {dtype: code for code, dtype in DATA_TYPES.items()}
+
+# 必需数组及其存储类型
+REQUIRED_ARRAYS = {
+    "points": np.dtype("<f8"),
+    "connectivity": np.dtype("<i8"),
+    "offsets": np.dtype("<i8"),
+    "cell_types": np.dtype("<u1"),
+    "zones": np.dtype("<i4"),
+}
+
+
+def align_up(offset):
+    """将偏移量向上对齐到 ALIGNMENT"""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class MeshFile:
+    """
+    内存映射的网格文件
+
+    所有数组都是只读的 numpy.memmap，与文件共享页缓存。
+    """
+
+    def __init__(self, path, header, arrays):
+        self.path = Path(path)
+        self.num_points = int(header["num_points"])
+        self.num_cells = int(header["num_cells"])
+        self.arrays = arrays
+
+    @property
+    def points(self):
+        return self.arrays["points"]
+
+    @property
+    def connectivity(self):
+        return self.arrays["connectivity"]
+
+    @property
+    def offsets(self):
+        return self.arrays["offsets"]
+
+    @property
+    def cell_types(self):
+        return self.arrays["cell_types"]
+
+    @property
+    def zones(self):
+        return self.arrays["zones"]
+
+    @property
+    def point_data(self):
+        """{名称: 数组} 形式的点数据"""
+        return self._field_arrays("point/")
+
+    @property
+    def cell_data(self):
+        """{名称: 数组} 形式的单元数据"""
+        return self._field_arrays("cell/")
+
+    def _field_arrays(self, prefix):
+        return {name[len(prefix):]: array for name, array in self.arrays.items() if name.startswith(prefix)}
+
+    def to_vtk(self):
+        """零拷贝构建 vtkUnstructuredGrid（需要 VTK）"""
+        from .vtk_mesh import numpy_to_unstructured_grid
+        return numpy_to_unstructured_grid(
+            self.points, self.connectivity, self.offsets, self.cell_types,
+            point_data=self.point_data,
+            cell_data={"zone": self.zones, **self.cell_data}
+        )
+
+
+def is_mesh_file(path):
+    """根据文件头判断是否为原生网格文件"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def open_mesh(path) -> MeshFile:
+    """
+    以内存映射方式打开网格文件
+
+    只读取文件头和数组表，数组数据延迟到访问时才从磁盘加载。
+    """
+    with open(path, "rb") as f:
+        header = np.frombuffer(f.read(HEADER_DTYPE.itemsize), dtype=HEADER_DTYPE)
+        # numpy 的定长字节串会去掉末尾的 \x00
+        if header.size != 1 or header["magic"][0] != MAGIC.rstrip(b"\x00"):
+            raise ValueError(f"不是 NumSim 网格文件: {path}")
+        header = header[0]
+        if header["version"] != VERSION:
+            raise ValueError(f"不支持的网格文件版本 {header['version']}: {path}")
+
+        f.seek(int(header["table_offset"]))
+        num_arrays = int(header["num_arrays"])
+        table = np.frombuffer(f.read(num_arrays * ARRAY_ENTRY_DTYPE.itemsize), dtype=ARRAY_ENTRY_DTYPE)
+        if table.size != num_arrays:
+            raise ValueError(f"网格文件数组表不完整: {path}")
+
+    file_size = Path(path).stat().st_size
+    arrays = {}
+    for entry in table:
+        name = entry["name"].decode("utf-8")
+        dtype = DATA_TYPES.get(int(entry["data_type"]))
+        num_tuples = int(entry["num_tuples"])
+        num_components = int(entry["num_components"])
+        offset = int(entry["offset"])
+        # 空数组不占字节，其对齐后的偏移可能位于文件末尾之后
+        num_bytes = int(entry["num_bytes"])
+        if dtype is None or (num_bytes > 0 and offset + num_bytes > file_size):
+            raise ValueError(f"网格文件数组 '{name}' 已损坏: {path}")
+
+        shape = (num_tuples, num_components) if num_components > 1 else (num_tuples,)
+        if num_tuples == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        else:
+            arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+    missing = [name for name in REQUIRED_ARRAYS if name not in arrays]
+    if missing:
+        raise ValueError(f"网格文件缺少数组 {missing}: {path}")
+
+    return MeshFile(path, header, arrays)
+
+
+def write_mesh(path, points, connectivity, offsets, cell_types, zones=None,
+               point_data=None, cell_data=None):
+    """
+    将完整的网格数组写入原生网格文件
+
+    zones 缺省时全部为 0。point_data / cell_data 中的数组以 "point/<名称>"、
+    "cell/<名称>" 存储。
+    """
+    num_cells = len(cell_types)
+    if zones is None:
+        zones = np.zeros(num_cells, dtype=REQUIRED_ARRAYS["zones"])
+
+    arrays = {
+        "points": np.asarray(points, dtype=REQUIRED_ARRAYS["points"]).reshape(-1, 3),
+        "connectivity": np.asarray(connectivity, dtype=REQUIRED_ARRAYS["connectivity"]),
+        "offsets": np.asarray(offsets, dtype=REQUIRED_ARRAYS["offsets"]),
+        "cell_types": np.asarray(cell_types, dtype=REQUIRED_ARRAYS["cell_types"]),
+        "zones": np.asarray(zones, dtype=REQUIRED_ARRAYS["zones"]),
+    }
+    for prefix, fields in (("point/", point_data), ("cell/", cell_data)):
+        for name, values in (fields or {}).items():
+            values = np.asarray(values)
+            arrays[prefix + name] = values.astype(values.dtype.newbyteorder("<"), copy=False)
+
+    if len(arrays["offsets"]) != num_cells + 1:
+        raise ValueError("offsets 长度应为单元数 + 1")
+
+    layout = [(name, array.dtype, array.shape) for name, array in arrays.items()]
+    header, table = build_layout(layout, len(arrays["points"]), num_cells)
+
+    with open(path, "wb") as f:
+        f.write(header.tobytes())
+        f.write(table.tobytes())
+        for entry, array in zip(table, arrays.values()):
+            f.seek(int(entry["offset"]))
+            np.ascontiguousarray(array).tofile(f)
+        # 末尾的空数组不写入数据，将文件补齐到最后一个数组的结束位置
+        if len(table):
+            f.truncate(max(f.tell(), int(table[-1]["offset"] + table[-1]["num_bytes"])))
+
+
+def build_layout(arrays, num_points, num_cells):
+    """
+    计算文件头和数组表
+
+    Args:
+        arrays: [(名称, dtype, shape)] 列表，shape 的第一维为元组数
+        num_points: 点数
+        num_cells: 单元数
+    """
+    header = np.zeros(1, dtype=HEADER_DTYPE)[0]
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["header_size"] = HEADER_DTYPE.itemsize
+    header["num_points"] = num_points
+    header["num_cells"] = num_cells
+    header["num_arrays"] = len(arrays)
+    header["table_offset"] = HEADER_DTYPE.itemsize
+    data_offset = align_up(HEADER_DTYPE.itemsize + len(arrays) * ARRAY_ENTRY_DTYPE.itemsize)
+    header["data_offset"] = data_offset
+
+    table = np.zeros(len(arrays), dtype=ARRAY_ENTRY_DTYPE)
+    offset = data_offset
+    for entry, (name, dtype, shape) in zip(table, arrays):
+        encoded = name.encode("utf-8")
+        if len(encoded) > ARRAY_NAME_SIZE:
+            raise ValueError(f"数组名称过长（最多 {ARRAY_NAME_SIZE} 字节）: {name}")
+        dtype = np.dtype(dtype).newbyteorder("<")
+        if dtype not in DATA_TYPE_CODES:
+            raise ValueError(f"不支持的数组类型 {dtype}: {name}")
+        num_tuples = shape[0] if shape else 1
+        num_components = int(np.prod(shape[1:])) if len(shape) > 1 else 1
+
+        entry["name"] = encoded
+        entry["data_type"] = DATA_TYPE_CODES[dtype]
+        entry["num_components"] = num_components
+        entry["num_tuples"] = num_tuples
+        entry["offset"] = offset
+        entry["num_bytes"] = num_tuples * num_components * dtype.itemsize
+        offset = align_up(offset + int(entry["num_bytes"]))
+
+    return header, table
+
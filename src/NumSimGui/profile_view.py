@@ -0,0 +1,363 @@
+"""
+性能分析视图
+读取求解器 NumSimProfiler 输出的 Chrome trace（profile_trace.json）和计时报告（profile.json），
+以火焰图显示每个进程、每个线程的计时区间，并以树形表格显示各进程汇总的计时（最小/最大/平均）。
+
+trace 中的 "X" 事件按时间嵌套：同一线程上包含在另一事件时间范围内的事件画在其下一层。
+火焰图中滚轮缩放（以鼠标位置为中心），左键拖动平移，双击恢复全部范围，鼠标悬停显示区间信息。
+"""
+import bisect
+import json
+import zlib
+from pathlib import Path
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QColor, QFontMetrics, QPainter, QPen
+from PySide6.QtWidgets import (
+    QDialog, QFileDialog, QHBoxLayout, QLabel, QMessageBox, QPushButton, QScrollArea, QTabWidget, QToolTip,
+    QTreeWidget, QTreeWidgetItem, QVBoxLayout, QWidget
+)
+
+ROW_HEIGHT = 18
+LANE_HEADER_HEIGHT = 18
+LANE_SPACING = 6
+
+
+class TraceEvent:
+    """一个计时区间（时间单位为微秒）"""
+    __slots__ = ("name", "start", "duration", "depth")
+
+    def __init__(self, name, start, duration):
+        self.name = name
+        self.start = start
+        self.duration = duration
+        self.depth = 0
+
+    @property
+    def end(self):
+        return self.start + self.duration
+
+
+class TraceLane:
+    """一个线程的全部区间，按嵌套深度分行"""
+
+    def __init__(self, pid, tid, name):
+        self.pid = pid
+        self.tid = tid
+        self.name = name
+        # rows[depth] 中的区间互不重叠，按开始时间排序
+        self.rows = []
+        self._row_ends = []
+
+    @property
+    def height(self):
+        return LANE_HEADER_HEIGHT + max(len(self.rows), 1) * ROW_HEIGHT + LANE_SPACING
+
+    def build(self, events):
+        """按开始时间（同时开始时长的在前）排序，用栈确定嵌套深度"""
+        events.sort(key=lambda event: (event.start, -event.duration))
+        stack = []
+        for event in events:
+            while stack and stack[-1].end <= event.start:
+                stack.pop()
+            event.depth = len(stack)
+            stack.append(event)
+            while len(self.rows) <= event.depth:
+                self.rows.append([])
+            self.rows[event.depth].append(event)
+        self._row_ends = [[event.end for event in row] for row in self.rows]
+
+    def visible(self, depth, start, end):
+        """第 depth 行中与 [start, end] 相交的区间"""
+        row = self.rows[depth]
+        # 同一行的区间不重叠，结束时间也是有序的
+        first = bisect.bisect_left(self._row_ends[depth], start)
+        for index in range(first, len(row)):
+            event = row[index]
+            if event.start > end:
+                break
+            yield event
+
+
+class Trace:
+    """Chrome trace 文件的内容"""
+
+    def __init__(self):
+        self.lanes = []
+        self.start = 0.0
+        self.end = 0.0
+        self.report_path = None
+
+    @classmethod
+    def load(cls, path):
+        """读取 trace 文件，只使用 "X"（完整区间）和 "M"（进程/线程名）事件"""
+        path = Path(path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        events = data.get("traceEvents", []) if isinstance(data, dict) else data
+
+        trace = cls()
+        process_names = {}
+        thread_names = {}
+        lane_events = {}
+        for item in events:
+            phase = item.get("ph")
+            pid = item.get("pid", 0)
+            tid = item.get("tid", 0)
+            if phase == "M":
+                name = item.get("args", {}).get("name", "")
+                if item.get("name") == "process_name":
+                    process_names[pid] = name
+                elif item.get("name") == "thread_name":
+                    thread_names[(pid, tid)] = name
+            elif phase == "X":
+                event = TraceEvent(str(item.get("name", "")), float(item.get("ts", 0.0)), float(item.get("dur", 0.0)))
+                lane_events.setdefault((pid, tid), []).append(event)
+
+        for (pid, tid), lane_list in sorted(lane_events.items()):
+            name = f"{process_names.get(pid, f'Process {pid}')} / {thread_names.get((pid, tid), f'Thread {tid}')}"
+            lane = TraceLane(pid, tid, name)
+            lane.build(lane_list)
+            trace.lanes.append(lane)
+
+        starts = [row[0].start for lane in trace.lanes for row in lane.rows if row]
+        ends = [max(event.end for event in row) for lane in trace.lanes for row in lane.rows if row]
+        if starts:
+            trace.start = min(starts)
+            trace.end = max(ends)
+
+        report = data.get("otherData", {}).get("report") if isinstance(data, dict) else None
+        if report and (path.parent / report).is_file():
+            trace.report_path = path.parent / report
+        return trace
+
+
+def load_report(path):
+    """读取计时报告（profile.json）"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def name_color(name):
+    """按名称确定的颜色，同名区间颜色相同"""
+    hue = zlib.crc32(name.encode("utf-8")) % 360
+    return QColor.fromHsv(hue, 90, 235)
+
+
+def format_duration(microseconds):
+    if microseconds >= 1.0e6:
+        return f"{microseconds / 1.0e6:.3f} s"
+    if microseconds >= 1.0e3:
+        return f"{microseconds / 1.0e3:.3f} ms"
+    return f"{microseconds:.1f} us"
+
+
+class FlameChartWidget(QWidget):
+    """火焰图：横轴为时间，每个线程一条泳道，嵌套的区间向下排列"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.trace = None
+        self.view_start = 0.0
+        self.view_end = 1.0
+        self._drag_x = None
+        self.setMouseTracking(True)
+        self.setMinimumHeight(100)
+
+    def set_trace(self, trace):
+        self.trace = trace
+        self.reset_view()
+        height = sum(lane.height for lane in trace.lanes) if trace else 0
+        self.setMinimumHeight(max(100, height))
+        self.update()
+
+    def reset_view(self):
+        if self.trace and self.trace.end > self.trace.start:
+            self.view_start = self.trace.start
+            self.view_end = self.trace.end
+        else:
+            self.view_start, self.view_end = 0.0, 1.0
+        self.update()
+
+    def _scale(self):
+        return self.width() / max(self.view_end - self.view_start, 1.0e-9)
+
+    def _time_at(self, x):
+        return self.view_start + x / self._scale()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.white)
+        if not self.trace:
+            painter.drawText(self.rect(), Qt.AlignCenter, "未加载 trace")
+            return
+
+        scale = self._scale()
+        metrics = QFontMetrics(painter.font())
+        clip = event.rect()
+        y = 0
+        for lane in self.trace.lanes:
+            if y > clip.bottom():
+                break
+            if y + lane.height >= clip.top():
+                painter.setPen(Qt.black)
+                painter.drawText(QRectF(4, y, self.width() - 8, LANE_HEADER_HEIGHT), Qt.AlignVCenter | Qt.AlignLeft, lane.name)
+                for depth in range(len(lane.rows)):
+                    top = y + LANE_HEADER_HEIGHT + depth * ROW_HEIGHT
+                    last_pixel = -1
+                    for trace_event in lane.visible(depth, self.view_start, self.view_end):
+                        x0 = (trace_event.start - self.view_start) * scale
+                        width = trace_event.duration * scale
+                        # 不足一个像素的相邻区间只画一次
+                        if width < 1.0 and int(x0) == last_pixel:
+                            continue
+                        last_pixel = int(x0)
+                        rect = QRectF(x0, top, max(width, 1.0), ROW_HEIGHT - 1)
+                        painter.fillRect(rect, name_color(trace_event.name))
+                        if width > 30:
+                            painter.setPen(QPen(QColor(40, 40, 40)))
+                            text = metrics.elidedText(trace_event.name, Qt.ElideRight, int(width) - 4)
+                            painter.drawText(rect.adjusted(2, 0, -2, 0), Qt.AlignVCenter | Qt.AlignLeft, text)
+            y += lane.height
+
+    def event_at(self, position):
+        """鼠标位置处的区间和其泳道，没有时返回 (None, None)"""
+        if not self.trace:
+            return None, None
+        time = self._time_at(position.x())
+        y = 0
+        for lane in self.trace.lanes:
+            if y <= position.y() < y + lane.height:
+                depth = int((position.y() - y - LANE_HEADER_HEIGHT) // ROW_HEIGHT)
+                if position.y() < y + LANE_HEADER_HEIGHT or depth >= len(lane.rows):
+                    return None, lane
+                # 放大前不足一个像素的区间也能选中
+                tolerance = 2.0 / self._scale()
+                for trace_event in lane.visible(depth, time - tolerance, time + tolerance):
+                    return trace_event, lane
+                return None, lane
+            y += lane.height
+        return None, None
+
+    def wheelEvent(self, event):
+        if not self.trace:
+            return
+        factor = 0.8 if event.angleDelta().y() > 0 else 1.25
+        center = self._time_at(event.position().x())
+        self.view_start = center - (center - self.view_start) * factor
+        self.view_end = center + (self.view_end - center) * factor
+        self.update()
+        event.accept()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag_x = event.position().x()
+
+    def mouseReleaseEvent(self, event):
+        self._drag_x = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.reset_view()
+
+    def mouseMoveEvent(self, event):
+        position = event.position()
+        if self._drag_x is not None:
+            shift = (self._drag_x - position.x()) / self._scale()
+            self.view_start += shift
+            self.view_end += shift
+            self._drag_x = position.x()
+            self.update()
+            return
+
+        trace_event, lane = self.event_at(position)
+        if trace_event is None:
+            QToolTip.hideText()
+            return
+        QToolTip.showText(
+            event.globalPosition().toPoint(),
+            f"{trace_event.name}\n{lane.name}\n开始: {format_duration(trace_event.start - self.trace.start)}\n"
+            f"耗时: {format_duration(trace_event.duration)}",
+            self
+        )
+
+
+class ProfileDialog(QDialog):
+    """性能分析对话框：火焰图和计时汇总"""
+
+    def __init__(self, default_dir="", parent=None):
+        super().__init__(parent)
+        self.default_dir = default_dir
+        self.setWindowTitle("性能分析")
+        self.resize(1000, 600)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        buttons = QHBoxLayout()
+        open_button = QPushButton("打开...")
+        open_button.clicked.connect(self.browse)
+        reset_button = QPushButton("全部显示")
+        reset_button.clicked.connect(lambda: self.flame_chart.reset_view())
+        self.file_label = QLabel()
+        buttons.addWidget(open_button)
+        buttons.addWidget(reset_button)
+        buttons.addWidget(self.file_label, 1)
+        layout.addLayout(buttons)
+
+        self.tab_widget = QTabWidget()
+        self.flame_chart = FlameChartWidget()
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(self.flame_chart)
+        self.tab_widget.addTab(scroll_area, "火焰图")
+
+        self.report_tree = QTreeWidget()
+        self.report_tree.setHeaderLabels(["区间", "调用次数", "进程数", "平均 (s)", "最小 (s)", "最大 (s)", "单次最大 (s)"])
+        self.tab_widget.addTab(self.report_tree, "汇总")
+        layout.addWidget(self.tab_widget, 1)
+        self.setLayout(layout)
+
+    def browse(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "打开性能分析结果", self.default_dir, "JSON 文件 (*.json);;所有文件 (*.*)"
+        )
+        if file_path:
+            self.load(file_path)
+
+    def load(self, path):
+        """打开 trace 或计时报告；trace 引用的报告一并打开"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and "scopes" in data:
+                self.show_report(data)
+                self.tab_widget.setCurrentIndex(1)
+            else:
+                trace = Trace.load(path)
+                self.flame_chart.set_trace(trace)
+                if trace.report_path:
+                    self.show_report(load_report(trace.report_path))
+                self.tab_widget.setCurrentIndex(0)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"读取性能分析结果失败:\n{str(e)}")
+            return
+        self.file_label.setText(str(path))
+
+    def show_report(self, report):
+        """以树形表格显示各进程汇总的计时"""
+        self.report_tree.clear()
+
+        def add_items(parent, scopes):
+            for scope in scopes:
+                total = scope.get("total", {})
+                item = QTreeWidgetItem(parent, [
+                    scope.get("name", ""), str(scope.get("count", 0)), str(scope.get("ranks", 0)),
+                    f"{total.get('avg', 0.0):.4f}", f"{total.get('min', 0.0):.4f}", f"{total.get('max', 0.0):.4f}",
+                    f"{scope.get('call', {}).get('max', 0.0):.4f}"
+                ])
+                add_items(item, scope.get("children", []))
+
+        add_items(self.report_tree, report.get("scopes", []))
+        self.report_tree.expandToDepth(1)
+        for column in range(self.report_tree.columnCount()):
+            self.report_tree.resizeColumnToContents(column)
@@ -0,0 +1,267 @@
+"""
+项目文件格式
+支持两种格式，读取时按文件头自动识别：
+    JSON（*.json）   与 NumSimSolver 求解器共用的文本格式
+    二进制（*.nsp）  不压缩的 zip 容器，每个分区一个 JSON 成员，数值数组以小端原始字节单独存放，
+                     读取时通过 np.frombuffer 直接解释，不经过文本解析
+
+二进制容器布局：
+    manifest.json                 {"format": "NumSimProject", "format_version": 1, "sections": [...]}
+    sections/<分区名>.json        分区内容，数组被替换为 {"$array": 成员名, "dtype": "<f8", "shape": [...]}
+    arrays/<分区名>/<序号>.bin    数组原始字节（C 顺序，小端）
+
+写入二进制格式时，NumPy 数组以及元素个数不少于 ARRAY_MIN_SIZE 的同类型数值列表按数组存放；
+读取后这些值均为只读的 NumPy 数组，写回 JSON 时转换为列表。
+
+用法（格式转换，在 src 目录下）：
+    python -m NumSimGui.project_format NumSimSolver.json NumSimSolver.nsp
+"""
+import argparse
+import json
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from urllib.parse import quote
+
+JSON_FORMAT = "json"
+BINARY_FORMAT = "binary"
+BINARY_PROJECT_SUFFIX = ".nsp"
+BINARY_MAGIC = b"PK\x03\x04"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = "NumSimProject"
+MANIFEST_FORMAT_VERSION = 1
+ARRAY_KEY = "$array"
+# 数值列表至少包含这么多元素时才按数组存放
+ARRAY_MIN_SIZE = 64
+
+
+def atomic_write(path, write, mode="wb", **kwargs):
+    """先通过 write(f) 写入同目录下的临时文件，fsync 后原子替换目标文件"""
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    # 确保目录项（重命名）也落盘
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def format_for_suffix(path):
+    """按后缀确定写入格式"""
+    return BINARY_FORMAT if Path(path).suffix.lower() == BINARY_PROJECT_SUFFIX else JSON_FORMAT
+
+
+def detect_format(path):
+    """按文件头识别已有项目文件的格式，文件不存在时按后缀确定"""
+    try:
+        with open(path, "rb") as f:
+            return BINARY_FORMAT if f.read(len(BINARY_MAGIC)) == BINARY_MAGIC else JSON_FORMAT
+    except OSError:
+        return format_for_suffix(path)
+
+
+def is_binary_project(path):
+    return detect_format(path) == BINARY_FORMAT and Path(path).is_file()
+
+
+def json_default(value):
+    """JSON 序列化 NumPy 数组和标量"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# ---------------------------------------------------------------------------
+# 分区编码：保存时只重新编码修改过的分区，其余分区复用上次的编码结果
+# ---------------------------------------------------------------------------
+
+def encode_section(name, value, file_format):
+    """
+    编码一个分区
+
+    Returns:
+        JSON 格式：分区值的文本（与 json.dump(indent=4) 中该值的文本一致）
+        二进制格式：(分区 JSON 字节, [(成员名, 数组)])
+    """
+    if file_format == JSON_FORMAT:
+        text = json.dumps(value, indent=4, ensure_ascii=False, default=json_default)
+        return text.replace("\n", "\n    ")
+
+    arrays = []
+    prefix = f"arrays/{quote(name, safe='')}/"
+    encoded = _extract_arrays(value, prefix, arrays)
+    text = json.dumps(encoded, ensure_ascii=False, separators=(",", ":"), default=json_default)
+    return text.encode("utf-8"), arrays
+
+
+def _flatten(values):
+    for value in values:
+        if isinstance(value, list):
+            yield from _flatten(value)
+        else:
+            yield value
+
+
+def _as_numeric_array(value):
+    """元素类型一致（全为 int 或全为 float）的规则数值列表转换为数组，否则返回 None"""
+    import numpy as np
+
+    first = value[0]
+    while isinstance(first, list) and first:
+        first = first[0]
+    if type(first) not in (int, float):
+        return None
+    if len(value) < ARRAY_MIN_SIZE and not isinstance(value[0], list):
+        return None
+
+    try:
+        array = np.asarray(value)
+    except ValueError:
+        return None  # 不规则嵌套列表
+    if array.dtype.kind not in "if" or array.size < ARRAY_MIN_SIZE:
+        return None
+    # bool 是 int 的子类，int 与 float 混合时会被提升为 float，均需保持原样
+    element_type = type(first)
+    if any(type(item) is not element_type for item in _flatten(value)):
+        return None
+    return array
+
+
+def _extract_arrays(value, prefix, arrays):
+    """将数组替换为引用，数组本身追加到 arrays"""
+    if isinstance(value, dict):
+        return {key: _extract_arrays(item, prefix, arrays) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        array = _as_numeric_array(value) if value else None
+        if array is None:
+            return [_extract_arrays(item, prefix, arrays) for item in value]
+        value = array
+    if hasattr(value, "__array_interface__") and getattr(value, "dtype", None) is not None \
+            and value.dtype.kind in "biuf" and value.ndim > 0:
+        member = f"{prefix}{len(arrays)}.bin"
+        dtype = value.dtype.newbyteorder("<")
+        arrays.append((member, value.astype(dtype, copy=False)))
+        return {ARRAY_KEY: member, "dtype": dtype.str, "shape": list(value.shape)}
+    return value
+
+
+def write_encoded(path, fragments, file_format):
+    """
+    按分区顺序写出编码后的分区（原子替换）
+
+    Args:
+        fragments: [(分区名, encode_section 的结果)]
+    """
+    if file_format == JSON_FORMAT:
+        items = [f"    {json.dumps(name, ensure_ascii=False)}: {fragment}" for name, fragment in fragments]
+        text = "{\n" + ",\n".join(items) + "\n}" if items else "{}"
+        atomic_write(path, lambda f: f.write(text), mode="w", encoding="utf-8", newline="\n")
+        return
+
+    def write(f):
+        import numpy as np
+
+        manifest = {"format": MANIFEST_FORMAT, "format_version": MANIFEST_FORMAT_VERSION, "sections": []}
+        # 数组已是原始字节，不压缩，读取时也无需解压
+        with zipfile.ZipFile(f, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name, (section_bytes, arrays) in fragments:
+                entry = f"sections/{quote(name, safe='')}.json"
+                manifest["sections"].append({"name": name, "entry": entry})
+                archive.writestr(entry, section_bytes)
+                for member, array in arrays:
+                    with archive.open(member, "w", force_zip64=array.nbytes >= 2 ** 31) as out:
+                        out.write(memoryview(np.ascontiguousarray(array)).cast("B"))
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=4))
+
+    atomic_write(path, write)
+
+
+def write_project(path, sections, file_format=None):
+    """写出完整项目（格式缺省时按后缀确定）"""
+    file_format = file_format or format_for_suffix(path)
+    write_encoded(
+        path,
+        [(name, encode_section(name, value, file_format)) for name, value in sections.items()],
+        file_format
+    )
+
+
+# ---------------------------------------------------------------------------
+# 读取
+# ---------------------------------------------------------------------------
+
+def _resolve_arrays(value, archive):
+    import numpy as np
+
+    if isinstance(value, dict):
+        if ARRAY_KEY in value:
+            buffer = archive.read(value[ARRAY_KEY])
+            return np.frombuffer(buffer, dtype=np.dtype(value["dtype"])).reshape(value["shape"])
+        return {key: _resolve_arrays(item, archive) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_arrays(item, archive) for item in value]
+    return value
+
+
+def read_binary_project(path):
+    """
+    读取二进制项目，返回 {分区名: 值}
+
+    Raises:
+        ValueError: 不是 NumSim 二进制项目文件、版本不受支持或文件已损坏（截断、缺少成员、数组大小不符）
+    """
+    try:
+        with zipfile.ZipFile(path, "r") as archive:
+            manifest = json.loads(archive.read(MANIFEST_NAME))
+            if manifest.get("format") != MANIFEST_FORMAT:
+                raise ValueError(f"不是 NumSim 二进制项目文件: {path}")
+            if manifest.get("format_version", 0) > MANIFEST_FORMAT_VERSION:
+                raise ValueError(f"不支持的项目文件版本: {manifest.get('format_version')}")
+            return {
+                section["name"]: _resolve_arrays(json.loads(archive.read(section["entry"])), archive)
+                for section in manifest["sections"]
+            }
+    except (zipfile.BadZipFile, KeyError, TypeError) as e:
+        raise ValueError(f"项目文件已损坏: {path}") from e
+
+
+def read_project(path):
+    """读取项目文件（自动识别 JSON 或二进制格式）"""
+    if detect_format(path) == BINARY_FORMAT:
+        return read_binary_project(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def convert_project(source, target, file_format=None):
+    """在 JSON 和二进制格式之间转换项目文件（目标格式缺省时按后缀确定）"""
+    write_project(target, read_project(source), file_format)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumSimSolver 项目文件格式转换")
+    parser.add_argument("source", help="源项目文件（JSON 或 *.nsp）")
+    parser.add_argument("target", help="目标项目文件，后缀为 .nsp 时写出二进制格式，否则写出 JSON")
+    args = parser.parse_args()
+    convert_project(args.source, args.target)
+    print(f"已转换: {args.source} -> {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+项目文件存储
+项目的每个顶层键作为一个分区（section），分区修改后标记为脏，保存时只重新编码脏分区，
+其余分区复用上次的编码结果，不再读取并合并磁盘上的旧文件。文件先写入同目录下的临时文件，
+fsync 后通过 os.replace 原子替换，写入过程中崩溃不会损坏原文件。
+文件格式（JSON 或二进制 *.nsp）见 project_format。
+ProjectAutosave 在后台线程中定期提交脏分区，不阻塞 GUI。
+"""
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from . import project_format
+
+APPLICATION_NAME = "NumSimSolver"
+FORMAT_VERSION = "1.0"
+# 默认自动保存间隔（毫秒）
+DEFAULT_AUTOSAVE_INTERVAL = 60 * 1000
+
+
+def _equal(a, b):
+    """比较分区值（包含 NumPy 数组、无法判断时视为不相等）"""
+    try:
+        return bool(a == b)
+    except ValueError:
+        # 数组的 == 返回数组，无法直接判断真假，视为已修改
+        return False
+
+
+class ProjectStore:
+    """
+    按分区跟踪修改的项目存储
+
+    set_section/update 传入的对象在提交时可能被后台线程序列化，调用方之后不应再原地修改它们，
+    需要修改时传入新的对象。
+    """
+
+    def __init__(self, path, sections=None, file_format=None):
+        self.path = Path(path)
+        self.file_format = file_format or project_format.detect_format(path)
+        self._sections = dict(sections or {})
+        self._fragments = {}  # 分区名 -> 上次提交时的编码结果
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+
+    @classmethod
+    def create(cls, path, version):
+        """新建项目（写入版本信息）"""
+        now = datetime.now().isoformat()
+        return cls(path, {
+            "version": version,
+            "created": now,
+            "modified": now,
+            "application": APPLICATION_NAME,
+            "format_version": FORMAT_VERSION,
+        })
+
+    @classmethod
+    def load(cls, path):
+        """读取项目文件（自动识别格式）"""
+        return cls(path, project_format.read_project(path))
+
+    @property
+    def is_dirty(self):
+        with self._lock:
+            return bool(self._dirty)
+
+    @property
+    def dirty_sections(self):
+        with self._lock:
+            return set(self._dirty)
+
+    def sections(self):
+        """当前全部分区（浅拷贝）"""
+        with self._lock:
+            return dict(self._sections)
+
+    def get_section(self, name, default=None):
+        with self._lock:
+            return self._sections.get(name, default)
+
+    def set_section(self, name, value):
+        """设置分区并标记为脏"""
+        with self._lock:
+            self._sections[name] = value
+            self._dirty.add(name)
+
+    def update(self, sections):
+        """批量设置分区，只有值发生变化的分区被标记为脏"""
+        with self._lock:
+            for name, value in sections.items():
+                if name not in self._sections or not _equal(self._sections[name], value):
+                    self._sections[name] = value
+                    self._dirty.add(name)
+
+    def remove_section(self, name):
+        with self._lock:
+            if name in self._sections:
+                del self._sections[name]
+                self._fragments.pop(name, None)
+                self._dirty.discard(name)
+                self._dirty.add(None)  # 分区结构变化，需要重写文件
+
+    def ensure_header(self, version):
+        """补齐缺失的版本信息"""
+        defaults = {"version": version, "application": APPLICATION_NAME, "format_version": FORMAT_VERSION}
+        with self._lock:
+            for name, value in defaults.items():
+                if name not in self._sections:
+                    self._sections[name] = value
+                    self._dirty.add(name)
+
+    def commit(self, path=None, force=False):
+        """
+        提交修改：只序列化脏分区，原子替换项目文件
+
+        Args:
+            path: 另存为的路径，缺省时写回 self.path；格式按其后缀确定
+            force: 没有脏分区时也写文件
+
+        Returns:
+            是否写入了文件
+        """
+        with self._commit_lock:
+            with self._lock:
+                target = Path(path) if path else self.path
+                file_format = project_format.format_for_suffix(target) if path else self.file_format
+                if not force and target == self.path and not self._dirty:
+                    return False
+                # 格式改变时全部分区都要重新编码；原有的编码结果在写入成功之前保持不变
+                previous = dict(self._fragments) if file_format == self.file_format else {}
+                self._sections["modified"] = datetime.now().isoformat()
+                dirty = set(self._dirty) | {"modified"}
+                pending = {
+                    name: value for name, value in self._sections.items()
+                    if name in dirty or name not in previous
+                }
+                self._dirty.clear()
+
+            try:
+                # 在锁外编码，期间GUI线程仍可设置分区（会重新标记为脏）
+                encoded = {
+                    name: project_format.encode_section(name, value, file_format)
+                    for name, value in pending.items()
+                }
+                fragments = {**previous, **encoded}
+                with self._lock:
+                    ordered = [(name, fragments[name]) for name in self._sections if name in fragments]
+                project_format.write_encoded(target, ordered, file_format)
+            except BaseException:
+                with self._lock:
+                    self._dirty.update(name for name in dirty if name is None or name in self._sections)
+                raise
+
+            with self._lock:
+                self._fragments = {name: fragment for name, fragment in fragments.items() if name in self._sections}
+                self.path = target
+                self.file_format = file_format
+            return True
+
+
+class CommitTask(QRunnable):
+    """在线程池中提交项目存储"""
+
+    def __init__(self, store, signals):
+        super().__init__()
+        self.store = store
+        self.signals = signals
+
+    def run(self):
+        try:
+            if self.store.commit():
+                self.signals.saved.emit(str(self.store.path))
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
+class ProjectAutosave(QObject):
+    """定时在后台线程中提交项目存储的脏分区"""
+    saved = Signal(str)
+    failed = Signal(str)
+
+    def __init__(self, parent=None, interval=DEFAULT_AUTOSAVE_INTERVAL, collect=None):
+        """
+        Args:
+            interval: 自动保存间隔（毫秒）
+            collect: 可选，每次自动保存前在GUI线程中调用，返回要更新的分区字典
+        """
+        super().__init__(parent)
+        self.store = None
+        self.collect = collect
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.save_now)
+
+    def set_store(self, store):
+        """切换要自动保存的项目（None 表示停止）"""
+        self.thread_pool.waitForDone()
+        self.store = store
+        if store is None:
+            self.timer.stop()
+        else:
+            self.timer.start()
+
+    def set_interval(self, interval):
+        self.timer.setInterval(interval)
+
+    def save_now(self):
+        """收集GUI状态并在后台提交（上一次提交尚未结束时跳过）"""
+        if self.store is None or self.thread_pool.activeThreadCount() > 0:
+            return
+        if self.collect:
+            self.store.update(self.collect())
+        if self.store.is_dirty:
+            self.thread_pool.start(CommitTask(self.store, self))
+
+    def shutdown(self):
+        """停止定时器，等待进行中的提交，并同步提交最后的修改"""
+        self.timer.stop()
+        self.thread_pool.waitForDone()
+        if self.store is None:
+            return
+        try:
+            if self.collect:
+                self.store.update(self.collect())
+            self.store.commit()
+        except Exception as e:
+            print(f"警告: 自动保存失败: {e}")
@@ -0,0 +1,240 @@
+"""
+求解结果缓存
+与求解器的 NumSimResultCache 使用相同的键和目录结构，二者可以共用一个缓存目录。
+
+缓存键为以下文本的 SHA-256：
+    "NumSimResultCache 1\\n" + 规范化配置 + 每个输入文件一行 "\\n<路径> <文件内容的 SHA-256>"
+规范化配置为紧凑 JSON：对象键排序，浮点数按 17 位有效数字输出（整数值的浮点数与整数相同），
+不含顶层的 cache 分区和 created/modified 时间戳。只是键顺序或格式不同的配置得到相同的键，
+任何值或输入文件（网格）内容的变化都会得到新的键。
+
+缓存条目：<缓存目录>/<键前两位>/<键>/entry.json 和 files/（按相对路径存放的输出文件），
+条目先在临时目录中写好再重命名到位。entry.json 的修改时间为最近使用时间，
+缓存总大小超过上限时从最久未使用的条目开始删除。
+
+配置文件中的 cache 分区（存在即启用，"enabled": false 时关闭）：
+    "cache": {"directory": ".numsim_cache", "max_size_mb": 1024, "inputs": ["mesh/plate.msh"], "outputs": ["results.json"]}
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+KEY_VERSION = "NumSimResultCache 1"
+ENTRY_FILE_NAME = "entry.json"
+FILES_DIRECTORY_NAME = "files"
+DEFAULT_DIRECTORY = ".numsim_cache"
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+# 不影响求解结果的顶层键
+IGNORED_KEYS = ("cache", "created", "modified")
+
+
+def _canonical_string(text):
+    parts = ['"']
+    for ch in text:
+        if ch in '"\\':
+            parts.append("\\" + ch)
+        elif ord(ch) < 0x20:
+            parts.append(f"\\u{ord(ch):04x}")
+        else:
+            parts.append(ch)
+    parts.append('"')
+    return "".join(parts)
+
+
+def _append_canonical(parts, value):
+    if hasattr(value, "tolist"):
+        # NumPy 数组和标量（*.nsp 项目中的数值数组）
+        value = value.tolist()
+    if value is None:
+        parts.append("null")
+    elif isinstance(value, bool):
+        parts.append("true" if value else "false")
+    elif isinstance(value, int):
+        parts.append(str(value))
+    elif isinstance(value, float):
+        parts.append(format(value, ".17g"))
+    elif isinstance(value, str):
+        parts.append(_canonical_string(value))
+    elif isinstance(value, (list, tuple)):
+        parts.append("[")
+        for i, element in enumerate(value):
+            if i:
+                parts.append(",")
+            _append_canonical(parts, element)
+        parts.append("]")
+    elif isinstance(value, dict):
+        parts.append("{")
+        # 按 UTF-8 字节排序，与求解器一致
+        for i, key in enumerate(sorted(value, key=lambda k: k.encode("utf-8"))):
+            if i:
+                parts.append(",")
+            parts.append(_canonical_string(key))
+            parts.append(":")
+            _append_canonical(parts, value[key])
+        parts.append("}")
+    else:
+        raise TypeError(f"无法规范化的配置值类型: {type(value).__name__}")
+
+
+def canonical_json(value):
+    """规范化 JSON 文本（与 NumSimResultCache::CanonicalJson 相同）"""
+    parts = []
+    _append_canonical(parts, value)
+    return "".join(parts)
+
+
+def _stable_config(config):
+    return {key: value for key, value in config.items() if key not in IGNORED_KEYS}
+
+
+def config_hash(config):
+    """规范化配置的 SHA-256（不含输入文件）"""
+    return hashlib.sha256(canonical_json(_stable_config(config)).encode("utf-8")).hexdigest()
+
+
+def file_digest(path):
+    """文件内容的 SHA-256"""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def cache_settings(config):
+    """配置文件中的 cache 分区，没有时返回空字典"""
+    settings = config.get("cache")
+    return settings if isinstance(settings, dict) else {}
+
+
+def cache_key(config, work_dir="."):
+    """
+    配置和输入文件的缓存键（与 NumSimResultCache::ComputeKey 相同）
+
+    Args:
+        config: 项目字典
+        work_dir: 求解器的工作目录，相对的输入文件路径相对于它
+    """
+    lines = [KEY_VERSION, canonical_json(_stable_config(config))]
+    for path in cache_settings(config).get("inputs", []):
+        lines.append(f"{path} {file_digest(Path(work_dir) / path)}")
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def _directory_size(path):
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return size
+
+
+def _copy(source, target):
+    if source.is_dir():
+        shutil.copytree(source, target, dirs_exist_ok=True)
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+
+
+class ResultCache:
+    """本地结果缓存目录，按大小做 LRU 淘汰"""
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_size=DEFAULT_MAX_SIZE):
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+    @classmethod
+    def from_config(cls, config, work_dir="."):
+        """按配置文件的 cache 分区创建，目录相对于工作目录"""
+        settings = cache_settings(config)
+        max_size = int(settings.get("max_size_mb", DEFAULT_MAX_SIZE / (1024 * 1024)) * 1024 * 1024)
+        return cls(Path(work_dir) / settings.get("directory", DEFAULT_DIRECTORY), max_size)
+
+    def entry_path(self, key):
+        return self.directory / key[:2] / key
+
+    def contains(self, key):
+        return (self.entry_path(key) / ENTRY_FILE_NAME).is_file()
+
+    def restore(self, key, work_dir):
+        """把缓存的输出文件复制到工作目录，未命中时返回 False"""
+        entry = self.entry_path(key)
+        if not (entry / ENTRY_FILE_NAME).is_file():
+            return False
+        work_dir = Path(work_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        files = entry / FILES_DIRECTORY_NAME
+        if files.is_dir():
+            for item in files.iterdir():
+                _copy(item, work_dir / item.name)
+        # 标记为最近使用
+        os.utime(entry / ENTRY_FILE_NAME)
+        return True
+
+    def store(self, key, work_dir, outputs):
+        """
+        把工作目录中的输出文件存入缓存并淘汰旧条目
+
+        Args:
+            outputs: 相对于工作目录的输出文件或目录
+        Returns:
+            有输出缺失时返回 False（不缓存）
+        """
+        work_dir = Path(work_dir)
+        if any(not (work_dir / output).exists() for output in outputs):
+            return False
+        entry = self.entry_path(key)
+        if (entry / ENTRY_FILE_NAME).is_file():
+            return True
+
+        # 先写临时目录再重命名，并发的 restore 不会看到不完整的条目
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_dir = Path(tempfile.mkdtemp(prefix="tmp-", dir=self.directory))
+        try:
+            for output in outputs:
+                _copy(work_dir / output, temp_dir / FILES_DIRECTORY_NAME / output)
+            with open(temp_dir / ENTRY_FILE_NAME, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "outputs": list(outputs)}, f, ensure_ascii=False)
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(temp_dir, entry)
+            except OSError:
+                # 其他进程已经存入了同一个键
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        self.evict()
+        return True
+
+    def evict(self):
+        """从最久未使用的条目开始删除，直到总大小不超过上限"""
+        entries = []
+        total_size = 0
+        if not self.directory.is_dir():
+            return
+        for prefix in self.directory.iterdir():
+            if not prefix.is_dir() or len(prefix.name) != 2:
+                continue
+            for entry in prefix.iterdir():
+                try:
+                    last_used = (entry / ENTRY_FILE_NAME).stat().st_mtime
+                except OSError:
+                    continue
+                size = _directory_size(entry)
+                entries.append((last_used, size, entry))
+                total_size += size
+
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
@@ -0,0 +1,516 @@
+"""
+Setting View
+以项目配置为数据源的树形模型（QAbstractItemModel），用于包含数万个节点（每个边界、每个区域的设置）的配置。
+
+- 节点在第一次展开时才创建，每次 fetchMore 只创建 FETCH_BATCH 个子节点，视图滚动到末尾时再创建下一批，
+  展开有 10^5 个子节点的分区与展开小分区的耗时相同。
+- 搜索使用全部节点路径文本（含叶子的值）的索引，数据变化后在空闲时分步构建；输入在上一次查询后追加字符时，
+  只在上一次的结果中继续筛选。结果以平铺列表显示，激活结果时在树中定位（只创建路径上需要的节点）。
+- update_sections 按分区批量替换数据，set_values 批量修改叶子的值，每个父节点只发出一次 dataChanged。
+  set_values 不原地修改配置对象，只复制被修改路径上的容器，调用方随后把 config 中的新分区交给 ProjectStore.set_section。
+
+性能测试见 benchmarks/bench_setting_view.py。
+"""
+import copy
+
+from PySide6.QtCore import QAbstractItemModel, QAbstractListModel, QModelIndex, Qt, QTimer, Signal
+from PySide6.QtWidgets import QLineEdit, QListView, QStackedWidget, QTreeView, QVBoxLayout, QWidget
+
+# 每次 fetchMore 创建的子节点数
+FETCH_BATCH = 256
+# 空闲时每次加入搜索索引的节点数
+INDEX_STEP = 5000
+# 叶子值显示的最大长度
+MAX_VALUE_LENGTH = 80
+
+PATH_ROLE = Qt.UserRole + 1
+VALUE_ROLE = Qt.UserRole + 2
+
+# flags() 对每个可见行都会调用，预先组合好标志（PySide6 中枚举的运算开销较大）
+CONTAINER_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+LEAF_FLAGS = CONTAINER_FLAGS | Qt.ItemNeverHasChildren
+
+
+def is_container(value):
+    return isinstance(value, (dict, list, tuple))
+
+
+def format_value(value):
+    """叶子值的显示文本"""
+    if hasattr(value, "shape") and hasattr(value, "dtype"):
+        # *.nsp 项目中的 NumPy 数组
+        return f"array{tuple(value.shape)} {value.dtype}"
+    text = str(value)
+    if len(text) > MAX_VALUE_LENGTH:
+        text = text[:MAX_VALUE_LENGTH - 3] + "..."
+    return text
+
+
+def _equal(a, b):
+    """与 ProjectStore 相同：同一对象或值相等（含 NumPy 数组、无法判断时视为不相等）"""
+    try:
+        return a is b or bool(a == b)
+    except ValueError:
+        return False
+
+
+def format_path(path):
+    return ".".join(str(key) for key in path)
+
+
+class SettingNode:
+    """树中的一个节点，children 只包含已创建的子节点"""
+
+    __slots__ = ("key", "value", "parent", "row", "children", "is_container", "num_children", "_keys", "_rows")
+
+    def __init__(self, key, value, parent, row):
+        self.key = key
+        self.parent = parent
+        self.row = row
+        self.reset(value)
+
+    def child_keys(self):
+        if self._keys is None:
+            self._keys = list(self.value) if isinstance(self.value, dict) else range(len(self.value))
+        return self._keys
+
+    def child_row(self, key):
+        """子节点的行号，没有该键时返回 None"""
+        if not isinstance(self.value, dict):
+            return key if isinstance(key, int) and 0 <= key < len(self.value) else None
+        if self._rows is None:
+            self._rows = {child_key: row for row, child_key in enumerate(self.child_keys())}
+        return self._rows.get(key)
+
+    def path(self):
+        keys = []
+        node = self
+        while node.parent is not None:
+            keys.append(node.key)
+            node = node.parent
+        return tuple(reversed(keys))
+
+    def reset(self, value):
+        # hasChildren/flags 对每个可见行都会调用，类型和子节点数在创建时确定
+        self.value = value
+        self.is_container = is_container(value)
+        self.num_children = len(value) if self.is_container else 0
+        self.children = []
+        self._keys = None
+        self._rows = None
+
+
+class SettingTreeModel(QAbstractItemModel):
+    """以配置字典为数据源、按需创建节点的树形模型"""
+
+    def __init__(self, config=None, parent=None, batch_size=FETCH_BATCH):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self._root = SettingNode(None, dict(config or {}), None, 0)
+        self._search_index = None
+        # 空闲时分步构建搜索索引，第一次搜索时通常已经完成
+        self._index_timer = QTimer(self)
+        self._index_timer.setInterval(0)
+        self._index_timer.timeout.connect(self._build_search_index)
+
+    # ------------------------------------------------------------------
+    # 数据
+    # ------------------------------------------------------------------
+
+    @property
+    def config(self):
+        return self._root.value
+
+    def set_config(self, config):
+        """替换全部配置（浅拷贝顶层字典）"""
+        self.beginResetModel()
+        self._root = SettingNode(None, dict(config or {}), None, 0)
+        self.endResetModel()
+        self._invalidate_search_index()
+
+    def update_sections(self, sections):
+        """批量替换顶层分区，值未变化的分区（展开状态）不受影响"""
+        root = self._root
+        for name, value in sections.items():
+            row = root.child_row(name)
+            if row is None:
+                root.value[name] = value
+                root.num_children = len(root.value)
+                root._keys = root._rows = None
+                # 行只在已全部创建时插入，否则由之后的 fetchMore 创建
+                if len(root.children) == root.num_children - 1:
+                    self._fetch(root, QModelIndex(), 1)
+                self._invalidate_search_index()
+                continue
+            if _equal(root.value[name], value):
+                continue
+            root.value[name] = value
+            self._invalidate_search_index()
+            if row < len(root.children):
+                self._replace(root.children[row], value)
+
+    def set_values(self, changes):
+        """
+        批量修改叶子的值
+
+        Args:
+            changes: [(路径, 值)]，路径为键的元组，必须指向已有的键
+
+        原有的配置对象可能由 ProjectStore 持有、正在自动保存线程中序列化，不能原地修改：路径上的容器
+        （含顶层分区）先复制再修改，未修改的子树仍然共用。调用方把 config 中的新分区交给 ProjectStore.set_section。
+
+        Returns:
+            值被修改的顶层分区名集合
+        """
+        changed_rows = {}  # 已创建的父节点 -> 变化的行
+        sections = set()
+        copied = set()  # 本次已复制的容器（id），同一容器中的多处修改只复制一次
+        for path, value in changes:
+            node = self._root
+            container = node.value
+            for depth, key in enumerate(path):
+                if depth == len(path) - 1:
+                    container[key] = value
+                else:
+                    child = container[key]
+                    if id(child) not in copied:
+                        child = copy.copy(child)
+                        container[key] = child
+                        copied.add(id(child))
+                    container = child
+                if node is not None:
+                    row = node.child_row(key)
+                    parent, node = node, node.children[row] if row is not None and row < len(node.children) else None
+                    if node is not None and depth < len(path) - 1:
+                        node.value = container
+            if node is not None:
+                if is_container(node.value) or is_container(value):
+                    self._replace(node, value)
+                else:
+                    node.value = value
+                    changed_rows.setdefault(parent, []).append(node.row)
+            sections.add(path[0])
+        for parent, rows in changed_rows.items():
+            parent_index = self._index_of(parent)
+            self.dataChanged.emit(
+                self.index(min(rows), 0, parent_index), self.index(max(rows), 0, parent_index),
+                [Qt.DisplayRole, VALUE_ROLE]
+            )
+        if changes:
+            self._invalidate_search_index()
+        return sections
+
+    def search_index(self):
+        """全部节点的搜索索引（数据变化后重建，search 时补全尚未构建的部分）"""
+        if self._search_index is None:
+            self._search_index = SettingSearchIndex(self._root.value)
+        return self._search_index
+
+    def index_for_path(self, path):
+        """路径对应的索引，只创建路径上需要的节点；路径不存在时返回无效索引"""
+        node = self._root
+        index = QModelIndex()
+        for key in path:
+            row = node.child_row(key) if node.is_container else None
+            if row is None:
+                return QModelIndex()
+            if row >= len(node.children):
+                # 一次创建到包含该行的整批
+                count = (row - len(node.children)) // self.batch_size * self.batch_size + self.batch_size
+                self._fetch(node, index, count)
+            node = node.children[row]
+            index = self.createIndex(row, 0, node)
+        return index
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else self._root
+
+    # ------------------------------------------------------------------
+    # QAbstractItemModel
+    # ------------------------------------------------------------------
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node(parent)
+        if column != 0 or not 0 <= row < len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index=None):
+        if index is None:
+            # QObject.parent()
+            return super().parent()
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        return self.node(parent).num_children > 0
+
+    def canFetchMore(self, parent):
+        node = self.node(parent)
+        return len(node.children) < node.num_children
+
+    def fetchMore(self, parent):
+        self._fetch(self.node(parent), parent, self.batch_size)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return CONTAINER_FLAGS if index.internalPointer().is_container else LEAF_FLAGS
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            if node.is_container:
+                return str(node.key)
+            return f"{node.key}: {format_value(node.value)}"
+        if role == Qt.ToolTipRole:
+            return format_path(node.path())
+        if role == PATH_ROLE:
+            return node.path()
+        if role == VALUE_ROLE:
+            return node.value
+        return None
+
+    # ------------------------------------------------------------------
+    # 内部
+    # ------------------------------------------------------------------
+
+    def _invalidate_search_index(self):
+        self._search_index = None
+        self._index_timer.start()
+
+    def _build_search_index(self):
+        if self.search_index().build(INDEX_STEP):
+            self._index_timer.stop()
+
+    def _index_of(self, node):
+        if node is None or node.parent is None:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def _fetch(self, node, parent_index, count):
+        start = len(node.children)
+        end = min(node.num_children, start + count)
+        if end <= start:
+            return
+        keys = node.child_keys()
+        value = node.value
+        self.beginInsertRows(parent_index, start, end - 1)
+        node.children.extend(
+            SettingNode(keys[row], value[keys[row]], node, row) for row in range(start, end)
+        )
+        self.endInsertRows()
+
+    def _replace(self, node, value):
+        """替换节点的值，已创建的子节点全部移除"""
+        index = self._index_of(node)
+        if node.children:
+            self.beginRemoveRows(index, 0, len(node.children) - 1)
+            node.reset(value)
+            self.endRemoveRows()
+        else:
+            node.reset(value)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, VALUE_ROLE])
+
+
+class SettingSearchIndex:
+    """全部节点的路径文本（小写，叶子附带值），可以分步构建"""
+
+    def __init__(self, config):
+        self.paths = []
+        self.texts = []
+        self._last_query = None
+        self._last_matches = None
+        # 用显式栈遍历，避免深层配置的递归开销；栈中是 (路径, 路径文本, 容器)
+        self._stack = [((), "", config)]
+
+    @property
+    def is_complete(self):
+        return not self._stack
+
+    def build(self, max_nodes=None):
+        """继续构建索引，最多加入约 max_nodes 个节点（None 表示全部），完成时返回 True"""
+        stack, paths, texts = self._stack, self.paths, self.texts
+        limit = len(paths) + max_nodes if max_nodes is not None else None
+        while stack and (limit is None or len(paths) < limit):
+            prefix, prefix_text, value = stack.pop()
+            items = value.items() if isinstance(value, dict) else enumerate(value)
+            children = []
+            for key, child in items:
+                path = prefix + (key,)
+                text = f"{prefix_text}.{key}" if prefix_text else str(key)
+                if is_container(child):
+                    children.append((path, text, child))
+                    texts.append(text.lower())
+                else:
+                    texts.append(f"{text}: {format_value(child)}".lower())
+                paths.append(path)
+            stack.extend(reversed(children))
+        return not stack
+
+    def __len__(self):
+        return len(self.paths)
+
+    def search(self, query):
+        """包含 query（不区分大小写）的节点序号列表"""
+        self.build()
+        query = query.strip().lower()
+        if not query:
+            self._last_query = self._last_matches = None
+            return []
+        if self._last_query is not None and self._last_query in query:
+            # 追加字符后的结果一定是上一次结果的子集
+            texts = self.texts
+            matches = [i for i in self._last_matches if query in texts[i]]
+        else:
+            matches = [i for i, text in enumerate(self.texts) if query in text]
+        self._last_query, self._last_matches = query, matches
+        return matches
+
+
+class SettingSearchModel(QAbstractListModel):
+    """搜索结果列表，与配置树一样按批显示"""
+
+    def __init__(self, parent=None, batch_size=FETCH_BATCH):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self._index = None
+        self._matches = []
+        self._shown = 0
+
+    @property
+    def num_matches(self):
+        return len(self._matches)
+
+    def set_matches(self, search_index, matches):
+        self.beginResetModel()
+        self._index = search_index
+        self._matches = matches
+        self._shown = min(len(matches), self.batch_size)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._shown
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self._shown < len(self._matches)
+
+    def fetchMore(self, parent):
+        end = min(len(self._matches), self._shown + self.batch_size)
+        self.beginInsertRows(QModelIndex(), self._shown, end - 1)
+        self._shown = end
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        position = self._matches[index.row()]
+        if role == Qt.DisplayRole:
+            return self._index.texts[position]
+        if role == PATH_ROLE:
+            return self._index.paths[position]
+        return None
+
+
+class SettingView(QWidget):
+    """Setting View：搜索框、配置树和搜索结果列表"""
+
+    # 节点被点击或激活：路径、值、是否为叶子
+    setting_activated = Signal(object, object, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = SettingTreeModel(parent=self)
+        self.search_model = SettingSearchModel(self)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("搜索设置...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.set_filter)
+        layout.addWidget(self.search_edit)
+
+        # 所有行高度相同，视图只布局可见的行
+        self.tree = QTreeView()
+        self.tree.setHeaderHidden(True)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setModel(self.model)
+        self.tree.clicked.connect(self._on_tree_clicked)
+        self.tree.setStyleSheet("""
+            QTreeView {
+                background-color: white;
+                border: none;
+            }
+        """)
+
+        self.results = QListView()
+        self.results.setUniformItemSizes(True)
+        self.results.setModel(self.search_model)
+        self.results.activated.connect(self._on_result_activated)
+        self.results.clicked.connect(self._on_result_activated)
+
+        self.stack = QStackedWidget()
+        self.stack.addWidget(self.tree)
+        self.stack.addWidget(self.results)
+        layout.addWidget(self.stack)
+        self.setLayout(layout)
+
+    def set_config(self, config):
+        self.model.set_config(config)
+        self.set_filter(self.search_edit.text())
+
+    def update_sections(self, sections):
+        self.model.update_sections(sections)
+        if self.search_edit.text().strip():
+            self.set_filter(self.search_edit.text())
+
+    def set_filter(self, text):
+        """按输入筛选，空文本时显示配置树"""
+        if not text.strip():
+            self.search_model.set_matches(None, [])
+            self.stack.setCurrentWidget(self.tree)
+            return
+        search_index = self.model.search_index()
+        self.search_model.set_matches(search_index, search_index.search(text))
+        self.stack.setCurrentWidget(self.results)
+
+    def reveal(self, path):
+        """在树中展开并选中路径对应的节点"""
+        index = self.model.index_for_path(path)
+        if not index.isValid():
+            return index
+        parent = index.parent()
+        while parent.isValid():
+            self.tree.expand(parent)
+            parent = parent.parent()
+        self.tree.setCurrentIndex(index)
+        self.tree.scrollTo(index)
+        return index
+
+    def _on_tree_clicked(self, index):
+        node = self.model.node(index)
+        self.setting_activated.emit(node.path(), node.value, not node.is_container)
+
+    def _on_result_activated(self, index):
+        path = index.data(PATH_ROLE)
+        self.search_edit.blockSignals(True)
+        self.search_edit.clear()
+        self.search_edit.blockSignals(False)
+        self.set_filter("")
+        tree_index = self.reveal(path)
+        if tree_index.isValid():
+            self._on_tree_clicked(tree_index)
@@ -0,0 +1,420 @@
+"""
+参数扫描
+以一个基础项目和参数空间（网格或拉丁超立方采样）生成一组配置，在本地进程池中并发运行求解器，
+按缓存键缓存结果（重复的参数点直接复用），并把各点的标量输出汇总成一张按列存储的表。
+
+参数空间文件（JSON）：
+    {"method": "grid", "parameters": {"settings.solver.dt": [0.1, 0.05], "settings.solver.order": [1, 2]}}
+    {"method": "lhs", "samples": 100, "seed": 0, "parameters": {"settings.solver.dt": [0.01, 0.1]}}
+网格方法中每个参数给出取值列表；拉丁超立方方法中给出 [下限, 上限]，上下限均为整数时按整数采样。
+参数路径以 "." 分隔，列表元素用下标表示（如 "visual_views.0.title"）。
+
+每个参数点在 <输出目录>/points/<配置哈希前 16 位>/ 下运行 `NumSimSolver -i NumSimSolver.json`，
+标量输出从该目录中的 results.json（{名称: 数值}）读取。汇总表写入 <输出目录>/results.csv。
+配置不符合求解器配置模式（见 config_schema）的参数点不运行，直接记为失败。
+成功的参数点把 results.json 和配置中 cache.outputs 列出的输出文件存入结果缓存（见 result_cache，
+与求解器的缓存格式相同），再次遇到相同配置和输入文件时直接从缓存恢复到工作目录。
+
+配置中的相对路径相对于求解器的工作目录。cache.inputs 中的相对路径按基础项目所在目录（base_dir）解析，
+运行前链接到参数点的工作目录（不支持符号链接时硬链接，再不行时复制），因此网格等输入文件需列在 cache.inputs 中，
+且不能以 ".." 指向基础项目目录之外（这样的文件请使用绝对路径）。
+
+用法（在 src 目录下）：
+    python -m NumSimGui.sweep NumSimSolver.json space.json --output-dir sweep --jobs 8
+"""
+import argparse
+import copy
+import csv
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from . import config_schema, project_format, result_cache
+
+GRID_METHOD = "grid"
+LHS_METHOD = "lhs"
+CONFIG_FILE_NAME = "NumSimSolver.json"
+RESULTS_FILE_NAME = "results.json"
+LOG_FILE_NAME = "solver.log"
+SOLVER_NAME = "NumSimSolver"
+
+
+# ---------------------------------------------------------------------------
+# 参数路径与参数空间
+# ---------------------------------------------------------------------------
+
+def _path_keys(path):
+    return [int(key) if key.lstrip("-").isdigit() else key for key in path.split(".")]
+
+
+def get_path(config, path):
+    """读取参数路径处的值"""
+    value = config
+    for key in _path_keys(path):
+        value = value[key]
+    return value
+
+
+def set_path(config, path, value):
+    """设置参数路径处的值，缺少的中间字典会被创建"""
+    keys = _path_keys(path)
+    node = config
+    for key in keys[:-1]:
+        if isinstance(node, dict) and key not in node:
+            node[key] = {}
+        node = node[key]
+    node[keys[-1]] = value
+
+
+class ParameterSpace:
+    """参数空间（网格或拉丁超立方采样）"""
+
+    def __init__(self, method, parameters, samples=None, seed=None):
+        if method not in (GRID_METHOD, LHS_METHOD):
+            raise ValueError(f"未知的参数空间方法: {method}")
+        if method == LHS_METHOD and not samples:
+            raise ValueError("拉丁超立方采样需要指定 samples")
+        self.method = method
+        self.parameters = dict(parameters)
+        self.samples = samples
+        self.seed = seed
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("method", GRID_METHOD), data["parameters"], data.get("samples"), data.get("seed"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @property
+    def names(self):
+        return list(self.parameters)
+
+    def points(self):
+        """返回参数点列表 [{参数路径: 值}]"""
+        if self.method == GRID_METHOD:
+            return [dict(zip(self.names, values)) for values in itertools.product(*self.parameters.values())]
+        return self._latin_hypercube()
+
+    def _latin_hypercube(self):
+        import numpy as np
+
+        rng = np.random.default_rng(self.seed)
+        n = int(self.samples)
+        columns = {}
+        for name, (low, high) in self.parameters.items():
+            # 每一维分成 n 个等概率区间，每个区间恰好取一个样本，区间顺序随机
+            u = (rng.permutation(n) + rng.random(n)) / n
+            if isinstance(low, int) and isinstance(high, int):
+                columns[name] = [int(v) for v in np.floor(low + u * (high - low + 1))]
+            else:
+                columns[name] = [float(v) for v in low + u * (high - low)]
+        return [{name: columns[name][i] for name in self.names} for i in range(n)]
+
+
+class SweepPoint:
+    """一个参数点"""
+
+    def __init__(self, index, parameters, config, work_dir):
+        self.index = index
+        self.parameters = parameters
+        self.config = config
+        self.hash = result_cache.config_hash(config)
+        self.work_dir = Path(work_dir) / self.hash[:16]
+
+    @property
+    def config_path(self):
+        return self.work_dir / CONFIG_FILE_NAME
+
+
+def materialize(base, space, output_dir):
+    """按参数空间生成各参数点的配置（尚未写入磁盘）"""
+    points_dir = Path(output_dir) / "points"
+    points = []
+    for index, parameters in enumerate(space.points()):
+        config = copy.deepcopy(base)
+        for path, value in parameters.items():
+            set_path(config, path, value)
+        points.append(SweepPoint(index, parameters, config, points_dir))
+    return points
+
+
+# ---------------------------------------------------------------------------
+# 汇总表
+# ---------------------------------------------------------------------------
+
+class SweepTable:
+    """按列存储的结果表，每个参数点一行，缺失的值为 None"""
+
+    def __init__(self):
+        self.columns = {}
+        self._num_rows = 0
+
+    def __len__(self):
+        return self._num_rows
+
+    def add_row(self, row):
+        for name in row:
+            if name not in self.columns:
+                self.columns[name] = [None] * self._num_rows
+        for name, column in self.columns.items():
+            column.append(row.get(name))
+        self._num_rows += 1
+
+    def column(self, name):
+        return self.columns[name]
+
+    def rows(self):
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+    def to_csv(self, path):
+        def write(f):
+            writer = csv.writer(f)
+            writer.writerow(self.columns)
+            writer.writerows(zip(*self.columns.values()))
+
+        project_format.atomic_write(path, write, mode="w", encoding="utf-8", newline="")
+
+
+# ---------------------------------------------------------------------------
+# 运行
+# ---------------------------------------------------------------------------
+
+def find_solver():
+    """在 install 目录下查找求解器（优先 Release 构建），找不到时返回 None"""
+    install_dir = Path(__file__).resolve().parents[2] / "install"
+    suffix = ".exe" if sys.platform == "win32" else ""
+    for config in ("Release", "RelWithDebInfo", "Debug", ""):
+        path = install_dir / config / f"{SOLVER_NAME}{suffix}"
+        if path.is_file():
+            return path
+    return None
+
+
+def read_outputs(work_dir):
+    """读取工作目录中 results.json 的标量输出"""
+    try:
+        with open(Path(work_dir) / RESULTS_FILE_NAME, "r", encoding="utf-8") as f:
+            results = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {key: value for key, value in results.items() if isinstance(value, (int, float, str, bool))}
+
+
+def run_solver(config_path, work_dir, solver, timeout=None):
+    """在工作目录中运行求解器，返回标量输出"""
+    with open(Path(work_dir) / LOG_FILE_NAME, "w", encoding="utf-8") as log:
+        result = subprocess.run(
+            [str(solver), "-i", str(config_path)],
+            cwd=work_dir, stdout=log, stderr=subprocess.STDOUT, timeout=timeout
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"求解器退出码 {result.returncode}，见 {Path(work_dir) / LOG_FILE_NAME}")
+    return read_outputs(work_dir)
+
+
+def _relative_inputs(config):
+    """
+    cache.inputs 中的相对路径
+
+    Raises:
+        ValueError: 相对路径指向基础项目目录之外
+    """
+    paths = []
+    for path in result_cache.cache_settings(config).get("inputs", []):
+        if Path(path).is_absolute():
+            continue
+        if ".." in Path(path).parts:
+            raise ValueError(f"输入文件路径不能包含 \"..\"，请使用绝对路径: {path}")
+        paths.append(path)
+    return paths
+
+
+def link_inputs(config, base_dir, work_dir):
+    """把 cache.inputs 中的相对路径输入文件从基础项目目录链接到参数点的工作目录"""
+    for path in _relative_inputs(config):
+        source = (Path(base_dir) / path).resolve()
+        target = Path(work_dir) / path
+        if target.exists() or target.is_symlink():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.symlink(source, target)
+        except OSError:
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copy2(source, target)
+
+
+def _run_point(runner, config_path, work_dir):
+    start = time.perf_counter()
+    outputs = runner(config_path, work_dir)
+    return outputs, time.perf_counter() - start
+
+
+class SolverRunner:
+    """默认运行方式：启动求解器子进程（可被 pickle，供进程池使用）"""
+
+    def __init__(self, solver, timeout=None):
+        self.solver = solver
+        self.timeout = timeout
+
+    def __call__(self, config_path, work_dir):
+        return run_solver(config_path, work_dir, self.solver, self.timeout)
+
+
+def _store_outputs(cache, key, point, outputs):
+    """把参数点的输出文件存入缓存；自定义运行方式没有写 results.json 时按返回值补写"""
+    results_path = point.work_dir / RESULTS_FILE_NAME
+    if not results_path.exists():
+        project_format.atomic_write(
+            results_path, lambda f: json.dump(outputs, f, ensure_ascii=False), mode="w", encoding="utf-8"
+        )
+    files = [RESULTS_FILE_NAME]
+    files += [path for path in result_cache.cache_settings(point.config).get("outputs", []) if path not in files]
+    cache.store(key, point.work_dir, files)
+
+
+def run_sweep(base, space, output_dir, jobs=None, runner=None, solver=None, cache_dir=None,
+              progress=None, cancel=None, base_dir="."):
+    """
+    运行参数扫描
+
+    Args:
+        base: 基础项目字典
+        space: ParameterSpace
+        output_dir: 输出目录（各参数点的工作目录和 results.csv）
+        jobs: 最大并发数，缺省为 CPU 核心数
+        runner: 可选，runner(config_path, work_dir) -> {输出名: 标量}，必须可被 pickle，
+                在进程池中执行（例如通过 NumSimPython 在进程内运行）；缺省时启动求解器子进程
+        solver: 求解器可执行文件，缺省时在 install 目录下查找
+        cache_dir: 结果缓存目录，缺省为 <输出目录>/cache；多次扫描或求解器共用同一目录时可跳过重复的参数点
+        progress: 可选，progress(已完成数, 总数)
+        cancel: 可选，带 is_set() 的对象（如 threading.Event），置位后不再启动新的参数点
+        base_dir: 基础项目所在目录，cache.inputs 中的相对路径相对于它
+
+    Returns:
+        SweepTable，列为 point、hash、各参数、status（ok/failed/cancelled）、cached、elapsed、error 和各标量输出
+    """
+    output_dir = Path(output_dir)
+    cache = result_cache.ResultCache(cache_dir or output_dir / "cache")
+    points = materialize(base, space, output_dir)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    table = SweepTable()
+    rows = {}
+
+    def finish(point, status, outputs=None, elapsed=None, cached=False, error=None):
+        row = {"point": point.index, "hash": point.hash}
+        row.update(point.parameters)
+        row.update({"status": status, "cached": cached, "elapsed": elapsed, "error": error})
+        row.update(outputs or {})
+        rows[point.index] = row
+        if progress:
+            progress(len(rows), len(points))
+
+    # 缓存命中和同一次扫描中的重复参数点不再运行
+    pending = {}
+    for point in points:
+        # 无效的配置不启动求解器，错误与求解器的配置检查相同
+        errors = config_schema.validate(point.config)
+        if errors:
+            finish(point, "failed", error="; ".join(errors))
+            continue
+        try:
+            _relative_inputs(point.config)
+            key = result_cache.cache_key(point.config, base_dir)
+        except ValueError as e:
+            finish(point, "failed", error=str(e))
+            continue
+        except OSError as e:
+            finish(point, "failed", error=f"读取输入文件失败: {e}")
+            continue
+        if cache.restore(key, point.work_dir):
+            finish(point, "ok", read_outputs(point.work_dir), 0.0, cached=True)
+        else:
+            pending.setdefault(key, []).append(point)
+
+    if runner is None:
+        solver = solver or find_solver()
+        if solver is None:
+            raise FileNotFoundError(f"未找到 {SOLVER_NAME}，请先构建或通过 solver 指定")
+        # 求解器本身就是子进程，用线程提交即可限制并发进程数
+        runner, executor = SolverRunner(solver), ThreadPoolExecutor(max_workers=jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+
+    with executor:
+        queue = list(pending.items())
+        running = {}
+        while queue or running:
+            while queue and len(running) < jobs and not (cancel and cancel.is_set()):
+                key, group = queue.pop(0)
+                point = group[0]
+                point.work_dir.mkdir(parents=True, exist_ok=True)
+                link_inputs(point.config, base_dir, point.work_dir)
+                project_format.write_project(point.config_path, point.config, project_format.JSON_FORMAT)
+                running[executor.submit(_run_point, runner, point.config_path, point.work_dir)] = key, group
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, group = running.pop(future)
+                try:
+                    outputs, elapsed = future.result()
+                except Exception as e:
+                    for point in group:
+                        finish(point, "failed", error=str(e))
+                    continue
+                _store_outputs(cache, key, group[0], outputs)
+                for i, point in enumerate(group):
+                    finish(point, "ok", outputs, elapsed, cached=i > 0)
+
+    # 取消后未启动的参数点
+    for _, group in queue:
+        for point in group:
+            finish(point, "cancelled")
+
+    for index in sorted(rows):
+        table.add_row(rows[index])
+    output_dir.mkdir(parents=True, exist_ok=True)
+    table.to_csv(output_dir / "results.csv")
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumSimSolver 参数扫描")
+    parser.add_argument("project", help="基础项目文件（JSON 或 *.nsp）")
+    parser.add_argument("space", help="参数空间文件（JSON）")
+    parser.add_argument("--output-dir", default="sweep", help="输出目录")
+    parser.add_argument("--jobs", type=int, default=None, help="最大并发数，缺省为 CPU 核心数")
+    parser.add_argument("--solver", default=None, help="求解器可执行文件")
+    parser.add_argument("--cache-dir", default=None, help="结果缓存目录，缺省为 <输出目录>/cache")
+    args = parser.parse_args()
+
+    def report(done, total):
+        print(f"\r{done}/{total}", end="", flush=True)
+
+    table = run_sweep(
+        project_format.read_project(args.project), ParameterSpace.load(args.space), args.output_dir,
+        jobs=args.jobs, solver=args.solver, cache_dir=args.cache_dir, progress=report,
+        base_dir=Path(args.project).resolve().parent
+    )
+    statuses = table.column("status") if len(table) else []
+    cached = sum(1 for value in table.columns.get("cached", []) if value)
+    print(f"\n完成 {statuses.count('ok')}/{len(table)} 个参数点（缓存命中 {cached}），"
+          f"结果: {Path(args.output_dir) / 'results.csv'}")
+    sys.exit(0 if statuses.count("failed") == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+参数扫描对话框
+以当前项目为基础项目，选择参数空间文件、输出目录和并发数，在后台线程中运行 sweep.run_sweep，
+完成后在表格中显示汇总结果。
+"""
+import os
+import threading
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtWidgets import (
+    QDialog, QFileDialog, QFormLayout, QHBoxLayout, QLabel, QLineEdit, QMessageBox, QProgressBar,
+    QPushButton, QSpinBox, QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget
+)
+
+from .sweep import ParameterSpace, find_solver, run_sweep
+
+
+class SweepSignals(QObject):
+    """扫描任务的信号"""
+    progress = Signal(int, int)
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class SweepTask(QRunnable):
+    """在线程池中运行参数扫描（各参数点在子进程中运行）"""
+
+    def __init__(self, base, space, output_dir, jobs, solver, base_dir="."):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.base = base
+        self.base_dir = base_dir
+        self.space = space
+        self.output_dir = output_dir
+        self.jobs = jobs
+        self.solver = solver
+        self.signals = SweepSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """不再启动新的参数点，正在运行的参数点会运行结束"""
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            table = run_sweep(
+                self.base, self.space, self.output_dir, jobs=self.jobs, solver=self.solver,
+                progress=self.signals.progress.emit, cancel=self._cancel_event, base_dir=self.base_dir
+            )
+            self.signals.finished.emit(table)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
+class SweepDialog(QDialog):
+    """参数扫描对话框"""
+
+    def __init__(self, base, default_output_dir="", parent=None, base_dir="."):
+        """
+        Args:
+            base: 基础项目字典（当前项目的全部分区）
+            default_output_dir: 默认输出目录
+            base_dir: 基础项目所在目录，输入文件的相对路径相对于它
+        """
+        super().__init__(parent)
+        self.base = base
+        self.base_dir = base_dir
+        self.task = None
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self.setWindowTitle("参数扫描")
+        self.resize(800, 500)
+        self.init_ui(default_output_dir)
+
+    def init_ui(self, default_output_dir):
+        layout = QVBoxLayout()
+        form = QFormLayout()
+
+        self.space_edit = QLineEdit()
+        form.addRow("参数空间文件:", self._with_browse(self.space_edit, self.browse_space))
+        self.output_dir_edit = QLineEdit(default_output_dir)
+        form.addRow("输出目录:", self._with_browse(self.output_dir_edit, self.browse_output_dir))
+        solver = find_solver()
+        self.solver_edit = QLineEdit(str(solver) if solver else "")
+        form.addRow("求解器:", self._with_browse(self.solver_edit, self.browse_solver))
+        self.jobs_spin = QSpinBox()
+        self.jobs_spin.setRange(1, 1024)
+        self.jobs_spin.setValue(os.cpu_count() or 1)
+        form.addRow("并发数:", self.jobs_spin)
+        layout.addLayout(form)
+
+        buttons = QHBoxLayout()
+        self.start_button = QPushButton("开始")
+        self.start_button.clicked.connect(self.start)
+        self.cancel_button = QPushButton("取消")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel)
+        self.progress_bar = QProgressBar()
+        self.status_label = QLabel()
+        buttons.addWidget(self.start_button)
+        buttons.addWidget(self.cancel_button)
+        buttons.addWidget(self.progress_bar, 1)
+        layout.addLayout(buttons)
+        layout.addWidget(self.status_label)
+
+        self.table_widget = QTableWidget()
+        self.table_widget.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table_widget, 1)
+        self.setLayout(layout)
+
+    def _with_browse(self, edit, callback):
+        widget = QWidget()
+        row = QHBoxLayout()
+        row.setContentsMargins(0, 0, 0, 0)
+        button = QPushButton("浏览...")
+        button.clicked.connect(callback)
+        row.addWidget(edit, 1)
+        row.addWidget(button)
+        widget.setLayout(row)
+        return widget
+
+    def browse_space(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "选择参数空间文件", "", "JSON 文件 (*.json);;所有文件 (*.*)")
+        if file_path:
+            self.space_edit.setText(file_path)
+
+    def browse_output_dir(self):
+        directory = QFileDialog.getExistingDirectory(self, "选择输出目录", self.output_dir_edit.text())
+        if directory:
+            self.output_dir_edit.setText(directory)
+
+    def browse_solver(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "选择求解器", "", "所有文件 (*.*)")
+        if file_path:
+            self.solver_edit.setText(file_path)
+
+    def start(self):
+        """读取参数空间并在后台开始扫描"""
+        try:
+            space = ParameterSpace.load(self.space_edit.text())
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"读取参数空间失败:\n{str(e)}")
+            return
+        if not self.output_dir_edit.text():
+            QMessageBox.critical(self, "错误", "请选择输出目录")
+            return
+
+        self.task = SweepTask(
+            self.base, space, Path(self.output_dir_edit.text()), self.jobs_spin.value(),
+            self.solver_edit.text() or None, self.base_dir
+        )
+        self.task.signals.progress.connect(self.on_progress)
+        self.task.signals.finished.connect(self.on_finished)
+        self.task.signals.failed.connect(self.on_failed)
+        self.start_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("正在运行...")
+        self.thread_pool.start(self.task)
+
+    def cancel(self):
+        if self.task:
+            self.task.cancel()
+            self.status_label.setText("正在取消，等待运行中的参数点结束...")
+
+    def on_progress(self, done, total):
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+
+    def on_finished(self, table):
+        """在表格中显示汇总结果"""
+        self._reset_buttons()
+        names = list(table.columns)
+        self.table_widget.setColumnCount(len(names))
+        self.table_widget.setHorizontalHeaderLabels(names)
+        self.table_widget.setRowCount(len(table))
+        for column, name in enumerate(names):
+            for row, value in enumerate(table.column(name)):
+                self.table_widget.setItem(row, column, QTableWidgetItem("" if value is None else str(value)))
+        self.table_widget.resizeColumnsToContents()
+
+        statuses = table.column("status") if len(table) else []
+        cached = sum(1 for value in table.columns.get("cached", []) if value)
+        self.status_label.setText(
+            f"完成 {statuses.count('ok')}/{len(table)} 个参数点（缓存命中 {cached}），"
+            f"结果: {Path(self.output_dir_edit.text()) / 'results.csv'}"
+        )
+
+    def on_failed(self, message):
+        self._reset_buttons()
+        self.status_label.setText("")
+        QMessageBox.critical(self, "错误", f"参数扫描失败:\n{message}")
+
+    def _reset_buttons(self):
+        self.start_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+    def done(self, result):
+        """关闭对话框前取消扫描并等待后台任务结束"""
+        self.cancel()
+        self.thread_pool.waitForDone()
+        super().done(result)
@@ -0,0 +1,371 @@
+"""
+运行监视
+连接求解器的运行监视数据流（NumSimTelemetry，见 NumSimCore/README.md），实时绘制残差、单步耗时和内存等曲线。
+
+数据流是 TCP 上逐行的 JSON：{"c": 通道名, "s": 步数, "t": 时间, "v": 数值}，另有 {"dropped": n} 和 {"end": true}。
+QTcpSocket 在主线程中异步接收，不阻塞界面；数据按通道存入可增长的 NumPy 数组，
+绘图以固定间隔刷新，每个像素列只画数据的最小值和最大值，10^6 步的数据绘制耗时与像素宽度相当。
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+from PySide6.QtCore import QObject, QPointF, QRectF, Qt, QTimer, Signal
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtNetwork import QAbstractSocket, QTcpSocket
+from PySide6.QtWidgets import (
+    QCheckBox, QDockWidget, QFileDialog, QHBoxLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem,
+    QPushButton, QSplitter, QVBoxLayout, QWidget
+)
+
+REFRESH_INTERVAL_MS = 200
+STRIP_MIN_HEIGHT = 80
+
+
+class TelemetrySeries:
+    """一个通道的数据（步数、时间、数值），容量按倍数增长"""
+
+    def __init__(self, name):
+        self.name = name
+        self.size = 0
+        self.steps = np.empty(1024, dtype=np.float64)
+        self.times = np.empty(1024, dtype=np.float64)
+        self.values = np.empty(1024, dtype=np.float64)
+
+    def append(self, steps, times, values):
+        count = len(steps)
+        if self.size + count > len(self.steps):
+            capacity = max(2 * len(self.steps), self.size + count)
+            for attribute in ("steps", "times", "values"):
+                array = np.empty(capacity, dtype=np.float64)
+                array[:self.size] = getattr(self, attribute)[:self.size]
+                setattr(self, attribute, array)
+        self.steps[self.size:self.size + count] = steps
+        self.times[self.size:self.size + count] = times
+        self.values[self.size:self.size + count] = values
+        self.size += count
+
+    @property
+    def last_value(self):
+        return self.values[self.size - 1] if self.size else float("nan")
+
+
+class TelemetryStream:
+    """解析数据流（不依赖 Qt），feed() 返回新出现的通道名"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.series = {}
+        self.dropped = 0
+        self.ended = False
+        self._buffer = b""
+
+    @property
+    def num_samples(self):
+        return sum(series.size for series in self.series.values())
+
+    def feed(self, data):
+        self._buffer += data
+        end = self._buffer.rfind(b"\n")
+        if end < 0:
+            return []
+        lines = self._buffer[:end]
+        self._buffer = self._buffer[end + 1:]
+        # 一次解析一批行比逐行 json.loads 快得多
+        records = json.loads(b"[" + lines.replace(b"\n", b",") + b"]")
+
+        grouped = {}
+        for record in records:
+            channel = record.get("c")
+            if channel is not None:
+                value = record.get("v")
+                grouped.setdefault(channel, []).append((record["s"], record["t"], float("nan") if value is None else value))
+            elif "dropped" in record:
+                self.dropped += record["dropped"]
+            elif record.get("end"):
+                self.ended = True
+
+        new_channels = []
+        for channel, samples in grouped.items():
+            if channel not in self.series:
+                self.series[channel] = TelemetrySeries(channel)
+                new_channels.append(channel)
+            array = np.array(samples, dtype=np.float64)
+            self.series[channel].append(array[:, 0], array[:, 1], array[:, 2])
+        return new_channels
+
+
+def decimate(x, y, width):
+    """
+    把 (x, y) 按 x 分成 width 个像素列，返回 (横坐标像素, 最小值, 最大值)；点数不多于 2 * width 时返回每个点
+    x 须单调递增，y 中的 NaN 被忽略
+    """
+    count = len(x)
+    span = float(x[-1] - x[0]) if count > 1 else 0.0
+    if count <= 2 * width:
+        columns = (x - x[0]) * ((width - 1) / span) if span > 0 else np.zeros(count)
+        return columns, y, y
+
+    edges = np.linspace(x[0], x[-1], width + 1)
+    starts = np.searchsorted(x, edges[:-1], side="left")
+    nonempty = np.flatnonzero(np.diff(np.append(starts, count)) > 0)
+    starts = starts[nonempty]
+    return nonempty.astype(np.float64), np.fmin.reduceat(y, starts), np.fmax.reduceat(y, starts)
+
+
+class TelemetryClient(QObject):
+    """异步接收数据流"""
+    samples_received = Signal(list)
+    state_changed = Signal(str)
+
+    def __init__(self, stream, parent=None):
+        super().__init__(parent)
+        self.stream = stream
+        self.socket = QTcpSocket(self)
+        self.socket.readyRead.connect(self._read)
+        self.socket.connected.connect(lambda: self.state_changed.emit("已连接"))
+        self.socket.disconnected.connect(self._disconnected)
+        self.socket.errorOccurred.connect(lambda error: self.state_changed.emit(f"错误: {self.socket.errorString()}"))
+
+    def connect_to(self, host, port):
+        self.disconnect_from()
+        self.state_changed.emit(f"正在连接 {host}:{port}")
+        self.socket.connectToHost(host, port)
+
+    def disconnect_from(self):
+        if self.socket.state() != QAbstractSocket.UnconnectedState:
+            self.socket.abort()
+
+    def is_connected(self):
+        return self.socket.state() == QAbstractSocket.ConnectedState
+
+    def _read(self):
+        new_channels = self.stream.feed(bytes(self.socket.readAll()))
+        self.samples_received.emit(new_channels)
+
+    def _disconnected(self):
+        self.state_changed.emit("运行结束" if self.stream.ended else "已断开")
+
+
+class TelemetryPlot(QWidget):
+    """每个选中通道一条曲线带，横轴为步数，纵轴范围各自独立"""
+
+    def __init__(self, stream, parent=None):
+        super().__init__(parent)
+        self.stream = stream
+        self.channels = []
+        self.log_scale = set()
+        self.setMinimumHeight(STRIP_MIN_HEIGHT)
+
+    def set_channels(self, channels):
+        self.channels = list(channels)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.white)
+        if not self.channels:
+            painter.drawText(self.rect(), Qt.AlignCenter, "无数据")
+            return
+
+        strip_height = self.height() / len(self.channels)
+        for index, channel in enumerate(self.channels):
+            rect = QRectF(0, index * strip_height, self.width(), strip_height)
+            self._paint_strip(painter, rect, self.stream.series[channel], channel in self.log_scale)
+
+    def _paint_strip(self, painter, rect, series, log_scale):
+        margin_left, margin_top, margin_bottom = 70.0, 16.0, 4.0
+        plot = QRectF(rect.left() + margin_left, rect.top() + margin_top,
+                      max(rect.width() - margin_left - 4.0, 1.0), max(rect.height() - margin_top - margin_bottom, 1.0))
+        painter.setPen(QPen(QColor(200, 200, 200)))
+        painter.drawRect(plot)
+        painter.setPen(Qt.black)
+        painter.drawText(QRectF(rect.left() + 4, rect.top(), rect.width() - 8, margin_top), Qt.AlignVCenter | Qt.AlignLeft,
+                         f"{series.name}    样本 {series.size}    当前 {series.last_value:.6g}")
+        if series.size == 0:
+            return
+
+        x = series.steps[:series.size]
+        y = series.values[:series.size]
+        if log_scale:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                y = np.where(y > 0, np.log10(y), np.nan)
+        columns, lower, upper = decimate(x, y, max(int(plot.width()), 1))
+
+        finite = np.isfinite(lower) & np.isfinite(upper)
+        if not finite.any():
+            return
+        y_min, y_max = float(lower[finite].min()), float(upper[finite].max())
+        if y_max <= y_min:
+            padding = abs(y_min) * 0.1 or 0.5
+            y_min, y_max = y_min - padding, y_max + padding
+        label = (lambda value: f"1e{value:.1f}") if log_scale else (lambda value: f"{value:.4g}")
+        painter.drawText(QRectF(rect.left(), plot.top() - 6, margin_left - 4, 12), Qt.AlignRight | Qt.AlignVCenter, label(y_max))
+        painter.drawText(QRectF(rect.left(), plot.bottom() - 6, margin_left - 4, 12), Qt.AlignRight | Qt.AlignVCenter, label(y_min))
+
+        # 每列依次连接最小值和最大值，得到数据的包络
+        px = plot.left() + columns[finite]
+        y_scale = plot.height() / (y_max - y_min)
+        py_lower = plot.bottom() - (lower[finite] - y_min) * y_scale
+        py_upper = plot.bottom() - (upper[finite] - y_min) * y_scale
+        points = np.empty((2 * len(px), 2))
+        points[0::2, 0] = px
+        points[1::2, 0] = px
+        points[0::2, 1] = py_lower
+        points[1::2, 1] = py_upper
+        painter.setPen(QPen(QColor(30, 100, 200), 1))
+        painter.drawPolyline(QPolygonF([QPointF(px_, py_) for px_, py_ in points]))
+
+
+class TelemetryDock(QDockWidget):
+    """运行监视停靠窗口"""
+
+    def __init__(self, default_dir="", parent=None):
+        super().__init__("Run Monitor", parent)
+        self.default_dir = default_dir
+        self.stream = TelemetryStream()
+        self.client = TelemetryClient(self.stream, self)
+        self.client.samples_received.connect(self.on_samples_received)
+        self.client.state_changed.connect(self.on_state_changed)
+        self._dirty = False
+        self.init_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start()
+
+        port_file = Path(default_dir) / "telemetry.json" if default_dir else None
+        if port_file and port_file.is_file():
+            self.load_port_file(port_file)
+
+    def init_ui(self):
+        container = QWidget()
+        layout = QVBoxLayout()
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        connection = QHBoxLayout()
+        self.address_edit = QLineEdit("127.0.0.1:")
+        self.address_edit.setPlaceholderText("地址:端口")
+        self.connect_button = QPushButton("连接")
+        self.connect_button.clicked.connect(self.toggle_connection)
+        port_file_button = QPushButton("端口文件...")
+        port_file_button.clicked.connect(self.browse_port_file)
+        self.status_label = QLabel("未连接")
+        self.count_label = QLabel()
+        connection.addWidget(self.address_edit, 1)
+        connection.addWidget(self.connect_button)
+        connection.addWidget(port_file_button)
+        connection.addWidget(self.status_label)
+        connection.addWidget(self.count_label)
+        layout.addLayout(connection)
+
+        splitter = QSplitter(Qt.Horizontal)
+        channel_panel = QWidget()
+        channel_layout = QVBoxLayout()
+        channel_layout.setContentsMargins(0, 0, 0, 0)
+        self.channel_list = QListWidget()
+        self.channel_list.itemChanged.connect(self.update_channels)
+        self.log_check = QCheckBox("选中通道用对数坐标")
+        self.log_check.toggled.connect(self.toggle_log_scale)
+        self.channel_list.currentItemChanged.connect(self.update_log_check)
+        channel_layout.addWidget(self.channel_list)
+        channel_layout.addWidget(self.log_check)
+        channel_panel.setLayout(channel_layout)
+
+        self.plot = TelemetryPlot(self.stream)
+        splitter.addWidget(channel_panel)
+        splitter.addWidget(self.plot)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter, 1)
+
+        container.setLayout(layout)
+        self.setWidget(container)
+
+    def browse_port_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "打开端口文件", self.default_dir, "端口文件 (telemetry.json);;JSON 文件 (*.json)"
+        )
+        if file_path:
+            self.load_port_file(file_path)
+            self.toggle_connection()
+
+    def load_port_file(self, path):
+        """读取求解器写出的端口文件，填入地址"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                info = json.load(f)
+            self.address_edit.setText(f"{info.get('address', '127.0.0.1')}:{info['port']}")
+        except (OSError, ValueError, KeyError) as e:
+            self.status_label.setText(f"端口文件无效: {e}")
+
+    def toggle_connection(self):
+        if self.client.is_connected():
+            self.client.disconnect_from()
+            return
+        host, _, port = self.address_edit.text().strip().rpartition(":")
+        if not port.isdigit():
+            self.status_label.setText("请输入 地址:端口")
+            return
+        # 重新连接时清空旧数据，求解器会先发送缓冲区中的全部数据
+        self.stream.reset()
+        self.channel_list.clear()
+        self.plot.log_scale.clear()
+        self.plot.set_channels([])
+        self.client.connect_to(host or "127.0.0.1", int(port))
+
+    def on_state_changed(self, text):
+        self.status_label.setText(text)
+        self.connect_button.setText("断开" if self.client.is_connected() else "连接")
+
+    def on_samples_received(self, new_channels):
+        for channel in new_channels:
+            item = QListWidgetItem(channel)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            if channel.endswith("residual"):
+                self.plot.log_scale.add(channel)
+            self.channel_list.addItem(item)
+        if new_channels:
+            self.update_channels()
+        self._dirty = True
+
+    def update_channels(self, *args):
+        channels = [
+            self.channel_list.item(i).text() for i in range(self.channel_list.count())
+            if self.channel_list.item(i).checkState() == Qt.Checked
+        ]
+        self.plot.set_channels(channels)
+        self.plot.setMinimumHeight(max(STRIP_MIN_HEIGHT, STRIP_MIN_HEIGHT * len(channels)))
+
+    def update_log_check(self, current, previous=None):
+        self.log_check.blockSignals(True)
+        self.log_check.setChecked(current is not None and current.text() in self.plot.log_scale)
+        self.log_check.blockSignals(False)
+
+    def toggle_log_scale(self, checked):
+        item = self.channel_list.currentItem()
+        if item is None:
+            return
+        if checked:
+            self.plot.log_scale.add(item.text())
+        else:
+            self.plot.log_scale.discard(item.text())
+        self.plot.update()
+
+    def refresh(self):
+        """按固定间隔重绘，避免每收到一批数据就重绘"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        text = f"样本 {self.stream.num_samples}"
+        if self.stream.dropped:
+            text += f"，丢弃 {self.stream.dropped}"
+        self.count_label.setText(text)
+        self.plot.update()
+
+    def closeEvent(self, event):
+        self.client.disconnect_from()
+        super().closeEvent(event)
@@ -0,0 +1,6 @@
+"""
+NumSimGui 单元测试
+
+用法（在 src 目录下）：
+    python -m pytest NumSimGui/tests
+"""
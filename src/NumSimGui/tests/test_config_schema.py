@@ -0,0 +1,97 @@
+"""
+求解器配置模式测试：错误信息（与 NumSimConfigSchema 相同的 "<路径>: <说明>"）和 find_field
+"""
+import json
+import sys
+
+import numpy as np
+import pytest
+
+from NumSimGui.config_schema import ConfigError, check, find_field, main, validate
+
+VALID = {
+    "scheduler": {
+        "mode": "parallel",
+        "num_threads": 4,
+        "simulations": {"Thermal": {"depends_on": ["Fluid"], "step_interval": 4}},
+    },
+    "checkpoint": {"interval": 100, "wall_interval": 3600, "check_interval": 10, "io": "mpiio"},
+    "comm": {"thread_level": "serialized"},
+    "simulations": {"Fluid": {"class": "FluidSimulation", "viscosity": 1e-3}},
+    "gui": {"theme": "dark"},
+}
+
+
+def test_valid_config():
+    assert validate(VALID) == []
+    check(VALID)
+
+
+@pytest.mark.parametrize("config, error", [
+    ({"scheduler": {"num_threads": "4"}}, "scheduler.num_threads: expected an integer"),
+    ({"scheduler": {"num_threads": 1.5}}, "scheduler.num_threads: expected an integer"),
+    ({"scheduler": {"num_threads": -1}}, "scheduler.num_threads: must be >= 0"),
+    ({"scheduler": {"mode": "threads"}}, "scheduler.mode: must be one of serial, parallel"),
+    ({"scheduler": {"mode": 1}}, "scheduler.mode: expected a string"),
+    ({"scheduler": {"threads": 4}}, "scheduler.threads: unknown key"),
+    ({"scheduler": {"simulations": {"Fluid": 1}}}, "scheduler.simulations.Fluid: expected an object"),
+    ({"scheduler": {"simulations": {"Fluid": {"depends_on": "Thermal"}}}},
+     "scheduler.simulations.Fluid.depends_on: expected an array of strings"),
+    ({"telemetry": {"port": 70000}}, "telemetry.port: must be <= 65535"),
+    ({"profile": {"enabled": 1}}, "profile.enabled: expected a boolean"),
+    ({"checkpoint": {"wall_interval": True}}, "checkpoint.wall_interval: expected a number"),
+    ({"post": []}, "post: expected an object"),
+    ({"simulations": {"Fluid": {"viscosity": 1e-3}}}, "simulations.Fluid.class: missing required key"),
+])
+def test_error_messages(config, error):
+    assert validate(config) == [error]
+
+
+def test_all_errors_are_reported():
+    config = {"scheduler": {"mode": "threads", "num_threads": -1}, "cache": {"enabled": "yes"}}
+    with pytest.raises(ConfigError) as info:
+        check(config)
+    assert info.value.errors == [
+        "scheduler.mode: must be one of serial, parallel",
+        "scheduler.num_threads: must be >= 0",
+        "cache.enabled: expected a boolean",
+    ]
+    assert str(info.value).startswith("Invalid NumSimSolver config:\n  scheduler.mode")
+
+
+def test_numpy_values():
+    """*.nsp 项目中的数值为 NumPy 标量或数组"""
+    assert validate({"scheduler": {"num_threads": np.int64(4)}, "cache": {"inputs": np.array(["a.msh"])}}) == []
+    assert validate({"scheduler": {"num_threads": np.float64(0.5)}}) == ["scheduler.num_threads: expected an integer"]
+
+
+def test_not_an_object():
+    assert validate([]) == ["expected a JSON object"]
+
+
+def test_find_field():
+    assert find_field(("scheduler", "mode")).values == ("serial", "parallel")
+    assert find_field(("scheduler", "simulations", "Fluid", "step_interval")).type == "integer"
+    assert find_field(("scheduler", "simulations")).type == "map"
+    assert find_field(("checkpoint",)).type == "object"
+    assert find_field(("simulations", "Fluid", "class")).required
+    # 插件自己的键和未检查的分区
+    assert find_field(("simulations", "Fluid", "viscosity")) is None
+    assert find_field(("gui", "theme")) is None
+    assert find_field(("scheduler", "mode", "extra")) is None
+    assert find_field(()) is None
+
+
+def test_main(tmp_path, capsys, monkeypatch):
+    path = tmp_path / "NumSimSolver.json"
+    monkeypatch.setattr(sys, "argv", ["config_schema", str(path)])
+
+    path.write_text(json.dumps({"scheduler": {"mode": "threads"}}), encoding="utf-8")
+    with pytest.raises(SystemExit) as info:
+        main()
+    assert info.value.code == 1
+    assert capsys.readouterr().out == "scheduler.mode: must be one of serial, parallel\n"
+
+    path.write_text(json.dumps(VALID), encoding="utf-8")
+    main()
+    assert capsys.readouterr().out.startswith("Config OK")
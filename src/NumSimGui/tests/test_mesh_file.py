@@ -0,0 +1,65 @@
+"""
+原生网格文件（*.nsm）读写测试
+"""
+import numpy as np
+import pytest
+
+from NumSimGui.mesh_file import ALIGNMENT, is_mesh_file, open_mesh, write_mesh
+
+VTK_TRIANGLE = 5
+
+
+def write_triangles(path, **kwargs):
+    points = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 1.0, 0.0]])
+    connectivity = np.array([0, 1, 2, 1, 3, 2])
+    offsets = np.array([0, 3, 6])
+    cell_types = np.full(2, VTK_TRIANGLE)
+    write_mesh(path, points, connectivity, offsets, cell_types, **kwargs)
+    return points, connectivity, offsets
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "mesh.nsm"
+    points, connectivity, offsets = write_triangles(
+        path, zones=[1, 2], point_data={"temperature": np.arange(4, dtype=np.float32)},
+        cell_data={"velocity": np.ones((2, 3))}
+    )
+
+    mesh = open_mesh(path)
+    assert is_mesh_file(path)
+    assert (mesh.num_points, mesh.num_cells) == (4, 2)
+    np.testing.assert_array_equal(mesh.points, points)
+    np.testing.assert_array_equal(mesh.connectivity, connectivity)
+    np.testing.assert_array_equal(mesh.offsets, offsets)
+    np.testing.assert_array_equal(mesh.zones, [1, 2])
+    assert mesh.point_data["temperature"].dtype == np.float32
+    assert mesh.cell_data["velocity"].shape == (2, 3)
+
+
+def test_trailing_empty_array(tmp_path):
+    """末尾的空数组偏移对齐到文件末尾之后，文件应被补齐且能正常打开"""
+    path = tmp_path / "empty.nsm"
+    write_mesh(path, np.zeros((3, 3)), np.array([], dtype=np.int64), [0], np.array([], dtype=np.uint8))
+
+    mesh = open_mesh(path)
+    assert mesh.num_cells == 0
+    assert mesh.zones.shape == (0,)
+    assert path.stat().st_size % ALIGNMENT == 0
+
+
+def test_truncated_file(tmp_path):
+    path = tmp_path / "mesh.nsm"
+    write_triangles(path)
+    path.write_bytes(path.read_bytes()[:-ALIGNMENT])
+
+    with pytest.raises(ValueError, match="已损坏"):
+        open_mesh(path)
+
+
+def test_not_a_mesh_file(tmp_path):
+    path = tmp_path / "mesh.nsm"
+    path.write_bytes(b"\x00" * 128)
+
+    assert not is_mesh_file(path)
+    with pytest.raises(ValueError, match="不是 NumSim 网格文件"):
+        open_mesh(path)
@@ -0,0 +1,107 @@
+"""
+项目文件格式（JSON 与二进制 *.nsp）测试：往返、格式识别、与 JSON 项目之间的转换和损坏文件的错误
+"""
+import json
+import zipfile
+
+import numpy as np
+import pytest
+
+from NumSimGui.project_format import (
+    ARRAY_MIN_SIZE, BINARY_FORMAT, JSON_FORMAT, MANIFEST_NAME, convert_project, detect_format, read_project,
+    write_project
+)
+
+SECTIONS = {
+    "version": "1.0",
+    "scheduler": {"mode": "parallel", "num_threads": 4},
+    "boundaries": {"inlet": {"type": "velocity", "value": [1.0, 0.0, 0.0]}},
+    "temperature": np.linspace(0.0, 1.0, 100),
+    "zones": list(range(ARRAY_MIN_SIZE)),
+    "名称": "平板",
+}
+
+
+def test_binary_round_trip(tmp_path):
+    path = tmp_path / "project.nsp"
+    write_project(path, SECTIONS)
+
+    assert detect_format(path) == BINARY_FORMAT
+    sections = read_project(path)
+    assert list(sections) == list(SECTIONS)
+    assert sections["scheduler"] == SECTIONS["scheduler"]
+    # 短列表保持为列表，长数值列表和数组按原始字节存放
+    assert sections["boundaries"]["inlet"]["value"] == [1.0, 0.0, 0.0]
+    np.testing.assert_array_equal(sections["temperature"], SECTIONS["temperature"])
+    assert not sections["temperature"].flags.writeable
+    assert sections["zones"].dtype.kind == "i"
+    assert sections["zones"].tolist() == SECTIONS["zones"]
+    assert sections["名称"] == "平板"
+
+
+def test_mixed_lists_keep_their_types(tmp_path):
+    """int 与 float、bool 混合的列表不转换为数组"""
+    path = tmp_path / "project.nsp"
+    values = {"mixed": [1, 2.5] * ARRAY_MIN_SIZE, "flags": [True, False] * ARRAY_MIN_SIZE}
+    write_project(path, values)
+
+    sections = read_project(path)
+    assert sections == values
+    assert type(sections["mixed"][0]) is int
+
+
+def test_convert_json_project(tmp_path):
+    """JSON 项目转换为二进制格式再转回，内容不变"""
+    source = tmp_path / "NumSimSolver.json"
+    data = {key: value.tolist() if isinstance(value, np.ndarray) else value for key, value in SECTIONS.items()}
+    source.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    assert detect_format(source) == JSON_FORMAT
+
+    binary = tmp_path / "NumSimSolver.nsp"
+    convert_project(source, binary)
+    assert detect_format(binary) == BINARY_FORMAT
+
+    target = tmp_path / "converted.json"
+    convert_project(binary, target)
+    with open(target, "r", encoding="utf-8") as f:
+        assert json.load(f) == data
+
+
+def test_detect_format_by_suffix_when_missing(tmp_path):
+    assert detect_format(tmp_path / "new.nsp") == BINARY_FORMAT
+    assert detect_format(tmp_path / "new.json") == JSON_FORMAT
+
+
+def test_truncated_binary_project(tmp_path):
+    path = tmp_path / "project.nsp"
+    write_project(path, SECTIONS)
+    path.write_bytes(path.read_bytes()[:-64])
+
+    with pytest.raises(ValueError, match="已损坏"):
+        read_project(path)
+
+
+def test_missing_array_member(tmp_path):
+    path = tmp_path / "project.nsp"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("sections/values.json", json.dumps({"$array": "arrays/values/0.bin", "dtype": "<f8", "shape": [4]}))
+        archive.writestr(MANIFEST_NAME, json.dumps({
+            "format": "NumSimProject", "format_version": 1,
+            "sections": [{"name": "values", "entry": "sections/values.json"}],
+        }))
+
+    with pytest.raises(ValueError, match="已损坏"):
+        read_project(path)
+
+
+@pytest.mark.parametrize("manifest, message", [
+    ({"format": "Other", "format_version": 1, "sections": []}, "不是 NumSim 二进制项目文件"),
+    ({"format": "NumSimProject", "format_version": 99, "sections": []}, "不支持的项目文件版本"),
+])
+def test_invalid_manifest(tmp_path, manifest, message):
+    path = tmp_path / "project.nsp"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest))
+
+    with pytest.raises(ValueError, match=message):
+        read_project(path)
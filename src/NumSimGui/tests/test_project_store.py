@@ -0,0 +1,180 @@
+"""
+项目存储（ProjectStore、ProjectAutosave）测试：只编码脏分区、原子替换、写入失败后的恢复和自动保存
+"""
+import json
+import os
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from NumSimGui import project_format
+from NumSimGui.project_store import ProjectAutosave, ProjectStore
+
+
+@pytest.fixture
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def count_encoded(monkeypatch):
+    """记录 encode_section 编码的分区名"""
+    encoded = []
+    encode_section = project_format.encode_section
+
+    def counting(name, value, file_format):
+        encoded.append(name)
+        return encode_section(name, value, file_format)
+
+    monkeypatch.setattr(project_format, "encode_section", counting)
+    return encoded
+
+
+def test_commit_encodes_only_dirty_sections(tmp_path, monkeypatch):
+    path = tmp_path / "project.json"
+    store = ProjectStore.create(path, "1.0")
+    store.set_section("mesh", {"file": "plate.msh"})
+    store.set_section("scheduler", {"mode": "serial"})
+    assert store.commit()
+
+    encoded = count_encoded(monkeypatch)
+    store.update({"mesh": {"file": "plate.msh"}, "scheduler": {"mode": "parallel"}})
+    assert store.dirty_sections == {"scheduler"}
+    assert store.commit()
+
+    assert sorted(encoded) == ["modified", "scheduler"]
+    assert not store.is_dirty
+    data = read_json(path)
+    assert data["mesh"] == {"file": "plate.msh"}
+    assert data["scheduler"] == {"mode": "parallel"}
+    assert not store.commit()
+
+
+def test_remove_section_rewrites_file(tmp_path):
+    path = tmp_path / "project.json"
+    store = ProjectStore(path, {"mesh": {"file": "plate.msh"}, "post": {"mode": "sync"}})
+    store.commit(force=True)
+
+    store.remove_section("post")
+    assert store.commit()
+    assert "post" not in read_json(path)
+
+
+def test_failed_write_keeps_file_and_dirty_sections(tmp_path, monkeypatch):
+    """写入过程中失败时原文件不变、不留临时文件，脏分区保留到下次提交"""
+    path = tmp_path / "project.json"
+    store = ProjectStore(path, {"mesh": {"file": "plate.msh"}})
+    store.commit(force=True)
+    original = path.read_bytes()
+
+    store.set_section("mesh", {"file": "disk.msh"})
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "replace", fail)
+        with pytest.raises(OSError, match="disk full"):
+            store.commit()
+
+    assert path.read_bytes() == original
+    assert sorted(os.listdir(tmp_path)) == ["project.json"]
+    assert "mesh" in store.dirty_sections
+
+    assert store.commit()
+    assert read_json(path)["mesh"] == {"file": "disk.msh"}
+
+
+def test_save_as_binary_reencodes_all_sections(tmp_path):
+    store = ProjectStore(tmp_path / "project.json", {"mesh": {"file": "plate.msh"}, "values": list(range(100))})
+    store.commit(force=True)
+
+    target = tmp_path / "project.nsp"
+    assert store.commit(target)
+    assert store.path == target
+    assert store.file_format == project_format.BINARY_FORMAT
+    sections = project_format.read_project(target)
+    assert sections["mesh"] == {"file": "plate.msh"}
+    assert sections["values"].tolist() == list(range(100))
+
+
+def test_failed_save_as_keeps_json_project(tmp_path):
+    """另存为其他格式失败后，原项目仍按原格式保存"""
+    path = tmp_path / "project.json"
+    store = ProjectStore.create(path, "1.0")
+    store.set_section("values", list(range(100)))
+    store.commit()
+
+    with pytest.raises(OSError):
+        store.commit(tmp_path / "missing" / "project.nsp")
+    assert store.path == path
+    assert store.file_format == project_format.JSON_FORMAT
+
+    store.set_section("mesh", {"file": "plate.msh"})
+    assert store.commit()
+    data = read_json(path)
+    assert data["version"] == "1.0"
+    assert data["values"] == list(range(100))
+    assert data["mesh"] == {"file": "plate.msh"}
+
+
+def test_load_round_trip(tmp_path):
+    path = tmp_path / "project.nsp"
+    store = ProjectStore.create(path, "1.0")
+    store.set_section("scheduler", {"mode": "parallel", "num_threads": 4})
+    store.commit()
+
+    loaded = ProjectStore.load(path)
+    assert loaded.file_format == project_format.BINARY_FORMAT
+    assert loaded.get_section("scheduler") == {"mode": "parallel", "num_threads": 4}
+    assert loaded.get_section("application") == "NumSimSolver"
+    assert not loaded.is_dirty
+
+
+def test_autosave_commits_collected_sections(tmp_path, app):
+    path = tmp_path / "project.json"
+    state = {"view": {"camera": [0.0, 0.0, 1.0]}}
+    autosave = ProjectAutosave(collect=lambda: dict(state))
+    autosave.set_store(ProjectStore(path))
+
+    autosave.save_now()
+    autosave.thread_pool.waitForDone()
+    assert read_json(path)["view"] == {"camera": [0.0, 0.0, 1.0]}
+
+    # 退出时同步提交最后的修改
+    state["view"] = {"camera": [1.0, 0.0, 0.0]}
+    autosave.shutdown()
+    assert read_json(path)["view"] == {"camera": [1.0, 0.0, 0.0]}
+    assert not autosave.timer.isActive()
+
+
+def test_autosave_retries_after_failure(tmp_path, app, monkeypatch):
+    """提交失败时报告错误，修改在下一次自动保存时写入"""
+    path = tmp_path / "project.json"
+    store = ProjectStore(path)
+    store.set_section("mesh", {"file": "plate.msh"})
+    autosave = ProjectAutosave()
+    autosave.set_store(store)
+    errors = []
+    autosave.failed.connect(errors.append)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "replace", fail)
+        autosave.save_now()
+        autosave.thread_pool.waitForDone()
+    app.processEvents()
+
+    assert errors == ["disk full"]
+    assert not path.exists()
+    assert store.is_dirty
+
+    autosave.save_now()
+    autosave.shutdown()
+    assert read_json(path)["mesh"] == {"file": "plate.msh"}
@@ -0,0 +1,118 @@
+"""
+结果缓存测试：缓存键的规范化（与求解器 NumSimResultCache 逐字节一致）、存入、恢复和淘汰
+
+CONFIG_TEXT 与 CANONICAL / CONFIG_HASH / KEY 是固定的测试向量，求解器一侧用同一配置检查
+NumSimResultCache::CanonicalJson（构建了 NumSimPython 时由 test_solver_canonical_json 检查）。
+"""
+import json
+import os
+
+import pytest
+
+from NumSimGui.result_cache import (
+    ENTRY_FILE_NAME, ResultCache, cache_key, canonical_json, config_hash, file_digest
+)
+
+CONFIG_TEXT = r'''{
+    "simulations": {"Plate": {"class": "Heat", "label": "a\tb \"q\" \\"}},
+    "checkpoint": {"wall_interval": 0.1, "interval": 100},
+    "scheduler": {"mode": "parallel", "num_threads": 4},
+    "values": [1.0, -2.5, 1e20, 3, true, false, null],
+    "été": 1,
+    "zeta": 2,
+    "cache": {"enabled": true},
+    "modified": "2024-01-01T00:00:00"
+}'''
+
+# 不含 cache 和 modified；键按 UTF-8 字节排序，浮点数为 %.17g，控制字符转义为 \u00XX
+CANONICAL = (
+    '{"checkpoint":{"interval":100,"wall_interval":0.10000000000000001},'
+    '"scheduler":{"mode":"parallel","num_threads":4},'
+    '"simulations":{"Plate":{"class":"Heat","label":"a\\u0009b \\"q\\" \\\\"}},'
+    '"values":[1,-2.5,1e+20,3,true,false,null],"zeta":2,"été":1}'
+)
+CONFIG_HASH = "7fd1fe728ad64abc930bb36617a3696fd4771a4919803e27b9eecd4700f243db"
+KEY = "ca4b3187367f0fc4676d81dc2b431367737d7b323ffe029a3f10e6a4a7b70859"
+
+
+def load_config():
+    return json.loads(CONFIG_TEXT)
+
+
+def test_fixed_vector():
+    config = load_config()
+    stable = {key: value for key, value in config.items() if key not in ("cache", "modified")}
+    assert canonical_json(stable) == CANONICAL
+    assert config_hash(config) == CONFIG_HASH
+    assert cache_key(config) == KEY
+
+
+def test_solver_canonical_json():
+    """求解器对同一配置给出相同的规范化文本"""
+    nsp = pytest.importorskip("NumSimPython")
+    if not hasattr(nsp, "Config"):
+        # 在 src 下运行时导入的是源码目录，而不是构建出的扩展模块
+        pytest.skip("NumSimPython is not built")
+    config = nsp.Config.loads(CONFIG_TEXT)
+    del config["cache"]
+    del config["modified"]
+    assert config.canonical_dumps() == CANONICAL
+
+
+def test_key_ignores_order_and_timestamps():
+    config = load_config()
+    reordered = json.loads(json.dumps(dict(reversed(list(config.items())))))
+    reordered["modified"] = "2025-06-01T12:00:00"
+    reordered["cache"] = {"enabled": False}
+    assert cache_key(reordered) == KEY
+
+    reordered["checkpoint"]["interval"] = 200
+    assert cache_key(reordered) != KEY
+
+
+def test_key_includes_input_files(tmp_path):
+    mesh = tmp_path / "plate.msh"
+    mesh.write_bytes(b"mesh 1")
+    config = {"scheduler": {"mode": "serial"}, "cache": {"inputs": ["plate.msh"]}}
+    key = cache_key(config, tmp_path)
+    assert cache_key(config, tmp_path) == key
+
+    mesh.write_bytes(b"mesh 2")
+    assert cache_key(config, tmp_path) != key
+    assert file_digest(mesh) == "8798c5e3e8416b786075bc05d97ecb15c28575ed755bffbd073b89bb32e532f2"
+
+
+def test_store_and_restore(tmp_path):
+    work_dir = tmp_path / "run"
+    (work_dir / "output").mkdir(parents=True)
+    (work_dir / "results.json").write_text('{"max_temperature": 1.5}')
+    (work_dir / "output" / "field.vtu").write_bytes(b"vtu")
+    cache = ResultCache(tmp_path / "cache")
+
+    assert not cache.store(KEY, work_dir, ["results.json", "missing.vtu"])
+    assert not cache.contains(KEY)
+    assert cache.store(KEY, work_dir, ["results.json", "output"])
+    assert cache.entry_path(KEY) == tmp_path / "cache" / KEY[:2] / KEY
+
+    restored = tmp_path / "restored"
+    assert cache.restore(KEY, restored)
+    assert (restored / "results.json").read_text() == '{"max_temperature": 1.5}'
+    assert (restored / "output" / "field.vtu").read_bytes() == b"vtu"
+    assert not cache.restore(CONFIG_HASH, restored)
+
+
+def test_evict_least_recently_used(tmp_path):
+    work_dir = tmp_path / "run"
+    work_dir.mkdir()
+    (work_dir / "results.bin").write_bytes(b"\0" * 1000)
+    cache = ResultCache(tmp_path / "cache", max_size=10 ** 9)
+    keys = [f"{i:02d}" + "0" * 62 for i in range(3)]
+    for age, key in enumerate(keys):
+        cache.store(key, work_dir, ["results.bin"])
+        # 第一个条目最久未使用
+        last_used = 1000000000 + age
+        os.utime(cache.entry_path(key) / ENTRY_FILE_NAME, (last_used, last_used))
+
+    cache.max_size = 2500
+    cache.evict()
+    assert [cache.contains(key) for key in keys] == [False, True, True]
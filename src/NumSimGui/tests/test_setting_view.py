@@ -0,0 +1,42 @@
+"""
+Setting View 模型测试：set_values 不原地修改 ProjectStore 持有的配置对象
+"""
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from NumSimGui.setting_view import VALUE_ROLE, SettingTreeModel
+
+
+@pytest.fixture
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def test_set_values_copies_modified_path(app):
+    boundaries = {f"wall_{i}": {"type": "wall", "temperature": 300.0} for i in range(3)}
+    config = {"settings": {"boundaries": boundaries, "zones": [{"id": 1}]}, "scheduler": {"mode": "serial"}}
+    model = SettingTreeModel(config)
+    # 已创建的节点在修改后指向新对象
+    index = model.index_for_path(("settings", "boundaries", "wall_1", "temperature"))
+
+    sections = model.set_values([
+        (("settings", "boundaries", "wall_1", "temperature"), 350.0),
+        (("settings", "boundaries", "wall_2", "type"), "inlet"),
+    ])
+
+    assert sections == {"settings"}
+    # 原对象不变
+    assert boundaries["wall_1"]["temperature"] == 300.0
+    assert boundaries["wall_2"]["type"] == "wall"
+    settings = model.config["settings"]
+    assert settings is not config["settings"]
+    assert settings["boundaries"]["wall_1"] == {"type": "wall", "temperature": 350.0}
+    assert settings["boundaries"]["wall_2"] == {"type": "inlet", "temperature": 300.0}
+    # 未修改的子树和分区仍然共用
+    assert settings["boundaries"]["wall_0"] is boundaries["wall_0"]
+    assert settings["zones"] is config["settings"]["zones"]
+    assert model.config["scheduler"] is config["scheduler"]
+
+    assert model.data(index, VALUE_ROLE) == 350.0
+    wall_1 = model.index_for_path(("settings", "boundaries", "wall_1"))
+    assert model.data(wall_1, VALUE_ROLE) is settings["boundaries"]["wall_1"]
@@ -0,0 +1,58 @@
+"""
+参数扫描测试：以基础项目目录解析输入文件并链接到参数点的工作目录
+"""
+import json
+from pathlib import Path
+
+from NumSimGui.sweep import ParameterSpace, run_sweep
+
+
+class MeshRunner:
+    """读取工作目录中的网格文件，代替求解器（可被 pickle）"""
+
+    def __call__(self, config_path, work_dir):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        mesh = (Path(work_dir) / config["mesh"]["file"]).read_text()
+        return {"mesh": mesh, "dt": config["settings"]["solver"]["dt"]}
+
+
+def make_project(tmp_path):
+    project_dir = tmp_path / "project"
+    (project_dir / "mesh").mkdir(parents=True)
+    (project_dir / "mesh" / "plate.msh").write_text("plate")
+    base = {
+        "settings": {"solver": {"dt": 0.1}},
+        "mesh": {"file": "mesh/plate.msh"},
+        "cache": {"inputs": ["mesh/plate.msh"]},
+    }
+    return base, project_dir
+
+
+def test_inputs_resolved_against_base_dir(tmp_path):
+    base, project_dir = make_project(tmp_path)
+    space = ParameterSpace("grid", {"settings.solver.dt": [0.1, 0.05]})
+
+    table = run_sweep(base, space, tmp_path / "sweep", jobs=1, runner=MeshRunner(), base_dir=project_dir)
+    assert table.column("status") == ["ok", "ok"]
+    assert table.column("mesh") == ["plate", "plate"]
+    assert table.column("dt") == [0.1, 0.05]
+
+    # 输入文件不变时第二次扫描全部命中缓存；输入文件修改后缓存键改变
+    table = run_sweep(base, space, tmp_path / "sweep", jobs=1, runner=MeshRunner(), base_dir=project_dir)
+    assert table.column("cached") == [True, True]
+    (project_dir / "mesh" / "plate.msh").write_text("refined")
+    table = run_sweep(base, space, tmp_path / "sweep2", jobs=1, runner=MeshRunner(), base_dir=project_dir,
+                      cache_dir=tmp_path / "sweep" / "cache")
+    assert table.column("cached") == [False, False]
+    assert table.column("mesh") == ["refined", "refined"]
+
+
+def test_input_outside_base_dir(tmp_path):
+    base, project_dir = make_project(tmp_path)
+    base["cache"]["inputs"] = ["../plate.msh"]
+    space = ParameterSpace("grid", {"settings.solver.dt": [0.1]})
+
+    table = run_sweep(base, space, tmp_path / "sweep", jobs=1, runner=MeshRunner(), base_dir=project_dir)
+    assert table.column("status") == ["failed"]
+    assert "绝对路径" in table.column("error")[0]
@@ -0,0 +1,80 @@
+"""
+Visual View 渲染窗口管理
+每个 Visual View 有自己的渲染窗口和 GL 上下文，打开多个大模型视图时显存和内存成倍增长。
+ViewManager 跟踪各视图的状态：
+
+- 隐藏的视图挂起渲染（不再响应 render 请求），GL 上下文和显存中的数据保留，切换回来时只需重绘一帧；
+- 持有 GL 上下文的视图超过 max_live_views 时，最久未激活的隐藏视图释放渲染窗口（GL 上下文、
+  顶点缓冲和纹理），数据集（dataset_registry 中共享）、渲染器和相机保留，激活时重新创建上下文并上传一次数据。
+
+视图只需提供 suspend()、resume()、release_graphics() 和 render()（见 vtk_view.DelayedVTKWidget），
+本模块不导入 VTK。
+"""
+from collections import OrderedDict
+
+# 同时持有 GL 上下文的视图数上限（当前视图总是保留）
+DEFAULT_MAX_LIVE_VIEWS = 4
+
+
+class ViewManager:
+    """按激活顺序管理 Visual View 的渲染窗口，限制同时持有 GL 上下文的视图数"""
+
+    def __init__(self, max_live_views=DEFAULT_MAX_LIVE_VIEWS):
+        self.max_live_views = max(1, max_live_views)
+        self.active_view = None
+        self._views = OrderedDict()  # 视图 ID -> 视图，从最久未激活到最近激活
+        self._live = set()  # 持有 GL 上下文的视图 ID
+
+    def __contains__(self, view_id):
+        return view_id in self._views
+
+    @property
+    def num_live_views(self):
+        return len(self._live)
+
+    def is_live(self, view_id):
+        return view_id in self._live
+
+    def add(self, view_id, view):
+        """登记视图，视图在第一次显示时创建 GL 上下文"""
+        self._views[view_id] = view
+        self._views.move_to_end(view_id, last=False)
+        if view_id == self.active_view:
+            self.activate(view_id)
+        else:
+            view.suspend()
+
+    def remove(self, view_id):
+        self._views.pop(view_id, None)
+        self._live.discard(view_id)
+        if self.active_view == view_id:
+            self.active_view = None
+
+    def activate(self, view_id):
+        """切换到视图：挂起之前的视图，恢复（必要时重新创建上下文）当前视图，超出上限时释放最久未激活的视图"""
+        previous = self._views.get(self.active_view)
+        if previous is not None and self.active_view != view_id:
+            previous.suspend()
+        self.active_view = view_id
+        view = self._views.get(view_id)
+        if view is None:
+            return
+        self._views.move_to_end(view_id)
+        view.resume()
+        self._live.add(view_id)
+        self.release_hidden(self.max_live_views)
+
+    def release_hidden(self, max_live_views=0):
+        """释放最久未激活的隐藏视图，直到持有 GL 上下文的视图不超过 max_live_views（当前视图除外）"""
+        for view_id, view in self._views.items():
+            if len(self._live) <= max_live_views:
+                break
+            if view_id in self._live and view_id != self.active_view:
+                view.release_graphics()
+                self._live.discard(view_id)
+
+    def render(self, view_id):
+        """重绘视图，挂起的视图在激活时再重绘"""
+        view = self._views.get(view_id)
+        if view is not None:
+            view.render()
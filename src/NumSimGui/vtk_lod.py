@@ -0,0 +1,158 @@
+"""
+大规模网格的多级细节（LOD）渲染
+对数据集预先提取表面并生成逐级简化的金字塔，相机交互时切换到满足帧时间预算的粗糙级别，
+交互结束后恢复完整分辨率。
+"""
+import time
+
+from vtkmodules.vtkCommonCore import vtkCommand
+from vtkmodules.vtkFiltersCore import vtkQuadricClustering, vtkQuadricDecimation, vtkTriangleFilter
+from vtkmodules.vtkFiltersGeometry import vtkCompositeDataGeometryFilter, vtkDataSetSurfaceFilter
+
+# 交互时的默认帧时间预算（秒）
+DEFAULT_FRAME_BUDGET = 1.0 / 15.0
+# 表面单元数低于该值时不再继续简化
+MIN_LEVEL_CELLS = 50000
+# 相邻两级之间的单元数缩减倍数
+LEVEL_REDUCTION = 4
+# 表面单元数低于该值时使用质量更好的 vtkQuadricDecimation，否则使用线性时间的 vtkQuadricClustering
+DECIMATION_CELL_LIMIT = 200000
+# 尚未测得渲染速度时，交互级别的单元数上限
+INITIAL_INTERACTIVE_CELLS = 500000
+# 渲染窗口期望刷新率高于该值时视为正在交互（静止时交互器将其设为 0.0001）
+INTERACTIVE_UPDATE_RATE = 0.001
+
+
+def extract_surface(dataset):
+    """提取数据集的外表面（多边形数据直接返回）"""
+    if dataset.IsA("vtkPolyData"):
+        return dataset
+
+    if dataset.IsA("vtkCompositeDataSet"):
+        surface_filter = vtkCompositeDataGeometryFilter()
+    else:
+        surface_filter = vtkDataSetSurfaceFilter()
+    surface_filter.SetInputData(dataset)
+    surface_filter.Update()
+    return surface_filter.GetOutput()
+
+
+def simplify_surface(surface, target_cells):
+    """将表面简化到约 target_cells 个单元"""
+    num_cells = surface.GetNumberOfCells()
+    if num_cells <= DECIMATION_CELL_LIMIT:
+        triangles = vtkTriangleFilter()
+        triangles.SetInputData(surface)
+        triangles.Update()
+        # 四边形等多边形被拆分为多个三角形，按三角形数计算缩减比例
+        num_triangles = triangles.GetOutput().GetNumberOfCells()
+        decimation = vtkQuadricDecimation()
+        decimation.SetInputConnection(triangles.GetOutputPort())
+        decimation.SetTargetReduction(max(0.0, 1.0 - target_cells / num_triangles))
+        decimation.Update()
+        return decimation.GetOutput()
+
+    # 表面三角形数约为网格划分数平方的两倍
+    divisions = max(8, int((target_cells / 2.0) ** 0.5))
+    clustering = vtkQuadricClustering()
+    clustering.SetInputData(surface)
+    clustering.SetNumberOfDivisions(divisions, divisions, divisions)
+    clustering.AutoAdjustNumberOfDivisionsOn()
+    clustering.Update()
+    return clustering.GetOutput()
+
+
+def build_lod_levels(dataset, min_cells=MIN_LEVEL_CELLS, reduction=LEVEL_REDUCTION):
+    """
+    构建 LOD 金字塔
+
+    Returns:
+        vtkPolyData 列表，第 0 级为完整表面，之后每级单元数约缩减 reduction 倍
+    """
+    levels = [extract_surface(dataset)]
+    while levels[-1].GetNumberOfCells() > min_cells * reduction:
+        target = levels[-1].GetNumberOfCells() // reduction
+        # 从上一级继续简化，每一级的输入规模逐级减小
+        level = simplify_surface(levels[-1], target)
+        if level.GetNumberOfCells() >= levels[-1].GetNumberOfCells():
+            break
+        levels.append(level)
+    return levels
+
+
+class LodController:
+    """
+    单个视图的 LOD 切换控制
+
+    监听渲染窗口的 StartEvent/EndEvent：交互中（期望刷新率较高）选择预计渲染时间不超过
+    frame_budget 的最精细级别，静止时使用第 0 级。渲染速度根据实际帧时间持续估计。
+    """
+
+    def __init__(self, render_window, mapper, levels, frame_budget=DEFAULT_FRAME_BUDGET, on_frame=None):
+        self.render_window = render_window
+        self.mapper = mapper
+        self.levels = levels
+        self.frame_budget = frame_budget
+        self.on_frame = on_frame
+        self.current_level = 0
+        self.last_frame_time = 0.0
+        self._seconds_per_cell = None
+        self._frame_start = 0.0
+
+        interactor = render_window.GetInteractor()
+        if interactor:
+            interactor.SetDesiredUpdateRate(1.0 / frame_budget)
+
+        self.mapper.SetInputData(levels[0])
+        self._observers = [
+            render_window.AddObserver(vtkCommand.StartEvent, self._on_render_start),
+            render_window.AddObserver(vtkCommand.EndEvent, self._on_render_end),
+        ]
+
+    def detach(self):
+        """移除观察者，恢复完整分辨率"""
+        for observer in self._observers:
+            self.render_window.RemoveObserver(observer)
+        self._observers = []
+        self.mapper.SetInputData(self.levels[0])
+
+    def set_frame_budget(self, frame_budget):
+        self.frame_budget = frame_budget
+        interactor = self.render_window.GetInteractor()
+        if interactor:
+            interactor.SetDesiredUpdateRate(1.0 / frame_budget)
+
+    def select_level(self, interactive):
+        """选择要渲染的级别"""
+        if not interactive or len(self.levels) == 1:
+            return 0
+
+        for index, level in enumerate(self.levels):
+            cells = level.GetNumberOfCells()
+            if self._seconds_per_cell is None:
+                if cells <= INITIAL_INTERACTIVE_CELLS:
+                    return index
+            elif cells * self._seconds_per_cell <= self.frame_budget:
+                return index
+        return len(self.levels) - 1
+
+    def _on_render_start(self, caller, event):
+        interactive = self.render_window.GetDesiredUpdateRate() > INTERACTIVE_UPDATE_RATE
+        level = self.select_level(interactive)
+        if level != self.current_level:
+            self.current_level = level
+            self.mapper.SetInputData(self.levels[level])
+        self._frame_start = time.perf_counter()
+
+    def _on_render_end(self, caller, event):
+        self.last_frame_time = time.perf_counter() - self._frame_start
+        cells = max(1, self.levels[self.current_level].GetNumberOfCells())
+        # 指数平滑，避免单帧抖动导致级别来回切换
+        rate = self.last_frame_time / cells
+        if self._seconds_per_cell is None:
+            self._seconds_per_cell = rate
+        else:
+            self._seconds_per_cell = 0.7 * self._seconds_per_cell + 0.3 * rate
+
+        if self.on_frame:
+            self.on_frame(self.last_frame_time, self.current_level, len(self.levels))
@@ -0,0 +1,124 @@
+"""
+NumPy 网格数组到 VTK 数据集的零拷贝转换
+点坐标、连接关系、单元偏移和单元类型数组通过 numpy_support 直接包装为 VTK 数组，
+不做逐单元的 Python 循环。dtype 与内存布局满足要求时不会发生任何复制。
+另提供按文件后缀创建 VTK 读取器的辅助函数。
+"""
+from pathlib import Path
+
+import numpy as np
+from vtkmodules.util import numpy_support
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkCommonDataModel import vtkCellArray, vtkUnstructuredGrid
+
+# 零拷贝所允许的 dtype，其他 dtype 会被转换（产生一次复制）
+POINT_DTYPES = (np.float32, np.float64)
+INDEX_DTYPES = (np.int32, np.int64)
+CELL_TYPE_DTYPE = np.uint8
+
+
+def _as_vtk_compatible(array, dtypes, name):
+    """返回可被 VTK 直接引用的 C 连续数组（满足条件时不复制）"""
+    array = np.asarray(array)
+    if array.dtype.type not in dtypes:
+        array = array.astype(dtypes[-1])
+    if not array.flags.c_contiguous:
+        array = np.ascontiguousarray(array)
+    if array.size == 0:
+        raise ValueError(f"{name} 数组为空")
+    return array
+
+
+def numpy_to_vtk_points(points) -> vtkPoints:
+    """将 (N, 3) 点坐标数组包装为 vtkPoints"""
+    points = _as_vtk_compatible(points, POINT_DTYPES, "points")
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError(f"points 数组形状应为 (N, 3)，实际为 {points.shape}")
+
+    vtk_points = vtkPoints()
+    vtk_points.SetData(numpy_support.numpy_to_vtk(points, deep=False))
+    return vtk_points
+
+
+def numpy_to_vtk_cell_array(connectivity, offsets) -> vtkCellArray:
+    """
+    将连接关系和偏移数组包装为 vtkCellArray
+
+    offsets 采用 VTK 9 的布局：长度为单元数 + 1，首元素为 0，末元素为 connectivity 的长度。
+    两个数组的 dtype 需一致（int32 或 int64），否则统一转换为 int64。
+    """
+    connectivity = _as_vtk_compatible(connectivity, INDEX_DTYPES, "connectivity").ravel()
+    offsets = _as_vtk_compatible(offsets, INDEX_DTYPES, "offsets").ravel()
+    if connectivity.dtype != offsets.dtype:
+        connectivity = connectivity.astype(np.int64, copy=False)
+        offsets = offsets.astype(np.int64, copy=False)
+    if offsets[0] != 0 or offsets[-1] != connectivity.size:
+        raise ValueError("offsets 首元素应为 0，末元素应等于 connectivity 的长度")
+
+    cell_array = vtkCellArray()
+    cell_array.SetData(
+        numpy_support.numpy_to_vtk(offsets, deep=False),
+        numpy_support.numpy_to_vtk(connectivity, deep=False)
+    )
+    return cell_array
+
+
+def numpy_to_unstructured_grid(points, connectivity, offsets, cell_types,
+                               point_data=None, cell_data=None) -> vtkUnstructuredGrid:
+    """
+    由 NumPy 数组构建 vtkUnstructuredGrid
+
+    Args:
+        points: (N, 3) float32/float64 点坐标
+        connectivity: 所有单元的点索引首尾相接
+        offsets: 长度为单元数 + 1 的偏移数组
+        cell_types: 长度为单元数的 uint8 VTK 单元类型
+        point_data: 可选，{名称: 数组} 形式的点数据
+        cell_data: 可选，{名称: 数组} 形式的单元数据
+
+    Returns:
+        引用原始 NumPy 内存的 vtkUnstructuredGrid。VTK 数组持有 NumPy 数组的引用，
+        调用方释放自己的引用后数据依然有效。
+    """
+    cell_types = _as_vtk_compatible(cell_types, (CELL_TYPE_DTYPE,), "cell_types").ravel()
+    cell_array = numpy_to_vtk_cell_array(connectivity, offsets)
+    if cell_array.GetNumberOfCells() != cell_types.size:
+        raise ValueError(
+            f"cell_types 长度 ({cell_types.size}) 与单元数 ({cell_array.GetNumberOfCells()}) 不一致"
+        )
+
+    grid = vtkUnstructuredGrid()
+    grid.SetPoints(numpy_to_vtk_points(points))
+    grid.SetCells(numpy_support.numpy_to_vtk(cell_types, deep=False), cell_array)
+
+    for name, values in (point_data or {}).items():
+        grid.GetPointData().AddArray(_numpy_to_named_vtk_array(name, values))
+    for name, values in (cell_data or {}).items():
+        grid.GetCellData().AddArray(_numpy_to_named_vtk_array(name, values))
+
+    return grid
+
+
+def _numpy_to_named_vtk_array(name, values):
+    """将场数据数组包装为带名称的 VTK 数组"""
+    values = np.asarray(values)
+    if not values.flags.c_contiguous:
+        values = np.ascontiguousarray(values)
+    vtk_array = numpy_support.numpy_to_vtk(values, deep=False)
+    vtk_array.SetName(name)
+    return vtk_array
+
+
+def create_vtk_reader(path):
+    """根据文件后缀创建 VTK 读取器（legacy *.vtk 或 XML 格式）"""
+    if not Path(path).is_file():
+        raise FileNotFoundError(f"文件不存在: {path}")
+
+    if Path(path).suffix.lower() == ".vtk":
+        from vtkmodules.vtkIOLegacy import vtkDataSetReader
+        reader = vtkDataSetReader()
+    else:
+        from vtkmodules.vtkIOXML import vtkXMLGenericDataObjectReader
+        reader = vtkXMLGenericDataObjectReader()
+    reader.SetFileName(str(path))
+    return reader
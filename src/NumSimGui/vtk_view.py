@@ -0,0 +1,217 @@
+"""
+Visual View 的 VTK 渲染组件
+仅在首次显示 Visual View 时由 main_window 导入，只加载渲染所需的 vtkmodules 子模块，
+避免程序启动时导入整个 vtk 包。导入本模块时会安装过滤关闭错误的 VTK 输出窗口。
+"""
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QWidget
+
+from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
+from vtkmodules.vtkCommonCore import vtkOutputWindow
+from vtkmodules.vtkFiltersSources import vtkSphereSource
+from vtkmodules.vtkRenderingCore import VTK_SURFACE, VTK_WIREFRAME, vtkActor, vtkPolyDataMapper, vtkRenderer
+import vtkmodules.vtkInteractionStyle  # noqa: F401  注册默认交互样式
+import vtkmodules.vtkRenderingOpenGL2  # noqa: F401  注册 OpenGL 渲染后端
+
+
+class FilteredVTKOutputWindow(vtkOutputWindow):
+    """过滤关闭窗口时 OpenGL 错误的 VTK 输出窗口"""
+    
+    def __init__(self):
+        super().__init__()
+        self._closing = False
+    
+    def DisplayErrorText(self, text):
+        # 如果正在关闭，忽略所有OpenGL相关错误
+        if self._closing:
+            if "wglMakeCurrent failed" in text or "句柄无效" in text or "error: 6" in text:
+                return
+        # 正常情况下的错误仍然输出
+        super().DisplayErrorText(text)
+    
+    def DisplayWarningText(self, text):
+        # 警告也过滤关闭时的错误
+        if self._closing:
+            if "wglMakeCurrent failed" in text or "句柄无效" in text:
+                return
+        super().DisplayWarningText(text)
+    
+    def DisplayGenericWarningText(self, text):
+        if self._closing:
+            if "wglMakeCurrent failed" in text or "句柄无效" in text:
+                return
+        super().DisplayGenericWarningText(text)
+    
+    def DisplayDebugText(self, text):
+        if self._closing:
+            if "wglMakeCurrent failed" in text or "句柄无效" in text:
+                return
+        super().DisplayDebugText(text)
+    
+    def set_closing(self, closing):
+        self._closing = closing
+
+
+class DelayedVTKWidget(QVTKRenderWindowInteractor):
+    """延迟初始化的VTK Widget"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._vtk_initialized = False
+        self._renderer = None
+        self._actor = None
+        self._suspended = False  # 隐藏时不渲染（见 view_manager）
+    
+    def showEvent(self, event):
+        """重写showEvent，延迟初始化VTK"""
+        super().showEvent(event)
+        if not self._vtk_initialized:
+            # 使用QTimer延迟初始化，确保窗口完全显示
+            QTimer.singleShot(100, self._initialize_vtk)
+    
+    def resizeEvent(self, event):
+        """重写resizeEvent，更新VTK窗口大小"""
+        super().resizeEvent(event)
+        if self._vtk_initialized and self.width() > 0 and self.height() > 0:
+            try:
+                render_window = self.GetRenderWindow()
+                if render_window:
+                    render_window.SetSize(self.width(), self.height())
+            except:
+                pass
+    
+    def closeEvent(self, event):
+        """重写closeEvent，清理VTK资源"""
+        # 先标记为已关闭，防止后续操作
+        self._vtk_initialized = False
+        
+        try:
+            # 停止交互（如果已初始化）
+            if hasattr(self, 'Stop'):
+                try:
+                    self.Stop()
+                except:
+                    pass
+            
+            # 清理渲染窗口
+            try:
+                render_window = self.GetRenderWindow()
+                if render_window:
+                    # 禁用渲染窗口，避免后续操作
+                    try:
+                        # 设置窗口为未映射状态
+                        render_window.SetMapped(0)
+                        # 移除所有渲染器
+                        render_window.RemoveAllRenderers()
+                        # 禁用渲染
+                        render_window.SetOffScreenRendering(1)
+                        # 释放窗口资源
+                        render_window.SetWindowId(None)
+                    except:
+                        pass
+            except:
+                pass
+        except Exception:
+            # 忽略所有清理错误
+            pass
+        QWidget.closeEvent(self, event)
+    
+    def cleanup_vtk(self):
+        """清理VTK资源（在窗口销毁前调用）"""
+        if self._vtk_initialized:
+            try:
+                # 停止交互
+                if hasattr(self, 'Stop'):
+                    try:
+                        self.Stop()
+                    except:
+                        pass
+                
+                # 清理渲染窗口
+                try:
+                    render_window = self.GetRenderWindow()
+                    if render_window:
+                        render_window.RemoveAllRenderers()
+                        render_window.Finalize()
+                except:
+                    pass
+                
+                self._vtk_initialized = False
+            except:
+                pass
+    
+    def suspend(self):
+        """挂起渲染（视图隐藏时），GL 上下文和显存中的数据保留"""
+        self._suspended = True
+    
+    def resume(self):
+        """恢复渲染（视图激活时），渲染窗口已释放时重新初始化"""
+        self._suspended = False
+        if self._vtk_initialized:
+            self.GetRenderWindow().Render()
+        else:
+            self._initialize_vtk()
+    
+    def release_graphics(self):
+        """释放渲染窗口（GL 上下文、顶点缓冲和纹理），渲染器、相机和数据保留，恢复时重新上传"""
+        self._suspended = True
+        if not self._vtk_initialized:
+            return
+        try:
+            # Finalize 先释放所有渲染器中各对象的图形资源，再销毁 GL 上下文；
+            # 随后重新关联到 widget 的原生窗口，下一次渲染时在其中创建新的 GL 上下文
+            render_window = self.GetRenderWindow()
+            render_window.Finalize()
+            render_window.SetWindowInfo(str(int(self.winId())))
+        except Exception as e:
+            print(f"警告: 释放VTK渲染窗口失败: {e}")
+        self._vtk_initialized = False
+    
+    def render(self):
+        """渲染一帧（挂起或尚未初始化时跳过，激活时再渲染）"""
+        if self._vtk_initialized and not self._suspended:
+            self.GetRenderWindow().Render()
+    
+    def _initialize_vtk(self):
+        """初始化VTK渲染"""
+        if self._vtk_initialized:
+            return
+        
+        try:
+            # 确保widget已经显示且大小有效
+            if not self.isVisible() or self.width() <= 0 or self.height() <= 0:
+                # 如果widget不可见或大小无效，再延迟一次
+                QTimer.singleShot(100, self._initialize_vtk)
+                return
+            
+            # 确保widget的父widget也已经显示（特别是tab widget）
+            parent = self.parent()
+            while parent:
+                if hasattr(parent, 'isVisible') and not parent.isVisible():
+                    QTimer.singleShot(100, self._initialize_vtk)
+                    return
+                parent = parent.parent()
+            
+            # 设置窗口大小
+            if self.width() > 0 and self.height() > 0:
+                self.GetRenderWindow().SetSize(self.width(), self.height())
+            
+            # 初始化交互（只在窗口完全准备好后）
+            if not self._vtk_initialized:
+                self.Initialize()
+                self.Start()
+                
+                # 触发渲染
+                self.GetRenderWindow().Render()
+                
+                self._vtk_initialized = True
+        except Exception as e:
+            print(f"警告: VTK初始化失败: {e}")
+            # 如果初始化失败，标记为已初始化以避免无限重试
+            self._vtk_initialized = True
+
+
+
+# 创建并设置自定义错误输出窗口
+filtered_output = FilteredVTKOutputWindow()
+vtkOutputWindow.SetInstance(filtered_output)
@@ -0,0 +1,314 @@
+#include <sstream>
+#include <stdexcept>
+
+#include "NumSimMeshWriter.h"
+
+namespace NumSimSolver
+{
+    namespace
+    {
+        const char* GetVtuTypeName(NumSimMeshFormat::DataType dataType)
+        {
+            switch (dataType)
+            {
+            case NumSimMeshFormat::DataType::UInt8: return "UInt8";
+            case NumSimMeshFormat::DataType::Int32: return "Int32";
+            case NumSimMeshFormat::DataType::Int64: return "Int64";
+            case NumSimMeshFormat::DataType::Float32: return "Float32";
+            case NumSimMeshFormat::DataType::Float64: return "Float64";
+            }
+
+            return "";
+        }
+
+        bool StartsWith(const std::string& name, const std::string& prefix)
+        {
+            return name.compare(0, prefix.size(), prefix) == 0;
+        }
+    }
+
+    NumSimMeshWriter::NumSimMeshWriter()
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimMeshWriter::~NumSimMeshWriter()
+    {
+        if (this->stream_.is_open())
+        {
+            this->stream_.close();
+        }
+    }
+
+    void NumSimMeshWriter::DeclareArray(const std::string& name, NumSimMeshFormat::DataType dataType,
+        std::uint32_t numComponents, std::uint64_t numTuples)
+    {
+        if (this->stream_.is_open())
+        {
+            throw std::runtime_error("Arrays must be declared before NumSimMeshWriter::Open: " + name);
+        }
+
+        if (name.size() > NumSimMeshFormat::ARRAY_NAME_SIZE || this->arrayIndices_.count(name))
+        {
+            throw std::runtime_error("Invalid or duplicate mesh array name: " + name);
+        }
+
+        ArrayState array;
+        std::memset(&array.entry, 0, sizeof(array.entry));
+        std::memcpy(array.entry.name, name.data(), name.size());
+        array.entry.dataType = static_cast<std::uint32_t>(dataType);
+        array.entry.numComponents = numComponents;
+        array.entry.numTuples = numTuples;
+        array.entry.numBytes = numTuples * numComponents * NumSimMeshFormat::GetDataTypeSize(dataType);
+
+        this->arrayIndices_[name] = this->arrays_.size();
+        this->arrays_.push_back(array);
+    }
+
+    void NumSimMeshWriter::Open(const std::string& fileName, Format format, std::uint64_t numPoints, std::uint64_t numCells)
+    {
+        for (const char* required : { "points", "connectivity", "offsets", "cell_types" })
+        {
+            if (!this->FindArray(required))
+            {
+                throw std::runtime_error(std::string("Mesh array not declared: ") + required);
+            }
+        }
+
+        if (format == Format::Native && !this->FindArray("zones"))
+        {
+            throw std::runtime_error("Mesh array not declared: zones");
+        }
+
+        this->fileName_ = fileName;
+        this->format_ = format;
+        this->numPoints_ = numPoints;
+        this->numCells_ = numCells;
+
+        this->stream_.open(fileName, std::ios::binary | std::ios::trunc);
+
+        if (!this->stream_.is_open())
+        {
+            throw std::runtime_error("Failed to create mesh file: " + fileName);
+        }
+
+        if (format == Format::Native)
+        {
+            this->WriteNativeHeader();
+        }
+        else
+        {
+            this->WriteVtuHeader();
+        }
+    }
+
+    void NumSimMeshWriter::WriteNativeHeader()
+    {
+        using namespace NumSimMeshFormat;
+
+        FileHeader header;
+        std::memset(&header, 0, sizeof(header));
+        std::memcpy(header.magic, MAGIC, sizeof(MAGIC));
+        header.version = VERSION;
+        header.headerSize = sizeof(FileHeader);
+        header.numPoints = this->numPoints_;
+        header.numCells = this->numCells_;
+        header.numArrays = this->arrays_.size();
+        header.tableOffset = sizeof(FileHeader);
+        header.dataOffset = AlignUp(sizeof(FileHeader) + this->arrays_.size() * sizeof(ArrayEntry));
+
+        std::uint64_t offset = header.dataOffset;
+
+        for (auto& array : this->arrays_)
+        {
+            array.entry.offset = offset;
+            array.filePosition = offset;
+            offset = AlignUp(offset + array.entry.numBytes);
+        }
+
+        this->stream_.write(reinterpret_cast<const char*>(&header), sizeof(header));
+
+        for (const auto& array : this->arrays_)
+        {
+            this->stream_.write(reinterpret_cast<const char*>(&array.entry), sizeof(array.entry));
+        }
+
+        this->endPosition_ = this->arrays_.empty()
+            ? header.dataOffset
+            : this->arrays_.back().entry.offset + this->arrays_.back().entry.numBytes;
+    }
+
+    std::string NumSimMeshWriter::GetVtuDataArray(const ArrayState& array, const std::string& vtkName) const
+    {
+        std::ostringstream stream;
+        stream << "        <DataArray type=\""
+            << GetVtuTypeName(static_cast<NumSimMeshFormat::DataType>(array.entry.dataType))
+            << "\" Name=\"" << vtkName << "\"";
+
+        if (array.entry.numComponents > 1)
+        {
+            stream << " NumberOfComponents=\"" << array.entry.numComponents << "\"";
+        }
+
+        stream << " format=\"appended\" offset=\"" << array.entry.offset << "\"/>\n";
+        return stream.str();
+    }
+
+    void NumSimMeshWriter::WriteVtuHeader()
+    {
+        using namespace NumSimMeshFormat;
+
+        // VTU offsets only store the end of each cell, so the leading 0 is not written
+        auto& offsets = this->arrays_[this->arrayIndices_.at("offsets")];
+        offsets.entry.numBytes -= GetDataTypeSize(static_cast<DataType>(offsets.entry.dataType));
+
+        // appended offsets are relative to the '_' marker, each block is a UInt64 size plus payload
+        std::uint64_t offset = 0;
+
+        for (auto& array : this->arrays_)
+        {
+            array.entry.offset = offset;
+            offset += sizeof(std::uint64_t) + array.entry.numBytes;
+        }
+
+        std::ostringstream pointData;
+        std::ostringstream cellData;
+
+        for (const auto& array : this->arrays_)
+        {
+            const std::string name = GetArrayName(array.entry);
+
+            if (StartsWith(name, "point/"))
+            {
+                pointData << this->GetVtuDataArray(array, name.substr(6));
+            }
+            else if (StartsWith(name, "cell/"))
+            {
+                cellData << this->GetVtuDataArray(array, name.substr(5));
+            }
+            else if (name == "zones")
+            {
+                cellData << this->GetVtuDataArray(array, "zone");
+            }
+        }
+
+        std::ostringstream xml;
+        xml << "<?xml version=\"1.0\"?>\n"
+            << "<VTKFile type=\"UnstructuredGrid\" version=\"1.0\" byte_order=\"LittleEndian\" header_type=\"UInt64\">\n"
+            << "  <UnstructuredGrid>\n"
+            << "    <Piece NumberOfPoints=\"" << this->numPoints_ << "\" NumberOfCells=\"" << this->numCells_ << "\">\n"
+            << "      <PointData>\n" << pointData.str() << "      </PointData>\n"
+            << "      <CellData>\n" << cellData.str() << "      </CellData>\n"
+            << "      <Points>\n" << this->GetVtuDataArray(*this->FindArray("points"), "Points") << "      </Points>\n"
+            << "      <Cells>\n"
+            << this->GetVtuDataArray(*this->FindArray("connectivity"), "connectivity")
+            << this->GetVtuDataArray(*this->FindArray("offsets"), "offsets")
+            << this->GetVtuDataArray(*this->FindArray("cell_types"), "types")
+            << "      </Cells>\n"
+            << "    </Piece>\n"
+            << "  </UnstructuredGrid>\n"
+            << "  <AppendedData encoding=\"raw\">\n"
+            << "   _";
+
+        const std::string header = xml.str();
+        this->stream_.write(header.data(), header.size());
+
+        const std::uint64_t appendedStart = header.size();
+
+        for (auto& array : this->arrays_)
+        {
+            this->stream_.seekp(appendedStart + array.entry.offset);
+            this->stream_.write(reinterpret_cast<const char*>(&array.entry.numBytes), sizeof(std::uint64_t));
+            array.filePosition = appendedStart + array.entry.offset + sizeof(std::uint64_t);
+        }
+
+        this->endPosition_ = appendedStart + offset;
+    }
+
+    void NumSimMeshWriter::WriteChunk(const std::string& name, const void* data, std::uint64_t numTuples)
+    {
+        auto it = this->arrayIndices_.find(name);
+
+        if (it == this->arrayIndices_.end())
+        {
+            throw std::runtime_error("Mesh array not declared: " + name);
+        }
+
+        if (!this->stream_.is_open())
+        {
+            throw std::runtime_error("NumSimMeshWriter is not open");
+        }
+
+        ArrayState& array = this->arrays_[it->second];
+
+        if (array.writtenTuples + numTuples > array.entry.numTuples)
+        {
+            throw std::runtime_error("Too many tuples written to mesh array: " + name);
+        }
+
+        const std::uint64_t tupleSize = array.entry.numComponents
+            * NumSimMeshFormat::GetDataTypeSize(static_cast<NumSimMeshFormat::DataType>(array.entry.dataType));
+
+        const char* bytes = static_cast<const char*>(data);
+        std::uint64_t numBytes = numTuples * tupleSize;
+
+        if (this->format_ == Format::VtuRaw && name == "offsets" && array.writtenTuples == 0 && numTuples > 0)
+        {
+            bytes += tupleSize;
+            numBytes -= tupleSize;
+        }
+
+        this->stream_.seekp(array.filePosition);
+        this->stream_.write(bytes, numBytes);
+        array.filePosition += numBytes;
+        array.writtenTuples += numTuples;
+
+        if (!this->stream_)
+        {
+            throw std::runtime_error("Failed to write mesh file: " + this->fileName_);
+        }
+    }
+
+    void NumSimMeshWriter::Close()
+    {
+        if (!this->stream_.is_open())
+        {
+            return;
+        }
+
+        for (const auto& array : this->arrays_)
+        {
+            if (array.writtenTuples != array.entry.numTuples)
+            {
+                this->stream_.close();
+                throw std::runtime_error("Mesh array not completely written: " + NumSimMeshFormat::GetArrayName(array.entry));
+            }
+        }
+
+        this->stream_.seekp(0, std::ios::end);
+        const auto fileSize = static_cast<std::uint64_t>(this->stream_.tellp());
+
+        if (fileSize < this->endPosition_)
+        {
+            // trailing empty arrays are not written, extend the file to the end of the layout
+            const std::vector<char> padding(this->endPosition_ - fileSize, 0);
+            this->stream_.write(padding.data(), padding.size());
+        }
+
+        this->stream_.seekp(this->endPosition_);
+
+        if (this->format_ == Format::VtuRaw)
+        {
+            const std::string footer = "\n  </AppendedData>\n</VTKFile>\n";
+            this->stream_.write(footer.data(), footer.size());
+        }
+
+        this->stream_.close();
+    }
+
+    const NumSimMeshWriter::ArrayState* NumSimMeshWriter::FindArray(const std::string& name) const
+    {
+        auto it = this->arrayIndices_.find(name);
+        return it == this->arrayIndices_.end() ? nullptr : &this->arrays_[it->second];
+    }
+}
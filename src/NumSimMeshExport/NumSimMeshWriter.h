@@ -0,0 +1,100 @@
+#pragma once
+
+#include <fstream>
+#include <map>
+#include <string>
+#include <vector>
+
+#include "NumSimObject.h"
+#include "NumSimMeshFormat.h"
+
+namespace NumSimSolver
+{
+    /**
+     * @brief streaming mesh writer for the native container (*.nsm) and VTU
+     *
+     * @details All arrays are declared up front with their final sizes, so the
+     * complete file layout is known before any payload is written. Each
+     * WriteChunk() call then writes its block directly at the array's current
+     * position in the file, so memory use is bounded by the caller's chunk
+     * size and arrays may be written in any interleaving.
+     *
+     * Array names and layouts follow NumSimMeshFormat. "offsets" is always
+     * passed in the native layout (numCells + 1 values starting at 0); the
+     * leading 0 is dropped for VTU output.
+     *
+     * @code
+     * NumSimMeshWriter writer;
+     * writer.DeclareArray("points", DataType::Float64, 3, numPoints);
+     * ...
+     * writer.Open("result.vtu", NumSimMeshWriter::Format::VtuRaw, numPoints, numCells);
+     * for (const auto& chunk : chunks)
+     * {
+     *     writer.WriteChunk("points", chunk.points, chunk.numPoints);
+     * }
+     * writer.Close();
+     * @endcode
+     */
+    class BOOST_SYMBOL_EXPORT NumSimMeshWriter : public NumSimObject
+    {
+    public:
+        enum class Format
+        {
+            Native,
+            VtuRaw
+        };
+
+        NumSimMeshWriter();
+        virtual ~NumSimMeshWriter();
+
+        /**
+         * @brief declare an array before Open()
+         * @param name array name, see NumSimMeshFormat
+         * @param dataType element type
+         * @param numComponents components per tuple
+         * @param numTuples total number of tuples that will be written
+         */
+        void DeclareArray(const std::string& name, NumSimMeshFormat::DataType dataType,
+            std::uint32_t numComponents, std::uint64_t numTuples);
+
+        /**
+         * @brief create the file and write its header
+         * @throws std::runtime_error if required arrays are missing or the file cannot be created
+         */
+        void Open(const std::string& fileName, Format format, std::uint64_t numPoints, std::uint64_t numCells);
+
+        /**
+         * @brief append numTuples tuples to an array
+         * @throws std::runtime_error if the array is unknown or would overflow its declared size
+         */
+        void WriteChunk(const std::string& name, const void* data, std::uint64_t numTuples);
+
+        /**
+         * @brief finish the file
+         * @throws std::runtime_error if any array was not completely written
+         */
+        void Close();
+
+    private:
+        struct ArrayState
+        {
+            NumSimMeshFormat::ArrayEntry entry;
+            std::uint64_t writtenTuples = 0;
+            std::uint64_t filePosition = 0;
+        };
+
+        void WriteNativeHeader();
+        void WriteVtuHeader();
+        std::string GetVtuDataArray(const ArrayState& array, const std::string& vtkName) const;
+        const ArrayState* FindArray(const std::string& name) const;
+
+        std::string fileName_;
+        Format format_ = Format::Native;
+        std::uint64_t numPoints_ = 0;
+        std::uint64_t numCells_ = 0;
+        std::uint64_t endPosition_ = 0;
+        std::vector<ArrayState> arrays_;
+        std::map<std::string, std::size_t> arrayIndices_;
+        std::ofstream stream_;
+    };
+}
@@ -0,0 +1,97 @@
+#pragma once
+
+#include <cstdint>
+#include <cstring>
+#include <string>
+
+namespace NumSimSolver
+{
+    /**
+     * @brief On-disk layout of the native NumSim mesh container (*.nsm).
+     *
+     * @details The file is a fixed 64-byte header, followed by a table of
+     * 64-byte array entries, followed by the array payloads. Every payload
+     * starts on a NUMSIM_MESH_ALIGNMENT boundary and is stored contiguous
+     * and little-endian, so a reader can map the file and hand out pointers
+     * into it without copying. The same layout is read by
+     * NumSimGui/mesh_file.py through numpy.memmap.
+     *
+     * Required arrays:
+     *  - "points"       Float64, 3 components, numPoints tuples
+     *  - "connectivity" Int64,   1 component
+     *  - "offsets"      Int64,   1 component, numCells + 1 tuples
+     *  - "cell_types"   UInt8,   1 component, numCells tuples (VTK cell types)
+     *  - "zones"        Int32,   1 component, numCells tuples
+     *
+     * Field data is stored as additional arrays named "point/<name>" or
+     * "cell/<name>".
+     */
+    namespace NumSimMeshFormat
+    {
+        constexpr char MAGIC[8] = { 'N', 'S', 'M', 'E', 'S', 'H', '\0', '\0' };
+        constexpr std::uint32_t VERSION = 1;
+        constexpr std::uint64_t ALIGNMENT = 64;
+        constexpr std::size_t ARRAY_NAME_SIZE = 32;
+
+        enum class DataType : std::uint32_t
+        {
+            UInt8 = 1,
+            Int32 = 2,
+            Int64 = 3,
+            Float32 = 4,
+            Float64 = 5
+        };
+
+        inline std::uint64_t GetDataTypeSize(DataType dataType)
+        {
+            switch (dataType)
+            {
+            case DataType::UInt8: return 1;
+            case DataType::Int32: return 4;
+            case DataType::Int64: return 8;
+            case DataType::Float32: return 4;
+            case DataType::Float64: return 8;
+            }
+
+            return 0;
+        }
+
+        inline std::uint64_t AlignUp(std::uint64_t offset)
+        {
+            return (offset + ALIGNMENT - 1) / ALIGNMENT * ALIGNMENT;
+        }
+
+#pragma pack(push, 1)
+        struct FileHeader
+        {
+            char magic[8];
+            std::uint32_t version;
+            std::uint32_t headerSize;
+            std::uint64_t numPoints;
+            std::uint64_t numCells;
+            std::uint64_t numArrays;
+            std::uint64_t tableOffset;
+            std::uint64_t dataOffset;
+            std::uint64_t reserved;
+        };
+
+        struct ArrayEntry
+        {
+            char name[ARRAY_NAME_SIZE];
+            std::uint32_t dataType;
+            std::uint32_t numComponents;
+            std::uint64_t numTuples;
+            std::uint64_t offset;
+            std::uint64_t numBytes;
+        };
+#pragma pack(pop)
+
+        static_assert(sizeof(FileHeader) == 64, "FileHeader must be 64 bytes");
+        static_assert(sizeof(ArrayEntry) == 64, "ArrayEntry must be 64 bytes");
+
+        inline std::string GetArrayName(const ArrayEntry& entry)
+        {
+            return std::string(entry.name, strnlen(entry.name, ARRAY_NAME_SIZE));
+        }
+    }
+}
@@ -0,0 +1,172 @@
+#include <stdexcept>
+
+#include "NumSimMeshReader.h"
+
+namespace NumSimSolver
+{
+    NumSimMeshReader::NumSimMeshReader()
+    {
+        this->className_ = __func__;
+    }
+
+    NumSimMeshReader::~NumSimMeshReader()
+    {
+        this->Close();
+    }
+
+    void NumSimMeshReader::Open(const std::string& fileName)
+    {
+        using namespace NumSimMeshFormat;
+
+        this->Close();
+
+        try
+        {
+            this->file_ = boost::interprocess::file_mapping(fileName.c_str(), boost::interprocess::read_only);
+            this->region_ = boost::interprocess::mapped_region(this->file_, boost::interprocess::read_only);
+        }
+        catch (const boost::interprocess::interprocess_exception& e)
+        {
+            throw std::runtime_error("Failed to map mesh file: " + fileName + " (" + e.what() + ")");
+        }
+
+        const auto* base = static_cast<const char*>(this->region_.get_address());
+        const std::uint64_t fileSize = this->region_.get_size();
+
+        if (fileSize < sizeof(FileHeader))
+        {
+            this->Close();
+            throw std::runtime_error("Mesh file is truncated: " + fileName);
+        }
+
+        const auto* header = reinterpret_cast<const FileHeader*>(base);
+
+        if (std::memcmp(header->magic, MAGIC, sizeof(MAGIC)) != 0 || header->version != VERSION)
+        {
+            this->Close();
+            throw std::runtime_error("Not a NumSim mesh file or unsupported version: " + fileName);
+        }
+
+        if (header->tableOffset + header->numArrays * sizeof(ArrayEntry) > fileSize)
+        {
+            this->Close();
+            throw std::runtime_error("Mesh file array table is truncated: " + fileName);
+        }
+
+        const auto* table = reinterpret_cast<const ArrayEntry*>(base + header->tableOffset);
+
+        for (std::uint64_t i = 0; i < header->numArrays; ++i)
+        {
+            const ArrayEntry& entry = table[i];
+            const std::uint64_t typeSize = GetDataTypeSize(static_cast<DataType>(entry.dataType));
+
+            // an empty array occupies no bytes, its aligned offset may lie at or past the end of the file
+            if (typeSize == 0
+                || entry.numBytes != entry.numTuples * entry.numComponents * typeSize
+                || entry.offset % ALIGNMENT != 0
+                || (entry.numBytes > 0 && entry.offset + entry.numBytes > fileSize))
+            {
+                this->Close();
+                throw std::runtime_error("Mesh file array '" + GetArrayName(entry) + "' is corrupt: " + fileName);
+            }
+
+            this->arrays_[GetArrayName(entry)] = &entry;
+        }
+
+        this->header_ = header;
+        this->fileName_ = fileName;
+
+        for (const char* required : { "points", "connectivity", "offsets", "cell_types", "zones" })
+        {
+            if (!this->FindArray(required))
+            {
+                this->Close();
+                throw std::runtime_error(std::string("Mesh file is missing array '") + required + "': " + fileName);
+            }
+        }
+    }
+
+    void NumSimMeshReader::Close()
+    {
+        this->arrays_.clear();
+        this->header_ = nullptr;
+        this->fileName_.clear();
+        this->region_ = boost::interprocess::mapped_region();
+        this->file_ = boost::interprocess::file_mapping();
+    }
+
+    std::uint64_t NumSimMeshReader::GetNumberOfPoints() const
+    {
+        return this->header_ ? this->header_->numPoints : 0;
+    }
+
+    std::uint64_t NumSimMeshReader::GetNumberOfCells() const
+    {
+        return this->header_ ? this->header_->numCells : 0;
+    }
+
+    const real_t* NumSimMeshReader::GetPoints() const
+    {
+        return static_cast<const real_t*>(this->GetArrayData("points", NumSimMeshFormat::DataType::Float64));
+    }
+
+    const std::int64_t* NumSimMeshReader::GetConnectivity() const
+    {
+        return static_cast<const std::int64_t*>(this->GetArrayData("connectivity", NumSimMeshFormat::DataType::Int64));
+    }
+
+    std::uint64_t NumSimMeshReader::GetConnectivitySize() const
+    {
+        const auto* entry = this->FindArray("connectivity");
+        return entry ? entry->numTuples : 0;
+    }
+
+    const std::int64_t* NumSimMeshReader::GetOffsets() const
+    {
+        return static_cast<const std::int64_t*>(this->GetArrayData("offsets", NumSimMeshFormat::DataType::Int64));
+    }
+
+    const std::uint8_t* NumSimMeshReader::GetCellTypes() const
+    {
+        return static_cast<const std::uint8_t*>(this->GetArrayData("cell_types", NumSimMeshFormat::DataType::UInt8));
+    }
+
+    const std::int32_t* NumSimMeshReader::GetZones() const
+    {
+        return static_cast<const std::int32_t*>(this->GetArrayData("zones", NumSimMeshFormat::DataType::Int32));
+    }
+
+    const NumSimMeshFormat::ArrayEntry* NumSimMeshReader::FindArray(const std::string& name) const
+    {
+        auto it = this->arrays_.find(name);
+
+        if (it == this->arrays_.end())
+        {
+            return nullptr;
+        }
+
+        return it->second;
+    }
+
+    const void* NumSimMeshReader::GetArrayData(const std::string& name, NumSimMeshFormat::DataType dataType) const
+    {
+        const auto* entry = this->FindArray(name);
+
+        if (!entry)
+        {
+            throw std::runtime_error("Mesh array not found: " + name);
+        }
+
+        if (entry->dataType != static_cast<std::uint32_t>(dataType))
+        {
+            throw std::runtime_error("Mesh array has unexpected data type: " + name);
+        }
+
+        if (entry->numBytes == 0)
+        {
+            return nullptr;
+        }
+
+        return static_cast<const char*>(this->region_.get_address()) + entry->offset;
+    }
+}
@@ -0,0 +1,98 @@
+#pragma once
+
+#include <map>
+#include <string>
+#include <boost/interprocess/file_mapping.hpp>
+#include <boost/interprocess/mapped_region.hpp>
+
+#include "NumSimObject.h"
+#include "NumSimMeshFormat.h"
+
+namespace NumSimSolver
+{
+    /**
+     * @brief memory-mapped reader for the native mesh container (*.nsm)
+     *
+     * @details Open() only maps the file and validates the header and array
+     * table, so its cost does not depend on the mesh size. Array pointers
+     * point directly into the mapping; pages are faulted in on first access.
+     * The pointers stay valid until Close() or destruction.
+     *
+     * Typical use from a simulation:
+     * @code
+     * void MySimulation::ReadMesh()
+     * {
+     *     this->meshReader_.Open(meshFileName);
+     *     const real_t* points = this->meshReader_.GetPoints();
+     *     ...
+     * }
+     * @endcode
+     */
+    class BOOST_SYMBOL_EXPORT NumSimMeshReader : public NumSimObject
+    {
+    public:
+        NumSimMeshReader();
+        virtual ~NumSimMeshReader();
+
+        /**
+         * @brief map a mesh file and validate its layout
+         * @param fileName path of the *.nsm file
+         * @throws std::runtime_error if the file is missing or malformed
+         */
+        void Open(const std::string& fileName);
+
+        /**
+         * @brief unmap the file, invalidating all array pointers
+         */
+        void Close();
+
+        inline bool IsOpen() const
+        {
+            return this->header_ != nullptr;
+        }
+
+        inline const std::string& GetFileName() const
+        {
+            return this->fileName_;
+        }
+
+        std::uint64_t GetNumberOfPoints() const;
+        std::uint64_t GetNumberOfCells() const;
+
+        /**
+         * @brief interleaved xyz coordinates, 3 * GetNumberOfPoints() values
+         */
+        const real_t* GetPoints() const;
+
+        const std::int64_t* GetConnectivity() const;
+        std::uint64_t GetConnectivitySize() const;
+
+        /**
+         * @brief cell offsets into the connectivity, GetNumberOfCells() + 1 values
+         */
+        const std::int64_t* GetOffsets() const;
+
+        const std::uint8_t* GetCellTypes() const;
+        const std::int32_t* GetZones() const;
+
+        /**
+         * @brief look up an array table entry
+         * @return the entry, or nullptr if the file has no such array
+         */
+        const NumSimMeshFormat::ArrayEntry* FindArray(const std::string& name) const;
+
+        /**
+         * @brief raw pointer to an array payload with data type checking
+         * @return the payload, or nullptr if the array is empty
+         * @throws std::runtime_error if the array is missing or has another type
+         */
+        const void* GetArrayData(const std::string& name, NumSimMeshFormat::DataType dataType) const;
+
+    private:
+        std::string fileName_;
+        boost::interprocess::file_mapping file_;
+        boost::interprocess::mapped_region region_;
+        const NumSimMeshFormat::FileHeader* header_ = nullptr;
+        std::map<std::string, const NumSimMeshFormat::ArrayEntry*> arrays_;
+    };
+}
@@ -0,0 +1,578 @@
+#include <algorithm>
+#include <memory>
+#include <set>
+#include <stdexcept>
+#include <string>
+
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include "NumSimCheckpointManager.h"
+#include "NumSimComm.h"
+#include "NumSimConfigSchema.h"
+#include "NumSimFramework.h"
+#include "NumSimPostPipeline.h"
+#include "NumSimProfiler.h"
+#include "NumSimResultCache.h"
+#include "NumSimScheduler.h"
+#include "NumSimSimulation.h"
+#include "NumSimTelemetry.h"
+
+namespace py = pybind11;
+
+namespace NumSimSolver
+{
+    namespace Python
+    {
+        boost::json::value ToJson(py::handle value)
+        {
+            if (value.is_none())
+            {
+                return nullptr;
+            }
+
+            // bool is a subclass of int in Python
+            if (py::isinstance<py::bool_>(value))
+            {
+                return value.cast<bool>();
+            }
+
+            if (py::isinstance<py::int_>(value))
+            {
+                return value.cast<std::int64_t>();
+            }
+
+            if (py::isinstance<py::float_>(value))
+            {
+                return value.cast<double>();
+            }
+
+            if (py::isinstance<py::str>(value))
+            {
+                return boost::json::string(value.cast<std::string>());
+            }
+
+            if (py::isinstance<py::dict>(value))
+            {
+                boost::json::object object;
+
+                for (auto item : value.cast<py::dict>())
+                {
+                    object[py::str(item.first).cast<std::string>()] = ToJson(item.second);
+                }
+
+                return object;
+            }
+
+            if (py::isinstance<py::list>(value) || py::isinstance<py::tuple>(value))
+            {
+                boost::json::array array;
+
+                for (auto item : value)
+                {
+                    array.push_back(ToJson(item));
+                }
+
+                return array;
+            }
+
+            // NumPy arrays and scalars
+            if (py::hasattr(value, "tolist"))
+            {
+                return ToJson(value.attr("tolist")());
+            }
+
+            throw py::type_error("Object of type " + py::type::of(value).attr("__name__").cast<std::string>() + " is not JSON serializable");
+        }
+
+        py::object FromJson(const boost::json::value& value)
+        {
+            switch (value.kind())
+            {
+            case boost::json::kind::bool_:
+                return py::bool_(value.as_bool());
+            case boost::json::kind::int64:
+                return py::int_(value.as_int64());
+            case boost::json::kind::uint64:
+                return py::int_(value.as_uint64());
+            case boost::json::kind::double_:
+                return py::float_(value.as_double());
+            case boost::json::kind::string:
+                return py::str(std::string(value.as_string().c_str()));
+            case boost::json::kind::array:
+            {
+                py::list list;
+
+                for (auto& item : value.as_array())
+                {
+                    list.append(FromJson(item));
+                }
+
+                return list;
+            }
+            case boost::json::kind::object:
+            {
+                py::dict dict;
+
+                for (auto& item : value.as_object())
+                {
+                    dict[py::str(std::string(item.key()))] = FromJson(item.value());
+                }
+
+                return dict;
+            }
+            default:
+                return py::none();
+            }
+        }
+
+        /**
+         * @brief solver configuration shared between Python and the framework
+         *
+         * @details wraps the boost::json::object that main.cpp would parse from
+         * the input file, so runs can be configured from a dict without a file.
+         */
+        class Config
+        {
+        public:
+            Config()
+                : object_(std::make_shared<boost::json::object>())
+            {
+            }
+
+            explicit Config(std::shared_ptr<boost::json::object> object)
+                : object_(std::move(object))
+            {
+            }
+
+            static Config FromDict(const py::dict& dict)
+            {
+                return Config(std::make_shared<boost::json::object>(ToJson(dict).as_object()));
+            }
+
+            /**
+             * @brief non-owning view of an object owned by C++ (valid during a callback)
+             */
+            static Config Borrow(boost::json::object& object)
+            {
+                return Config(std::shared_ptr<boost::json::object>(&object, [](boost::json::object*) {}));
+            }
+
+            static Config Parse(const std::string& text)
+            {
+                boost::system::error_code ec;
+                boost::json::value value = boost::json::parse(text, ec);
+
+                if (ec || !value.is_object())
+                {
+                    throw std::runtime_error("Failed to parse NumSimSolver config: " + (ec ? ec.message() : std::string("not an object")));
+                }
+
+                return Config(std::make_shared<boost::json::object>(value.as_object()));
+            }
+
+            static Config Load(const std::string& fileName)
+            {
+                boost::json::value value = NumSimConfigSchema::ParseFile(fileName);
+                return Config(std::make_shared<boost::json::object>(std::move(value.as_object())));
+            }
+
+            inline boost::json::object& GetObject() const
+            {
+                return *this->object_;
+            }
+
+        private:
+            std::shared_ptr<boost::json::object> object_;
+        };
+
+        /**
+         * @brief trampoline so that Python subclasses can implement simulations
+         */
+        class PySimulation : public NumSimSimulation
+        {
+        public:
+            using NumSimSimulation::NumSimSimulation;
+
+            void Initialize(boost::json::object& numSimSolverJson) override
+            {
+                py::gil_scoped_acquire gil;
+                py::function override = py::get_override(static_cast<const NumSimSimulation*>(this), "initialize");
+
+                if (override)
+                {
+                    override(Config::Borrow(numSimSolverJson));
+                }
+            }
+
+            void PrintInfo() override
+            {
+                PYBIND11_OVERRIDE_NAME(void, NumSimSimulation, "print_info", PrintInfo);
+            }
+
+            void ReadMesh() override
+            {
+                PYBIND11_OVERRIDE_NAME(void, NumSimSimulation, "read_mesh", ReadMesh);
+            }
+
+            void InitFields(int flag) override
+            {
+                PYBIND11_OVERRIDE_NAME(void, NumSimSimulation, "init_fields", InitFields, flag);
+            }
+
+            void InitBoundaries(int flag) override
+            {
+                PYBIND11_OVERRIDE_NAME(void, NumSimSimulation, "init_boundaries", InitBoundaries, flag);
+            }
+
+            void InitFromRestart() override
+            {
+                PYBIND11_OVERRIDE_NAME(void, NumSimSimulation, "init_from_restart", InitFromRestart);
+            }
+
+            void Solve() override
+            {
+                PYBIND11_OVERRIDE_NAME(void, NumSimSimulation, "solve", Solve);
+            }
+
+            void Post() override
+            {
+                PYBIND11_OVERRIDE_NAME(void, NumSimSimulation, "post", Post);
+            }
+
+            void Finalize() override
+            {
+                PYBIND11_OVERRIDE_NAME(void, NumSimSimulation, "finalize", Finalize);
+            }
+
+            bool IsFinished() const override
+            {
+                PYBIND11_OVERRIDE_NAME(bool, NumSimSimulation, "is_finished", IsFinished);
+            }
+
+            bool SupportsAsyncPost() const override
+            {
+                PYBIND11_OVERRIDE_NAME(bool, NumSimSimulation, "supports_async_post", SupportsAsyncPost);
+            }
+
+            void Snapshot(NumSimPostBuffer& buffer) override
+            {
+                PYBIND11_OVERRIDE_NAME(void, NumSimSimulation, "snapshot", Snapshot, std::ref(buffer));
+            }
+
+            void WritePost(const NumSimPostBuffer& buffer) override
+            {
+                PYBIND11_OVERRIDE_NAME(void, NumSimSimulation, "write_post", WritePost, std::cref(buffer));
+            }
+        };
+
+        /**
+         * @brief framework whose simulations added from Python stay owned by Python
+         */
+        class PyFramework : public NumSimFramework
+        {
+        public:
+            ~PyFramework() override
+            {
+                // stop the I/O thread without holding the GIL, it may call Python write_post()
+                if (this->postPipeline_ && PyGILState_Check())
+                {
+                    py::gil_scoped_release release;
+
+                    try
+                    {
+                        this->postPipeline_->Stop();
+                    }
+                    catch (const std::exception&)
+                    {
+                    }
+                }
+
+                // NumSimFramework deletes the remaining simulations
+                auto end = std::remove_if(this->simulations_.begin(), this->simulations_.end(), [this](NumSimSimulation* simulation)
+                {
+                    return this->borrowed_.count(simulation) > 0;
+                });
+
+                this->simulations_.erase(end, this->simulations_.end());
+            }
+
+            void Initialize(const Config& config)
+            {
+                NumSimConfigSchema::GetSolverSchema().Check(config.GetObject());
+                this->config_ = config;
+                NumSimFramework::Initialize(config.GetObject());
+            }
+
+            void AddBorrowedSimulation(NumSimSimulation* simulation)
+            {
+                this->borrowed_.insert(simulation);
+                this->AddSimulation(simulation);
+            }
+
+            inline const std::vector<NumSimSimulation*>& GetSimulations() const
+            {
+                return this->simulations_;
+            }
+
+            inline const Config& GetConfig() const
+            {
+                return this->config_;
+            }
+
+        private:
+            Config config_;
+            std::set<NumSimSimulation*> borrowed_;
+        };
+
+        py::array FieldView(const real_t* data, std::size_t numTuples, int_t numComponents, py::handle base, bool writeable)
+        {
+            std::vector<py::ssize_t> shape = { static_cast<py::ssize_t>(numTuples) };
+            std::vector<py::ssize_t> strides = { static_cast<py::ssize_t>(numComponents * sizeof(real_t)) };
+
+            if (numComponents != 1)
+            {
+                shape.push_back(numComponents);
+                strides.push_back(sizeof(real_t));
+            }
+
+            // base keeps the owner alive as long as the view exists
+            py::array_t<real_t> array(shape, strides, data, base);
+
+            if (!writeable)
+            {
+                array.attr("setflags")(py::arg("write") = false);
+            }
+
+            return std::move(array);
+        }
+    }
+}
+
+PYBIND11_MODULE(NumSimPython, m)
+{
+    using namespace NumSimSolver;
+    using namespace NumSimSolver::Python;
+
+    m.doc() = "In-process Python bindings for NumSimCore";
+
+    py::class_<Config>(m, "Config", "Solver configuration (the parsed input JSON)")
+        .def(py::init<>())
+        .def(py::init(&Config::FromDict), py::arg("data"))
+        .def_static("loads", &Config::Parse, py::arg("text"), "Parse a JSON string")
+        .def_static("load", &Config::Load, py::arg("file_name"), "Read a JSON config file")
+        .def("to_dict", [](const Config& config) { return FromJson(config.GetObject()); })
+        .def("dumps", [](const Config& config) { return boost::json::serialize(config.GetObject()); })
+        .def("canonical_dumps", [](const Config& config) { return NumSimResultCache::CanonicalJson(config.GetObject()); },
+            "Canonical JSON hashed by the result cache (sorted keys, no whitespace, doubles with 17 digits)")
+        .def("validate", [](const Config& config) { return NumSimConfigSchema::GetSolverSchema().Validate(config.GetObject()); },
+            "Problems of the configuration as \"<path>: <message>\", empty if it is valid")
+        .def("__getitem__", [](const Config& config, const std::string& key)
+        {
+            auto value = config.GetObject().if_contains(key);
+
+            if (!value)
+            {
+                throw py::key_error(key);
+            }
+
+            return FromJson(*value);
+        })
+        .def("__setitem__", [](Config& config, const std::string& key, py::handle value) { config.GetObject()[key] = ToJson(value); })
+        .def("__delitem__", [](Config& config, const std::string& key)
+        {
+            if (!config.GetObject().erase(key))
+            {
+                throw py::key_error(key);
+            }
+        })
+        .def("__contains__", [](const Config& config, const std::string& key) { return config.GetObject().contains(key); })
+        .def("__len__", [](const Config& config) { return config.GetObject().size(); });
+
+    py::implicitly_convertible<py::dict, Config>();
+
+    py::class_<NumSimPostBuffer>(m, "PostBuffer", "Snapshot passed to Simulation.write_post; views are valid only during the call")
+        .def_property_readonly("step", &NumSimPostBuffer::GetStep)
+        .def("set_field", [](NumSimPostBuffer& buffer, const std::string& name, py::array_t<real_t, py::array::c_style | py::array::forcecast> array)
+        {
+            int_t numComponents = array.ndim() > 1 ? static_cast<int_t>(array.shape(1)) : 1;
+            buffer.SetField(name, array.data(), array.ndim() > 0 ? array.shape(0) : 1, numComponents);
+        }, py::arg("name"), py::arg("array"))
+        .def("field", [](py::object self, const std::string& name)
+        {
+            auto field = self.cast<const NumSimPostBuffer&>().GetField(name);
+
+            if (!field)
+            {
+                throw py::key_error(name);
+            }
+
+            return FieldView(field->data.data(), field->numTuples, field->numComponents, self, false);
+        }, py::arg("name"))
+        .def("field_names", [](const NumSimPostBuffer& buffer)
+        {
+            std::vector<std::string> names;
+
+            for (auto& item : buffer.GetFields())
+            {
+                names.push_back(item.first);
+            }
+
+            return names;
+        });
+
+    py::class_<NumSimSimulation, PySimulation>(m, "Simulation", "Base class for simulations; subclass it to implement one in Python", py::dynamic_attr())
+        .def(py::init_alias<>())
+        .def_property("name", &NumSimSimulation::GetObjectName, &NumSimSimulation::SetObjectName)
+        .def_property_readonly("class_name", &NumSimSimulation::GetClassName)
+        .def_property("dependencies", &NumSimSimulation::GetDependencies, &NumSimSimulation::SetDependencies)
+        .def("add_dependency", &NumSimSimulation::AddDependency, py::arg("name"))
+        .def_property("step_interval", &NumSimSimulation::GetStepInterval, &NumSimSimulation::SetStepInterval)
+        .def("initialize", [](NumSimSimulation& simulation, const Config& config) { simulation.NumSimSimulation::Initialize(config.GetObject()); }, py::arg("config"))
+        .def("print_info", &NumSimSimulation::PrintInfo)
+        .def("read_mesh", &NumSimSimulation::ReadMesh)
+        .def("init_fields", &NumSimSimulation::InitFields, py::arg("flag"))
+        .def("init_boundaries", &NumSimSimulation::InitBoundaries, py::arg("flag"))
+        .def("init_from_restart", &NumSimSimulation::InitFromRestart)
+        .def("solve", &NumSimSimulation::Solve)
+        .def("post", &NumSimSimulation::Post)
+        .def("finalize", &NumSimSimulation::Finalize)
+        .def("is_finished", &NumSimSimulation::IsFinished)
+        .def("supports_async_post", &NumSimSimulation::SupportsAsyncPost)
+        .def("snapshot", &NumSimSimulation::Snapshot, py::arg("buffer"))
+        .def("write_post", &NumSimSimulation::WritePost, py::arg("buffer"))
+        .def("register_field", [](py::object self, const std::string& name, py::array array)
+        {
+            // the solver works on the array's memory directly, so no conversion copy is allowed
+            if (!array.dtype().is(py::dtype::of<real_t>()) || !(array.flags() & py::array::c_style) || !array.writeable() || array.ndim() < 1 || array.ndim() > 2)
+            {
+                throw py::value_error("Field arrays must be writeable, C-contiguous float64 arrays with 1 or 2 dimensions");
+            }
+
+            int_t numComponents = array.ndim() == 2 ? static_cast<int_t>(array.shape(1)) : 1;
+            self.cast<NumSimSimulation&>().RegisterField(name, static_cast<real_t*>(array.mutable_data()), array.shape(0), numComponents);
+
+            // keep the array owning the memory alive with the simulation
+            py::object owners = py::getattr(self, "_field_owners", py::none());
+
+            if (owners.is_none())
+            {
+                owners = py::dict();
+                py::setattr(self, "_field_owners", owners);
+            }
+
+            owners[py::str(name)] = array;
+        }, py::arg("name"), py::arg("array"), "Register a NumPy array as a field (shared, not copied)")
+        .def("field", [](py::object self, const std::string& name)
+        {
+            auto field = self.cast<const NumSimSimulation&>().GetField(name);
+
+            if (!field)
+            {
+                throw py::key_error(name);
+            }
+
+            return FieldView(field->data, field->numTuples, field->numComponents, self, true);
+        }, py::arg("name"), "Zero-copy NumPy view of a registered field")
+        .def("fields", [](py::object self)
+        {
+            py::dict fields;
+
+            for (auto& field : self.cast<const NumSimSimulation&>().GetFields())
+            {
+                fields[py::str(field.name)] = FieldView(field.data, field.numTuples, field.numComponents, self, true);
+            }
+
+            return fields;
+        }, "Zero-copy NumPy views of all registered fields");
+
+    py::class_<NumSimScheduler> scheduler(m, "Scheduler");
+
+    py::enum_<NumSimScheduler::Mode>(scheduler, "Mode")
+        .value("SERIAL", NumSimScheduler::Mode::Serial)
+        .value("PARALLEL", NumSimScheduler::Mode::Parallel);
+
+    scheduler
+        .def_property("mode", &NumSimScheduler::GetMode, &NumSimScheduler::SetMode)
+        .def_property("num_threads", &NumSimScheduler::GetNumThreads, &NumSimScheduler::SetNumThreads);
+
+    py::class_<NumSimPostPipeline> postPipeline(m, "PostPipeline");
+
+    py::enum_<NumSimPostPipeline::Mode>(postPipeline, "Mode")
+        .value("SYNC", NumSimPostPipeline::Mode::Sync)
+        .value("ASYNC", NumSimPostPipeline::Mode::Async);
+
+    postPipeline
+        .def_property("mode", &NumSimPostPipeline::GetMode, &NumSimPostPipeline::SetMode)
+        .def_property("buffers", &NumSimPostPipeline::GetBuffersPerSimulation, &NumSimPostPipeline::SetBuffersPerSimulation)
+        .def_property("queue_size", &NumSimPostPipeline::GetQueueSize, &NumSimPostPipeline::SetQueueSize)
+        .def_property_readonly("stall_time", &NumSimPostPipeline::GetStallTime);
+
+    py::class_<NumSimCheckpointManager> checkpointManager(m, "CheckpointManager");
+
+    py::enum_<NumSimCheckpointManager::IO>(checkpointManager, "IO")
+        .value("PER_RANK", NumSimCheckpointManager::IO::PerRank)
+        .value("MPIIO", NumSimCheckpointManager::IO::MPIIO);
+
+    checkpointManager
+        .def_property("directory", &NumSimCheckpointManager::GetDirectory, &NumSimCheckpointManager::SetDirectory)
+        .def_property("interval", &NumSimCheckpointManager::GetInterval, &NumSimCheckpointManager::SetInterval)
+        .def_property("wall_interval", &NumSimCheckpointManager::GetWallInterval, &NumSimCheckpointManager::SetWallInterval)
+        .def_property("check_interval", &NumSimCheckpointManager::GetCheckInterval, &NumSimCheckpointManager::SetCheckInterval)
+        .def_property("keep", &NumSimCheckpointManager::GetKeep, &NumSimCheckpointManager::SetKeep)
+        .def_property("io", &NumSimCheckpointManager::GetIO, &NumSimCheckpointManager::SetIO)
+        .def_property("restart", &NumSimCheckpointManager::GetRestart, &NumSimCheckpointManager::SetRestart)
+        .def("list_checkpoints", &NumSimCheckpointManager::ListCheckpoints);
+
+    py::class_<NumSimComm> comm(m, "Comm");
+
+    py::enum_<NumSimComm::ThreadLevel>(comm, "ThreadLevel")
+        .value("SINGLE", NumSimComm::ThreadLevel::Single)
+        .value("FUNNELED", NumSimComm::ThreadLevel::Funneled)
+        .value("SERIALIZED", NumSimComm::ThreadLevel::Serialized)
+        .value("MULTIPLE", NumSimComm::ThreadLevel::Multiple);
+
+    comm
+        .def_property_readonly("rank", &NumSimComm::GetMyRank)
+        .def_property_readonly("num_procs", &NumSimComm::GetNumProcs)
+        .def_property_readonly("node_rank", &NumSimComm::GetNodeRank)
+        .def_property_readonly("num_node_procs", &NumSimComm::GetNumNodeProcs)
+        .def_property_readonly("num_nodes", &NumSimComm::GetNumNodes)
+        .def_property_readonly("thread_level", &NumSimComm::GetProvidedThreadLevel)
+        .def_property_readonly("threads_per_rank", &NumSimComm::GetThreadsPerRank)
+        .def("barrier", &NumSimComm::Barrier, py::call_guard<py::gil_scoped_release>());
+
+    py::class_<NumSimProfiler>(m, "Profiler")
+        .def_property("enabled", &NumSimProfiler::IsEnabled, &NumSimProfiler::SetEnabled)
+        .def_property("report", &NumSimProfiler::GetReportFileName, &NumSimProfiler::SetReportFileName)
+        .def_property("trace", &NumSimProfiler::GetTraceFileName, &NumSimProfiler::SetTraceFileName)
+        .def_property("max_events", &NumSimProfiler::GetMaxEvents, &NumSimProfiler::SetMaxEvents);
+
+    py::class_<NumSimTelemetry>(m, "Telemetry")
+        .def_property("enabled", &NumSimTelemetry::IsEnabled, &NumSimTelemetry::SetEnabled)
+        .def_property("address", &NumSimTelemetry::GetAddress, &NumSimTelemetry::SetAddress)
+        .def_property("port", &NumSimTelemetry::GetPort, &NumSimTelemetry::SetPort)
+        .def_property("port_file", &NumSimTelemetry::GetPortFileName, &NumSimTelemetry::SetPortFileName)
+        .def_property("capacity", &NumSimTelemetry::GetCapacity, &NumSimTelemetry::SetCapacity)
+        .def_property_readonly("active", &NumSimTelemetry::IsActive)
+        .def_property_readonly("bound_port", &NumSimTelemetry::GetBoundPort)
+        .def("record", &NumSimTelemetry::Record, py::arg("channel"), py::arg("value"), "Append a sample to the live stream (rank 0 only)");
+
+    py::class_<PyFramework>(m, "Framework", "NumSimFramework driven in-process")
+        .def(py::init<>())
+        .def_property("name", &PyFramework::GetObjectName, &PyFramework::SetObjectName)
+        .def("initialize", &PyFramework::Initialize, py::arg("config"), "Configure from a Config or dict")
+        .def_property_readonly("config", &PyFramework::GetConfig)
+        .def("add_simulation", &PyFramework::AddBorrowedSimulation, py::arg("simulation"), py::keep_alive<1, 2>())
+        .def_property_readonly("simulations", &PyFramework::GetSimulations, py::return_value_policy::reference_internal)
+        .def_property_readonly("comm", &PyFramework::GetComm, py::return_value_policy::reference_internal, "MPI environment, None before initialize()")
+        .def_property_readonly("scheduler", &PyFramework::GetScheduler, py::return_value_policy::reference_internal)
+        .def_property_readonly("post_pipeline", &PyFramework::GetPostPipeline, py::return_value_policy::reference_internal)
+        .def_property_readonly("checkpoint", &PyFramework::GetCheckpointManager, py::return_value_policy::reference_internal)
+        .def_property_readonly("profiler", &PyFramework::GetProfiler, py::return_value_policy::reference_internal)
+        .def_property_readonly("telemetry", &PyFramework::GetTelemetry, py::return_value_policy::reference_internal)
+        .def("print_info", &PyFramework::PrintInfo)
+        .def("run", &PyFramework::Run, py::call_guard<py::gil_scoped_release>(), "Run all simulations (releases the GIL)")
+        .def("finalize", &PyFramework::Finalize);
+}
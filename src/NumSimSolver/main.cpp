@@ -2,7 +2,10 @@
 #include <fstream>
 #include <boost/program_options.hpp>
 
+#include "NumSimComm.h"
+#include "NumSimConfigSchema.h"
 #include "NumSimFramework.h"
+#include "NumSimResultCache.h"
 
 int main(int argc, char* argv[])
 {
@@ -10,7 +13,9 @@ int main(int argc, char* argv[])
     
     desc.add_options()
         ("help,h", "produce help message")
-        ("input,i", boost::program_options::value<std::string>(), "Input File");
+        ("input,i", boost::program_options::value<std::string>(), "Input File")
+        ("no-cache", "run the solver even if the result cache has the outputs")
+        ("check", "validate the config file and exit");
 
     boost::program_options::variables_map vm;
 
@@ -43,34 +48,69 @@ int main(int argc, char* argv[])
 
     std::cout << "Hello NumSimSolver." << std::endl;
 
-    boost::system::error_code ec;
+    // validate once up front, every component then reads its section without checking types
+    boost::json::value numSimSolverValue = NumSimSolver::NumSimConfigSchema::ParseFile(inputFile);
+    boost::json::object& numSimSolverJson = numSimSolverValue.as_object();
 
-    boost::json::object numSimSolverJson;
+    NumSimSolver::NumSimConfigSchema::GetSolverSchema().Check(numSimSolverJson);
 
-    std::ifstream inputFileStream(inputFile);
-
-    if (!inputFileStream.is_open())
+    if (vm.count("check"))
     {
-        throw std::runtime_error("Failed to open NumSimSolver config file: " + inputFile);
+        std::cout << "Config OK: " << inputFile << std::endl;
+        return 0;
     }
 
-    std::string inputFileContent((std::istreambuf_iterator<char>(inputFileStream)), std::istreambuf_iterator<char>());
+    auto framework = NumSimSolver::NumSimFramework::Create();
+
+    framework->SetObjectName("MainFramework");
+    framework->Initialize(numSimSolverJson);
+    framework->PrintInfo();
 
-    inputFileStream.close();
+    // the cache runs inside the MPI lifetime and on rank 0 only: the other ranks neither hash
+    // the inputs nor write to the cache directory, they follow the hit/miss decision of rank 0
+    NumSimSolver::NumSimComm* comm = framework->GetComm();
+    const bool isRoot = comm->GetMyRank() == 0;
 
-    numSimSolverJson = boost::json::parse(inputFileContent, ec).as_object();
+    NumSimSolver::NumSimResultCache resultCache;
+    resultCache.Initialize(numSimSolverJson);
 
-    if (ec)
+    std::string cacheKey;
+    int cacheHit = 0;
+
+    if (isRoot)
     {
-        throw std::runtime_error("Failed to parse NumSimSolver config file: " + ec.message());
+        resultCache.PrintInfo();
+
+        if (resultCache.IsEnabled())
+        {
+            cacheKey = resultCache.ComputeKey(numSimSolverJson);
+
+            if (!vm.count("no-cache") && resultCache.Restore(cacheKey))
+            {
+                std::cout << "Result cache hit: " << cacheKey << std::endl;
+                cacheHit = 1;
+            }
+        }
     }
 
-    auto framework = NumSimSolver::NumSimFramework::Create();
+    MPI_Bcast(&cacheHit, 1, MPI_INT, 0, comm->GetComm());
+
+    if (!cacheHit)
+    {
+        framework->Run();
+
+        if (resultCache.IsEnabled())
+        {
+            // every rank has written its outputs before rank 0 copies them
+            comm->Barrier();
+
+            if (isRoot)
+            {
+                resultCache.Store(cacheKey);
+            }
+        }
+    }
 
-    framework->SetObjectName("MainFramework");
-    framework->Initialize(numSimSolverJson);
-    framework->PrintInfo();
-    framework->Run();
     framework->Finalize();
 
     delete framework;